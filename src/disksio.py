@@ -3,27 +3,396 @@
 # Author: Carles Mateo
 # Description: IO operations for Disks
 
-from lib.driveutils import DriveUtils
+import argparse
+import sys
+import time
+
+from lib.diskinventory import DiskInventory
+from lib.driveutils import DriveUtils, ScanStatus
+from lib.diskstats import DiskStatsSampler
+from lib.diskwatcher import DiskWatcher
+from lib.enclosure import EnclosureIndex
+from lib.fanoutbenchmark import FanoutBenchmark
 from lib.file import File
+from lib.inventorysnapshot import InventorySnapshot
+from lib.metricsexporter import MetricsExporter
+from lib.readbenchmark import ReadBenchmark
+from lib.slowdiskdetector import SlowDiskDetector
+from lib.topology import Topology
+from lib.writebenchmark import WriteBenchmark
+
+
+# Fields for --fields, with their label and the attribute of the Disk
+D_FIELDS = {"dev_name": ("Device", "s_dev_name"),
+            "id": ("Id", "s_id"),
+            "serial": ("Serial", "s_serial"),
+            "wwn": ("WWN", "s_wwn"),
+            "major_minor": ("Major:Minor", "s_major_minor"),
+            "slot": ("Slot", "s_slot"),
+            "fault": ("Fault", "s_fault"),
+            "locate": ("Locate", "s_locate"),
+            "size": ("Size", "s_size"),
+            "logical_block_size": ("Logical", "s_logical_block_size"),
+            "physical_block_size": ("Physical", "s_physical_block_size"),
+            "ioc": ("IOC", "ioc"),
+            "vendor": ("Vendor", "manufacturer"),
+            "type": ("Type", "type"),
+            "status": ("Status", "status")}
+
+# Fields that require walking the enclosures
+A_ENCLOSURE_FIELDS = ["slot", "fault", "locate"]
+
+
+def format_disk(o_disk):
+    s_dev_name, s_id, s_serial, s_slot, s_size, s_logical_block_size, s_physical_block_size = o_disk.get_drive_info()
+    s_line = "Device: " + s_dev_name + " Id: " + s_id + " Serial: " + s_serial + " Slot: " + s_slot + \
+             "Size: " + s_size + "Physical/Logical: " + s_physical_block_size + "/" + s_logical_block_size
+    return s_line
+
+
+def print_disks(o_file, s_cache_path=""):
+    """
+    Prints a line for every disk as soon as it has been probed, instead of waiting for all of them.
+    With a cache path, the disks come from the snapshot if the hardware did not change since it was taken.
+    """
+    o_driveutils = DriveUtils(o_file)
+
+    # The enclosures are walked once before the scan, so every line can be printed complete
+    o_enclosure_index = EnclosureIndex(o_file)
+    o_enclosure_index.build()
+
+    l_disks = DiskInventory()
+    if s_cache_path != "":
+        o_snapshot = InventorySnapshot(o_driveutils, s_cache_path)
+        s_fingerprint = o_snapshot.get_fingerprint()
+        b_success, l_disks = o_snapshot.load(s_fingerprint)
+        if b_success is True:
+            for o_disk in l_disks:
+                o_enclosure_index.apply_to_disk(o_disk)
+                print(format_disk(o_disk))
+            return
+
+    o_scan_status = ScanStatus()
+    for o_disk in o_driveutils.iter_disks(l_disks, o_scan_status=o_scan_status):
+        o_enclosure_index.apply_to_disk(o_disk)
+        print(format_disk(o_disk), flush=True)
+
+    if o_scan_status.i_error_code != 0:
+        print("Error reading the drives")
+    elif s_cache_path != "":
+        o_snapshot.save(l_disks, s_fingerprint)
+
+
+def format_disk_fields(o_disk, a_fields):
+    a_columns = []
+    for s_field in a_fields:
+        s_label, s_attribute = D_FIELDS[s_field]
+        o_value = getattr(o_disk, s_attribute)
+        a_columns.append(s_label + ": " + ("" if o_value is None else str(o_value).strip()))
+    return " ".join(a_columns)
+
+
+def print_disk_fields(o_file, a_fields, s_cache_path=""):
+    """
+    Prints only the fields requested. The Disks are lazy, so only the sysfs files of those fields are read, and the
+    enclosures are only walked for the slot, fault and locate fields.
+    """
+    o_driveutils = DriveUtils(o_file)
+
+    o_enclosure_index = None
+    for s_field in a_fields:
+        if s_field in A_ENCLOSURE_FIELDS:
+            o_enclosure_index = EnclosureIndex(o_file)
+            o_enclosure_index.build()
+            break
+
+    l_disks = DiskInventory()
+    b_from_snapshot = False
+    if s_cache_path != "":
+        o_snapshot = InventorySnapshot(o_driveutils, s_cache_path)
+        b_from_snapshot, l_disks = o_snapshot.load(o_snapshot.get_fingerprint())
+
+    # The snapshot is not written from here, as it would read every field
+    o_scan_status = ScanStatus()
+    o_disks = l_disks if b_from_snapshot is True else o_driveutils.iter_disks(l_disks, b_lazy=True,
+                                                                              o_scan_status=o_scan_status)
+    for o_disk in o_disks:
+        if o_enclosure_index is not None:
+            o_enclosure_index.apply_to_disk(o_disk)
+        print(format_disk_fields(o_disk, a_fields), flush=True)
+
+    if o_scan_status.i_error_code != 0:
+        print("Error reading the drives")
+
+
+def get_all_disks(o_file, s_cache_path=""):
+    """
+    :return: An error code, 0 means everything is ok. A DiskInventory, from the snapshot if there is a valid one
+    :rtype int, DiskInventory
+    """
+    o_driveutils = DriveUtils(o_file)
+    if s_cache_path == "":
+        return o_driveutils.get_all_disks()
+
+    i_error_code, l_disks, b_from_snapshot = InventorySnapshot(o_driveutils, s_cache_path).get_all_disks()
+    return i_error_code, l_disks
+
+
+def watch(o_file, f_interval, s_cache_path="", s_group_by="", b_slow_disks=False):
+    """
+    Prints the throughput and latency of the disks every f_interval seconds, until interrupted.
+    With s_group_by, host, expander or port, it also prints the throughput behind every one of them.
+    With b_slow_disks it also prints the disks that become much slower than their peers, and when they recover.
+    """
+    i_error_code, l_disks = get_all_disks(o_file, s_cache_path)
+    a_dev_names = [o_disk.s_dev_name for o_disk in l_disks]
+
+    o_detector = None
+    if b_slow_disks is True:
+        o_enclosure_index = EnclosureIndex(o_file)
+        if o_enclosure_index.build() is False:
+            o_enclosure_index = None
+        o_detector = SlowDiskDetector()
+        o_detector.set_disks(l_disks, o_enclosure_index)
+
+    o_topology = None
+    if s_group_by != "":
+        o_topology = Topology(o_file)
+        if o_topology.build() is False:
+            print("Error reading /sys/class/block")
+            return
+
+    o_sampler = DiskStatsSampler(o_file)
+    b_success, d_metrics = o_sampler.sample()
+    if b_success is False:
+        print("Error reading /proc/diskstats")
+        return
+
+    try:
+        while True:
+            time.sleep(f_interval)
+            b_success, d_metrics = o_sampler.sample()
+            if b_success is False:
+                print("Error reading /proc/diskstats")
+                return
+            # Without disks identified, like in some VMs, show every device in /proc/diskstats
+            for s_dev_name in a_dev_names or sorted(d_metrics.keys()):
+                if s_dev_name in d_metrics:
+                    print(o_sampler.format_metrics(s_dev_name, d_metrics[s_dev_name]))
+            if o_topology is not None:
+                d_groups = o_topology.get_metrics_by(s_group_by, d_metrics)
+                for s_name in sorted(d_groups.keys()):
+                    print(o_topology.format_metrics(s_name, d_groups[s_name]))
+            if o_detector is not None:
+                a_became_slow, a_recovered = o_detector.update(d_metrics)
+                for s_dev_name in a_became_slow:
+                    print("Slow disk: " + o_detector.format_score(s_dev_name))
+                for s_dev_name in a_recovered:
+                    print("Recovered disk: " + o_detector.format_score(s_dev_name))
+            print("")
+    except KeyboardInterrupt:
+        pass
+
+
+def watch_disks(o_file, f_debounce, s_cache_path=""):
+    """
+    Prints the disks added, removed or changed as /dev/disk/by-id changes, probing only the disks affected
+    :return: 0 if it could watch, 1 otherwise
+    """
+    i_error_code, l_disks = get_all_disks(o_file, s_cache_path)
+    o_enclosure_index = EnclosureIndex(o_file)
+    o_enclosure_index.build()
+    o_enclosure_index.apply_to_disks(l_disks)
+    for o_disk in l_disks:
+        print(format_disk(o_disk))
+
+    o_disk_watcher = DiskWatcher(DriveUtils(o_file), l_disks, f_debounce=f_debounce,
+                                 o_enclosure_index=o_enclosure_index)
+    if o_disk_watcher.start() is False:
+        print("Error watching /dev/disk/by-id")
+        o_disk_watcher.close()
+        return 1
+
+    def print_events(a_events):
+        for o_event in a_events:
+            print(time.strftime("%Y-%m-%d %H:%M:%S") + " " + str(o_event), flush=True)
+
+    try:
+        o_disk_watcher.run(print_events)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        o_disk_watcher.close()
+
+    return 0
+
+
+def export_metrics(o_file, s_listen, f_interval, f_inventory_interval):
+    """
+    Serves the metrics of the disks in OpenMetrics format until interrupted
+    :return: 0 if it could listen, 1 otherwise
+    """
+    s_address, s_separator, s_port = s_listen.rpartition(":")
+    if s_separator == "" or s_port.isdigit() is False:
+        print("The address to listen to must be like 127.0.0.1:9789")
+        return 1
+
+    o_exporter = MetricsExporter(DriveUtils(o_file), s_address=s_address.strip("[]"), i_port=int(s_port),
+                                 f_interval=f_interval, f_inventory_interval=f_inventory_interval)
+    if o_exporter.start() is False:
+        print("Error listening on " + s_listen)
+        return 1
+
+    print("Serving the metrics on http://" + s_address + ":" + str(o_exporter.get_port()) + "/metrics", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        o_exporter.stop()
+
+    return 0
+
+
+def bench_read(o_file, o_args):
+    """
+    Runs the read benchmark on a device or file and prints the results
+    :return: 0 if it could run, 1 otherwise
+    """
+    o_read_benchmark = ReadBenchmark(o_args.bench_read, o_file)
+    b_success, d_results = o_read_benchmark.run(s_pattern=o_args.pattern, i_io_size=o_args.io_size,
+                                                i_queue_depth=o_args.queue_depth, f_duration=o_args.duration,
+                                                b_direct=not o_args.buffered)
+    if b_success is False:
+        print("Error running the benchmark: " + d_results["error"])
+        return 1
+
+    print(o_read_benchmark.format_results(d_results))
+    return 0
+
+
+def bench_write(o_file, o_args):
+    """
+    Runs the write benchmark on a scratch file in a directory and prints the results
+    :return: 0 if it could run, 1 otherwise
+    """
+    o_write_benchmark = WriteBenchmark(o_args.bench_write, o_file)
+    b_success, d_results = o_write_benchmark.run(s_pattern=o_args.pattern, s_mode=o_args.write_mode,
+                                                 i_block_size=o_args.io_size, i_file_size=o_args.file_size,
+                                                 f_duration=o_args.duration, i_fsync_every=o_args.fsync_every)
+    if b_success is False:
+        print("Error running the benchmark: " + d_results["error"])
+        return 1
+
+    print(o_write_benchmark.format_results(d_results))
+    return 0
+
+
+def bench_all(o_file, o_args):
+    """
+    Runs the read benchmark on all the disks at the same time and prints the results grouped by IOC
+    :return: 0 if every disk could be benchmarked, 1 otherwise
+    """
+    i_error_code, l_disks = get_all_disks(o_file, o_args.cache_path)
+    if len(l_disks) == 0:
+        print("Error reading the drives")
+        return 1
+
+    s_mode = FanoutBenchmark.MODE_PER_CPU if o_args.per_cpu is True else FanoutBenchmark.MODE_PER_DISK
+    o_fanout_benchmark = FanoutBenchmark()
+    b_success, d_report = o_fanout_benchmark.run(l_disks, s_mode=s_mode, s_pattern=o_args.pattern,
+                                                 i_io_size=o_args.io_size, i_queue_depth=o_args.queue_depth,
+                                                 f_duration=o_args.duration, b_direct=not o_args.buffered)
+    for s_line in o_fanout_benchmark.format_report(d_report):
+        print(s_line)
+
+    return 0 if b_success is True else 1
 
 
 def main():
+    o_parser = argparse.ArgumentParser(description="IO operations for Disks")
+    o_parser.add_argument("--watch", action="store_true",
+                          help="Print IOPS, MB/s, await, queue depth and %%util of the disks continuously")
+    o_parser.add_argument("--group-by", default="",
+                          choices=[Topology.TYPE_HOST, Topology.TYPE_EXPANDER, Topology.TYPE_PORT],
+                          help="In --watch mode also print the throughput behind every host, expander or port")
+    o_parser.add_argument("--slow-disks", action="store_true",
+                          help="In --watch mode also flag the disks much slower than their peers in the same "
+                               "enclosure and IOC with the same vendor and type")
+    o_parser.add_argument("--interval", type=float, default=1.0, help="Seconds between samples in --watch mode")
+    o_parser.add_argument("--fields", default="",
+                          help="Comma separated fields to print, reading only what they need. Available: " +
+                               ",".join(D_FIELDS.keys()))
+    o_parser.add_argument("--exporter", action="store_true",
+                          help="Serve the metrics of the disks for Prometheus, refreshing them every --interval")
+    o_parser.add_argument("--listen", default="127.0.0.1:9789", help="Address and port of --exporter")
+    o_parser.add_argument("--inventory-interval", type=float, default=300.0,
+                          help="Seconds between scans of the disks in --exporter mode")
+    o_parser.add_argument("--watch-disks", action="store_true",
+                          help="Print the disks added, removed or changed, watching /dev/disk/by-id")
+    o_parser.add_argument("--debounce", type=float, default=0.5,
+                          help="Seconds without changes in /dev/disk/by-id before probing the disks affected")
+    o_parser.add_argument("--bench-read", default="", metavar="TARGET",
+                          help="Benchmark the reads of a block device, like /dev/loop0, or a file")
+    o_parser.add_argument("--bench-all", action="store_true",
+                          help="Benchmark the reads of all the disks at the same time, grouped by IOC")
+    o_parser.add_argument("--per-cpu", action="store_true",
+                          help="In --bench-all use a process per CPU core instead of one per disk")
+    o_parser.add_argument("--bench-write", default="", metavar="DIRECTORY",
+                          help="Benchmark the writes to a scratch file created, and deleted, in the directory")
+    o_parser.add_argument("--pattern", default=ReadBenchmark.PATTERN_SEQUENTIAL, choices=WriteBenchmark.A_PATTERNS,
+                          help="I/O pattern for the benchmarks. append is only for --bench-write")
+    o_parser.add_argument("--write-mode", default=WriteBenchmark.MODE_BUFFERED, choices=WriteBenchmark.A_MODES,
+                          help="How --bench-write writes: buffered, direct (O_DIRECT), dsync (O_DSYNC) or fsync "
+                               "(fsync every --fsync-every writes)")
+    o_parser.add_argument("--fsync-every", type=int, default=16, help="Writes between fsyncs in the fsync mode")
+    o_parser.add_argument("--file-size", type=int, default=67108864,
+                          help="Maximum size in bytes of the scratch file of --bench-write")
+    o_parser.add_argument("--io-size", type=int, default=131072,
+                          help="Bytes per read for the benchmarks. Rounded up to the physical block size")
+    o_parser.add_argument("--queue-depth", type=int, default=1, help="Reads in flight per disk in the benchmarks")
+    o_parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run the benchmarks")
+    o_parser.add_argument("--buffered", action="store_true", help="Do not use O_DIRECT in the benchmarks")
+    o_parser.add_argument("--cache-path", default=InventorySnapshot.S_DEFAULT_PATH,
+                          help="Snapshot of the inventory, used while the disks do not change")
+    o_parser.add_argument("--no-cache", action="store_true", help="Always scan the disks, without snapshot")
+    o_args = o_parser.parse_args()
+    if o_args.no_cache is True:
+        o_args.cache_path = ""
+
     o_file = File()
-    o_driveutils = DriveUtils(o_file)
 
-    i_error_code, l_disks = o_driveutils.get_all_disks()
+    if o_args.bench_read != "":
+        return bench_read(o_file, o_args)
+
+    if o_args.bench_write != "":
+        return bench_write(o_file, o_args)
+
+    if o_args.bench_all is True:
+        return bench_all(o_file, o_args)
 
-    # Please Note: Serial works in Python2 but not un Python3
-    if i_error_code == 0:
-        for o_disk in l_disks:
-            s_dev_name, s_id, s_serial, s_slot, s_size, s_logical_block_size, s_physical_block_size = o_disk.get_drive_info()
-            s_line = "Device: " + s_dev_name + " Id: " + s_id + " Serial: " + s_serial + " Slot: " + s_slot + \
-                     "Size: " + s_size + "Physical/Logical: " + s_physical_block_size + "/" + s_logical_block_size
-            print(s_line)
+    if o_args.exporter is True:
+        return export_metrics(o_file, o_args.listen, o_args.interval, o_args.inventory_interval)
+
+    if o_args.watch_disks is True:
+        return watch_disks(o_file, o_args.debounce, o_args.cache_path)
+
+    if o_args.watch is True:
+        watch(o_file, o_args.interval, o_args.cache_path, o_args.group_by, o_args.slow_disks)
+    elif o_args.fields != "":
+        a_fields = [s_field.strip() for s_field in o_args.fields.split(",") if s_field.strip() != ""]
+        for s_field in a_fields:
+            if s_field not in D_FIELDS:
+                print("Unknown field " + s_field + ". Available: " + ",".join(D_FIELDS.keys()))
+                return 1
+        print_disk_fields(o_file, a_fields, o_args.cache_path)
     else:
-        print("Error reading the drives")
+        print_disks(o_file, o_args.cache_path)
+
+    return 0
 
 
 if __name__ == "__main__":
     # execute only if run as a script
-    main()
+    sys.exit(main())
@@ -0,0 +1,220 @@
+#
+# AsyncDriveUtils Class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: asyncio facade of DriveUtils for agents built on an event loop. The probes of the disks run on the
+#              threads of an AsyncFile, with a cap of probes running at the same time for every device, and the disks
+#              are yielded as they finish with: async for o_disk in o_async_driveutils.scan()
+#
+
+import asyncio
+
+from .asyncfile import AsyncFile
+from .diskinventory import DiskInventory
+from .driveutils import DriveUtils, ScanStatus
+
+
+class AsyncDriveUtils:
+
+    def __init__(self, o_driveutils=DriveUtils(), o_async_file=None, i_max_per_device=1, f_timeout=5.0,
+                 f_discovery_timeout=30.0):
+        """
+        :param o_driveutils: The DriveUtils doing the reads, with its File and roots
+        :type o_driveutils: DriveUtils
+        :param o_async_file: Where the reads run. By default an AsyncFile with the File of o_driveutils
+        :type o_async_file: AsyncFile
+        :param i_max_per_device: Maximum number of reads running at the same time for the same device
+        :type i_max_per_device: int
+        :param f_timeout: Seconds a disk has to wait for its device and to finish its probe before being flagged as
+                          suspect
+        :type f_timeout: float
+        :param f_discovery_timeout: Seconds to list /dev/disk/by-id and read /proc/partitions
+        :type f_discovery_timeout: float
+        """
+        self.o_driveutils = o_driveutils
+        if o_async_file is None:
+            o_async_file = AsyncFile(o_driveutils.o_file)
+        self.o_async_file = o_async_file
+        self.i_max_per_device = max(i_max_per_device, 1)
+        self.f_timeout = f_timeout
+        self.f_discovery_timeout = f_discovery_timeout
+        self.d_device_semaphores = {}
+        self.o_workers_semaphore = asyncio.Semaphore(self.o_async_file.i_max_workers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, o_type, o_value, o_traceback):
+        self.close()
+
+    async def get_all_disks(self):
+        """
+        Like DriveUtils.get_all_disks, probing the disks concurrently
+        :return: An error code, 0 means everything is ok. A DiskInventory
+        :rtype int, DiskInventory
+        """
+        all_disks = DiskInventory()
+        o_scan_status = ScanStatus()
+        async for o_disk in self.scan(all_disks, o_scan_status):
+            pass
+
+        return o_scan_status.i_error_code, all_disks
+
+    async def scan(self, all_disks=None, o_scan_status=None):
+        """
+        Async generator that yields every Disk as soon as its probe finishes, like DriveUtils.iter_disks in
+        concurrent mode. The disks are probed completely, as reading the fields of a lazy Disk would block the loop.
+        Cancelling the task iterating, or closing the generator, cancels the probes not started yet. After a break use
+        contextlib.aclosing, or the probes are only cancelled when the generator is garbage collected.
+        If the discovery does not finish in f_discovery_timeout no disk is yielded and the error code is
+        ScanStatus.ERROR_NOT_READ.
+        :param all_disks: If passed, the disks and all their by-id aliases are added to it in discovery order
+        :type all_disks: DiskInventory
+        :param o_scan_status: If passed, it gets the error code of this scan
+        :type o_scan_status: ScanStatus
+        :return: The Disks
+        :rtype Disk
+        """
+        if o_scan_status is None:
+            o_scan_status = ScanStatus()
+        b_success, a_new_disks = await self.discover_disks(all_disks, o_scan_status)
+        if b_success is False:
+            return
+
+        a_tasks = [asyncio.ensure_future(self.probe_disk(o_disk)) for o_disk in a_new_disks]
+        try:
+            for o_task in asyncio.as_completed(a_tasks):
+                o_disk = await o_task
+                if all_disks is not None:
+                    all_disks.update(o_disk)
+                yield o_disk
+        finally:
+            for o_task in a_tasks:
+                o_task.cancel()
+
+    async def discover_disks(self, all_disks, o_scan_status):
+        """
+        Runs get_new_disks on the executor, with f_discovery_timeout. The discovery fills an inventory and a
+        ScanStatus of its own, merged in the loop, so a discovery that timed out and finishes later never touches
+        the ones of the caller.
+        :return: A boolean indicating success, The disks found
+        :rtype boolean, list
+        """
+        new_disks = DiskInventory()
+        o_future = self.o_async_file.submit(self.get_new_disks, new_disks)
+        try:
+            o_scan_status.i_error_code, a_new_disks = await asyncio.wait_for(asyncio.wrap_future(o_future),
+                                                                              self.f_discovery_timeout)
+        except asyncio.TimeoutError:
+            self.o_async_file.detach(o_future)
+            o_scan_status.i_error_code = ScanStatus.ERROR_NOT_READ
+            return False, []
+
+        if all_disks is not None:
+            for o_disk in a_new_disks:
+                all_disks.add(o_disk)
+                for s_alias in new_disks.get_aliases(o_disk.s_dev_name):
+                    all_disks.add_alias(o_disk.s_dev_name, s_alias)
+
+        return True, a_new_disks
+
+    def get_new_disks(self, all_disks):
+        """
+        Runs on the executor, as listing /dev/disk/by-id and resolving its links blocks
+        :return: The error code of the scan, The disks found
+        :rtype int, list
+        """
+        o_scan_status = ScanStatus()
+        a_new_disks = list(self.o_driveutils.iter_new_disks(all_disks, o_scan_status))
+        return o_scan_status.i_error_code, a_new_disks
+
+    async def probe_disk(self, disk):
+        """
+        Runs get_disk_info for the disk
+        :param disk: The disk to probe
+        :type disk: Disk
+        :return: The Disk. If it timed out a new one flagged as suspect and timed out, see
+                 DriveUtils.get_timed_out_disk
+        :rtype Disk
+        """
+        try:
+            i_info_error_code = await self.run_on_device(disk.s_dev_name, self.o_driveutils.get_disk_info_safe, disk)
+        except asyncio.TimeoutError:
+            return self.o_driveutils.get_timed_out_disk(disk)
+
+        if i_info_error_code != 0:
+            disk.suspect = True
+        return disk
+
+    async def load_disk_group(self, disk, s_group):
+        """
+        Reads one group of fields of a lazy Disk without blocking the loop, see DriveUtils.load_disk_group
+        :raise asyncio.TimeoutError: If the device did not answer in f_timeout
+        """
+        await self.run_on_device(disk.s_dev_name, self.o_driveutils.load_disk_group, disk, s_group)
+
+    async def load_enclosure_info(self, all_disks):
+        """
+        See DriveUtils.load_enclosure_info
+        :rtype EnclosureIndex
+        """
+        return await self.o_async_file.run(self.o_driveutils.load_enclosure_info, all_disks)
+
+    def get_device_semaphore(self, s_dev_name):
+        o_semaphore = self.d_device_semaphores.get(s_dev_name)
+        if o_semaphore is None:
+            o_semaphore = asyncio.Semaphore(self.i_max_per_device)
+            self.d_device_semaphores[s_dev_name] = o_semaphore
+        return o_semaphore
+
+    async def run_on_device(self, s_dev_name, fn, *args):
+        """
+        Runs a blocking callable reading a device on the executor, with at most i_max_per_device running for the
+        same device. The slot of the device is freed when the thread finishes, not when the coroutine gives up
+        waiting, so a device blocking its reads holds at most i_max_per_device threads however many times it is
+        probed. A call that times out is detached from the executor, like the threads left behind by
+        DriveUtils.iter_probed_disks_concurrently, so the blocked devices never take the threads of the rest.
+        Waiting for the device and running have f_timeout each. Waiting for a free thread has no timeout, so a big
+        scan does not time out the disks queued behind the others.
+        :return: What the callable returns
+        :raise asyncio.TimeoutError: If the device was busy or the callable did not finish in time
+        """
+        o_loop = asyncio.get_running_loop()
+        o_device_semaphore = self.get_device_semaphore(s_dev_name)
+        await asyncio.wait_for(o_device_semaphore.acquire(), self.f_timeout)
+        try:
+            await self.o_workers_semaphore.acquire()
+        except BaseException:
+            o_device_semaphore.release()
+            raise
+
+        try:
+            o_future = self.o_async_file.submit(fn, *args)
+        except BaseException:
+            self.o_workers_semaphore.release()
+            o_device_semaphore.release()
+            raise
+        o_future.add_done_callback(lambda o_done: self.release_from_thread(o_loop, o_device_semaphore))
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(o_future), self.f_timeout)
+        finally:
+            if o_future.done() is False:
+                # Timed out or cancelled: not started calls are cancelled, and a running one gets a replacement
+                self.o_async_file.detach(o_future)
+            self.o_workers_semaphore.release()
+
+    def release_from_thread(self, o_loop, o_device_semaphore):
+        """
+        Done callback of the calls of run_on_device. It runs in the thread of the call, the semaphore belongs to the
+        loop.
+        """
+        try:
+            o_loop.call_soon_threadsafe(o_device_semaphore.release)
+        except RuntimeError:
+            # The loop is already closed
+            pass
+
+    def close(self):
+        self.o_async_file.close()
@@ -0,0 +1,191 @@
+#
+# AsyncFile Classes
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: asyncio backend for File. The blocking calls run on a bounded pool of daemon threads, so the event
+#              loop never waits for sysfs, and a read blocked by a dying drive never prevents the program from exiting.
+#
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+
+from .file import File
+
+
+class BoundedExecutor:
+    """
+    Runs callables on up to i_max_workers daemon threads. concurrent.futures.ThreadPoolExecutor is not used as its
+    threads are joined at exit, which would hang forever on a blocked read. A thread blocked in a call can be
+    detached, so it stops counting against i_max_workers.
+    """
+
+    def __init__(self, i_max_workers=8):
+        self.i_max_workers = max(i_max_workers, 1)
+        self.o_queue = queue.Queue()
+        self.a_threads = []
+        self.o_lock = threading.Lock()
+        self.b_shutdown = False
+        # Futures whose threads were detached, and exit once their call finishes
+        self.a_detached = set()
+
+    def submit(self, fn, *args):
+        """
+        :return: The future with the result. It can be cancelled until a thread takes it.
+        :rtype concurrent.futures.Future
+        """
+        o_future = concurrent.futures.Future()
+        with self.o_lock:
+            if self.b_shutdown is True:
+                raise RuntimeError("The executor is shut down")
+            self.o_queue.put((o_future, fn, args))
+            if len(self.a_threads) < self.i_max_workers + len(self.a_detached):
+                self.start_thread()
+
+        return o_future
+
+    def start_thread(self):
+        o_thread = threading.Thread(target=self.run_worker, name="disksio-async-file", daemon=True)
+        self.a_threads.append(o_thread)
+        o_thread.start()
+
+    def detach(self, o_future):
+        """
+        Gives up on a call: it is cancelled if it did not start, and if it is running, blocked on a dying drive for
+        example, its thread stops counting against i_max_workers and another one takes the work queued.
+        :return: True if the call was still running
+        :rtype boolean
+        """
+        if o_future.cancel() is True:
+            return False
+
+        with self.o_lock:
+            if o_future.done() is True or o_future in self.a_detached:
+                return False
+            self.a_detached.add(o_future)
+            if self.b_shutdown is False:
+                self.start_thread()
+
+        return True
+
+    def run_worker(self):
+        while True:
+            t_work = self.o_queue.get()
+            if t_work is None:
+                return
+            o_future, fn, a_args = t_work
+            if o_future.set_running_or_notify_cancel() is False:
+                continue
+            try:
+                o_result = fn(*a_args)
+            except BaseException as o_exception:
+                o_future.set_exception(o_exception)
+            else:
+                o_future.set_result(o_result)
+
+            with self.o_lock:
+                if o_future in self.a_detached:
+                    # Its replacement is already running
+                    self.a_detached.discard(o_future)
+                    self.a_threads.remove(threading.current_thread())
+                    return
+
+    def shutdown(self):
+        """
+        Cancels the work not started yet and lets the threads finish. Does not wait for them.
+        """
+        with self.o_lock:
+            self.b_shutdown = True
+            while True:
+                try:
+                    t_work = self.o_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if t_work is not None:
+                    t_work[0].cancel()
+            for o_thread in self.a_threads:
+                self.o_queue.put(None)
+
+
+class AsyncFile:
+    """
+    The same methods of File that read, as coroutines. Cancelling a coroutine cancels its call if it did not start
+    yet. A call already running can not be interrupted: it finishes in its thread and the result is discarded.
+    """
+
+    def __init__(self, o_file=File(), i_max_workers=8):
+        """
+        :param o_file: The File, or a CachedFile, doing the calls
+        :param i_max_workers: Maximum number of calls running at the same time
+        :type i_max_workers: int
+        """
+        self.o_file = o_file
+        self.i_max_workers = max(i_max_workers, 1)
+        self.o_executor = BoundedExecutor(self.i_max_workers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, o_type, o_value, o_traceback):
+        self.close()
+
+    def submit(self, fn, *args):
+        """
+        Runs a blocking callable on the executor
+        :rtype concurrent.futures.Future
+        """
+        return self.o_executor.submit(fn, *args)
+
+    def detach(self, o_future):
+        """
+        See BoundedExecutor.detach
+        """
+        return self.o_executor.detach(o_future)
+
+    async def run(self, fn, *args):
+        """
+        Runs a blocking callable on the executor and waits for it without blocking the loop
+        :return: What the callable returns
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    async def read(self, s_file):
+        return await self.run(self.o_file.read, s_file)
+
+    async def read_binary(self, s_file):
+        return await self.run(self.o_file.read_binary, s_file)
+
+    async def readlines(self, s_file):
+        return await self.run(self.o_file.readlines, s_file)
+
+    async def read_many(self, s_dir, a_files):
+        return await self.run(self.o_file.read_many, s_dir, a_files)
+
+    async def list_dir(self, s_dir):
+        return await self.run(self.o_file.list_dir, s_dir)
+
+    async def scan_dir(self, s_dir):
+        return await self.run(self.o_file.scan_dir, s_dir)
+
+    async def read_link(self, s_file):
+        return await self.run(self.o_file.read_link, s_file)
+
+    async def get_real_path(self, s_file):
+        return await self.run(self.o_file.get_real_path, s_file)
+
+    async def file_exists(self, s_file):
+        return await self.run(self.o_file.file_exists, s_file)
+
+    async def folder_exists(self, s_folder):
+        return await self.run(self.o_file.folder_exists, s_folder)
+
+    async def path_exists(self, s_file_path):
+        return await self.run(self.o_file.path_exists, s_file_path)
+
+    async def write(self, s_file, s_text):
+        return await self.run(self.o_file.write, s_file, s_text)
+
+    def close(self):
+        self.o_executor.shutdown()
@@ -0,0 +1,247 @@
+#
+# CachedFile Class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Decorator for File that memoizes the results of read, read_binary, read_many, list_dir, read_link,
+#              get_real_path, file_exists and path_exists, with a TTL per kind of path and LRU eviction. It can be
+#              injected wherever a File is.
+#
+
+import time
+import threading
+from collections import OrderedDict
+from fnmatch import fnmatch
+
+from .file import File
+
+
+class CachedFile:
+
+    # (method mask, path mask, seconds to live). The first rule matching wins. Paths not matching any rule use the
+    # default TTL, 0 by default, so volatile attributes like stat, status, fault or locate are never cached.
+    # The masks start by *, so they match whatever the sysfs and devfs roots are.
+    A_DEFAULT_TTL_RULES = [("read*", "*/device/vendor", 21600),
+                           ("read*", "*/device/model", 21600),
+                           ("read*", "*/device/rev", 21600),
+                           ("read*", "*/device/vpd_pg*", 21600),
+                           ("read*", "*/queue/logical_block_size", 21600),
+                           ("read*", "*/queue/physical_block_size", 21600),
+                           ("read*", "*/queue/rotational", 21600),
+                           ("read*", "*/class/block/*/size", 60),
+                           ("read*", "*/enclosure_device*/slot", 3600),
+                           ("file_exists", "*/device/vpd_pg*", 21600),
+                           ("path_exists", "*/class/block/*/*", 60),
+                           ("list_dir", "*/block/*/device/", 3600),
+                           ("read_link", "*/class/block/*", 3600),
+                           ("read_link", "*/disk/by-id/*", 60),
+                           ("get_real_path", "*/block/*", 3600),
+                           ("get_real_path", "*/disk/by-id/*", 60)]
+
+    def __init__(self, o_file=File(), a_ttl_rules=None, f_default_ttl=0, i_max_entries=10000, fn_time=time.monotonic):
+        """
+        :param o_file: The File to decorate
+        :param a_ttl_rules: List of tuples (method mask, path mask, seconds). By default A_DEFAULT_TTL_RULES
+        :param f_default_ttl: Seconds to live for the paths not matching any rule. 0 means not cached
+        :param i_max_entries: Maximum number of results kept, the least recently used are evicted
+        :param fn_time: The clock
+        """
+        self.o_file = o_file
+        if a_ttl_rules is None:
+            a_ttl_rules = self.A_DEFAULT_TTL_RULES
+        self.a_ttl_rules = a_ttl_rules
+        self.f_default_ttl = f_default_ttl
+        self.i_max_entries = i_max_entries
+        self.fn_time = fn_time
+
+        # (method, path) to (expiration time, result), the least recently used first
+        self.d_cache = OrderedDict()
+        self.d_ttls = {}
+        self.o_lock = threading.Lock()
+        self.i_hits = 0
+        self.i_misses = 0
+
+    def __getattr__(self, s_name):
+        # Everything not cached goes straight to the decorated File
+        if s_name == "o_file":
+            raise AttributeError(s_name)
+        return getattr(self.o_file, s_name)
+
+    def read(self, s_file):
+        return self.get_cached("read", s_file)
+
+    def read_binary(self, s_file):
+        return self.get_cached("read_binary", s_file)
+
+    def list_dir(self, s_dir):
+        return self.get_cached("list_dir", s_dir)
+
+    def get_real_path(self, s_file):
+        return self.get_cached("get_real_path", s_file)
+
+    def read_link(self, s_file):
+        return self.get_cached("read_link", s_file)
+
+    def read_many(self, s_dir, a_files):
+        """
+        Returns the files cached and reads the rest in one batch with the decorated File. Every file is cached on its
+        own, with the TTL of its path, so a batch with static and volatile attributes only reads the volatile ones.
+        """
+        d_results = {}
+        a_files_to_read = []
+        f_now = self.fn_time()
+        with self.o_lock:
+            for s_name in a_files:
+                t_key = ("read_many", s_dir + "/" + s_name)
+                t_entry = self.d_cache.get(t_key)
+                if t_entry is not None and t_entry[0] > f_now:
+                    self.d_cache.move_to_end(t_key)
+                    self.i_hits = self.i_hits + 1
+                    d_results[s_name] = t_entry[1]
+                else:
+                    self.i_misses = self.i_misses + 1
+                    a_files_to_read.append(s_name)
+
+        if len(a_files_to_read) == 0:
+            return True, d_results
+
+        b_success, d_read = self.o_file.read_many(s_dir, a_files_to_read)
+        for s_name in a_files_to_read:
+            a_value = d_read.get(s_name)
+            d_results[s_name] = a_value
+            f_ttl = self.get_ttl("read_many", s_dir + "/" + s_name)
+            # The bytes are immutable, so they do not need to be copied
+            if a_value is not None and f_ttl > 0:
+                self.store(("read_many", s_dir + "/" + s_name), f_now + f_ttl, a_value)
+
+        return b_success, d_results
+
+    def file_exists(self, s_file):
+        return self.get_cached("file_exists", s_file)
+
+    def path_exists(self, s_file_path):
+        return self.get_cached("path_exists", s_file_path)
+
+    def write(self, s_file, s_text):
+        self.invalidate(s_file)
+        return self.o_file.write(s_file, s_text)
+
+    def append(self, s_file, s_text):
+        self.invalidate(s_file)
+        return self.o_file.append(s_file, s_text)
+
+    def delete(self, s_file):
+        self.invalidate(s_file)
+        return self.o_file.delete(s_file)
+
+    def get_ttl(self, s_method, s_path):
+        """
+        Returns the seconds to live for the results of a method on a path, according to the rules
+        :rtype float
+        """
+        t_key = (s_method, s_path)
+        f_ttl = self.d_ttls.get(t_key)
+        if f_ttl is not None:
+            return f_ttl
+
+        f_ttl = self.f_default_ttl
+        for s_method_mask, s_path_mask, f_rule_ttl in self.a_ttl_rules:
+            if fnmatch(s_method, s_method_mask) and fnmatch(s_path, s_path_mask):
+                f_ttl = f_rule_ttl
+                break
+
+        # The decisions are memoized, within the same bound as the results
+        if len(self.d_ttls) >= self.i_max_entries:
+            self.d_ttls.clear()
+        self.d_ttls[t_key] = f_ttl
+
+        return f_ttl
+
+    def get_cached(self, s_method, s_path):
+        """
+        Returns the result of the method for the path from the cache, or calls the decorated File and caches it.
+        Failed reads are not cached, as they can be transient, and neither are the files not found, as a page or a
+        partition missing now can appear after a rescan.
+        """
+        f_ttl = self.get_ttl(s_method, s_path)
+        if f_ttl <= 0:
+            return getattr(self.o_file, s_method)(s_path)
+
+        t_key = (s_method, s_path)
+        f_now = self.fn_time()
+        with self.o_lock:
+            t_entry = self.d_cache.get(t_key)
+            if t_entry is not None and t_entry[0] > f_now:
+                self.d_cache.move_to_end(t_key)
+                self.i_hits = self.i_hits + 1
+                return self.copy_result(t_entry[1])
+            self.i_misses = self.i_misses + 1
+
+        o_result = getattr(self.o_file, s_method)(s_path)
+
+        b_cacheable = o_result is True
+        if isinstance(o_result, tuple):
+            b_cacheable = o_result[0] is True
+        if b_cacheable is True:
+            self.store(t_key, f_now + f_ttl, o_result)
+
+        return self.copy_result(o_result)
+
+    def store(self, t_key, f_expiration, o_result):
+        with self.o_lock:
+            self.d_cache[t_key] = (f_expiration, o_result)
+            self.d_cache.move_to_end(t_key)
+            while len(self.d_cache) > self.i_max_entries:
+                self.d_cache.popitem(last=False)
+
+    def copy_result(self, o_result):
+        """
+        Lists and byte arrays are mutable, so every caller gets its own copy
+        """
+        if isinstance(o_result, tuple):
+            b_success, o_value = o_result
+            if isinstance(o_value, list):
+                return b_success, list(o_value)
+            if isinstance(o_value, bytearray):
+                return b_success, bytearray(o_value)
+        return o_result
+
+    def invalidate(self, s_path_prefix):
+        """
+        Removes the results cached for the paths starting by s_path_prefix
+        :return: Number of results removed
+        :rtype int
+        """
+        i_removed = 0
+        with self.o_lock:
+            for t_key in list(self.d_cache.keys()):
+                if t_key[1].startswith(s_path_prefix):
+                    del self.d_cache[t_key]
+                    i_removed = i_removed + 1
+
+        return i_removed
+
+    def invalidate_device(self, s_dev_name):
+        """
+        Removes all the results cached for a device, for example after it was hot swapped
+        :param s_dev_name: The dev name, like sda
+        :return: Number of results removed
+        :rtype int
+        """
+        i_removed = 0
+        with self.o_lock:
+            for t_key, t_entry in list(self.d_cache.items()):
+                s_path = t_key[1].rstrip("/")
+                b_matches = ("/" + s_dev_name + "/") in s_path or s_path.endswith("/" + s_dev_name)
+                # Links in /dev/disk/by-id pointing to the device
+                if t_key[0] in ["get_real_path", "read_link"] and t_entry[1][1].endswith("/" + s_dev_name):
+                    b_matches = True
+                if b_matches is True:
+                    del self.d_cache[t_key]
+                    i_removed = i_removed + 1
+
+        return i_removed
+
+    def clear(self):
+        with self.o_lock:
+            self.d_cache.clear()
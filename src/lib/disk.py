@@ -6,47 +6,260 @@
 # Description: Class for a Disk
 #
 
+from enum import Enum
+
 from .file import File
+from .vpddecoder import VpdDecoder
+
+
+class DiskStatus(str, Enum):
+    """
+    Status of the drives. It is a str, so it compares equal to the plain Strings used before.
+    """
+    ONLINE = "ONLINE"
+    OFFLINE = "OFFLINE"
+    FAULTED = "FAULTED"
+    UNAVAIL = "UNAVAIL"
+    DEGRADED = "DEGRADED"
+    REMOVED = "REMOVED"
+    BUILDING = "BUILDING"
+    CHECKSUM = "CHECKSUM"
+    FAILURE = "FAILURE"
+
+    def __str__(self):
+        return self.value
 
 
 class Disk:
+    """
+    A Disk uses __slots__ and keeps the sizes as integers, so inventories of thousands of hosts can be held in memory.
+    The attributes that were Strings before are still available as properties.
+    A lazy Disk reads the groups of fields from sysfs on their first access, see set_lazy.
+    """
 
     # Strings identifying the STATUS of the drives. Do not modify the Strings as they are used for comparisons.
-    STATUS_ONLINE = "ONLINE"
-    STATUS_OFFLINE = "OFFLINE"
-    STATUS_FAULTED = "FAULTED"
-    STATUS_UNAVAIL = "UNAVAIL"
-    STATUS_DEGRADED = "DEGRADED"
-    STATUS_REMOVED = "REMOVED"
-    STATUS_BUILDING = "BUILDING"
-    STATUS_CHECKSUM = "CHECKSUM"
-    STATUS_FAILURE = "FAILURE"
+    STATUS_ONLINE = DiskStatus.ONLINE
+    STATUS_OFFLINE = DiskStatus.OFFLINE
+    STATUS_FAULTED = DiskStatus.FAULTED
+    STATUS_UNAVAIL = DiskStatus.UNAVAIL
+    STATUS_DEGRADED = DiskStatus.DEGRADED
+    STATUS_REMOVED = DiskStatus.REMOVED
+    STATUS_BUILDING = DiskStatus.BUILDING
+    STATUS_CHECKSUM = DiskStatus.CHECKSUM
+    STATUS_FAILURE = DiskStatus.FAILURE
 
     LIGHT_FAULT = "fault"
     LIGHT_LOCATE = "locate"
 
-    o_file = File()
-    s_dev_name = ""
-    s_id = ""
-    s_serial = ""
-    s_slot = ""
-    s_drive_status = ""
-    s_power_status = ""
-    s_fault = ""
-    s_locate = ""
-    s_size = ""
-    s_logical_block_size = ""
-    s_physical_block_size = ""
-
-    def __init__(self, s_dev_name, o_file=File()):
-        self.s_dev_name = s_dev_name
+    TYPE_SOLID_STATE = "Solid State"
+    TYPE_SPINNING = "Spinning"
+
+    # Health compared with its peers, see SlowDiskDetector. Empty while there is no verdict.
+    HEALTH_OK = "OK"
+    HEALTH_SLOW = "SLOW"
+
+    # Values of the integer fields not read yet, and not available
+    I_NOT_READ = -1
+    I_NOT_AVAILABLE = 0
+
+    # Groups of fields read together by DriveUtils.load_disk_group, each one with the fewest sysfs reads possible
+    GROUP_IOC = "ioc"
+    GROUP_SIZE = "size"
+    GROUP_VENDOR = "vendor"
+    GROUP_TYPE = "type"
+    GROUP_SERIAL = "serial"
+    GROUP_STAT = "stat"
+    GROUP_BLOCK_SIZES = "block_sizes"
+    GROUP_PARTITIONS = "partitions"
+
+    D_GROUP_FIELDS = {GROUP_IOC: ["ioc", "suspect"],
+                      GROUP_SIZE: ["i_sectors"],
+                      GROUP_VENDOR: ["manufacturer"],
+                      GROUP_TYPE: ["type"],
+                      GROUP_SERIAL: ["s_serial"],
+                      GROUP_STAT: ["status", "b_unreadable"],
+                      GROUP_BLOCK_SIZES: ["i_logical_block_size", "i_physical_block_size"],
+                      GROUP_PARTITIONS: ["has_partition3"]}
+
+    D_FIELD_GROUPS = {s_field: s_group for s_group, a_fields in D_GROUP_FIELDS.items() for s_field in a_fields}
+
+    # Values of the fields of the groups before reading them, the same that __init__ sets
+    D_FIELD_DEFAULTS = {"ioc": "", "suspect": False, "i_sectors": I_NOT_READ, "manufacturer": "", "type": "",
+                        "s_serial": "", "status": None, "b_unreadable": False, "i_logical_block_size": I_NOT_READ,
+                        "i_physical_block_size": I_NOT_READ, "has_partition3": False}
+
+    __slots__ = ["o_file", "s_dev_name", "id", "s_serial", "s_wwn", "s_major_minor", "s_slot", "s_drive_status",
+                 "s_power_status", "s_fault", "s_locate", "i_sectors", "i_logical_block_size", "i_physical_block_size",
+                 "ioc", "manufacturer", "type", "status", "b_unreadable", "suspect", "b_timed_out", "has_partition3",
+                 "o_latency_histogram", "s_health", "fn_load_group"]
+
+    def __init__(self, s_dev_name, o_file=None):
+        """
+        :param s_dev_name: The dev name, like sda
+        :param o_file: The File dependency. If None a File is created only when needed
+        """
         self.o_file = o_file
+        self.s_dev_name = s_dev_name
+        self.id = ""
+        self.s_serial = ""
+        self.s_wwn = ""
+        self.s_major_minor = ""
+        self.s_slot = ""
+        self.s_drive_status = ""
+        self.s_power_status = ""
+        self.s_fault = ""
+        self.s_locate = ""
+        self.i_sectors = Disk.I_NOT_READ
+        self.i_logical_block_size = Disk.I_NOT_READ
+        self.i_physical_block_size = Disk.I_NOT_READ
+        self.ioc = ""
+        self.manufacturer = ""
+        self.type = ""
+        self.status = None
+        self.b_unreadable = False
+        self.suspect = False
+        self.b_timed_out = False
+        self.has_partition3 = False
+        # LatencyHistogram of the device, when a report attaches one
+        self.o_latency_histogram = None
+        self.s_health = ""
+        # For the lazy Disks, the function that reads a group of fields
+        self.fn_load_group = None
+
+    def __getattr__(self, s_name):
+        # Python only calls it for the slots without value, which are the fields of the groups of a lazy Disk that
+        # were not read yet
+        s_group = Disk.D_FIELD_GROUPS.get(s_name)
+        if s_group is None or self.fn_load_group is None:
+            raise AttributeError(s_name)
+        self.load_group(s_group)
+        return object.__getattribute__(self, s_name)
+
+    def set_lazy(self, fn_load_group):
+        """
+        Makes the fields of every group be read on their first access, all the fields of the group at once, and kept.
+        The fields already set, like the ones of a probed Disk, are discarded.
+        :param fn_load_group: Function that receives the Disk and the group and sets the fields, like
+                              DriveUtils.load_disk_group
+        :return: None
+        """
+        self.fn_load_group = fn_load_group
+        for s_field in Disk.D_FIELD_GROUPS:
+            if self.is_field_loaded(s_field) is True:
+                delattr(self, s_field)
+
+    def is_field_loaded(self, s_field):
+        """
+        :return: False for the fields of a lazy Disk not read yet. It does not read them.
+        :rtype boolean
+        """
+        try:
+            object.__getattribute__(self, s_field)
+        except AttributeError:
+            return False
+        return True
+
+    def load_group(self, s_group):
+        """
+        Reads a group of fields of a lazy Disk
+        """
+        # The defaults first, so the fields that can not be read have the same value as in a Disk not probed.
+        # The fields of the group set before, like suspect by a scan that timed out, keep their value.
+        d_values_set = {}
+        for s_field in Disk.D_GROUP_FIELDS[s_group]:
+            if self.is_field_loaded(s_field) is True:
+                d_values_set[s_field] = object.__getattribute__(self, s_field)
+            setattr(self, s_field, Disk.D_FIELD_DEFAULTS[s_field])
+        self.fn_load_group(self, s_group)
+        for s_field, o_value in d_values_set.items():
+            setattr(self, s_field, o_value)
+
+    @property
+    def s_id(self):
+        return self.id
+
+    @property
+    def i_byte_size(self):
+        if self.i_sectors < 0:
+            return 0
+        return self.i_sectors * 512
+
+    @property
+    def byte_size(self):
+        return self.i_byte_size
+
+    @property
+    def size(self):
+        """
+        The size in human readable format, like 4.00TB
+        :rtype str
+        """
+        if self.i_sectors < 0:
+            return ""
+
+        i_size_in_tb = float(self.i_sectors)*512/1000/1000/1000/1000  # Dividing by 1000 for human readable
+        if i_size_in_tb > 1:
+            if i_size_in_tb > 10:
+                return "%.1f" % i_size_in_tb + "TB"
+            return "%.2f" % i_size_in_tb + "TB"
+
+        i_size_in_gb = float(self.i_sectors)*512/1000/1000/1000  # Dividing by 1000 for human readable
+        if i_size_in_gb > 10:
+            return "%.0f" % i_size_in_gb + "GB"
+        return "%.2f" % i_size_in_gb + "GB"
+
+    @property
+    def s_size(self):
+        return self.size
+
+    @property
+    def s_logical_block_size(self):
+        return self.format_block_size(self.i_logical_block_size)
+
+    @s_logical_block_size.setter
+    def s_logical_block_size(self, s_block_size):
+        self.i_logical_block_size = self.parse_block_size(s_block_size)
+
+    @property
+    def s_physical_block_size(self):
+        return self.format_block_size(self.i_physical_block_size)
+
+    @s_physical_block_size.setter
+    def s_physical_block_size(self, s_block_size):
+        self.i_physical_block_size = self.parse_block_size(s_block_size)
+
+    def parse_block_size(self, s_block_size):
+        """
+        :param s_block_size: The block size as read from sysfs, or "n/a"
+        :return: The block size, I_NOT_AVAILABLE or I_NOT_READ for an empty String
+        :rtype int
+        """
+        s_block_size = s_block_size.strip()
+        if s_block_size == "":
+            return Disk.I_NOT_READ
+        if s_block_size.isdigit() is False:
+            return Disk.I_NOT_AVAILABLE
+        return int(s_block_size)
+
+    def format_block_size(self, i_block_size):
+        if i_block_size == Disk.I_NOT_READ:
+            return ""
+        if i_block_size == Disk.I_NOT_AVAILABLE:
+            return "n/a"
+        return str(i_block_size)
+
+    def get_file(self):
+        if self.o_file is None:
+            self.o_file = File()
+        return self.o_file
 
     def get_device_info(self):
         path = "/sys/block/" + self.s_dev_name + "/device/"
 
+        o_file = self.get_file()
+
         # get files in device directory
-        b_success, device_files = self.o_file.list_dir(path)
+        b_success, device_files = o_file.list_dir(path)
         for filename in device_files:
             if "enclosure_device" in filename:
                 path += filename + "/"
@@ -55,22 +268,72 @@ class Disk:
         if "enclosure" not in path:
             return
 
-        b_success, s_slot = self.o_file.read(path + "slot")
+        b_success, s_slot = o_file.read(path + "slot")
         if b_success is True:
             self.s_slot = s_slot.strip()
-        b_success, s_drive_status = self.o_file.read(path + "status")
+        b_success, s_drive_status = o_file.read(path + "status")
         if b_success is True:
             self.s_drive_status = s_drive_status.strip()
-        b_success, s_power_status = self.o_file.read(path + "power_status")
+        b_success, s_power_status = o_file.read(path + "power_status")
         if b_success is True:
             self.s_power_status = s_power_status.strip()
-        b_success, s_fault = self.o_file.read(path + "fault")
+        b_success, s_fault = o_file.read(path + "fault")
         if b_success is True:
             self.s_fault = s_fault.strip()
-        b_success, s_locate = self.o_file.read(path + "locate")
+        b_success, s_locate = o_file.read(path + "locate")
         if b_success is True:
             self.s_locate = s_locate.strip()
 
+    def set_size_from_sectors(self, s_size):
+        """
+        Sets the size from the number of 512 bytes sectors, as reported by sysfs
+        :param s_size: Number of sectors, as text
+        :type s_size: str
+        :return: None
+        """
+        self.i_sectors = int(s_size)
+
+    def set_type_from_rotational(self, s_type_value):
+        """
+        Sets the type of the drive, spinning or solid state, from the sysfs queue/rotational value
+        :param s_type_value: The content of queue/rotational
+        :type s_type_value: str
+        :return: None
+        """
+        if s_type_value.strip() == "0" or s_type_value == 0:
+            self.type = Disk.TYPE_SOLID_STATE
+        else:
+            self.type = Disk.TYPE_SPINNING
+
+    def set_serial_from_vpd_pg80(self, a_serial):
+        """
+        Sets the serial number from the raw content of the vpd_pg80 page
+        :param a_serial: The bytes of the page
+        :type a_serial: bytearray
+        :return: None
+        """
+        b_success, self.s_serial = VpdDecoder().decode_serial(a_serial)
+
+    def set_readable_from_stat(self, b_success, s_stat):
+        """
+        Flags the drive as failed if its stat counters could not be read or are all zero
+        :param b_success: If the stat file was read
+        :type b_success: bool
+        :param s_stat: The content of the stat file
+        :type s_stat: str
+        :return: None
+        """
+        b_readable = False
+        if b_success is True:
+            for s_part in s_stat.split():
+                if s_part != "0":
+                    b_readable = True
+                    break
+
+        if b_readable is False:
+            self.status = Disk.STATUS_FAILURE
+            self.b_unreadable = True
+
     def get_drive_info(self):
         """
         Returns the information of the drive
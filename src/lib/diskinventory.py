@@ -0,0 +1,213 @@
+#
+# DiskInventory Class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Collection of Disks indexed by dev name, by-id alias, WWN, serial, slot and major:minor.
+#              Iterates like the list returned before, in insertion order, but lookups are O(1).
+#
+
+
+class DiskInventory:
+
+    def __init__(self):
+        self.a_disks = []
+        self.d_positions = {}
+        self.d_by_dev_name = {}
+        self.d_by_alias = {}
+        self.d_aliases = {}
+        self.d_by_wwn = {}
+        self.d_by_serial = {}
+        self.d_by_slot = {}
+        self.d_by_major_minor = {}
+        # Keys indexed for every disk, so they can be removed when the Disk is updated
+        self.d_indexed_keys = {}
+        # Dev names of the lazy Disks indexed before reading their serial
+        self.a_lazy_serials = set()
+
+    def __iter__(self):
+        return iter(self.a_disks)
+
+    def __len__(self):
+        return len(self.a_disks)
+
+    def __getitem__(self, i_index):
+        return self.a_disks[i_index]
+
+    def __contains__(self, s_dev_name):
+        return s_dev_name in self.d_by_dev_name
+
+    def add(self, disk):
+        """
+        Adds a Disk to the inventory, if there is not already one with the same dev name
+        :param disk: The Disk to add
+        :type disk: Disk
+        :return: True if it was added, False if it was a duplicate
+        :rtype boolean
+        """
+        if disk.s_dev_name in self.d_by_dev_name:
+            return False
+
+        self.d_by_dev_name[disk.s_dev_name] = disk
+        self.d_aliases[disk.s_dev_name] = []
+        self.d_positions[disk.s_dev_name] = len(self.a_disks)
+        self.a_disks.append(disk)
+        self.index_disk(disk)
+
+        return True
+
+    def add_alias(self, s_dev_name, s_alias):
+        """
+        Adds a /dev/disk/by-id alias for a Disk already in the inventory. Repeated aliases are ignored.
+        :param s_dev_name: The dev name of the Disk, like sda
+        :type s_dev_name: str
+        :param s_alias: The alias, like wwn-0x5000c500a1b2c3d4
+        :type s_alias: str
+        :return: True if the alias was added
+        :rtype boolean
+        """
+        if s_dev_name not in self.d_by_dev_name or s_alias in self.d_by_alias:
+            return False
+
+        self.d_by_alias[s_alias] = s_dev_name
+        self.d_aliases[s_dev_name].append(s_alias)
+
+        return True
+
+    def remove(self, s_dev_name):
+        """
+        Removes a Disk and its aliases, for example when it is pulled out
+        :param s_dev_name: The dev name of the Disk
+        :type s_dev_name: str
+        :return: The Disk removed, or None if there was no Disk with that dev name
+        :rtype Disk
+        """
+        o_disk = self.d_by_dev_name.get(s_dev_name)
+        if o_disk is None:
+            return None
+
+        self.unindex_disk(s_dev_name)
+        for s_alias in self.d_aliases.pop(s_dev_name):
+            del self.d_by_alias[s_alias]
+        del self.d_by_dev_name[s_dev_name]
+        i_position = self.d_positions.pop(s_dev_name)
+        del self.a_disks[i_position]
+        for i_index in range(i_position, len(self.a_disks)):
+            self.d_positions[self.a_disks[i_index].s_dev_name] = i_index
+
+        return o_disk
+
+    def remove_alias(self, s_alias):
+        """
+        :return: True if the alias was removed
+        :rtype boolean
+        """
+        s_dev_name = self.d_by_alias.pop(s_alias, None)
+        if s_dev_name is None:
+            return False
+        self.d_aliases[s_dev_name].remove(s_alias)
+
+        return True
+
+    def update(self, disk):
+        """
+        Replaces the Disk with the same dev name, keeping its position, and refreshes the indexes of the attributes
+        that may have changed after probing it: WWN, serial, slot and major:minor.
+        :param disk: The Disk
+        :type disk: Disk
+        :return: False if there was no Disk with that dev name
+        :rtype boolean
+        """
+        o_old_disk = self.d_by_dev_name.get(disk.s_dev_name)
+        if o_old_disk is None:
+            return False
+
+        self.unindex_disk(disk.s_dev_name)
+        if o_old_disk is not disk:
+            self.a_disks[self.d_positions[disk.s_dev_name]] = disk
+            self.d_by_dev_name[disk.s_dev_name] = disk
+        self.index_disk(disk)
+
+        return True
+
+    def index_disk(self, disk):
+        s_wwn = disk.s_wwn
+        s_serial = ""
+        if disk.is_field_loaded("s_serial") is True:
+            s_serial = disk.s_serial
+            self.a_lazy_serials.discard(disk.s_dev_name)
+        else:
+            # Indexing must not read it. get_by_serial does when needed.
+            self.a_lazy_serials.add(disk.s_dev_name)
+        s_slot = disk.s_slot
+        s_major_minor = disk.s_major_minor
+
+        if s_wwn != "":
+            self.d_by_wwn[s_wwn] = disk
+        if s_serial != "":
+            self.d_by_serial[s_serial] = disk
+        if s_slot != "":
+            self.d_by_slot.setdefault(s_slot, []).append(disk)
+        if s_major_minor != "":
+            self.d_by_major_minor[s_major_minor] = disk
+
+        self.d_indexed_keys[disk.s_dev_name] = (s_wwn, s_serial, s_slot, s_major_minor)
+
+    def unindex_disk(self, s_dev_name):
+        s_wwn, s_serial, s_slot, s_major_minor = self.d_indexed_keys.pop(s_dev_name, ("", "", "", ""))
+        o_disk = self.d_by_dev_name[s_dev_name]
+        self.a_lazy_serials.discard(s_dev_name)
+
+        if self.d_by_wwn.get(s_wwn) is o_disk:
+            del self.d_by_wwn[s_wwn]
+        if self.d_by_serial.get(s_serial) is o_disk:
+            del self.d_by_serial[s_serial]
+        if s_slot in self.d_by_slot:
+            a_slot_disks = [o_slot_disk for o_slot_disk in self.d_by_slot[s_slot] if o_slot_disk is not o_disk]
+            self.d_by_slot[s_slot] = a_slot_disks
+            if len(a_slot_disks) == 0:
+                del self.d_by_slot[s_slot]
+        if self.d_by_major_minor.get(s_major_minor) is o_disk:
+            del self.d_by_major_minor[s_major_minor]
+
+    def get_by_dev_name(self, s_dev_name):
+        return self.d_by_dev_name.get(s_dev_name)
+
+    def get_by_alias(self, s_alias):
+        s_dev_name = self.d_by_alias.get(s_alias)
+        if s_dev_name is None:
+            return None
+        return self.d_by_dev_name[s_dev_name]
+
+    def get_aliases(self, s_dev_name):
+        return list(self.d_aliases.get(s_dev_name, []))
+
+    def get_by_wwn(self, s_wwn):
+        return self.d_by_wwn.get(s_wwn)
+
+    def get_by_serial(self, s_serial):
+        o_disk = self.d_by_serial.get(s_serial)
+        if o_disk is None and len(self.a_lazy_serials) > 0:
+            # Reads the serials of the lazy Disks not read yet, once
+            for s_dev_name in list(self.a_lazy_serials):
+                o_lazy_disk = self.d_by_dev_name[s_dev_name]
+                if o_lazy_disk.s_serial != "":
+                    self.update(o_lazy_disk)
+                else:
+                    self.a_lazy_serials.discard(s_dev_name)
+            o_disk = self.d_by_serial.get(s_serial)
+
+        return o_disk
+
+    def get_by_slot(self, s_slot):
+        """
+        Returns the Disks in a slot. The same slot number can exist in several enclosures, so it is a list.
+        :param s_slot: The slot, like "37"
+        :type s_slot: str
+        :return: List of Disk
+        :rtype list
+        """
+        return list(self.d_by_slot.get(str(s_slot), []))
+
+    def get_by_major_minor(self, s_major_minor):
+        return self.d_by_major_minor.get(s_major_minor)
@@ -0,0 +1,201 @@
+#
+# DiskStats Classes
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: iostat like sampler. Reads /proc/diskstats once per interval for all the devices and computes IOPS,
+#              MB/s, await, queue depth and %util from every pair of samples, keeping a fixed history per disk and a
+#              histogram of the await of all the I/Os since the start.
+#
+
+import time
+
+from .file import File
+from .latencyhistogram import LatencyHistogram
+
+
+class RingBuffer:
+    """
+    Fixed size history. When it is full the oldest item is overwritten.
+    """
+
+    def __init__(self, i_size):
+        self.i_size = i_size
+        self.a_items = [None] * i_size
+        self.i_next = 0
+        self.i_count = 0
+
+    def append(self, o_item):
+        self.a_items[self.i_next] = o_item
+        self.i_next = (self.i_next + 1) % self.i_size
+        if self.i_count < self.i_size:
+            self.i_count = self.i_count + 1
+
+    def get_last(self):
+        if self.i_count == 0:
+            return None
+        return self.a_items[(self.i_next - 1) % self.i_size]
+
+    def get_all(self):
+        """
+        :return: The items, from the oldest to the newest
+        :rtype list
+        """
+        i_start = (self.i_next - self.i_count) % self.i_size
+        return [self.a_items[(i_start + i_offset) % self.i_size] for i_offset in range(self.i_count)]
+
+    def __len__(self):
+        return self.i_count
+
+
+class DiskStatsSampler:
+
+    # Positions of the counters in a /proc/diskstats line, after major, minor and name
+    I_READS = 0
+    I_SECTORS_READ = 2
+    I_MS_READING = 3
+    I_WRITES = 4
+    I_SECTORS_WRITTEN = 6
+    I_MS_WRITING = 7
+    I_IOS_IN_PROGRESS = 8
+    I_MS_DOING_IO = 9
+    I_WEIGHTED_MS_DOING_IO = 10
+
+    # /proc/diskstats always counts 512 bytes sectors, independently of the block size of the drive
+    I_SECTOR_SIZE = 512
+
+    o_file = File()
+
+    def __init__(self, o_file=File(), s_proc_root="/proc", i_history=60):
+        """
+        :param o_file: The File dependency
+        :param s_proc_root: Where procfs is mounted
+        :param i_history: Number of samples of metrics kept per disk
+        """
+        self.o_file = o_file
+        self.s_diskstats_path = s_proc_root.rstrip("/") + "/diskstats"
+        self.i_history = i_history
+        self.d_last_counters = {}
+        self.f_last_time = None
+        self.d_history = {}
+        self.d_await_histograms = {}
+
+    def read_counters(self):
+        """
+        Reads /proc/diskstats with a single read, reusing the same file descriptor on every tick
+        :return: A boolean indicating success, A dict with the dev name as key and the list of counters as value
+        :rtype boolean, dict
+        """
+        d_counters = {}
+        b_success, s_output = self.o_file.read_pooled(self.s_diskstats_path)
+        if b_success is False:
+            return False, d_counters
+
+        for s_line in s_output.split("\n"):
+            a_fields = s_line.split()
+            if len(a_fields) < 14:
+                continue
+            d_counters[a_fields[2]] = [int(s_field) for s_field in a_fields[3:14]]
+
+        return True, d_counters
+
+    def sample(self, f_time=None):
+        """
+        Takes a sample and computes the metrics for every device against the previous one.
+        The first call only sets the baseline and returns no metrics.
+        :param f_time: Time of the sample in seconds, by default the monotonic clock
+        :type f_time: float
+        :return: A boolean indicating success, A dict with the dev name as key and a dict of metrics as value
+        :rtype boolean, dict
+        """
+        d_metrics = {}
+        if f_time is None:
+            f_time = time.monotonic()
+
+        b_success, d_counters = self.read_counters()
+        if b_success is False:
+            return False, d_metrics
+
+        if self.f_last_time is not None and f_time > self.f_last_time:
+            f_elapsed = f_time - self.f_last_time
+            for s_dev_name, a_counters in d_counters.items():
+                a_last_counters = self.d_last_counters.get(s_dev_name)
+                if a_last_counters is None:
+                    continue
+                d_disk_metrics = self.compute_metrics(a_last_counters, a_counters, f_elapsed)
+                if d_disk_metrics is None:
+                    continue
+                d_metrics[s_dev_name] = d_disk_metrics
+                if s_dev_name not in self.d_history:
+                    self.d_history[s_dev_name] = RingBuffer(self.i_history)
+                self.d_history[s_dev_name].append(d_disk_metrics)
+                self.record_await(s_dev_name, d_disk_metrics, f_elapsed)
+
+        self.d_last_counters = d_counters
+        self.f_last_time = f_time
+
+        return True, d_metrics
+
+    def compute_metrics(self, a_last_counters, a_counters, f_elapsed):
+        """
+        Computes the metrics between two samples of the counters of a device
+        :return: A dict with iops, read_mb_s, write_mb_s, await_ms, queue_depth and util_percent, or None if the
+                 counters went backwards (overflow or device replaced)
+        :rtype dict
+        """
+        a_deltas = [i_counter - i_last_counter for i_counter, i_last_counter in zip(a_counters, a_last_counters)]
+        for i_position, i_delta in enumerate(a_deltas):
+            # I/Os in progress is a gauge, not a counter
+            if i_delta < 0 and i_position != self.I_IOS_IN_PROGRESS:
+                return None
+
+        i_ios = a_deltas[self.I_READS] + a_deltas[self.I_WRITES]
+        f_await_ms = 0.0
+        if i_ios > 0:
+            f_await_ms = float(a_deltas[self.I_MS_READING] + a_deltas[self.I_MS_WRITING]) / i_ios
+
+        f_util_percent = min(a_deltas[self.I_MS_DOING_IO] / (f_elapsed * 1000) * 100, 100.0)
+
+        d_metrics = {"iops": i_ios / f_elapsed,
+                     "read_mb_s": a_deltas[self.I_SECTORS_READ] * self.I_SECTOR_SIZE / f_elapsed / 1000 / 1000,
+                     "write_mb_s": a_deltas[self.I_SECTORS_WRITTEN] * self.I_SECTOR_SIZE / f_elapsed / 1000 / 1000,
+                     "await_ms": f_await_ms,
+                     "queue_depth": a_deltas[self.I_WEIGHTED_MS_DOING_IO] / (f_elapsed * 1000),
+                     "util_percent": f_util_percent}
+
+        return d_metrics
+
+    def record_await(self, s_dev_name, d_disk_metrics, f_elapsed):
+        """
+        Records the await of the interval once per I/O completed in it, so the histogram weights the busy intervals
+        """
+        i_ios = int(d_disk_metrics["iops"] * f_elapsed + 0.5)
+        if i_ios == 0:
+            return
+        if s_dev_name not in self.d_await_histograms:
+            self.d_await_histograms[s_dev_name] = LatencyHistogram()
+        self.d_await_histograms[s_dev_name].record_ms(d_disk_metrics["await_ms"], i_ios)
+
+    def get_await_histogram(self, s_dev_name):
+        """
+        :return: The LatencyHistogram of the await of a disk, or None if it did not complete any I/O yet
+        :rtype LatencyHistogram
+        """
+        return self.d_await_histograms.get(s_dev_name)
+
+    def get_history(self, s_dev_name):
+        """
+        :return: The metrics kept for a disk, from the oldest to the newest
+        :rtype list
+        """
+        if s_dev_name not in self.d_history:
+            return []
+        return self.d_history[s_dev_name].get_all()
+
+    def format_metrics(self, s_dev_name, d_metrics):
+        return "Device: " + s_dev_name + \
+               " IOPS: " + "%.1f" % d_metrics["iops"] + \
+               " MB/s read/write: " + "%.2f" % d_metrics["read_mb_s"] + "/" + "%.2f" % d_metrics["write_mb_s"] + \
+               " Await: " + "%.2f" % d_metrics["await_ms"] + "ms" + \
+               " Queue: " + "%.2f" % d_metrics["queue_depth"] + \
+               " Util: " + "%.1f" % d_metrics["util_percent"] + "%"
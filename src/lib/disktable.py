@@ -0,0 +1,175 @@
+#
+# DiskTable Class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Columnar storage for the Disks of a fleet of hosts. Numbers are kept in arrays and repeated Strings,
+#              like vendor or type, as codes in arrays, so 100k+ disks take a few MB and the aggregates run as passes
+#              of C iterators over the columns instead of loops over Disk objects.
+#
+
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+from operator import eq
+
+
+class CategoryColumn:
+    """
+    Dictionary encoded column: every distinct String is stored once and the rows keep its code
+    """
+
+    def __init__(self):
+        self.a_codes = array("I")
+        self.a_values = []
+        self.d_codes = {}
+
+    def __len__(self):
+        return len(self.a_codes)
+
+    def get_code(self, s_value):
+        i_code = self.d_codes.get(s_value)
+        if i_code is None:
+            i_code = len(self.a_values)
+            self.d_codes[s_value] = i_code
+            self.a_values.append(s_value)
+        return i_code
+
+    def append(self, s_value):
+        self.a_codes.append(self.get_code(s_value))
+
+    def get(self, i_row):
+        return self.a_values[self.a_codes[i_row]]
+
+    def get_mask(self, s_value):
+        """
+        :return: An iterator of booleans, True for the rows with the value
+        """
+        i_code = self.d_codes.get(s_value)
+        if i_code is None:
+            return repeat(False, len(self.a_codes))
+        return map(eq, self.a_codes, repeat(i_code))
+
+
+class DiskTable:
+
+    # Columns that can be used to group the aggregates
+    A_CATEGORY_COLUMNS = ["host", "vendor", "type", "ioc", "status"]
+
+    def __init__(self):
+        self.a_dev_names = []
+        self.a_serials = []
+        self.d_categories = {}
+        for s_column in self.A_CATEGORY_COLUMNS:
+            self.d_categories[s_column] = CategoryColumn()
+        self.a_byte_sizes = array("Q")
+        self.a_logical_block_sizes = array("i")
+        self.a_physical_block_sizes = array("i")
+        self.a_faulted = array("B")
+        self.a_suspect = array("B")
+        self.a_unreadable = array("B")
+
+    def __len__(self):
+        return len(self.a_dev_names)
+
+    def add_disk(self, o_disk, s_host=""):
+        """
+        Adds a row with the values of a Disk
+        :param o_disk: The Disk
+        :type o_disk: Disk
+        :param s_host: The host the Disk belongs to
+        :type s_host: str
+        :return: The number of the row
+        :rtype int
+        """
+        self.a_dev_names.append(o_disk.s_dev_name)
+        self.a_serials.append(o_disk.s_serial)
+        self.d_categories["host"].append(s_host)
+        self.d_categories["vendor"].append(o_disk.manufacturer.strip())
+        self.d_categories["type"].append(o_disk.type)
+        self.d_categories["ioc"].append(o_disk.ioc)
+        self.d_categories["status"].append("" if o_disk.status is None else str(o_disk.status))
+        self.a_byte_sizes.append(o_disk.i_byte_size)
+        self.a_logical_block_sizes.append(o_disk.i_logical_block_size)
+        self.a_physical_block_sizes.append(o_disk.i_physical_block_size)
+        self.a_faulted.append(1 if o_disk.s_fault == "1" else 0)
+        self.a_suspect.append(1 if o_disk.suspect is True else 0)
+        self.a_unreadable.append(1 if o_disk.b_unreadable is True else 0)
+
+        return len(self.a_dev_names) - 1
+
+    def add_disks(self, disks, s_host=""):
+        """
+        Adds all the Disks of a host, for example the DiskInventory returned by DriveUtils.get_all_disks
+        :return: Number of Disks added
+        :rtype int
+        """
+        i_added = 0
+        for o_disk in disks:
+            self.add_disk(o_disk, s_host)
+            i_added = i_added + 1
+
+        return i_added
+
+    def get_row(self, i_row):
+        """
+        :return: A dict with the values of a row
+        :rtype dict
+        """
+        d_row = {"dev_name": self.a_dev_names[i_row],
+                 "serial": self.a_serials[i_row],
+                 "byte_size": self.a_byte_sizes[i_row],
+                 "logical_block_size": self.a_logical_block_sizes[i_row],
+                 "physical_block_size": self.a_physical_block_sizes[i_row],
+                 "faulted": self.a_faulted[i_row] == 1,
+                 "suspect": self.a_suspect[i_row] == 1,
+                 "unreadable": self.a_unreadable[i_row] == 1}
+        for s_column, o_category_column in self.d_categories.items():
+            d_row[s_column] = o_category_column.get(i_row)
+
+        return d_row
+
+    def get_total_capacity(self):
+        return sum(self.a_byte_sizes)
+
+    def get_capacity_by(self, s_column):
+        """
+        Sums the bytes of the disks grouped by a category column, like vendor or type. One pass over the rows,
+        adding into a list indexed by the code, so the high cardinality columns, like ioc, are not quadratic.
+        :param s_column: One of A_CATEGORY_COLUMNS
+        :return: A dict with the value of the column as key and the bytes as value
+        :rtype dict
+        """
+        o_category_column = self.d_categories[s_column]
+        a_capacities = [0] * len(o_category_column.a_values)
+        for i_code, i_byte_size in zip(o_category_column.a_codes, self.a_byte_sizes):
+            a_capacities[i_code] += i_byte_size
+
+        return dict(zip(o_category_column.a_values, a_capacities))
+
+    def get_count_by(self, s_column):
+        """
+        Counts the disks grouped by a category column, in one pass over the codes
+        :return: A dict with the value of the column as key and the number of disks as value
+        :rtype dict
+        """
+        o_category_column = self.d_categories[s_column]
+        d_code_counts = Counter(o_category_column.a_codes)
+
+        return dict([(s_value, d_code_counts[i_code]) for i_code, s_value in enumerate(o_category_column.a_values)])
+
+    def count_faulted(self):
+        return self.a_faulted.count(1)
+
+    def count_suspect(self):
+        return self.a_suspect.count(1)
+
+    def count_unreadable(self):
+        return self.a_unreadable.count(1)
+
+    def get_faulted_rows(self):
+        """
+        :return: The numbers of the rows with the fault light on
+        :rtype list
+        """
+        return list(compress(range(len(self.a_faulted)), self.a_faulted))
@@ -0,0 +1,400 @@
+#
+# DiskWatcher Classes
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Keeps an inventory up to date watching /dev/disk/by-id with inotify, or polling it where inotify is
+#              not available. The bursts of events of a hot swap are debounced and only the disks whose aliases
+#              changed are probed again, updating the inventory in place. If events are lost, because the queue
+#              of inotify overflowed or the directory was removed, all the disks are probed again.
+#
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from .disk import Disk
+from .inventorydiff import InventoryDiff
+
+
+class InotifyWatch:
+    """
+    Minimal inotify binding with ctypes, watching the entries created, deleted or moved in a directory.
+    b_rescan is set when events were lost, and has to be reset by the caller after listing the directory again.
+    """
+
+    IN_ATTRIB = 0x00000004
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    # Sent without being asked for, with wd -1 for the overflow
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    I_MASK = IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+    # wd, mask, cookie and length of the name of struct inotify_event
+    S_EVENT_FORMAT = "iIII"
+    I_EVENT_SIZE = struct.calcsize(S_EVENT_FORMAT)
+
+    def __init__(self, s_path):
+        self.s_path = s_path
+        self.i_fd = -1
+        self.i_wd = -1
+        self.fn_add_watch = None
+        self.b_rescan = False
+
+    def open(self):
+        """
+        :return: A boolean indicating success. False if inotify is not available, like outside Linux
+        :rtype boolean
+        """
+        s_libc = ctypes.util.find_library("c")
+        try:
+            o_libc = ctypes.CDLL(s_libc if s_libc is not None else "libc.so.6", use_errno=True)
+            fn_init = o_libc.inotify_init1
+            fn_add_watch = o_libc.inotify_add_watch
+        except (OSError, AttributeError):
+            return False
+
+        fn_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fn_add_watch = fn_add_watch
+        self.i_fd = fn_init(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.i_fd < 0:
+            self.i_fd = -1
+            return False
+        if self.add_watch() is False:
+            self.close()
+            return False
+
+        return True
+
+    def add_watch(self):
+        self.i_wd = self.fn_add_watch(self.i_fd, os.fsencode(self.s_path), self.I_MASK)
+        if self.i_wd < 0:
+            self.i_wd = -1
+            return False
+        return True
+
+    def read_events(self, f_timeout):
+        """
+        Waits up to f_timeout seconds for events. If the directory was removed it is watched again as soon as it
+        exists, and b_rescan is set, as the entries created in between were not seen.
+        :return: The names of the entries with events, without repetitions
+        :rtype set
+        """
+        a_names = set()
+        if self.i_wd == -1 and self.fn_add_watch is not None and self.add_watch() is True:
+            self.b_rescan = True
+            return a_names
+
+        a_ready, a_write, a_error = select.select([self.i_fd], [], [], max(f_timeout, 0))
+        if len(a_ready) == 0:
+            return a_names
+
+        try:
+            a_buffer = os.read(self.i_fd, 65536)
+        except BlockingIOError:
+            return a_names
+
+        i_offset = 0
+        while i_offset + self.I_EVENT_SIZE <= len(a_buffer):
+            i_wd, i_mask, i_cookie, i_length = struct.unpack_from(self.S_EVENT_FORMAT, a_buffer, i_offset)
+            i_offset = i_offset + self.I_EVENT_SIZE
+            s_name = a_buffer[i_offset:i_offset + i_length].rstrip(b"\0")
+            i_offset = i_offset + i_length
+            if i_mask & self.IN_Q_OVERFLOW != 0:
+                self.b_rescan = True
+            elif i_mask & (self.IN_DELETE_SELF | self.IN_IGNORED) != 0 and i_wd == self.i_wd:
+                # The watch is gone with the directory
+                self.i_wd = -1
+                self.b_rescan = True
+            elif len(s_name) > 0:
+                a_names.add(os.fsdecode(s_name))
+
+        return a_names
+
+    def close(self):
+        if self.i_fd != -1:
+            os.close(self.i_fd)
+            self.i_fd = -1
+
+
+class PollingWatch:
+    """
+    Same interface as InotifyWatch, comparing the listing of the directory and the targets of its links
+    """
+
+    def __init__(self, s_path, o_file, f_poll_interval=2.0):
+        self.s_path = s_path
+        self.o_file = o_file
+        self.f_poll_interval = f_poll_interval
+        self.d_entries = {}
+        # The listing is complete every time, no event can be lost
+        self.b_rescan = False
+
+    def get_entries(self):
+        d_entries = {}
+        b_success, a_names = self.o_file.list_dir(self.s_path)
+        for s_name in a_names:
+            b_success, s_target = self.o_file.read_link(self.s_path + "/" + s_name)
+            d_entries[s_name] = s_target
+        return d_entries
+
+    def open(self):
+        self.d_entries = self.get_entries()
+        return True
+
+    def read_events(self, f_timeout):
+        f_deadline = time.monotonic() + max(f_timeout, 0)
+        while True:
+            d_entries = self.get_entries()
+            a_names = set()
+            for s_name in set(d_entries.keys()) | set(self.d_entries.keys()):
+                if d_entries.get(s_name) != self.d_entries.get(s_name):
+                    a_names.add(s_name)
+            self.d_entries = d_entries
+            f_remaining = f_deadline - time.monotonic()
+            if len(a_names) > 0 or f_remaining <= 0:
+                return a_names
+            time.sleep(min(self.f_poll_interval, f_remaining))
+
+    def close(self):
+        self.d_entries = {}
+
+
+class DiskWatcher:
+
+    def __init__(self, o_driveutils, all_disks, f_debounce=0.5, f_max_delay=5.0, b_use_inotify=True,
+                 f_poll_interval=2.0, o_enclosure_index=None):
+        """
+        :param o_driveutils: The DriveUtils used to probe the disks
+        :type o_driveutils: DriveUtils
+        :param all_disks: The inventory kept up to date, as returned by get_all_disks
+        :type all_disks: DiskInventory
+        :param f_debounce: Seconds without events that close a burst
+        :param f_max_delay: Maximum seconds a burst is extended by new events before processing it
+        :param b_use_inotify: If False, or if inotify is not available, the directory is polled
+        :param f_poll_interval: Seconds between listings when polling
+        :param o_enclosure_index: If passed, it is built again on every change and applied to the disks probed
+        :type o_enclosure_index: EnclosureIndex
+        """
+        self.o_driveutils = o_driveutils
+        self.o_file = o_driveutils.o_file
+        self.all_disks = all_disks
+        self.f_debounce = f_debounce
+        self.f_max_delay = f_max_delay
+        self.b_use_inotify = b_use_inotify
+        self.f_poll_interval = f_poll_interval
+        self.o_enclosure_index = o_enclosure_index
+        self.s_by_id_path = o_driveutils.s_dev_root + "/disk/by-id"
+        self.o_watch = None
+        self.b_stop = False
+        # by-id alias to dev name, for the aliases of disks
+        self.d_alias_dev_names = {}
+
+    def start(self):
+        """
+        Starts watching. The changes from here on are seen by wait_for_changes.
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        self.o_watch = None
+        if self.b_use_inotify is True:
+            o_inotify_watch = InotifyWatch(self.s_by_id_path)
+            if o_inotify_watch.open() is True:
+                self.o_watch = o_inotify_watch
+        if self.o_watch is None:
+            self.o_watch = PollingWatch(self.s_by_id_path, self.o_file, self.f_poll_interval)
+            if self.o_watch.open() is False:
+                return False
+
+        self.d_alias_dev_names = {}
+        b_success, a_disk_ids = self.o_file.list_dir(self.s_by_id_path)
+        for s_disk_id in a_disk_ids:
+            b_is_disk, s_dev_name = self.o_driveutils.get_dev_name_for_alias(s_disk_id)
+            if b_is_disk is True:
+                self.d_alias_dev_names[s_disk_id] = s_dev_name
+
+        return b_success
+
+    def is_inotify(self):
+        return isinstance(self.o_watch, InotifyWatch)
+
+    def wait_for_changes(self, f_timeout):
+        """
+        Waits up to f_timeout seconds for a change and then until there are no events during f_debounce seconds, or
+        for f_max_delay at most.
+        :return: The names of the by-id entries changed, empty if there were none. If events were lost
+                 o_watch.b_rescan is set too, and apply_changes probes all the disks.
+        :rtype set
+        """
+        a_names = self.o_watch.read_events(f_timeout)
+        if len(a_names) == 0 and self.o_watch.b_rescan is False:
+            return a_names
+
+        f_deadline = time.monotonic() + self.f_max_delay
+        while True:
+            f_wait = min(self.f_debounce, f_deadline - time.monotonic())
+            if f_wait <= 0:
+                break
+            a_new_names = self.o_watch.read_events(f_wait)
+            if len(a_new_names) == 0:
+                break
+            a_names = a_names | a_new_names
+
+        return a_names
+
+    def apply_changes(self, a_names):
+        """
+        Probes again the disks of the by-id entries changed and updates the inventory in place. If the watch lost
+        events, all the disks are probed again, see rescan.
+        :param a_names: Names of entries in /dev/disk/by-id, like the ones returned by wait_for_changes
+        :return: The InventoryEvents of the changes
+        :rtype list
+        """
+        if self.o_watch is not None and self.o_watch.b_rescan is True:
+            self.o_watch.b_rescan = False
+            return self.rescan()
+
+        a_dev_names = set()
+        for s_disk_id in a_names:
+            s_old_dev_name = self.d_alias_dev_names.pop(s_disk_id, None)
+            if s_old_dev_name is not None:
+                a_dev_names.add(s_old_dev_name)
+                self.invalidate_device(s_old_dev_name)
+            self.invalidate_alias(s_disk_id)
+            b_exists, s_target = self.o_file.read_link(self.s_by_id_path + "/" + s_disk_id)
+            if b_exists is False:
+                continue
+            b_is_disk, s_dev_name = self.o_driveutils.get_dev_name_for_alias(s_disk_id)
+            if b_is_disk is True:
+                self.d_alias_dev_names[s_disk_id] = s_dev_name
+                if s_dev_name not in a_dev_names:
+                    a_dev_names.add(s_dev_name)
+                    self.invalidate_device(s_dev_name)
+
+        if len(a_dev_names) == 0:
+            return []
+
+        d_dev_aliases = {}
+        for s_disk_id in sorted(self.d_alias_dev_names.keys()):
+            d_dev_aliases.setdefault(self.d_alias_dev_names[s_disk_id], []).append(s_disk_id)
+
+        b_success, d_major_minors = self.o_driveutils.get_major_minors()
+        if self.o_enclosure_index is not None:
+            self.o_enclosure_index.build()
+
+        a_old_disks = []
+        a_new_disks = []
+        for s_dev_name in sorted(a_dev_names):
+            o_old_disk = self.all_disks.get_by_dev_name(s_dev_name)
+            if o_old_disk is not None:
+                a_old_disks.append(o_old_disk)
+            a_aliases = d_dev_aliases.get(s_dev_name, [])
+            if len(a_aliases) == 0:
+                self.all_disks.remove(s_dev_name)
+                continue
+            a_new_disks.append(self.probe_disk(s_dev_name, a_aliases, o_old_disk, d_major_minors))
+
+        return InventoryDiff().diff(a_old_disks, a_new_disks)
+
+    def rescan(self):
+        """
+        Probes all the disks, like get_all_disks, and replaces the content of the inventory in place
+        :return: The InventoryEvents of the changes
+        :rtype list
+        """
+        self.invalidate_alias("")
+        for o_disk in self.all_disks:
+            self.invalidate_device(o_disk.s_dev_name)
+        i_error_code, all_new_disks = self.o_driveutils.get_all_disks()
+        if self.o_enclosure_index is not None:
+            self.o_enclosure_index.build()
+            for o_disk in all_new_disks:
+                self.o_enclosure_index.apply_to_disk(o_disk)
+
+        a_old_disks = list(self.all_disks)
+        for o_disk in a_old_disks:
+            self.all_disks.remove(o_disk.s_dev_name)
+        self.d_alias_dev_names = {}
+        for o_disk in all_new_disks:
+            self.all_disks.add(o_disk)
+            for s_alias in all_new_disks.get_aliases(o_disk.s_dev_name):
+                self.all_disks.add_alias(o_disk.s_dev_name, s_alias)
+                self.d_alias_dev_names[s_alias] = o_disk.s_dev_name
+
+        return InventoryDiff().diff(a_old_disks, all_new_disks)
+
+    def invalidate_alias(self, s_disk_id):
+        """
+        If the File is a CachedFile, removes the results cached for the by-id entries starting by s_disk_id, so a link
+        recreated by udev is read again
+        """
+        if hasattr(self.o_file, "invalidate") is True:
+            self.o_file.invalidate(self.s_by_id_path + "/" + s_disk_id)
+
+    def invalidate_device(self, s_dev_name):
+        """
+        If the File is a CachedFile, removes the results cached for a device, so a disk hot swapped in the same dev
+        name is not probed with the vendor, serial or size of the one before
+        """
+        if hasattr(self.o_file, "invalidate_device") is True:
+            self.o_file.invalidate_device(s_dev_name)
+
+    def probe_disk(self, s_dev_name, a_aliases, o_old_disk, d_major_minors):
+        """
+        Probes a disk into a new Disk, so events can compare it with the old one, and puts it in the inventory
+        """
+        o_disk = Disk(s_dev_name, self.o_file)
+        if o_old_disk is not None and o_old_disk.id in a_aliases:
+            o_disk.id = o_old_disk.id
+        else:
+            o_disk.id = a_aliases[0]
+        o_disk.s_major_minor = d_major_minors.get(s_dev_name, "")
+        if self.o_driveutils.get_disk_info(o_disk) != 0:
+            o_disk.suspect = True
+        if self.o_enclosure_index is not None:
+            self.o_enclosure_index.apply_to_disk(o_disk)
+
+        if o_old_disk is None:
+            self.all_disks.add(o_disk)
+        else:
+            for s_alias in self.all_disks.get_aliases(s_dev_name):
+                if s_alias not in a_aliases:
+                    self.all_disks.remove_alias(s_alias)
+        # The Disk must be in the inventory before add_disk_alias takes the WWN
+        self.all_disks.update(o_disk)
+        for s_alias in a_aliases:
+            self.o_driveutils.add_disk_alias(self.all_disks, s_dev_name, s_alias)
+        self.all_disks.update(o_disk)
+
+        return o_disk
+
+    def run(self, fn_on_events, f_timeout=1.0):
+        """
+        Applies the changes until stop is called, calling fn_on_events with the list of InventoryEvents of every
+        burst that changed something
+        """
+        self.b_stop = False
+        while self.b_stop is False:
+            a_names = self.wait_for_changes(f_timeout)
+            if len(a_names) == 0 and self.o_watch.b_rescan is False:
+                continue
+            a_events = self.apply_changes(a_names)
+            if len(a_events) > 0:
+                fn_on_events(a_events)
+
+    def stop(self):
+        self.b_stop = True
+
+    def close(self):
+        if self.o_watch is not None:
+            self.o_watch.close()
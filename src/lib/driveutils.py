@@ -6,54 +6,196 @@
 # Description: Class to deal with Disks (Disk objects)
 #
 
+import os
+import threading
+import time
+import queue
+
 from .file import File
 from .disk import Disk
+from .diskinventory import DiskInventory
+from .enclosure import EnclosureIndex
+from .vpddecoder import VpdDecoder, VpdIdentity
+
+
+class ScanStatus:
+    """
+    Result of one scan that is only known once its generator is exhausted. Every scan has its own, so concurrent
+    scans with the same DriveUtils, like the ones of a metrics refresher and of a watcher, never mix their results.
+    """
+
+    ERROR_OK = 0
+    # /dev/disk/by-id or /proc/partitions could not be read, or did not answer in time
+    ERROR_NOT_READ = 1
+
+    def __init__(self):
+        self.i_error_code = self.ERROR_OK
 
 
 class DriveUtils:
 
+    # Attributes read in one batch when probing a disk, relative to /sys/class/block/<dev>/
+    A_ATTRIBUTES = ["size",
+                    "device/vendor",
+                    "queue/rotational",
+                    "device/vpd_pg80",
+                    "stat",
+                    "queue/logical_block_size",
+                    "queue/physical_block_size"]
+
     o_file = File()
+    s_sys_root = "/sys"
+    s_dev_root = "/dev"
+    s_proc_root = "/proc"
 
-    def __init__(self, o_file=File()):
+    def __init__(self, o_file=File(), s_sys_root="/sys", s_dev_root="/dev", s_proc_root="/proc"):
+        """
+        :param o_file: The File dependency
+        :param s_sys_root: Where sysfs is mounted. Point the roots to a synthetic tree for testing or benchmarking
+        :param s_dev_root: Where devfs is mounted
+        :param s_proc_root: Where procfs is mounted
+        """
         self.o_file = o_file
+        self.s_sys_root = s_sys_root.rstrip("/")
+        self.s_dev_root = s_dev_root.rstrip("/")
+        self.s_proc_root = s_proc_root.rstrip("/")
+        # Dev names whose probe timed out and is still blocked in its thread, across scans
+        self.a_blocked_devices = set()
+        self.o_blocked_lock = threading.Lock()
+
+    def get_all_disks(self, i_max_workers=0, f_timeout=5.0):
+        """
+        Get all the available disks
+        :param i_max_workers: If greater than 0 the disks are probed concurrently with up to this number of threads
+        :type i_max_workers: int
+        :param f_timeout: In concurrent mode, seconds a disk has to finish its probe before being flagged as suspect
+        :type f_timeout: float
+        :return: An error code, 0 means everything is ok. A DiskInventory
+        :rtype int, DiskInventory
+        """
+        all_disks = DiskInventory()
+        o_scan_status = ScanStatus()
+        for o_disk in self.iter_disks(all_disks, i_max_workers, f_timeout, o_scan_status=o_scan_status):
+            pass
+
+        return o_scan_status.i_error_code, all_disks
+
+    def iter_disks(self, all_disks=None, i_max_workers=0, f_timeout=5.0, b_lazy=False, o_scan_status=None):
+        """
+        Generator that yields every Disk as soon as its probe finishes, so the first lines can be shown while the
+        rest of the disks are still being read. In concurrent mode the disks are yielded in the order their probes
+        finish, and a timed out disk when its deadline expires.
+        Once the generator is exhausted o_scan_status has the error code of the scan: 0 means everything is ok,
+        1 that /dev/disk/by-id or /proc/partitions could not be read.
+        :param all_disks: If passed, the disks and all their by-id aliases are added to it in discovery order
+        :type all_disks: DiskInventory
+        :param i_max_workers: If greater than 0 the disks are probed concurrently with up to this number of threads
+        :type i_max_workers: int
+        :param f_timeout: In concurrent mode, seconds a disk has to finish its probe before being flagged as suspect
+        :type f_timeout: float
+        :param b_lazy: If True the disks are not probed. Their fields are read from sysfs on their first access.
+        :type b_lazy: bool
+        :param o_scan_status: If passed, it gets the error code of this scan
+        :type o_scan_status: ScanStatus
+        :return: The Disks
+        :rtype Disk
+        """
+        o_new_disks = self.iter_new_disks(all_disks, o_scan_status)
+        if b_lazy is True:
+            for o_disk in o_new_disks:
+                o_disk.set_lazy(self.load_disk_group)
+                if all_disks is not None:
+                    all_disks.update(o_disk)
+                yield o_disk
+            return
+
+        if i_max_workers > 0:
+            o_probed_disks = self.iter_probed_disks_concurrently(o_new_disks, i_max_workers, f_timeout)
+        else:
+            o_probed_disks = self.iter_probed_disks(o_new_disks)
+
+        for i_index, o_disk in o_probed_disks:
+            if all_disks is not None:
+                all_disks.update(o_disk)
+            yield o_disk
 
-    def get_all_disks(self):
-        """ Get all the available disks """
-        all_disks = []
-        i_error_code = 0
+    def iter_new_disks(self, all_disks=None, o_scan_status=None):
+        """
+        Generator with the disks found, not probed yet. First the ones in /dev/disk/by-id and then the ones only
+        in /proc/partitions (for virtualbox), each one only once. /proc/partitions is read first, so the disks come
+        out with their major:minor already set, and all the by-id aliases of a disk are resolved before yielding it,
+        so it comes out with its WWN even if its wwn- alias is listed after the ata- one.
+        :param all_disks: If passed, the disks and all their by-id aliases are added to it
+        :type all_disks: DiskInventory
+        :param o_scan_status: If passed, it gets the error code of the scan
+        :type o_scan_status: ScanStatus
+        :return: The Disks
+        :rtype Disk
+        """
+        if o_scan_status is None:
+            o_scan_status = ScanStatus()
+        o_scan_status.i_error_code = ScanStatus.ERROR_OK
+        b_success, d_major_minors = self.get_major_minors()
+        if b_success is False:
+            o_scan_status.i_error_code = ScanStatus.ERROR_NOT_READ
+
+        # Dev names already yielded, to not yield twice a disk with both wwn and ata, or duplicated by wrong zoning
+        a_seen = set()
 
         # get all attached disks by id
-        s_path = "/dev/disk/by-id"
+        s_path = self.s_dev_root + "/disk/by-id"
         b_success, a_disk_ids = self.o_file.list_dir(s_path)
         if b_success is False:
-            return 1, all_disks
+            o_scan_status.i_error_code = ScanStatus.ERROR_NOT_READ
+            a_disk_ids = []
 
+        # The aliases of every disk, the disks in the order of their first alias
+        d_aliases = {}
         for s_disk_id in a_disk_ids:
-            if "part" in s_disk_id:
+            b_is_disk, s_dev_name = self.get_dev_name_for_alias(s_disk_id)
+            if b_is_disk is False:
                 continue
-
-            if "wwn" in s_disk_id or "VBOX" in s_disk_id or "nvme" in s_disk_id \
-                    or ("ata-" in s_disk_id):
-                # get the device name
-                b_success, s_dev_name = self.o_file.get_real_path(s_path + "/" + s_disk_id)
-                s_dev_name = s_dev_name.replace("/dev/", "")
-                # check its an sd device or an NVMe
-                if ("sd" not in s_dev_name) and ("nvme" not in s_dev_name):
-                    continue
-                # make sure a disk with both wwn and ata is not added twice
-                # Or if wrong zoning show them as duplicates
-                if s_dev_name in [disk.s_dev_name for disk in all_disks]:
-                    continue
-                new_disk = Disk(s_dev_name, self.o_file)
-                new_disk.id = s_disk_id
-
-                i_info_error_code = self.get_disk_info(new_disk)
-                if i_info_error_code != 0:
-                    new_disk.suspect = True
-                all_disks.append(new_disk)
+            if s_dev_name not in d_aliases:
+                d_aliases[s_dev_name] = []
+            d_aliases[s_dev_name].append(s_disk_id)
+
+        for s_dev_name, a_aliases in d_aliases.items():
+            a_seen.add(s_dev_name)
+            new_disk = Disk(s_dev_name, self.o_file)
+            new_disk.id = a_aliases[0]
+            new_disk.s_major_minor = d_major_minors.get(s_dev_name, "")
+            for s_disk_id in a_aliases:
+                if s_disk_id.startswith("wwn-") and new_disk.s_wwn == "":
+                    new_disk.s_wwn = s_disk_id[4:]
+            if all_disks is not None:
+                all_disks.add(new_disk)
+                for s_disk_id in a_aliases:
+                    self.add_disk_alias(all_disks, s_dev_name, s_disk_id)
+            yield new_disk
 
         # get all attached disks if not found by id (for virtualbox)
-        b_success, s_output = self.o_file.read("/proc/partitions")
+        for s_drive_dev_name, s_major_minor in d_major_minors.items():
+            if s_drive_dev_name in a_seen:
+                continue
+            if any(char.isdigit() for char in s_drive_dev_name):
+                continue
+            a_seen.add(s_drive_dev_name)
+            new_disk = Disk(s_drive_dev_name, self.o_file)
+            new_disk.id = "n/a"
+            new_disk.s_major_minor = s_major_minor
+            if all_disks is not None:
+                all_disks.add(new_disk)
+            yield new_disk
+
+    def get_major_minors(self):
+        """
+        Reads /proc/partitions
+        :return: A boolean indicating success, A dict with the dev name as key and the major:minor as value
+        :rtype boolean, dict
+        """
+        d_major_minors = {}
+
+        b_success, s_output = self.o_file.read(self.s_proc_root + "/partitions")
         if b_success is True:
             output_lines = s_output.split("\n")
             for line in output_lines:
@@ -62,16 +204,250 @@ class DriveUtils:
                     continue
                 elif len(line) == 0 or len(line) < 4:
                     continue
-                s_drive_dev_name = line.split()[3]
-                if any(char.isdigit() for char in s_drive_dev_name):
+                a_fields = line.split()
+                d_major_minors[a_fields[3]] = a_fields[0] + ":" + a_fields[1]
+
+        return b_success, d_major_minors
+
+    def get_dev_name_for_alias(self, s_disk_id):
+        """
+        Resolves a /dev/disk/by-id entry, if it is one of the aliases of a whole disk that are inventoried
+        :param s_disk_id: The name of the entry, like wwn-0x5000c500a1b2c3d4
+        :type s_disk_id: str
+        :return: A boolean indicating if it is the alias of a disk, The dev name
+        :rtype boolean, str
+        """
+        if "part" in s_disk_id:
+            return False, ""
+
+        if "wwn" in s_disk_id or "VBOX" in s_disk_id or "nvme" in s_disk_id \
+                or ("ata-" in s_disk_id):
+            # get the device name, reading the link instead of resolving the whole path
+            b_success, s_target = self.o_file.read_link(self.s_dev_root + "/disk/by-id/" + s_disk_id)
+            if b_success is False:
+                return False, ""
+            s_dev_name = os.path.basename(s_target)
+            # check its an sd device or an NVMe
+            if ("sd" not in s_dev_name) and ("nvme" not in s_dev_name):
+                return False, ""
+            return True, s_dev_name
+
+        return False, ""
+
+    def add_disk_alias(self, all_disks, s_dev_name, s_disk_id):
+        """
+        Registers a /dev/disk/by-id alias of a Disk in the inventory, taking the WWN from wwn- aliases
+        :param all_disks: The inventory
+        :type all_disks: DiskInventory
+        :param s_dev_name: The dev name of the Disk
+        :param s_disk_id: The alias
+        :return: None
+        """
+        all_disks.add_alias(s_dev_name, s_disk_id)
+        if s_disk_id.startswith("wwn-"):
+            o_disk = all_disks.get_by_dev_name(s_dev_name)
+            if o_disk.s_wwn == "":
+                o_disk.s_wwn = s_disk_id[4:]
+                # So get_by_wwn finds it
+                all_disks.update(o_disk)
+
+    def iter_probed_disks(self, o_disks):
+        """
+        Runs get_disk_info for the disks, one after the other
+        :param o_disks: Iterable with the disks to probe
+        :return: Tuples with the position of the disk in o_disks and the Disk, once probed
+        :rtype tuple
+        """
+        for i_index, o_disk in enumerate(o_disks):
+            i_info_error_code = self.get_disk_info(o_disk)
+            if i_info_error_code != 0:
+                o_disk.suspect = True
+            yield i_index, o_disk
+
+    def probe_disks_concurrently(self, a_disks, i_max_workers, f_timeout):
+        """
+        Runs get_disk_info for the disks with up to i_max_workers threads at the same time.
+        :param a_disks: The disks to probe
+        :type a_disks: list
+        :param i_max_workers: Maximum number of disks being probed at the same time
+        :type i_max_workers: int
+        :param f_timeout: Seconds every disk has to complete its probe
+        :type f_timeout: float
+        :return: The list of disks, in the same order they were passed
+        :rtype list
+        """
+        a_results = list(a_disks)
+        for i_index, o_disk in self.iter_probed_disks_concurrently(a_results, i_max_workers, f_timeout):
+            a_results[i_index] = o_disk
+
+        return a_results
+
+    def iter_probed_disks_concurrently(self, o_disks, i_max_workers, f_timeout):
+        """
+        Runs get_disk_info for the disks on a pool of i_max_workers threads, taking the next disk from o_disks only
+        when a thread is free, and yields them as they finish.
+        Every disk has its own deadline, counted from when it is handed to a thread. A disk that does not finish in
+        time, for example a dying drive blocking its reads, is replaced by a Disk flagged as suspect and timed out,
+        and the scan goes on without waiting for it. Its thread is left behind and another one takes its place, but
+        the device stays in a_blocked_devices until the thread returns, and is not probed again, by this scan or the
+        next ones, until then: it is reported as timed out right away. So there is at most one blocked thread per
+        device however many times the disks are scanned. The threads are daemons, so a blocked one never prevents
+        exiting.
+        :param o_disks: Iterable with the disks to probe
+        :param i_max_workers: Maximum number of disks being probed at the same time
+        :type i_max_workers: int
+        :param f_timeout: Seconds every disk has to complete its probe
+        :type f_timeout: float
+        :return: Tuples with the position of the disk in o_disks and the Disk, once probed or timed out
+        :rtype tuple
+        """
+        o_iterator = iter(o_disks)
+        o_pending = queue.Queue()
+        o_finished = queue.Queue()
+        # Index as key and True while its probe runs, False once it was given up. Shared with the workers.
+        d_probing = {}
+        d_running = {}
+        d_deadlines = {}
+        i_workers = 0
+        i_next = 0
+        b_pending = True
+
+        try:
+            while b_pending is True or len(d_deadlines) > 0:
+                while b_pending is True and len(d_deadlines) < i_max_workers:
+                    o_disk = next(o_iterator, None)
+                    if o_disk is None:
+                        b_pending = False
+                        break
+                    i_index = i_next
+                    i_next = i_next + 1
+                    with self.o_blocked_lock:
+                        b_blocked = o_disk.s_dev_name in self.a_blocked_devices
+                        if b_blocked is False:
+                            d_probing[i_index] = True
+                    if b_blocked is True:
+                        yield i_index, self.get_timed_out_disk(o_disk)
+                        continue
+                    d_running[i_index] = o_disk
+                    d_deadlines[i_index] = time.monotonic() + f_timeout
+                    o_pending.put((i_index, o_disk))
+                    if i_workers < len(d_deadlines):
+                        o_thread = threading.Thread(target=self.run_probe_worker, args=(o_pending, o_finished,
+                                                                                        d_probing))
+                        o_thread.daemon = True
+                        o_thread.start()
+                        i_workers = i_workers + 1
+
+                if len(d_deadlines) == 0:
                     continue
-                if s_drive_dev_name not in [drive.s_dev_name for drive in all_disks]:
-                    new_disk = Disk(s_drive_dev_name, self.o_file)
-                    new_disk.id = "n/a"
-        else:
-            i_error_code = 1
 
-        return i_error_code, all_disks
+                f_wait = max(min(d_deadlines.values()) - time.monotonic(), 0)
+                try:
+                    i_index, i_info_error_code = o_finished.get(timeout=f_wait)
+                    del d_deadlines[i_index]
+                    o_disk = d_running.pop(i_index)
+                    if i_info_error_code != 0:
+                        o_disk.suspect = True
+                    yield i_index, o_disk
+                except queue.Empty:
+                    pass
+
+                f_now = time.monotonic()
+                for i_index in list(d_deadlines.keys()):
+                    if d_deadlines[i_index] > f_now:
+                        continue
+                    with self.o_blocked_lock:
+                        # It finished meanwhile, its result is in the queue
+                        if i_index not in d_probing:
+                            continue
+                        d_probing[i_index] = False
+                        self.a_blocked_devices.add(d_running[i_index].s_dev_name)
+                    # Its thread leaves the pool when the probe returns
+                    i_workers = i_workers - 1
+                    del d_deadlines[i_index]
+                    yield i_index, self.get_timed_out_disk(d_running.pop(i_index))
+        finally:
+            for i_worker in range(i_workers):
+                o_pending.put(None)
+
+    def run_probe_worker(self, o_pending, o_finished, d_probing):
+        """
+        Worker of iter_probed_disks_concurrently. Puts the index of every disk and the error code in o_finished,
+        until it gets None or its probe was given up.
+        """
+        while True:
+            t_work = o_pending.get()
+            if t_work is None:
+                return
+            i_index, disk = t_work
+            i_info_error_code = self.get_disk_info_safe(disk)
+            with self.o_blocked_lock:
+                if d_probing.pop(i_index) is False:
+                    # The scan gave up on it and another thread took its place
+                    self.a_blocked_devices.discard(disk.s_dev_name)
+                    return
+            o_finished.put((i_index, i_info_error_code))
+
+    def get_timed_out_disk(self, o_blocked_disk):
+        """
+        The blocked thread still owns the original object, so it is not touched. A new Disk with what was known
+        before the probe is returned instead, flagged as suspect and timed out.
+        :param o_blocked_disk: The Disk whose probe did not finish in time
+        :type o_blocked_disk: Disk
+        :return: The Disk to report
+        :rtype Disk
+        """
+        o_disk = Disk(o_blocked_disk.s_dev_name, self.o_file)
+        o_disk.id = o_blocked_disk.id
+        o_disk.s_wwn = o_blocked_disk.s_wwn
+        o_disk.s_major_minor = o_blocked_disk.s_major_minor
+        o_disk.suspect = True
+        o_disk.b_timed_out = True
+
+        return o_disk
+
+    def get_disk_info_safe(self, disk):
+        """
+        get_disk_info for the probes running in other threads, where an exception would be lost
+        :return: The error code of get_disk_info, 1 if it raised an exception
+        :rtype int
+        """
+        try:
+            return self.get_disk_info(disk)
+        except Exception:
+            return 1
+
+    def load_enclosure_info(self, all_disks):
+        """
+        Fills the slot, status, power status, fault and locate of all the disks walking the enclosures only once
+        :param all_disks: The disks, as returned by get_all_disks
+        :type all_disks: DiskInventory
+        :return: The EnclosureIndex, for enclosure level queries like the empty or faulted slots
+        :rtype EnclosureIndex
+        """
+        o_enclosure_index = EnclosureIndex(self.o_file, self.s_sys_root)
+        if o_enclosure_index.build() is True:
+            o_enclosure_index.apply_to_disks(all_disks)
+
+        return o_enclosure_index
+
+    def attach_latency_histograms(self, all_disks, d_histograms):
+        """
+        Attaches to every Disk its LatencyHistogram, like the ones of DiskStatsSampler or of a benchmark
+        :param all_disks: The disks
+        :type all_disks: DiskInventory
+        :param d_histograms: The dev name as key and the LatencyHistogram as value
+        :type d_histograms: dict
+        :return: Number of Disks with a histogram
+        :rtype int
+        """
+        i_attached = 0
+        for o_disk in all_disks:
+            o_disk.o_latency_histogram = d_histograms.get(o_disk.s_dev_name)
+            if o_disk.o_latency_histogram is not None:
+                i_attached = i_attached + 1
+
+        return i_attached
 
     def get_disk_info(self, disk, b_cmdline=False):
         """
@@ -82,130 +458,216 @@ class DriveUtils:
         :return: Returns an error code indicating the success of the command. O indicates everything is ok.
         :rtype int
         """
-        i_error_code = 0
-        i_ioc_error_code, s_output = self.get_ioc_info_for_drive_from_system(disk.s_dev_name)
-        if i_ioc_error_code == 0:
-            if 'platform' in s_output:  # The drive is a Zvol so skip it
-                return None
-
-            disk.ioc = self.parse_ioc_info(s_output)
-        else:
-            i_error_code = i_ioc_error_code
-
+        i_error_code = self.load_ioc(disk)
+        if i_error_code is None:
+            return None
 
         self.get_disk_info_from_sys_fs(disk)
+        self.load_partitions(disk)
 
-        # get physical and logical block size
-        disk.s_logical_block_size = self.get_logical_block_size(disk.s_dev_name)
-        disk.s_physical_block_size = self.get_physical_block_size(disk.s_dev_name)
+        return i_error_code
 
-        # check for partition 3
-        if self.o_file.file_exists("/sys/block/" + disk.s_dev_name + "/" + disk.s_dev_name + "3"):
-            disk.has_partition3 = True
-        else:
-            disk.has_partition3 = False
+    def load_disk_group(self, disk, s_group):
+        """
+        Reads only one group of fields of a Disk. Used by the lazy Disks, see Disk.set_lazy
+        :param disk: The disk
+        :type disk: Disk
+        :param s_group: One of the Disk.GROUP_ constants
+        :type s_group: str
+        :return: None
+        """
+        if s_group == Disk.GROUP_IOC:
+            if self.load_ioc(disk) != 0:
+                disk.suspect = True
+        elif s_group == Disk.GROUP_SIZE:
+            self.load_size(disk)
+        elif s_group == Disk.GROUP_VENDOR:
+            self.load_vendor(disk)
+        elif s_group == Disk.GROUP_TYPE:
+            self.load_type(disk)
+        elif s_group == Disk.GROUP_SERIAL:
+            self.load_serial(disk)
+        elif s_group == Disk.GROUP_STAT:
+            self.load_stat(disk)
+        elif s_group == Disk.GROUP_BLOCK_SIZES:
+            self.load_block_sizes(disk)
+        elif s_group == Disk.GROUP_PARTITIONS:
+            self.load_partitions(disk)
+
+    def load_ioc(self, disk):
+        """
+        :return: The error code, 0 means everything is ok. None if the drive is a Zvol
+        :rtype int
+        """
+        i_ioc_error_code, s_output = self.get_ioc_info_for_drive_from_system(disk.s_dev_name)
+        if i_ioc_error_code != 0:
+            return i_ioc_error_code
 
-        return i_error_code
+        if 'platform' in s_output:  # The drive is a Zvol so skip it
+            return None
+        disk.ioc = self.parse_ioc_info(s_output)
+
+        return 0
 
     def get_disk_info_from_sys_fs(self, disk):
         """
-        Load the information for a disk from sysfs
+        Load the information for a disk from sysfs, reading all its attributes in one batch
         :param disk: The disk to load the information for
         :type disk: Disk
         :return: None
         """
-        s_drive_path = "/sys/class/block/" + disk.s_dev_name
-        # get disk size
-        b_success, s_size = self.o_file.read(s_drive_path + "/size")
-        s_size = s_size.strip()
-        if b_success is True:
-            i_size_in_tb = float(s_size)*512/1000/1000/1000/1000  # Dividing by 1000 for human readable
-            if i_size_in_tb > 1:
-                if i_size_in_tb > 10:
-                    disk.size = "%.1f" % i_size_in_tb + "TB"
-                else:
-                    disk.size = "%.2f" % i_size_in_tb + "TB"
-            else:
-                i_size_in_gb = float(s_size)*512/1000/1000/1000  # Dividing by 1000 for human readable
-                if i_size_in_gb > 100:
-                    disk.size = "%.0f" % i_size_in_gb + "GB"
-                elif i_size_in_gb > 10:
-                    disk.size = "%.0f" % i_size_in_gb + "GB"
-                else:
-                    disk.size = "%.2f" % i_size_in_gb + "GB"
-            disk.byte_size = int(s_size)/2*1024
-
-        # get the vendor
-        b_success, s_vendor = self.o_file.read(s_drive_path + "/device/vendor")
-        if b_success is True:
+        a_attributes = list(self.A_ATTRIBUTES)
+        if disk.s_wwn == "":
+            # Drives without a wwn- link, like the ones only seen as ata-
+            a_attributes.append("device/vpd_pg83")
+        self.load_attributes(disk, a_attributes)
+
+    def load_attributes(self, disk, a_attributes):
+        """
+        Reads attributes of /sys/class/block/<dev>/ with File.read_many, so the directory of the disk is resolved
+        once, and sets the fields from them. The attributes that can not be read leave the fields as they are,
+        except the serial, which is emptied, and the block sizes, which are "n/a".
+        :param disk: The disk
+        :type disk: Disk
+        :param a_attributes: Attributes from A_ATTRIBUTES, or device/vpd_pg83
+        :type a_attributes: list
+        :return: None
+        """
+        b_success, d_attributes = self.o_file.read_many(self.s_sys_root + "/class/block/" + disk.s_dev_name,
+                                                        a_attributes)
+
+        s_size = self.decode_attribute(d_attributes.get("size"))
+        if s_size is not None:
+            disk.set_size_from_sectors(s_size.strip())
+
+        s_vendor = self.decode_attribute(d_attributes.get("device/vendor"))
+        if s_vendor is not None:
             disk.manufacturer = s_vendor
 
-        # get the type - spinning or solid state
-        b_success, s_type_value = self.o_file.read(s_drive_path + "/queue/rotational")
-        if b_success is True:
-            if s_type_value.strip() == "0" or s_type_value == 0:
-                disk.type = "Solid State"
-            else:
-                disk.type = "Spinning"
-
-        # get serial number
-        s_serial = ""
-        s_file_serial = s_drive_path + "/device/vpd_pg80"
-        if self.o_file.file_exists(s_file_serial) is True:
-            b_success, a_serial = self.o_file.read_binary(s_file_serial)
-            if b_success is True:
-                for i_char in a_serial:
-                    if i_char > 40 and i_char < 123:
-                        s_serial += chr(i_char)
-                disk.s_serial = s_serial
+        # spinning or solid state
+        s_type_value = self.decode_attribute(d_attributes.get("queue/rotational"))
+        if s_type_value is not None:
+            disk.set_type_from_rotational(s_type_value)
+
+        if "device/vpd_pg80" in d_attributes:
+            if d_attributes["device/vpd_pg80"] is not None:
+                disk.set_serial_from_vpd_pg80(d_attributes["device/vpd_pg80"])
             else:
                 disk.s_serial = ""
-                print("Error reading: " + s_file_serial)
-        else:
-            disk.s_serial = ""
 
-        # check drive is readable
-        b_success, s_serial = self.o_file.read(s_drive_path + "/stat")
-        b_readable = False
-        if b_success is True:
-            for s_part in s_serial.split():
-                if s_part != "0":
-                    b_readable = True
-                    break
+        if d_attributes.get("device/vpd_pg83") is not None:
+            o_identity = VpdIdentity()
+            VpdDecoder().decode_device_identification(d_attributes["device/vpd_pg83"], o_identity)
+            disk.s_wwn = o_identity.s_wwn
 
-        if b_readable is False:
-            disk.status = Disk.STATUS_FAILURE
-            disk.b_unreadable = True
+        if "stat" in d_attributes:
+            # check drive is readable
+            s_stat = self.decode_attribute(d_attributes["stat"])
+            disk.set_readable_from_stat(s_stat is not None, s_stat or "")
 
-    def get_ioc_info_for_drive_from_system(self, s_disk_name):
-        # get the host (ioc)
-        i_error_code = 0
+        if "queue/logical_block_size" in d_attributes:
+            disk.s_logical_block_size = self.get_block_size(d_attributes["queue/logical_block_size"])
+        if "queue/physical_block_size" in d_attributes:
+            disk.s_physical_block_size = self.get_block_size(d_attributes["queue/physical_block_size"])
+
+    def decode_attribute(self, a_value):
+        """
+        Converts the bytes of a sysfs attribute to text
+        :param a_value: The bytes read, or None if the attribute could not be read
+        :return: The text or None
+        """
+        if a_value is None:
+            return None
+        return a_value.decode("utf-8", "replace")
+
+    def get_block_size(self, a_block_size):
+        s_block_size = self.decode_attribute(a_block_size)
+        if s_block_size is not None:
+            return s_block_size.strip()
+        return "n/a"
+
+    def load_size(self, disk):
+        self.load_attributes(disk, ["size"])
+
+    def load_vendor(self, disk):
+        self.load_attributes(disk, ["device/vendor"])
+
+    def load_type(self, disk):
+        self.load_attributes(disk, ["queue/rotational"])
+
+    def load_serial(self, disk):
+        self.load_attributes(disk, ["device/vpd_pg80"])
+
+    def load_wwn(self, disk):
+        self.load_attributes(disk, ["device/vpd_pg83"])
+
+    def get_vpd_identities(self, all_disks):
+        """
+        Reads the VPD pages 0x00, 0x80, 0x83 and 0xB1 of all the disks and decodes them in one batch.
+        The pages not exposed, like all of them for NVMe drives, are skipped.
+        :param all_disks: The disks
+        :type all_disks: DiskInventory
+        :return: Dict with the dev name as key and the VpdIdentity as value
+        :rtype dict
+        """
+        d_pages_by_dev_name = {}
+        for o_disk in all_disks:
+            b_success, d_page_files = self.o_file.read_many(self.s_sys_root + "/class/block/" + o_disk.s_dev_name +
+                                                            "/device", list(VpdDecoder.D_PAGE_FILES.values()))
+            d_pages = {}
+            for i_page_code, s_page_file in VpdDecoder.D_PAGE_FILES.items():
+                if d_page_files[s_page_file] is not None:
+                    d_pages[i_page_code] = d_page_files[s_page_file]
+            d_pages_by_dev_name[o_disk.s_dev_name] = d_pages
 
-        if self.o_file.path_exists("/sys/block/" + s_disk_name):
-            b_success, s_ioc_info_path = self.o_file.get_real_path("/sys/block/" + s_disk_name)
+        return VpdDecoder().decode_many(d_pages_by_dev_name)
 
-            if s_disk_name not in s_ioc_info_path:
-                i_error_code = 1
+    def load_stat(self, disk):
+        self.load_attributes(disk, ["stat"])
+
+    def load_block_sizes(self, disk):
+        self.load_attributes(disk, ["queue/logical_block_size", "queue/physical_block_size"])
+
+    def load_partitions(self, disk):
+        # check for partition 3
+        if self.o_file.path_exists(self.s_sys_root + "/class/block/" + disk.s_dev_name + "/" + disk.s_dev_name + "3"):
+            disk.has_partition3 = True
         else:
-            s_ioc_info_path = ""
-            i_error_code = 2
+            disk.has_partition3 = False
+
+    def get_ioc_info_for_drive_from_system(self, s_disk_name):
+        """
+        Gets the path of the device under /sys/devices, which goes through its host (ioc), reading a single link.
+        The path returned is always relative to /sys, as parse_ioc_info expects, whatever the sysfs root is.
+        :return: Error code, 0 means ok, 2 that the device is not in sysfs. The path
+        :rtype int, str
+        """
+        b_success, s_target = self.o_file.read_link(self.s_sys_root + "/class/block/" + s_disk_name)
+        if b_success is False:
+            return 2, ""
 
-        return i_error_code, s_ioc_info_path
+        s_ioc_info_path = "/sys/" + os.path.normpath(os.path.join("class/block", s_target))
+        if s_disk_name not in s_ioc_info_path:
+            return 1, s_ioc_info_path
+
+        return 0, s_ioc_info_path
 
     def parse_ioc_info(self, s_output):
         ioc = "-"
         if 'host' in s_output and 'expander' in s_output:
-            ioc = s_output.split('/')[6][4:]
+            # The host is not always at the same depth, like behind a PCIe switch
+            for s_component in s_output.split('/'):
+                if s_component.startswith('host') and s_component[4:].isdigit():
+                    ioc = s_component[4:]
+                    break
         return ioc
 
     def get_logical_block_size(self, s_disk_name):
-        b_success, s_logical_block = self.o_file.read("/sys/class/block/" + s_disk_name + "/queue/logical_block_size")
-        if b_success is True:
-            return s_logical_block.strip()
-        return "n/a"
+        b_success, d_attributes = self.o_file.read_many(self.s_sys_root + "/class/block/" + s_disk_name,
+                                                        ["queue/logical_block_size"])
+        return self.get_block_size(d_attributes["queue/logical_block_size"])
 
     def get_physical_block_size(self, s_disk_name):
-        b_success, s_physical_block = self.o_file.read("/sys/class/block/" + s_disk_name + "/queue/physical_block_size")
-        if b_success is True:
-            return s_physical_block.strip()
-        return "n/a"
+        b_success, d_attributes = self.o_file.read_many(self.s_sys_root + "/class/block/" + s_disk_name,
+                                                        ["queue/physical_block_size"])
+        return self.get_block_size(d_attributes["queue/physical_block_size"])
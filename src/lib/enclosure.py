@@ -0,0 +1,154 @@
+#
+# Enclosure Classes
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Index of the enclosure slots, built walking /sys/class/enclosure once, instead of listing the device
+#              directory of every Disk looking for its enclosure_device.
+#
+
+from .file import File
+from .diskinventory import DiskInventory
+
+
+class EnclosureSlot:
+
+    def __init__(self, s_enclosure, s_component):
+        self.s_enclosure = s_enclosure
+        self.s_component = s_component
+        self.s_slot = ""
+        self.s_dev_name = ""
+        self.s_drive_status = ""
+        self.s_power_status = ""
+        self.s_fault = ""
+        self.s_locate = ""
+
+    def is_empty(self):
+        return self.s_dev_name == ""
+
+    def is_faulted(self):
+        return self.s_fault == "1"
+
+
+class EnclosureIndex:
+
+    A_ATTRIBUTES = ["slot", "status", "power_status", "fault", "locate"]
+
+    # Entries of an enclosure directory that are not components
+    A_NOT_COMPONENTS = ["device", "subsystem", "power"]
+
+    o_file = File()
+    s_sys_root = "/sys"
+
+    def __init__(self, o_file=File(), s_sys_root="/sys"):
+        self.o_file = o_file
+        self.s_sys_root = s_sys_root.rstrip("/")
+        # Enclosure name to list of EnclosureSlot, in the order of the components
+        self.d_enclosures = {}
+        self.d_by_dev_name = {}
+
+    def build(self):
+        """
+        Walks /sys/class/enclosure/*/ once, reading the attributes of every component in a batch.
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        self.d_enclosures = {}
+        self.d_by_dev_name = {}
+
+        s_enclosures_path = self.s_sys_root + "/class/enclosure"
+        b_success, a_enclosures = self.o_file.scan_dir(s_enclosures_path)
+        if b_success is False:
+            return False
+
+        for o_enclosure in sorted(a_enclosures, key=lambda o_entry: o_entry.name):
+            a_slots = []
+            b_success, a_components = self.o_file.scan_dir(o_enclosure.path)
+            for o_component in sorted(a_components, key=lambda o_entry: o_entry.name):
+                if o_component.name in self.A_NOT_COMPONENTS or o_component.is_dir() is False:
+                    continue
+                o_slot = self.read_slot(o_enclosure.name, o_component.name, o_component.path)
+                a_slots.append(o_slot)
+                if o_slot.s_dev_name != "":
+                    self.d_by_dev_name[o_slot.s_dev_name] = o_slot
+            self.d_enclosures[o_enclosure.name] = a_slots
+
+        return True
+
+    def read_slot(self, s_enclosure, s_component, s_component_path):
+        o_slot = EnclosureSlot(s_enclosure, s_component)
+
+        b_success, d_attributes = self.o_file.read_many(s_component_path, self.A_ATTRIBUTES)
+        for s_attribute, a_value in d_attributes.items():
+            if a_value is None:
+                continue
+            s_value = a_value.decode("utf-8", "replace").strip()
+            if s_attribute == "slot":
+                o_slot.s_slot = s_value
+            elif s_attribute == "status":
+                o_slot.s_drive_status = s_value
+            elif s_attribute == "power_status":
+                o_slot.s_power_status = s_value
+            elif s_attribute == "fault":
+                o_slot.s_fault = s_value
+            elif s_attribute == "locate":
+                o_slot.s_locate = s_value
+
+        # The device link of an occupied slot points to the SCSI device, which lists its block device
+        b_success, a_block_devices = self.o_file.scan_dir(s_component_path + "/device/block")
+        if b_success is True and len(a_block_devices) > 0:
+            o_slot.s_dev_name = a_block_devices[0].name
+
+        return o_slot
+
+    def apply_to_disk(self, o_disk):
+        """
+        Fills s_slot, s_drive_status, s_power_status, s_fault and s_locate of a Disk
+        :param o_disk: The Disk
+        :type o_disk: Disk
+        :return: A boolean indicating if the Disk was found in an enclosure
+        :rtype boolean
+        """
+        o_slot = self.d_by_dev_name.get(o_disk.s_dev_name)
+        if o_slot is None:
+            return False
+        o_disk.s_slot = o_slot.s_slot
+        o_disk.s_drive_status = o_slot.s_drive_status
+        o_disk.s_power_status = o_slot.s_power_status
+        o_disk.s_fault = o_slot.s_fault
+        o_disk.s_locate = o_slot.s_locate
+
+        return True
+
+    def apply_to_disks(self, disks):
+        """
+        Fills s_slot, s_drive_status, s_power_status, s_fault and s_locate of the Disks in bulk.
+        :param disks: The disks. If it is a DiskInventory the slot index is refreshed too
+        :type disks: DiskInventory
+        :return: Number of Disks found in an enclosure
+        :rtype int
+        """
+        i_found = 0
+        for o_disk in disks:
+            if self.apply_to_disk(o_disk) is False:
+                continue
+            if isinstance(disks, DiskInventory):
+                disks.update(o_disk)
+            i_found = i_found + 1
+
+        return i_found
+
+    def get_enclosures(self):
+        return sorted(self.d_enclosures.keys())
+
+    def get_slots(self, s_enclosure):
+        return list(self.d_enclosures.get(s_enclosure, []))
+
+    def get_slot_for_dev_name(self, s_dev_name):
+        return self.d_by_dev_name.get(s_dev_name)
+
+    def get_empty_slots(self, s_enclosure):
+        return [o_slot for o_slot in self.d_enclosures.get(s_enclosure, []) if o_slot.is_empty()]
+
+    def get_faulted_slots(self, s_enclosure):
+        return [o_slot for o_slot in self.d_enclosures.get(s_enclosure, []) if o_slot.is_faulted()]
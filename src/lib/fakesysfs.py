@@ -0,0 +1,325 @@
+#
+# FakeSysfs Class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Generates a synthetic /sys, /dev and /proc tree under a folder, with SAS/SATA disks behind expanders
+#              and enclosures and NVMe drives, so DriveUtils can be tested and benchmarked without hardware.
+#              Use the roots of the tree as s_sys_root, s_dev_root and s_proc_root.
+#
+
+import struct
+
+from .file import File
+
+
+class FakeSysfs:
+
+    # Majors used by the sd driver, 16 disks per major. Beyond them the kernel uses the extended major 259
+    A_SD_MAJORS = [8, 65, 66, 67, 68, 69, 70, 71, 128, 129, 130, 131, 132, 133, 134, 135]
+    I_BLOCK_EXT_MAJOR = 259
+
+    I_SECTORS = 7814037168  # 4TB
+
+    o_file = File()
+
+    def __init__(self, s_root, o_file=File()):
+        self.o_file = o_file
+        self.s_root = s_root.rstrip("/")
+        self.s_sys_root = self.s_root + "/sys"
+        self.s_dev_root = self.s_root + "/dev"
+        self.s_proc_root = self.s_root + "/proc"
+        # One dict per disk generated, with the values expected to be read back
+        self.a_disks = []
+        self.i_next_ext_minor = 0
+        self.a_partitions_lines = []
+        self.a_diskstats_lines = []
+
+    def create(self, i_disks, i_nvme_disks=0, i_slots_per_enclosure=60, i_disks_per_host=240):
+        """
+        Creates the tree
+        :param i_disks: Number of SAS/SATA disks, behind expanders and enclosures
+        :type i_disks: int
+        :param i_nvme_disks: Number of NVMe drives
+        :type i_nvme_disks: int
+        :param i_slots_per_enclosure: Slots of every enclosure. The last one may have empty slots
+        :type i_slots_per_enclosure: int
+        :param i_disks_per_host: Disks behind every HBA
+        :type i_disks_per_host: int
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        for s_folder in [self.s_sys_root + "/block", self.s_sys_root + "/class/block",
+                         self.s_sys_root + "/class/enclosure", self.s_dev_root + "/disk/by-id", self.s_proc_root]:
+            if self.o_file.folder_exists(s_folder) is False and self.o_file.create_folder(s_folder) is False:
+                return False
+
+        i_enclosures = (i_disks + i_slots_per_enclosure - 1) // i_slots_per_enclosure
+        for i_enclosure in range(i_enclosures):
+            self.create_enclosure(i_enclosure, i_slots_per_enclosure)
+
+        for i_disk in range(i_disks):
+            self.create_sd_disk(i_disk, i_slots_per_enclosure, i_disks_per_host)
+
+        for i_nvme in range(i_nvme_disks):
+            self.create_nvme_disk(i_nvme)
+
+        return self.write_proc_files()
+
+    def write_proc_files(self):
+        b_success = self.o_file.write(self.s_proc_root + "/partitions",
+                                      "major minor  #blocks  name\n\n" + "".join(self.a_partitions_lines))
+        b_success = self.o_file.write(self.s_proc_root + "/diskstats", "".join(self.a_diskstats_lines)) and b_success
+
+        return b_success
+
+    def get_sd_name(self, i_index):
+        """
+        Returns the name the kernel gives to the disk number i_index: sda ... sdz, sdaa ...
+        """
+        s_name = ""
+        i_index = i_index + 1
+        while i_index > 0:
+            i_index, i_remainder = divmod(i_index - 1, 26)
+            s_name = chr(97 + i_remainder) + s_name
+
+        return "sd" + s_name
+
+    def get_sd_major_minor(self, i_index, i_partition):
+        i_major_index = i_index // 16
+        if i_major_index < len(self.A_SD_MAJORS):
+            return self.A_SD_MAJORS[i_major_index], (i_index % 16) * 16 + i_partition
+
+        return self.I_BLOCK_EXT_MAJOR, self.get_ext_minor()
+
+    def get_host_path(self, i_host):
+        return self.s_sys_root + "/devices/pci0000:00/0000:00:%02x.0/0000:%02x:00.0/host%d" % \
+            (i_host % 32, i_host + 1, i_host)
+
+    def get_enclosure_path(self, i_enclosure):
+        return self.s_sys_root + "/class/enclosure/%d:0:%d:0" % (i_enclosure, 1000 + i_enclosure)
+
+    def create_enclosure(self, i_enclosure, i_slots_per_enclosure):
+        s_enclosure_path = self.get_enclosure_path(i_enclosure)
+        for i_slot in range(i_slots_per_enclosure):
+            s_component_path = s_enclosure_path + "/Slot %02d" % i_slot
+            self.o_file.create_folder(s_component_path)
+            self.o_file.write(s_component_path + "/slot", "%d\n" % i_slot)
+            self.o_file.write(s_component_path + "/status", "OK\n")
+            self.o_file.write(s_component_path + "/power_status", "on\n")
+            self.o_file.write(s_component_path + "/fault", "0\n")
+            self.o_file.write(s_component_path + "/locate", "0\n")
+
+    def create_block_device(self, s_block_path, s_dev_name, i_major, i_minor, i_sectors, b_rotational, i_partition=0):
+        self.o_file.create_folder(s_block_path + "/queue")
+        if i_partition > 0:
+            self.o_file.write(s_block_path + "/partition", "%d\n" % i_partition)
+        self.o_file.write(s_block_path + "/size", "%d\n" % i_sectors)
+        self.o_file.write(s_block_path + "/dev", "%d:%d\n" % (i_major, i_minor))
+        self.o_file.write(s_block_path + "/stat", "    1532        0    81290     1201       12        0       96"
+                                                  "        8        0     1172     1209\n")
+        self.o_file.write(s_block_path + "/queue/rotational", "1\n" if b_rotational is True else "0\n")
+        self.o_file.write(s_block_path + "/queue/logical_block_size", "512\n")
+        self.o_file.write(s_block_path + "/queue/physical_block_size", "4096\n")
+        self.o_file.write(self.s_dev_root + "/" + s_dev_name, "")
+
+        s_relative_path = s_block_path[len(self.s_sys_root) + 1:]
+        self.o_file.create_symlink("../../" + s_relative_path, self.s_sys_root + "/class/block/" + s_dev_name)
+
+        self.a_partitions_lines.append("%4d %7d %10d %s\n" % (i_major, i_minor, i_sectors // 2, s_dev_name))
+        self.a_diskstats_lines.append("%4d %7d %s 1532 0 81290 1201 12 0 96 8 0 1172 1209 0 0 0 0\n" %
+                                      (i_major, i_minor, s_dev_name))
+
+    def create_sd_disk(self, i_disk, i_slots_per_enclosure, i_disks_per_host):
+        s_dev_name = self.get_sd_name(i_disk)
+        i_host = i_disk // i_disks_per_host
+        i_target = i_disk % i_disks_per_host
+        i_enclosure = i_disk // i_slots_per_enclosure
+        i_slot = i_disk % i_slots_per_enclosure
+        s_serial = "ZC1%05d" % i_disk
+        s_wwn = "0x5000c500%08x" % i_disk
+        s_model = "ST4000NM0035"
+
+        s_scsi_name = "%d:0:%d:0" % (i_host, i_target)
+        s_scsi_path = self.get_host_path(i_host) + \
+            "/port-%d:0/expander-%d:0/port-%d:0:%d/end_device-%d:0:%d/target%d:0:%d/%s" % \
+            (i_host, i_host, i_host, i_target, i_host, i_target, i_host, i_target, s_scsi_name)
+        self.o_file.create_folder(s_scsi_path + "/block")
+        self.o_file.write(s_scsi_path + "/vendor", "SEAGATE ")
+        self.o_file.write(s_scsi_path + "/model", s_model + "    ")
+        self.o_file.write(s_scsi_path + "/rev", "E004")
+        self.o_file.write_binary(s_scsi_path + "/vpd_pg80", self.get_vpd_pg80(s_serial))
+        self.o_file.write_binary(s_scsi_path + "/vpd_pg83", self.get_vpd_pg83(s_wwn))
+        self.o_file.write_binary(s_scsi_path + "/vpd_pg0", self.get_vpd_pg0())
+        self.o_file.write_binary(s_scsi_path + "/vpd_pgb1", self.get_vpd_pgb1(7200, 2))
+
+        # Enclosure links in both directions
+        s_component_path = self.get_enclosure_path(i_enclosure) + "/Slot %02d" % i_slot
+        self.o_file.create_symlink(s_scsi_path, s_component_path + "/device")
+        self.o_file.create_symlink(s_component_path, s_scsi_path + "/enclosure_device:Slot %02d" % i_slot)
+
+        i_major, i_minor = self.get_sd_major_minor(i_disk, 0)
+        s_block_path = s_scsi_path + "/block/" + s_dev_name
+        self.create_block_device(s_block_path, s_dev_name, i_major, i_minor, self.I_SECTORS, True)
+        self.o_file.create_symlink("../../../" + s_scsi_name, s_block_path + "/device")
+        self.o_file.create_symlink("../" + s_block_path[len(self.s_sys_root) + 1:],
+                                   self.s_sys_root + "/block/" + s_dev_name)
+
+        s_by_id_path = self.s_dev_root + "/disk/by-id/"
+        self.o_file.create_symlink("../../" + s_dev_name, s_by_id_path + "wwn-" + s_wwn)
+        self.o_file.create_symlink("../../" + s_dev_name, s_by_id_path + "ata-" + s_model + "_" + s_serial)
+
+        # Half of the disks are partitioned like ZFS does, with partitions 1 and 9, the other half with 1 to 3
+        a_partitions = [1, 9] if i_disk % 2 == 0 else [1, 2, 3]
+        for i_partition in a_partitions:
+            s_partition_name = s_dev_name + str(i_partition)
+            i_partition_major, i_partition_minor = self.get_sd_major_minor(i_disk, i_partition)
+            self.create_block_device(s_block_path + "/" + s_partition_name, s_partition_name, i_partition_major,
+                                     i_partition_minor, self.I_SECTORS // 4, True, i_partition)
+            self.o_file.create_symlink("../../" + s_partition_name,
+                                       s_by_id_path + "wwn-" + s_wwn + "-part" + str(i_partition))
+
+        self.a_disks.append({"dev_name": s_dev_name,
+                             "serial": s_serial,
+                             "wwn": s_wwn,
+                             "ioc": str(i_host),
+                             "enclosure": "%d:0:%d:0" % (i_enclosure, 1000 + i_enclosure),
+                             "slot": str(i_slot),
+                             "has_partition3": 3 in a_partitions})
+
+    def create_nvme_disk(self, i_nvme):
+        s_dev_name = "nvme%dn1" % i_nvme
+        s_serial = "S4EWNX0N%06d" % i_nvme
+        s_eui = "0025388%09x" % i_nvme
+        s_model = "SAMSUNG_MZQLB3T8HALS"
+
+        s_controller_path = self.s_sys_root + "/devices/pci0000:00/0000:00:1d.0/0000:%02x:00.0/nvme/nvme%d" % \
+            (0x40 + i_nvme % 128, i_nvme)
+        self.o_file.create_folder(s_controller_path)
+        self.o_file.write(s_controller_path + "/model", s_model.replace("_", " ") + "\n")
+        self.o_file.write(s_controller_path + "/serial", s_serial + "\n")
+        self.o_file.write(s_controller_path + "/firmware_rev", "EDA5202Q\n")
+
+        s_block_path = s_controller_path + "/" + s_dev_name
+        self.create_block_device(s_block_path, s_dev_name, self.I_BLOCK_EXT_MAJOR, self.get_ext_minor(),
+                                 self.I_SECTORS, False)
+        self.o_file.create_symlink("../../nvme%d" % i_nvme, s_block_path + "/device")
+        self.o_file.create_symlink("../" + s_block_path[len(self.s_sys_root) + 1:],
+                                   self.s_sys_root + "/block/" + s_dev_name)
+
+        s_by_id_path = self.s_dev_root + "/disk/by-id/"
+        self.o_file.create_symlink("../../" + s_dev_name, s_by_id_path + "nvme-eui." + s_eui)
+        self.o_file.create_symlink("../../" + s_dev_name, s_by_id_path + "nvme-" + s_model + "_" + s_serial)
+
+        self.a_disks.append({"dev_name": s_dev_name,
+                             "serial": "",
+                             "wwn": "",
+                             "ioc": "-",
+                             "enclosure": "",
+                             "slot": "",
+                             "has_partition3": False})
+
+    def create_nvme_subsystem(self, i_subsystem, a_controllers):
+        """
+        Creates a namespace with native NVMe multipath, reached through several controllers. Its block device is
+        under /sys/devices/virtual/nvme-subsystem and is partitioned. Call it after create.
+        :param i_subsystem: Number of the subsystem, also used for the namespace, like nvme<i_subsystem>n1
+        :param a_controllers: Numbers of the controllers, not used by the NVMe drives of create
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        s_dev_name = "nvme%dn1" % i_subsystem
+        s_subsystem_path = self.s_sys_root + "/devices/virtual/nvme-subsystem/nvme-subsys%d" % i_subsystem
+        if self.o_file.create_folder(s_subsystem_path) is False:
+            return False
+        self.o_file.write(s_subsystem_path + "/model", "SAMSUNG MZWLJ3T8HBLS\n")
+        self.o_file.write(s_subsystem_path + "/serial", "S4YPNE0N%06d\n" % i_subsystem)
+        for i_controller in a_controllers:
+            s_controller_path = self.s_sys_root + "/devices/pci0000:80/0000:80:%02x.0/0000:%02x:00.0/nvme/nvme%d" % \
+                (i_controller % 32, 0x80 + i_controller % 128, i_controller)
+            self.o_file.create_folder(s_controller_path)
+            self.o_file.create_symlink("../../../" + s_controller_path[len(self.s_sys_root + "/devices/"):],
+                                       s_subsystem_path + "/nvme%d" % i_controller)
+
+        s_block_path = s_subsystem_path + "/" + s_dev_name
+        self.create_block_device(s_block_path, s_dev_name, self.I_BLOCK_EXT_MAJOR, self.get_ext_minor(),
+                                 self.I_SECTORS, False)
+        self.o_file.create_symlink("../../nvme-subsys%d" % i_subsystem, s_block_path + "/device")
+        s_partition_name = s_dev_name + "p1"
+        self.create_block_device(s_block_path + "/" + s_partition_name, s_partition_name, self.I_BLOCK_EXT_MAJOR,
+                                 self.get_ext_minor(), self.I_SECTORS // 2, False, 1)
+
+        return self.write_proc_files()
+
+    def get_ext_minor(self):
+        i_minor = self.i_next_ext_minor
+        self.i_next_ext_minor = self.i_next_ext_minor + 1
+        return i_minor
+
+    def create_holder(self, s_dev_name, a_slaves, i_partitions=0):
+        """
+        Creates a virtual block device, like md0 or dm-0, built on top of other block devices. Call it after create.
+        :param s_dev_name: The name of the device
+        :param a_slaves: The names of the disks or partitions it uses
+        :param i_partitions: Number of partitions of the device, named like md0p1
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        s_block_path = self.s_sys_root + "/devices/virtual/block/" + s_dev_name
+        if self.o_file.create_folder(s_block_path + "/slaves") is False or \
+                self.o_file.create_folder(s_block_path + "/holders") is False:
+            return False
+        self.o_file.write(s_block_path + "/size", "%d\n" % self.I_SECTORS)
+        self.o_file.write(s_block_path + "/stat", "0 0 0 0 0 0 0 0 0 0 0\n")
+        self.o_file.create_symlink("../../devices/virtual/block/" + s_dev_name,
+                                   self.s_sys_root + "/class/block/" + s_dev_name)
+        self.o_file.create_symlink("../devices/virtual/block/" + s_dev_name, self.s_sys_root + "/block/" + s_dev_name)
+
+        for s_slave in a_slaves:
+            b_success, s_slave_path = self.o_file.get_real_path(self.s_sys_root + "/class/block/" + s_slave)
+            if self.o_file.folder_exists(s_slave_path) is False:
+                return False
+            self.o_file.create_symlink(s_slave_path, s_block_path + "/slaves/" + s_slave)
+            if self.o_file.folder_exists(s_slave_path + "/holders") is False:
+                self.o_file.create_folder(s_slave_path + "/holders")
+            self.o_file.create_symlink(s_block_path, s_slave_path + "/holders/" + s_dev_name)
+
+        for i_partition in range(1, i_partitions + 1):
+            s_partition_name = s_dev_name + "p" + str(i_partition)
+            s_partition_path = s_block_path + "/" + s_partition_name
+            if self.o_file.create_folder(s_partition_path) is False:
+                return False
+            self.o_file.write(s_partition_path + "/partition", "%d\n" % i_partition)
+            self.o_file.create_symlink("../../" + s_partition_path[len(self.s_sys_root) + 1:],
+                                       self.s_sys_root + "/class/block/" + s_partition_name)
+
+        return True
+
+    def get_vpd_pg0(self):
+        """
+        Supported VPD Pages page
+        """
+        a_pages = bytes([0x00, 0x80, 0x83, 0xb1])
+        return struct.pack(">BBH", 0, 0x00, len(a_pages)) + a_pages
+
+    def get_vpd_pgb1(self, i_rotation_rate, i_form_factor):
+        """
+        Block Device Characteristics VPD page
+        """
+        a_characteristics = struct.pack(">HBB", i_rotation_rate, 0, i_form_factor) + bytes(56)
+        return struct.pack(">BBH", 0, 0xb1, len(a_characteristics)) + a_characteristics
+
+    def get_vpd_pg80(self, s_serial):
+        """
+        Unit Serial Number VPD page
+        """
+        a_serial = s_serial.encode("ascii")
+        return struct.pack(">BBH", 0, 0x80, len(a_serial)) + a_serial
+
+    def get_vpd_pg83(self, s_wwn):
+        """
+        Device Identification VPD page with a single NAA designator
+        """
+        a_naa = struct.pack(">Q", int(s_wwn, 16))
+        a_designator = struct.pack(">BBBB", 0x01, 0x03, 0x00, len(a_naa)) + a_naa
+        return struct.pack(">BBH", 0, 0x83, len(a_designator)) + a_designator
@@ -0,0 +1,233 @@
+#
+# FanoutBenchmark Class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Runs the read benchmark on all the disks at the same time, from several processes so the GIL is not
+#              the limit, and groups the results by IOC, to find a slow HBA lane or a saturated expander.
+#
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from .file import File
+from .latencyhistogram import LatencyHistogram
+from .readbenchmark import ReadBenchmark
+
+
+def run_worker(a_jobs, d_options, o_start, o_results):
+    """
+    Entry point of every worker process. Runs the read benchmark of its disks at the same time, one thread each,
+    once all the processes are ready.
+    :param a_jobs: Tuples with the dev name and the path of the disks of this worker
+    :param d_options: Parameters for ReadBenchmark.run
+    :param o_start: Barrier of all the workers and the parent, to start all the workers together once all of them
+                    were spawned and imported the modules
+    :param o_results: Queue for tuples of dev name, success, results and the serialized LatencyHistogram
+    """
+    def run_job(s_dev_name, s_target):
+        o_read_benchmark = ReadBenchmark(s_target, File(), d_options["sys_root"])
+        b_success, d_results = o_read_benchmark.run(s_pattern=d_options["pattern"], i_io_size=d_options["io_size"],
+                                                    i_queue_depth=d_options["queue_depth"],
+                                                    f_duration=d_options["duration"],
+                                                    i_max_ios=d_options["max_ios"], b_direct=d_options["direct"])
+        o_results.put((s_dev_name, b_success, d_results, o_read_benchmark.o_histogram.to_bytes()))
+
+    try:
+        o_start.wait(d_options["start_timeout"])
+    except threading.BrokenBarrierError:
+        # Another worker did not start in time. Running alone would not measure the disks under the shared load.
+        for s_dev_name, s_target in a_jobs:
+            o_results.put((s_dev_name, False, {"error": "The workers could not start together"},
+                           LatencyHistogram().to_bytes()))
+        return
+
+    a_threads = []
+    for s_dev_name, s_target in a_jobs:
+        o_thread = threading.Thread(target=run_job, args=(s_dev_name, s_target))
+        o_thread.start()
+        a_threads.append(o_thread)
+    for o_thread in a_threads:
+        o_thread.join()
+
+
+class FanoutBenchmark:
+
+    MODE_PER_DISK = "disk"
+    MODE_PER_CPU = "cpu"
+
+    A_PERCENTILES = [50, 99, 99.9]
+
+    s_dev_root = "/dev"
+    s_sys_root = "/sys"
+
+    def __init__(self, s_dev_root="/dev", s_sys_root="/sys"):
+        """
+        :param s_dev_root: Where devfs is mounted. The targets are s_dev_root/<dev name>
+        :param s_sys_root: Where sysfs is mounted
+        """
+        self.s_dev_root = s_dev_root.rstrip("/")
+        self.s_sys_root = s_sys_root.rstrip("/")
+
+    def get_jobs_per_worker(self, a_disks, s_mode):
+        """
+        Splits the disks among the worker processes: one per disk, or one per CPU core with the disks shared
+        round robin.
+        :return: A list with a list of jobs, dev name and path, per worker
+        :rtype list
+        """
+        a_jobs = [(o_disk.s_dev_name, self.s_dev_root + "/" + o_disk.s_dev_name) for o_disk in a_disks]
+        if s_mode == self.MODE_PER_CPU:
+            i_workers = min(os.cpu_count() or 1, len(a_jobs))
+        else:
+            i_workers = len(a_jobs)
+
+        a_workers = [[] for i_worker in range(i_workers)]
+        for i_job, t_job in enumerate(a_jobs):
+            a_workers[i_job % i_workers].append(t_job)
+
+        return a_workers
+
+    def run(self, a_disks, s_mode="disk", s_pattern="sequential", i_io_size=131072, i_queue_depth=1,
+            f_duration=10.0, i_max_ios=0, b_direct=True, f_grace=30.0):
+        """
+        Benchmarks the reads of all the disks at the same time.
+        :param a_disks: The Disks, like the DiskInventory returned by DriveUtils.get_all_disks
+        :param s_mode: MODE_PER_DISK for a process per disk, MODE_PER_CPU for a process per CPU core
+        :type s_mode: str
+        :param f_grace: Seconds to wait for the workers to be ready, and for the results after the duration, before
+                        giving up on a worker
+        :type f_grace: float
+        :return: A boolean indicating that every disk could be benchmarked. The report, see get_report
+        :rtype bool, dict
+        """
+        a_disks = list(a_disks)
+        d_options = {"sys_root": self.s_sys_root, "pattern": s_pattern, "io_size": i_io_size,
+                     "queue_depth": i_queue_depth, "duration": f_duration, "max_ios": i_max_ios, "direct": b_direct,
+                     "start_timeout": f_grace}
+
+        a_workers = self.get_jobs_per_worker(a_disks, s_mode)
+        # Process.start returns before the child is running, so the parent waits in the barrier too
+        o_start = multiprocessing.Barrier(len(a_workers) + 1)
+        o_results = multiprocessing.Queue()
+        a_processes = []
+        for a_jobs in a_workers:
+            o_process = multiprocessing.Process(target=run_worker, args=(a_jobs, d_options, o_start, o_results))
+            o_process.daemon = True
+            o_process.start()
+            a_processes.append(o_process)
+        try:
+            o_start.wait(f_grace)
+        except threading.BrokenBarrierError:
+            # The workers waiting report their disks as failed
+            pass
+
+        d_results = {}
+        d_histograms = {}
+        f_deadline = time.monotonic() + f_duration + f_grace
+        try:
+            while len(d_results) < len(a_disks):
+                f_wait = max(f_deadline - time.monotonic(), 0.001)
+                s_dev_name, b_success, d_disk_results, a_histogram = o_results.get(timeout=f_wait)
+                if b_success is False:
+                    d_disk_results["ios"] = 0
+                d_results[s_dev_name] = d_disk_results
+                o_histogram = LatencyHistogram()
+                o_histogram.load_bytes(a_histogram)
+                d_histograms[s_dev_name] = o_histogram
+        except queue.Empty:
+            pass
+
+        for o_process in a_processes:
+            o_process.join(timeout=1.0)
+            if o_process.is_alive():
+                o_process.terminate()
+
+        b_all_ok = True
+        for o_disk in a_disks:
+            if o_disk.s_dev_name not in d_results:
+                d_results[o_disk.s_dev_name] = {"error": "No results from the worker", "ios": 0}
+            if "error" in d_results[o_disk.s_dev_name]:
+                b_all_ok = False
+
+        return b_all_ok, self.get_report(a_disks, d_results, d_histograms)
+
+    def get_report(self, a_disks, d_results, d_histograms):
+        """
+        :return: A dict with the results of every disk in "disks", the aggregates per IOC in "iocs" and the
+                 aggregate of all the disks in "total"
+        :rtype dict
+        """
+        d_disks = {}
+        d_ioc_histograms = {}
+        d_ioc_disks = {}
+        o_total_histogram = LatencyHistogram()
+        a_all_disk_results = []
+
+        for o_disk in a_disks:
+            s_ioc = o_disk.ioc if o_disk.ioc != "" else "-"
+            d_disk_results = dict(d_results[o_disk.s_dev_name])
+            d_disk_results["ioc"] = s_ioc
+            d_disks[o_disk.s_dev_name] = d_disk_results
+
+            if s_ioc not in d_ioc_disks:
+                d_ioc_disks[s_ioc] = []
+                d_ioc_histograms[s_ioc] = LatencyHistogram()
+            d_ioc_disks[s_ioc].append(d_disk_results)
+            if o_disk.s_dev_name in d_histograms:
+                d_ioc_histograms[s_ioc].merge(d_histograms[o_disk.s_dev_name])
+                o_total_histogram.merge(d_histograms[o_disk.s_dev_name])
+            a_all_disk_results.append(d_disk_results)
+
+        d_iocs = {}
+        for s_ioc, a_ioc_disks in d_ioc_disks.items():
+            d_iocs[s_ioc] = self.get_aggregate(a_ioc_disks, d_ioc_histograms[s_ioc])
+
+        return {"disks": d_disks,
+                "iocs": d_iocs,
+                "total": self.get_aggregate(a_all_disk_results, o_total_histogram)}
+
+    def get_aggregate(self, a_disk_results, o_histogram):
+        """
+        The disks run at the same time, so their throughputs add up
+        """
+        d_aggregate = {"disks": len(a_disk_results),
+                       "failed": len([d_result for d_result in a_disk_results if "error" in d_result]),
+                       "mb_s": sum([d_result.get("mb_s", 0.0) for d_result in a_disk_results]),
+                       "iops": sum([d_result.get("iops", 0.0) for d_result in a_disk_results]),
+                       "ios": o_histogram.i_count}
+        for f_percentile in self.A_PERCENTILES:
+            d_aggregate["latency_p" + ("%g" % f_percentile) + "_ms"] = o_histogram.get_percentile_ms(f_percentile)
+
+        return d_aggregate
+
+    def format_aggregate(self, s_title, d_aggregate):
+        return s_title + " Disks: " + str(d_aggregate["disks"]) + " Failed: " + str(d_aggregate["failed"]) + \
+               " MB/s: " + "%.2f" % d_aggregate["mb_s"] + " IOPS: " + "%.0f" % d_aggregate["iops"] + \
+               " Latency ms p50/p99/p99.9: " + "%.3f" % d_aggregate["latency_p50_ms"] + "/" + \
+               "%.3f" % d_aggregate["latency_p99_ms"] + "/" + "%.3f" % d_aggregate["latency_p99.9_ms"]
+
+    def format_report(self, d_report):
+        """
+        :return: The lines of the report: every disk, grouped by IOC, followed by the IOC and the total
+        :rtype list
+        """
+        a_lines = []
+        for s_ioc in sorted(d_report["iocs"].keys()):
+            for s_dev_name in sorted(d_report["disks"].keys()):
+                d_disk_results = d_report["disks"][s_dev_name]
+                if d_disk_results["ioc"] != s_ioc:
+                    continue
+                if "error" in d_disk_results:
+                    a_lines.append("  Device: " + s_dev_name + " Error: " + d_disk_results["error"])
+                else:
+                    a_lines.append("  Device: " + s_dev_name + " MB/s: " + "%.2f" % d_disk_results["mb_s"] +
+                                   " IOPS: " + "%.0f" % d_disk_results["iops"] +
+                                   " Latency ms p99: " + "%.3f" % d_disk_results["latency_p99_ms"])
+            a_lines.append(self.format_aggregate("IOC: " + s_ioc, d_report["iocs"][s_ioc]))
+        a_lines.append(self.format_aggregate("Total:", d_report["total"]))
+
+        return a_lines
@@ -7,13 +7,28 @@
 #              Please try to keep it lightweight and without other library dependencies as it is injected as Dependency.
 #
 import os
+import fnmatch
 import glob
+import mmap
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 
 class File:
 
-    def __init__(self):
-        pass
+    def __init__(self, i_max_pooled_fds=128):
+        """
+        :param i_max_pooled_fds: Maximum number of file descriptors kept open by the pooled reads
+        :type i_max_pooled_fds: int
+        """
+        self.i_max_pooled_fds = max(i_max_pooled_fds, 1)
+        # Path to file descriptor, the least recently used first
+        self.d_pooled_fds = OrderedDict()
+        self.a_pool_buffer = bytearray(4096)
+        self.o_pool_lock = threading.Lock()
 
     def write(self, s_file, s_text):
         """
@@ -35,6 +50,26 @@ class File:
 
         return True
 
+    def write_binary(self, s_file, a_bytes):
+        """
+        This method creates or overwrites a binary file
+        :param s_file: The file path for the file to write
+        :type s_file: str
+        :param a_bytes: Bytes to write
+        :type a_bytes: bytes
+        :return: Indicate success of writing
+        :rtype boolean
+        """
+        try:
+            fh = open(s_file, "wb")
+            fh.write(a_bytes)
+            fh.close()
+
+        except:
+            return False
+
+        return True
+
     def append(self, s_file, s_text):
         """
         This method creates or appends to a file
@@ -55,6 +90,88 @@ class File:
 
         return True
 
+    def write_atomic(self, s_file, s_text):
+        """
+        Creates or replaces a text file atomically, so after a crash the file has the old or the new content,
+        never a part. For state files.
+        :param s_file: The file path for the file to write
+        :type s_file: str
+        :param s_text: Text to write
+        :type s_text: str
+        :return: Indicate success of writing
+        :rtype boolean
+        """
+        return self.write_binary_atomic(s_file, s_text.encode("utf-8"))
+
+    def write_binary_atomic(self, s_file, a_bytes):
+        """
+        Writes to a temporary file in the same directory, fsyncs it, renames it over the file and fsyncs the
+        directory, so the rename is durable too. The permissions of the file replaced are kept.
+        :param s_file: The file path for the file to write
+        :type s_file: str
+        :param a_bytes: Bytes to write
+        :type a_bytes: bytes
+        :return: Indicate success of writing
+        :rtype boolean
+        """
+        s_dir = os.path.dirname(os.path.abspath(s_file))
+        try:
+            i_mode = os.stat(s_file).st_mode & 0o7777
+        except OSError:
+            i_mode = 0o644
+
+        try:
+            i_fd, s_temp_file = tempfile.mkstemp(prefix="." + os.path.basename(s_file) + ".", suffix=".tmp",
+                                                 dir=s_dir)
+        except OSError:
+            return False
+
+        try:
+            with os.fdopen(i_fd, "wb") as fh:
+                fh.write(a_bytes)
+                fh.flush()
+                os.fchmod(fh.fileno(), i_mode)
+                os.fsync(fh.fileno())
+            os.replace(s_temp_file, s_file)
+        except OSError:
+            try:
+                os.remove(s_temp_file)
+            except OSError:
+                pass
+            return False
+
+        try:
+            i_dir_fd = os.open(s_dir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(i_dir_fd)
+            finally:
+                os.close(i_dir_fd)
+        except OSError:
+            # Some file systems do not allow fsync of directories. The content is already replaced
+            pass
+
+        return True
+
+    def get_appender(self, s_file, i_max_buffer_bytes=65536, f_max_delay=1.0, b_fsync=False):
+        """
+        Opens a long lived FileAppender, for files appended often, like logs, instead of calling append every time
+        :param s_file: The file path for the file to append to
+        :type s_file: str
+        :param i_max_buffer_bytes: The buffer is written when it reaches this size
+        :type i_max_buffer_bytes: int
+        :param f_max_delay: Seconds a line can wait in the buffer. 0 to only write when the buffer is full
+        :type f_max_delay: float
+        :param b_fsync: If every write of the buffer is followed by a fsync
+        :type b_fsync: bool
+        :return: A boolean indicating success, The FileAppender or None
+        :rtype boolean, FileAppender
+        """
+        o_appender = FileAppender(s_file, i_max_buffer_bytes, f_max_delay, b_fsync)
+        if o_appender.open() is False:
+            return False, None
+
+        return True, o_appender
+
     def read(self, s_file):
         """
         This method reads the file in text format.
@@ -126,6 +243,55 @@ class File:
 
         return b_success, a_result
 
+    def iter_lines(self, s_file):
+        """
+        Returns a generator with the lines of a text file, like readlines but without loading the whole file.
+        The file is mapped in memory with mmap and the lines are decoded one by one. Files that can not be mapped,
+        like the ones in /proc and /sys, are read line by line instead. The bytes that are not valid UTF-8 are
+        replaced by U+FFFD, so a corrupted line never raises in the middle of the iteration.
+        :param s_file: The file to read
+        :type s_file: str
+        :return: A boolean indicating that the file exists and is readable, A generator of Strings, with the end of
+                 line. The file is opened at the first line and closed when the generator is exhausted or closed, so a
+                 generator never started holds no descriptor.
+        :rtype boolean, generator
+        """
+        if os.path.isfile(s_file) is False or os.access(s_file, os.R_OK) is False:
+            return False, iter([])
+
+        return True, self.generate_lines(s_file)
+
+    def generate_lines(self, s_file):
+        fh = None
+        o_mmap = None
+        try:
+            try:
+                fh = open(s_file, "rb")
+            except OSError:
+                # Removed after iter_lines checked it
+                return
+
+            try:
+                o_mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Empty files and pseudo files can not be mapped
+                for a_line in fh:
+                    yield a_line.decode("utf-8", errors="replace")
+                return
+
+            i_start = 0
+            i_size = len(o_mmap)
+            while i_start < i_size:
+                i_end = o_mmap.find(b"\n", i_start)
+                i_end = i_size if i_end == -1 else i_end + 1
+                yield o_mmap[i_start:i_end].decode("utf-8", errors="replace")
+                i_start = i_end
+        finally:
+            if o_mmap is not None:
+                o_mmap.close()
+            if fh is not None:
+                fh.close()
+
     def delete(self, s_file):
         """
         This method deletes a given file
@@ -150,6 +316,7 @@ class File:
         """
         This method deletes all files matching a given mask. Example mask: '/root/file*.txt'. This mask will delete any
         file in the root directory, starting with 'file' and ending with '.txt'.
+        A file that can not be deleted does not stop the deletion of the others, see delete_all_with_mask_in_batches.
         :param s_mask: The mask to use for deletion. Should contain entire file path.
         :type s_mask: str
         :return: Indicate success of deletion
@@ -158,16 +325,107 @@ class File:
         :rtype integer
 
         """
-        b_success = True
+        b_success, i_files_deleted, d_failures = self.delete_all_with_mask_in_batches(s_mask)
+
+        return b_success, i_files_deleted
+
+    def delete_all_with_mask_in_batches(self, s_mask, i_batch_size=1000, i_max_workers=0):
+        """
+        Deletes the files matching a mask while they are being listed, i_batch_size at a time, so memory stays
+        flat for directories with millions of files.
+        :param s_mask: The mask to use for deletion. Should contain entire file path.
+        :type s_mask: str
+        :param i_batch_size: Files listed before deleting them
+        :type i_batch_size: int
+        :param i_max_workers: If greater than 0 every batch is deleted with a pool of threads of this size
+        :type i_max_workers: int
+        :return: A boolean indicating that all the files were deleted, Number of files deleted,
+                 A dict with the files that could not be deleted as key and the error as value
+        :rtype boolean, int, dict
+        """
         i_files_deleted = 0
+        d_failures = {}
+        o_executor = None
+        if i_max_workers > 0:
+            o_executor = ThreadPoolExecutor(max_workers=i_max_workers)
+
         try:
-            for o_file in glob.glob(s_mask):
-                os.remove(o_file)
+            a_batch = []
+            for s_file in self.iter_with_mask(s_mask):
+                a_batch.append(s_file)
+                if len(a_batch) < i_batch_size:
+                    continue
+                i_files_deleted = i_files_deleted + self.delete_batch(a_batch, d_failures, o_executor)
+                a_batch = []
+            i_files_deleted = i_files_deleted + self.delete_batch(a_batch, d_failures, o_executor)
+        finally:
+            if o_executor is not None:
+                o_executor.shutdown()
+
+        return len(d_failures) == 0, i_files_deleted, d_failures
+
+    def delete_batch(self, a_files, d_failures, o_executor=None):
+        """
+        Deletes a list of files, adding the ones that fail to d_failures
+        :return: Number of files deleted
+        :rtype int
+        """
+        if o_executor is None:
+            a_errors = map(self.remove_file, a_files)
+        else:
+            a_errors = o_executor.map(self.remove_file, a_files)
+
+        i_files_deleted = 0
+        for s_file, s_error in zip(a_files, a_errors):
+            if s_error == "":
                 i_files_deleted = i_files_deleted + 1
-        except IOError:
-            b_success = False
+            else:
+                d_failures[s_file] = s_error
 
-        return b_success, i_files_deleted
+        return i_files_deleted
+
+    def remove_file(self, s_file):
+        """
+        :return: The error, or an empty String if the file was deleted
+        :rtype str
+        """
+        try:
+            os.remove(s_file)
+        except OSError as o_error:
+            return str(o_error)
+
+        return ""
+
+    def iter_with_mask(self, s_mask):
+        """
+        Generator with the files matching a mask, like get_all_with_mask, but listing the directory with scandir as
+        it goes, instead of building the list. Wildcards in the directory part are resolved with glob.iglob.
+        :param s_mask: The mask. Should contain entire file path.
+        :type s_mask: str
+        :return: The paths of the files
+        :rtype str
+        """
+        s_dir, s_pattern = os.path.split(s_mask)
+        if glob.has_magic(s_dir):
+            yield from glob.iglob(s_mask)
+            return
+        if glob.has_magic(s_pattern) is False:
+            if os.path.lexists(s_mask):
+                yield s_mask
+            return
+
+        try:
+            o_entries = os.scandir(s_dir if s_dir != "" else ".")
+        except OSError:
+            return
+
+        with o_entries:
+            for o_entry in o_entries:
+                # Like glob, hidden files only match masks starting with a dot
+                if o_entry.name.startswith(".") and s_pattern.startswith(".") is False:
+                    continue
+                if fnmatch.fnmatchcase(o_entry.name, s_pattern):
+                    yield os.path.join(s_dir, o_entry.name)
 
     def get_all_with_mask(self, s_mask):
         """
@@ -301,6 +559,23 @@ class File:
 
         return b_success
 
+    def create_symlink(self, s_target, s_link):
+        """
+        Creates a symbolic link
+        :param s_target: What the link points to, it can be relative to the folder of the link
+        :param s_link: The path of the link
+        :return: A boolean indicating success
+        """
+        b_success = True
+        try:
+            os.symlink(s_target, s_link)
+        except IOError:
+            b_success = False
+        except OSError:
+            b_success = False
+
+        return b_success
+
     def get_real_path(self, s_file):
         """
         Get the canonical path(removes symbolic links) for a specified file
@@ -320,3 +595,443 @@ class File:
             b_success = False
 
         return b_success, s_path
+
+    def scan_dir(self, s_dir):
+        """
+        Get the entries of a directory using os.scandir, so the type of each entry comes with the listing and does not
+        require an extra stat call per entry
+        :param s_dir: The directory to scan
+        :return: A boolean indicating success, A list of os.DirEntry
+        """
+        b_success = True
+        a_entries = []
+        try:
+            o_iterator = os.scandir(s_dir)
+            a_entries = list(o_iterator)
+            o_iterator.close()
+        except IOError:
+            b_success = False
+        except OSError:
+            b_success = False
+
+        return b_success, a_entries
+
+    def read_link(self, s_file):
+        """
+        Get the target of a symbolic link, without resolving the whole path like get_real_path does
+        :param s_file: The symbolic link
+        :return: A boolean indicating success, A string with the target as stored in the link
+        """
+        b_success = True
+        s_target = ""
+        try:
+            s_target = os.readlink(s_file)
+        except IOError:
+            b_success = False
+        except OSError:
+            b_success = False
+
+        return b_success, s_target
+
+    def read_many(self, s_dir, a_files):
+        """
+        Reads several files from the same directory in one batch. The directory is opened once and the files are
+        opened relatively to it, so the path is only resolved once. Meant for sysfs attributes.
+        :param s_dir: The directory containing the files
+        :type s_dir: str
+        :param a_files: The relative paths of the files to read
+        :type a_files: list
+        :return: A boolean indicating if the directory could be opened, A dict with the bytes of every file or None if
+                 that file could not be read
+        :rtype boolean, dict
+        """
+        d_results = {}
+
+        try:
+            i_dir_fd = os.open(s_dir, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            for s_name in a_files:
+                d_results[s_name] = None
+            return False, d_results
+
+        try:
+            for s_name in a_files:
+                d_results[s_name] = None
+                try:
+                    i_fd = os.open(s_name, os.O_RDONLY, dir_fd=i_dir_fd)
+                except OSError:
+                    continue
+                try:
+                    a_chunks = []
+                    while True:
+                        a_chunk = os.read(i_fd, 65536)
+                        a_chunks.append(a_chunk)
+                        # A short read from a regular or a sysfs file is the end of file, no need to read again
+                        if len(a_chunk) < 65536:
+                            break
+                    d_results[s_name] = b"".join(a_chunks)
+                except OSError:
+                    pass
+                finally:
+                    os.close(i_fd)
+        finally:
+            os.close(i_dir_fd)
+
+        return True, d_results
+
+    def open_for_write(self, s_file, i_extra_flags=0):
+        """
+        Opens a file for writing with os.open, creating it if needed and without truncating it, so writes can be done
+        with pwrite at any offset and flags like O_DIRECT, O_DSYNC or O_APPEND can be used.
+        :param s_file: The file path
+        :type s_file: str
+        :param i_extra_flags: Flags added to O_WRONLY | O_CREAT | O_CLOEXEC
+        :type i_extra_flags: int
+        :return: A boolean indicating success, The file descriptor or -1
+        :rtype boolean, int
+        """
+        try:
+            i_fd = os.open(s_file, os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC | i_extra_flags, 0o644)
+        except OSError:
+            return False, -1
+
+        return True, i_fd
+
+    def pwrite(self, i_fd, a_buffer, i_offset):
+        """
+        Writes a buffer at an offset, without moving the position of the descriptor
+        :param i_fd: The file descriptor, as returned by open_for_write
+        :type i_fd: int
+        :param a_buffer: The bytes, bytearray or memoryview to write
+        :param i_offset: The offset in the file
+        :type i_offset: int
+        :return: A boolean indicating that the whole buffer was written, The number of bytes written
+        :rtype boolean, int
+        """
+        try:
+            i_written = os.pwrite(i_fd, a_buffer, i_offset)
+        except OSError:
+            return False, 0
+
+        return i_written == len(a_buffer), i_written
+
+    def fsync(self, i_fd):
+        """
+        Flushes the data and metadata of the file to the disk
+        :param i_fd: The file descriptor
+        :type i_fd: int
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        try:
+            os.fsync(i_fd)
+        except OSError:
+            return False
+
+        return True
+
+    def read_pooled(self, s_file):
+        """
+        Reads the file in text format, like read, but keeps the file descriptor open in a pool and re-reads it with
+        pread at offset 0 into a reused buffer. Meant for attributes polled often, like sysfs stat, enclosure status
+        or /proc/diskstats, where opening and closing costs more than the read itself.
+        :param s_file: The file path for the file to read
+        :type s_file: str
+        :return: b_result: Indicate success reading
+        :rtype boolean
+        :return: s_result: The text
+        :rtype str
+        """
+        s_result = ""
+        b_success, a_result = self.pread_pooled(s_file)
+        if b_success is True:
+            try:
+                s_result = a_result.decode("utf-8")
+            except UnicodeDecodeError:
+                b_success = False
+
+        return b_success, s_result
+
+    def read_binary_pooled(self, s_file):
+        """
+        Reads the file in binary format, like read_binary, keeping the file descriptor open in the pool
+        :param s_file: The file path for the file to read
+        :type s_file: str
+        :return: Indicate success reading
+        :rtype boolean
+        :return: a_result: byte array
+        :rtype byte_array
+        """
+        b_success, a_result = self.pread_pooled(s_file)
+        if b_success is False:
+            return False, []
+
+        return True, bytearray(a_result)
+
+    def pread_pooled(self, s_file):
+        """
+        Reads the whole file from offset 0 using a pooled file descriptor.
+        If the read fails, for example with ENODEV because the device disappeared, the descriptor is discarded and
+        the file is opened again once.
+        :param s_file: The file path for the file to read
+        :type s_file: str
+        :return: A boolean indicating success, The bytes read
+        :rtype boolean, bytes
+        """
+        with self.o_pool_lock:
+            for i_attempt in range(2):
+                i_fd = self.get_pooled_fd(s_file)
+                if i_fd is None:
+                    return False, b""
+                try:
+                    return True, self.pread_whole(i_fd)
+                except OSError:
+                    self.close_pooled_fd(s_file)
+
+        return False, b""
+
+    def pread_whole(self, i_fd):
+        """
+        Reads from offset 0 into the pool buffer, growing it if the content does not fit
+        """
+        while True:
+            i_read = os.preadv(i_fd, [self.a_pool_buffer], 0)
+            if i_read < len(self.a_pool_buffer):
+                return bytes(self.a_pool_buffer[:i_read])
+            self.a_pool_buffer = bytearray(len(self.a_pool_buffer) * 2)
+
+    def get_pooled_fd(self, s_file):
+        """
+        Returns the pooled file descriptor for the file, opening it and evicting the least recently used one when
+        the pool is full. Must be called holding o_pool_lock.
+        :return: The file descriptor or None if it could not be opened
+        :rtype int
+        """
+        if s_file in self.d_pooled_fds:
+            self.d_pooled_fds.move_to_end(s_file)
+            return self.d_pooled_fds[s_file]
+
+        try:
+            i_fd = os.open(s_file, os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            return None
+
+        self.d_pooled_fds[s_file] = i_fd
+        while len(self.d_pooled_fds) > self.i_max_pooled_fds:
+            s_evicted_file, i_evicted_fd = self.d_pooled_fds.popitem(last=False)
+            self.close_fd(i_evicted_fd)
+
+        return i_fd
+
+    def close_pooled_fd(self, s_file):
+        i_fd = self.d_pooled_fds.pop(s_file, None)
+        if i_fd is not None:
+            self.close_fd(i_fd)
+
+    def close_fd(self, i_fd):
+        try:
+            os.close(i_fd)
+        except OSError:
+            pass
+
+    def invalidate_pooled(self, s_path_prefix):
+        """
+        Closes the pooled descriptors of the files under a path. Call it when a device disappears, for example with
+        "/sys/class/block/sdb/", so the next read opens the new device instead of the stale one.
+        :param s_path_prefix: The path prefix
+        :type s_path_prefix: str
+        :return: Number of descriptors closed
+        :rtype int
+        """
+        i_closed = 0
+        with self.o_pool_lock:
+            for s_file in list(self.d_pooled_fds.keys()):
+                if s_file.startswith(s_path_prefix):
+                    self.close_pooled_fd(s_file)
+                    i_closed = i_closed + 1
+
+        return i_closed
+
+    def close_pooled(self):
+        """
+        Closes all the pooled descriptors
+        :return: None
+        """
+        with self.o_pool_lock:
+            for s_file in list(self.d_pooled_fds.keys()):
+                self.close_pooled_fd(s_file)
+
+
+class FileAppender:
+    """
+    Appends to a file keeping it open and buffering the writes. The buffer is written when it reaches
+    i_max_buffer_bytes, when the oldest data in it is older than f_max_delay, on flush and on close.
+    It can be shared by several threads. The ones that need their data on the disk use sync, and the fsyncs of the
+    threads waiting at the same time are grouped in one.
+    """
+
+    def __init__(self, s_file, i_max_buffer_bytes=65536, f_max_delay=1.0, b_fsync=False):
+        self.s_file = s_file
+        self.i_max_buffer_bytes = i_max_buffer_bytes
+        self.f_max_delay = f_max_delay
+        self.b_fsync = b_fsync
+        self.i_fd = -1
+        self.a_buffer = bytearray()
+        self.f_first_buffered_time = 0.0
+        # Bytes appended since opening, bytes written to the file and bytes known to be on the disk
+        self.i_appended = 0
+        self.i_written = 0
+        self.i_synced = 0
+        self.i_fsyncs = 0
+        self.o_lock = threading.Lock()
+        self.o_fsync_lock = threading.Lock()
+        self.o_closed = threading.Event()
+        self.o_flusher = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, o_type, o_value, o_traceback):
+        self.close()
+        return False
+
+    def open(self):
+        """
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        try:
+            self.i_fd = os.open(self.s_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC, 0o644)
+        except OSError:
+            return False
+
+        if self.f_max_delay > 0:
+            self.o_flusher = threading.Thread(target=self.flush_periodically)
+            self.o_flusher.daemon = True
+            self.o_flusher.start()
+
+        return True
+
+    def append(self, s_text):
+        """
+        Adds text to the buffer, writing it to the file if a threshold is reached
+        :param s_text: Text to add
+        :type s_text: str
+        :return: Indicate success. False if the appender is closed or the write failed
+        :rtype boolean
+        """
+        return self.append_binary(s_text.encode("utf-8"))
+
+    def append_binary(self, a_bytes):
+        with self.o_lock:
+            if self.i_fd == -1:
+                return False
+            if len(self.a_buffer) == 0:
+                self.f_first_buffered_time = time.monotonic()
+            self.a_buffer += a_bytes
+            self.i_appended = self.i_appended + len(a_bytes)
+            if len(self.a_buffer) < self.i_max_buffer_bytes and \
+                    (self.f_max_delay <= 0 or time.monotonic() - self.f_first_buffered_time < self.f_max_delay):
+                return True
+            b_success = self.write_buffer()
+
+        if b_success is True and self.b_fsync is True:
+            b_success = self.sync()
+
+        return b_success
+
+    def write_buffer(self):
+        """
+        Writes the buffer to the file. Must be called holding o_lock.
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        try:
+            o_view = memoryview(self.a_buffer)
+            while len(o_view) > 0:
+                i_written = os.write(self.i_fd, o_view)
+                o_view = o_view[i_written:]
+                self.i_written = self.i_written + i_written
+            o_view.release()
+        except OSError:
+            return False
+        finally:
+            self.a_buffer = bytearray(self.a_buffer[len(self.a_buffer) - (self.i_appended - self.i_written):])
+
+        return True
+
+    def flush(self):
+        """
+        Writes the buffer to the file, and fsyncs it if the appender was created with b_fsync
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        with self.o_lock:
+            if self.i_fd == -1:
+                return False
+            b_success = self.write_buffer()
+
+        if b_success is True and self.b_fsync is True:
+            b_success = self.sync()
+
+        return b_success
+
+    def sync(self):
+        """
+        Returns when everything appended before the call is on the disk. If another thread is doing a fsync, waits
+        for it and then does one fsync for all the threads that arrived meanwhile, a group commit.
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        with self.o_lock:
+            if self.i_fd == -1:
+                return False
+            i_target = self.i_appended
+            if self.write_buffer() is False:
+                return False
+
+        with self.o_fsync_lock:
+            if self.i_synced >= i_target:
+                # The fsync of another thread already covered this data
+                return True
+            with self.o_lock:
+                i_written = self.i_written
+                i_fd = self.i_fd
+            try:
+                os.fsync(i_fd)
+            except OSError:
+                return False
+            self.i_synced = i_written
+            self.i_fsyncs = self.i_fsyncs + 1
+
+        return True
+
+    def flush_periodically(self):
+        while self.o_closed.wait(self.f_max_delay) is False:
+            with self.o_lock:
+                if self.i_fd == -1:
+                    return
+                if len(self.a_buffer) == 0 or time.monotonic() - self.f_first_buffered_time < self.f_max_delay:
+                    continue
+                b_success = self.write_buffer()
+            if b_success is True and self.b_fsync is True:
+                self.sync()
+
+    def close(self):
+        """
+        Writes the buffer and closes the file
+        :return: Indicate success of the last write
+        :rtype boolean
+        """
+        if self.i_fd == -1:
+            return False
+        b_success = self.flush()
+        self.o_closed.set()
+        with self.o_lock:
+            try:
+                os.close(self.i_fd)
+            except OSError:
+                b_success = False
+            self.i_fd = -1
+
+        return b_success
@@ -0,0 +1,189 @@
+#
+# InventoryDiff Classes
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Compares two inventories of Disks and returns what changed as typed events: disks added, disks removed
+#              and fields changed, like a fault light going on, a serial showing up in another slot or a disk that
+#              became unreadable. Disks are matched by WWN or serial, so a disk renamed from sdb to sdc is the same,
+#              and a disk that failed to report one of them in a scan is still the same.
+#
+
+class InventoryEvent:
+
+    EVENT_ADDED = "added"
+    EVENT_REMOVED = "removed"
+    EVENT_CHANGED = "changed"
+
+    def __init__(self, s_type, s_key, o_disk, s_field="", o_old_value=None, o_new_value=None):
+        """
+        :param s_type: EVENT_ADDED, EVENT_REMOVED or EVENT_CHANGED
+        :param s_key: The key of the disk, the one in the old inventory for the removed and changed events
+        :param o_disk: The Disk, the old one for the removed events and the new one for the rest
+        :param s_field: For the changed events, the field
+        :param o_old_value: For the changed events, the value before
+        :param o_new_value: For the changed events, the value now
+        """
+        self.s_type = s_type
+        self.s_key = s_key
+        self.o_disk = o_disk
+        self.s_field = s_field
+        self.o_old_value = o_old_value
+        self.o_new_value = o_new_value
+
+    def to_dict(self):
+        """
+        :return: The event with simple types, to send it as JSON
+        :rtype dict
+        """
+        d_event = {"type": self.s_type, "key": self.s_key, "dev_name": self.o_disk.s_dev_name}
+        if self.s_type == self.EVENT_CHANGED:
+            d_event["field"] = self.s_field
+            d_event["old"] = self.o_old_value
+            d_event["new"] = self.o_new_value
+        return d_event
+
+    def __str__(self):
+        s_text = self.s_type + " " + self.o_disk.s_dev_name + " (" + self.s_key + ")"
+        if self.s_type == self.EVENT_CHANGED:
+            s_text = s_text + " " + self.s_field + ": " + str(self.o_old_value) + " -> " + str(self.o_new_value)
+        return s_text
+
+
+class InventoryDiff:
+
+    # Fields compared, in the order the events are returned
+    A_FIELDS = ["s_dev_name", "s_slot", "s_fault", "s_locate", "s_drive_status", "s_power_status", "status",
+                "b_unreadable", "suspect", "b_timed_out", "i_sectors", "s_major_minor", "ioc", "id",
+                "s_wwn", "s_serial"]
+
+    def get_key(self, o_disk):
+        """
+        The identity of a disk: its WWN, or its serial, or its dev name when the drive reports neither
+        :rtype str
+        """
+        if o_disk.s_wwn != "":
+            return "wwn:" + o_disk.s_wwn
+        if o_disk.s_serial != "":
+            return "serial:" + o_disk.s_serial
+        return "dev:" + o_disk.s_dev_name
+
+    def get_identities(self, o_disk):
+        """
+        :return: All the identities a disk can be matched by: its WWN and its serial, or its dev name if it has neither
+        :rtype list
+        """
+        a_identities = []
+        if o_disk.s_wwn != "":
+            a_identities.append("wwn:" + o_disk.s_wwn)
+        if o_disk.s_serial != "":
+            a_identities.append("serial:" + o_disk.s_serial)
+        if len(a_identities) == 0:
+            a_identities.append("dev:" + o_disk.s_dev_name)
+        return a_identities
+
+    def is_same_disk(self, o_old_disk, o_new_disk):
+        """
+        Two disks with a different WWN are different disks, even if they report the same serial
+        :rtype bool
+        """
+        return o_old_disk.s_wwn == "" or o_new_disk.s_wwn == "" or o_old_disk.s_wwn == o_new_disk.s_wwn
+
+    def get_matches(self, d_old_disks, d_new_disks):
+        """
+        Matches the disks of both inventories, first by key and then, for the rest, by any of their identities. A disk
+        that reports neither WWN nor serial, like after a transient read error, is matched by its dev name.
+        :return: A dict with the key in the new inventory as key and the key in the old one as value
+        :rtype dict
+        """
+        d_matches = {}
+        a_old_keys = []
+        for s_old_key in d_old_disks:
+            if s_old_key in d_new_disks:
+                d_matches[s_old_key] = s_old_key
+            else:
+                a_old_keys.append(s_old_key)
+        if len(a_old_keys) == 0:
+            return d_matches
+
+        # The new disks not matched, by identity and by dev name
+        d_new_keys = {}
+        d_new_keys_by_dev_name = {}
+        for s_new_key, o_new_disk in d_new_disks.items():
+            if s_new_key in d_matches:
+                continue
+            for s_identity in self.get_identities(o_new_disk):
+                d_new_keys.setdefault(s_identity, s_new_key)
+            d_new_keys_by_dev_name.setdefault(o_new_disk.s_dev_name, s_new_key)
+
+        for s_old_key in a_old_keys:
+            o_old_disk = d_old_disks[s_old_key]
+            a_new_keys = [d_new_keys.get(s_identity) for s_identity in self.get_identities(o_old_disk)]
+            s_new_key = d_new_keys_by_dev_name.get(o_old_disk.s_dev_name)
+            if s_new_key is not None:
+                o_new_disk = d_new_disks[s_new_key]
+                if self.get_key(o_old_disk).startswith("dev:") or self.get_key(o_new_disk).startswith("dev:"):
+                    # The dev name only identifies the disk when one of both has no other identity
+                    a_new_keys.append(s_new_key)
+            for s_new_key in a_new_keys:
+                if s_new_key is not None and s_new_key not in d_matches and \
+                        self.is_same_disk(o_old_disk, d_new_disks[s_new_key]):
+                    d_matches[s_new_key] = s_old_key
+                    break
+
+        return d_matches
+
+    def get_disks_by_key(self, disks):
+        """
+        :return: A dict with the key as key and the Disk as value, in the order of the disks
+        :rtype dict
+        """
+        d_disks = {}
+        for o_disk in disks:
+            s_key = self.get_key(o_disk)
+            if s_key in d_disks:
+                # The same drive seen through two paths, like with wrong zoning
+                s_key = s_key + "@" + o_disk.s_dev_name
+            d_disks[s_key] = o_disk
+
+        return d_disks
+
+    def get_value(self, o_disk, s_field):
+        o_value = getattr(o_disk, s_field)
+        if s_field == "status" and o_value is not None:
+            # The DiskStatus members, as plain Strings
+            return str(o_value)
+        return o_value
+
+    def diff(self, old_disks, new_disks):
+        """
+        Compares two inventories, like two results of DriveUtils.get_all_disks, in linear time
+        :param old_disks: The disks of the previous scan
+        :param new_disks: The disks of the last scan
+        :return: The events: first the removed disks and then the added and changed ones, in the order of the scans
+        :rtype list
+        """
+        a_events = []
+        d_old_disks = self.get_disks_by_key(old_disks)
+        d_new_disks = self.get_disks_by_key(new_disks)
+        d_matches = self.get_matches(d_old_disks, d_new_disks)
+        a_matched_old_keys = set(d_matches.values())
+
+        for s_key, o_old_disk in d_old_disks.items():
+            if s_key not in a_matched_old_keys:
+                a_events.append(InventoryEvent(InventoryEvent.EVENT_REMOVED, s_key, o_old_disk))
+
+        for s_new_key, o_new_disk in d_new_disks.items():
+            s_key = d_matches.get(s_new_key)
+            if s_key is None:
+                a_events.append(InventoryEvent(InventoryEvent.EVENT_ADDED, s_new_key, o_new_disk))
+                continue
+            o_old_disk = d_old_disks[s_key]
+            for s_field in self.A_FIELDS:
+                o_old_value = self.get_value(o_old_disk, s_field)
+                o_new_value = self.get_value(o_new_disk, s_field)
+                if o_old_value != o_new_value:
+                    a_events.append(InventoryEvent(InventoryEvent.EVENT_CHANGED, s_key, o_new_disk, s_field,
+                                                   o_old_value, o_new_value))
+
+        return a_events
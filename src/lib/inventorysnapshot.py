@@ -0,0 +1,158 @@
+#
+# InventorySnapshot Class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Keeps the result of a full scan in a snapshot file under /run, keyed by a fingerprint of
+#              /dev/disk/by-id, /proc/partitions and the boot id. While the fingerprint does not change the disks are
+#              loaded from the snapshot and only the volatile fields are read again from sysfs.
+#
+
+import hashlib
+import json
+import os
+
+from .disk import Disk
+from .diskinventory import DiskInventory
+
+
+class InventorySnapshot:
+
+    I_FORMAT_VERSION = 1
+
+    S_DEFAULT_PATH = "/run/disksio/inventory.json"
+
+    # Fields of the Disk that do not change while the hardware is the same
+    A_FIELDS = ["id", "s_serial", "s_wwn", "s_major_minor", "ioc", "manufacturer", "type", "i_sectors",
+                "i_logical_block_size", "i_physical_block_size", "has_partition3", "suspect"]
+
+    def __init__(self, o_driveutils, s_path=S_DEFAULT_PATH):
+        """
+        :param o_driveutils: The DriveUtils used for the scans. Its File and roots are used for everything
+        :type o_driveutils: DriveUtils
+        :param s_path: The snapshot file
+        :type s_path: str
+        """
+        self.o_driveutils = o_driveutils
+        self.o_file = o_driveutils.o_file
+        self.s_path = s_path
+
+    def get_fingerprint(self):
+        """
+        Hash of the /dev/disk/by-id links, /proc/partitions, which has the sizes too, and the boot id.
+        It costs a directory listing, a readlink per link and two small reads, instead of the full scan.
+        :return: The fingerprint
+        :rtype str
+        """
+        o_hash = hashlib.sha256()
+        o_hash.update(("disksio snapshot %d\n" % self.I_FORMAT_VERSION).encode("utf-8"))
+
+        s_by_id_path = self.o_driveutils.s_dev_root + "/disk/by-id"
+        b_success, a_disk_ids = self.o_file.list_dir(s_by_id_path)
+        for s_disk_id in sorted(a_disk_ids):
+            b_success, s_target = self.o_file.read_link(s_by_id_path + "/" + s_disk_id)
+            o_hash.update((s_disk_id + " " + s_target + "\n").encode("utf-8"))
+
+        for s_file in ["/partitions", "/sys/kernel/random/boot_id"]:
+            b_success, s_content = self.o_file.read(self.o_driveutils.s_proc_root + s_file)
+            o_hash.update((s_file + "\n" + s_content).encode("utf-8"))
+
+        return o_hash.hexdigest()
+
+    def save(self, all_disks, s_fingerprint):
+        """
+        Writes the snapshot atomically, creating its directory if needed
+        :param all_disks: The disks, as returned by get_all_disks
+        :type all_disks: DiskInventory
+        :param s_fingerprint: The fingerprint taken before the scan
+        :type s_fingerprint: str
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        a_disks = []
+        for o_disk in all_disks:
+            d_disk = {"dev_name": o_disk.s_dev_name, "aliases": all_disks.get_aliases(o_disk.s_dev_name)}
+            for s_field in self.A_FIELDS:
+                d_disk[s_field] = getattr(o_disk, s_field)
+            a_disks.append(d_disk)
+
+        s_snapshot = json.dumps({"version": self.I_FORMAT_VERSION, "fingerprint": s_fingerprint, "disks": a_disks},
+                                separators=(",", ":"))
+
+        s_dir = os.path.dirname(self.s_path)
+        if s_dir != "" and self.o_file.folder_exists(s_dir) is False:
+            if self.o_file.create_folder(s_dir) is False:
+                return False
+
+        return self.o_file.write_atomic(self.s_path, s_snapshot)
+
+    def load(self, s_fingerprint):
+        """
+        Loads the disks from the snapshot if it was taken with the same fingerprint, and reads their volatile fields.
+        :param s_fingerprint: The current fingerprint
+        :type s_fingerprint: str
+        :return: A boolean indicating that the snapshot is valid, The DiskInventory
+        :rtype boolean, DiskInventory
+        """
+        all_disks = DiskInventory()
+
+        b_success, s_snapshot = self.o_file.read(self.s_path)
+        if b_success is False:
+            return False, all_disks
+        try:
+            d_snapshot = json.loads(s_snapshot)
+        except ValueError:
+            return False, all_disks
+        if not isinstance(d_snapshot, dict) or d_snapshot.get("version") != self.I_FORMAT_VERSION or \
+                d_snapshot.get("fingerprint") != s_fingerprint:
+            return False, all_disks
+
+        try:
+            for d_disk in d_snapshot["disks"]:
+                o_disk = Disk(d_disk["dev_name"], self.o_file)
+                for s_field in self.A_FIELDS:
+                    setattr(o_disk, s_field, d_disk[s_field])
+                all_disks.add(o_disk)
+                for s_disk_id in d_disk["aliases"]:
+                    all_disks.add_alias(o_disk.s_dev_name, s_disk_id)
+        except (KeyError, TypeError):
+            return False, DiskInventory()
+
+        for o_disk in all_disks:
+            self.refresh_volatile_fields(o_disk)
+
+        return True, all_disks
+
+    def refresh_volatile_fields(self, o_disk):
+        """
+        Reads again what can change without a change in the fingerprint: if the drive is readable. The disks that
+        were suspect are probed entirely.
+        """
+        if o_disk.suspect is True:
+            o_disk.suspect = False
+            if self.o_driveutils.get_disk_info(o_disk) != 0:
+                o_disk.suspect = True
+            return
+
+        b_success, s_stat = self.o_file.read(self.o_driveutils.s_sys_root + "/class/block/" + o_disk.s_dev_name +
+                                             "/stat")
+        o_disk.set_readable_from_stat(b_success, s_stat)
+
+    def get_all_disks(self):
+        """
+        Like DriveUtils.get_all_disks, but from the snapshot when it is valid. When not, the full scan is done and
+        the snapshot written for the next time, if the scan had no errors.
+        :return: An error code, 0 means everything is ok. A DiskInventory. A boolean indicating if it came from the
+                 snapshot
+        :rtype int, DiskInventory, boolean
+        """
+        s_fingerprint = self.get_fingerprint()
+        b_success, all_disks = self.load(s_fingerprint)
+        if b_success is True:
+            return 0, all_disks, True
+
+        i_error_code, all_disks = self.o_driveutils.get_all_disks()
+        if i_error_code == 0:
+            self.save(all_disks, s_fingerprint)
+
+        return i_error_code, all_disks, False
@@ -0,0 +1,214 @@
+#
+# LatencyHistogram Class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: HDR like histogram of latencies. Fixed memory, independently of the number of values recorded, with
+#              linear buckets for the small values and log buckets of the same relative precision for the rest.
+#              Histograms of different threads or hosts merge adding their buckets, and serialize to a few bytes.
+#
+
+from array import array
+from operator import add
+
+
+class LatencyHistogram:
+    """
+    The values are integers, by default microseconds.
+    Recording is not synchronized: every thread records in its own instance and they are merged at the end.
+    """
+
+    # 7 bits gives 128 buckets per power of two, so any value is kept with an error below 1.6%
+    I_DEFAULT_SUB_BUCKET_BITS = 7
+    # One hour in microseconds. Bigger values are counted in the last bucket
+    I_DEFAULT_MAX_VALUE = 3600 * 1000 * 1000
+
+    S_MAGIC = b"LH"
+    I_VERSION = 1
+
+    def __init__(self, i_sub_bucket_bits=I_DEFAULT_SUB_BUCKET_BITS, i_max_value=I_DEFAULT_MAX_VALUE):
+        """
+        :param i_sub_bucket_bits: Precision. Values below 2^i_sub_bucket_bits are kept exactly
+        :type i_sub_bucket_bits: int
+        :param i_max_value: The highest value tracked
+        :type i_max_value: int
+        """
+        self.i_sub_bucket_bits = i_sub_bucket_bits
+        self.i_max_value = i_max_value
+        self.i_linear_buckets = 1 << i_sub_bucket_bits
+        self.i_half_buckets = self.i_linear_buckets >> 1
+        self.i_max_shift = max(i_max_value.bit_length() - i_sub_bucket_bits, 0)
+        self.i_buckets = self.i_linear_buckets + self.i_max_shift * self.i_half_buckets
+        self.reset()
+
+    def reset(self):
+        self.a_counts = array("Q", bytes(8 * self.i_buckets))
+        self.i_count = 0
+        self.i_min = 0
+        self.i_max = 0
+        self.i_sum = 0
+
+    def __len__(self):
+        return self.i_count
+
+    def get_bucket_index(self, i_value):
+        i_bits = i_value.bit_length()
+        if i_bits <= self.i_sub_bucket_bits:
+            return i_value
+        i_shift = i_bits - self.i_sub_bucket_bits
+        if i_shift > self.i_max_shift:
+            return self.i_buckets - 1
+        return self.i_linear_buckets + (i_shift - 1) * self.i_half_buckets + (i_value >> i_shift) - self.i_half_buckets
+
+    def get_bucket_highest_value(self, i_index):
+        """
+        :return: The highest value that is counted in the bucket
+        :rtype int
+        """
+        if i_index < self.i_linear_buckets:
+            return i_index
+        i_shift, i_sub_bucket = divmod(i_index - self.i_linear_buckets, self.i_half_buckets)
+        i_shift = i_shift + 1
+        return ((self.i_half_buckets + i_sub_bucket) << i_shift) + (1 << i_shift) - 1
+
+    def record(self, i_value, i_count=1):
+        """
+        Records a value i_count times. Negative values are recorded as 0.
+        :param i_value: The value, by default in microseconds
+        :type i_value: int
+        :param i_count: Times the value happened
+        :type i_count: int
+        """
+        if i_value < 0:
+            i_value = 0
+        self.a_counts[self.get_bucket_index(i_value)] += i_count
+        if self.i_count == 0 or i_value < self.i_min:
+            self.i_min = i_value
+        if i_value > self.i_max:
+            self.i_max = i_value
+        self.i_count = self.i_count + i_count
+        self.i_sum = self.i_sum + i_value * i_count
+
+    def record_seconds(self, f_seconds, i_count=1):
+        self.record(int(f_seconds * 1000000 + 0.5), i_count)
+
+    def record_ms(self, f_ms, i_count=1):
+        self.record(int(f_ms * 1000 + 0.5), i_count)
+
+    def get_value_at_percentile(self, f_percentile):
+        """
+        :param f_percentile: From 0 to 100, like 99.9
+        :type f_percentile: float
+        :return: The value at the percentile, 0 if nothing was recorded
+        :rtype int
+        """
+        if self.i_count == 0:
+            return 0
+        i_rank = int(self.i_count * f_percentile / 100.0 + 0.999999999)
+        i_rank = min(max(i_rank, 1), self.i_count)
+
+        i_seen = 0
+        for i_index, i_bucket_count in enumerate(self.a_counts):
+            i_seen = i_seen + i_bucket_count
+            if i_seen >= i_rank:
+                return max(min(self.get_bucket_highest_value(i_index), self.i_max), self.i_min)
+
+        return self.i_max
+
+    def get_percentile_ms(self, f_percentile):
+        return self.get_value_at_percentile(f_percentile) / 1000.0
+
+    def get_mean(self):
+        if self.i_count == 0:
+            return 0.0
+        return float(self.i_sum) / self.i_count
+
+    def is_compatible(self, o_histogram):
+        return self.i_sub_bucket_bits == o_histogram.i_sub_bucket_bits and \
+            self.i_max_value == o_histogram.i_max_value
+
+    def merge(self, o_histogram):
+        """
+        Adds the values of another histogram to this one
+        :param o_histogram: A histogram with the same precision and maximum value
+        :type o_histogram: LatencyHistogram
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        if self.is_compatible(o_histogram) is False:
+            return False
+        if o_histogram.i_count == 0:
+            return True
+
+        self.a_counts = array("Q", map(add, self.a_counts, o_histogram.a_counts))
+        if self.i_count == 0 or o_histogram.i_min < self.i_min:
+            self.i_min = o_histogram.i_min
+        self.i_max = max(self.i_max, o_histogram.i_max)
+        self.i_count = self.i_count + o_histogram.i_count
+        self.i_sum = self.i_sum + o_histogram.i_sum
+
+        return True
+
+    def to_bytes(self):
+        """
+        Serializes the histogram. Only the buckets with values are written, as pairs of distance to the previous
+        bucket with values and count, in variable length integers.
+        :rtype bytes
+        """
+        a_values = [self.I_VERSION, self.i_sub_bucket_bits, self.i_max_value, self.i_min, self.i_max, self.i_sum]
+        i_last_index = -1
+        for i_index, i_bucket_count in enumerate(self.a_counts):
+            if i_bucket_count == 0:
+                continue
+            a_values.append(i_index - i_last_index)
+            a_values.append(i_bucket_count)
+            i_last_index = i_index
+
+        a_bytes = bytearray(self.S_MAGIC)
+        for i_value in a_values:
+            while i_value > 127:
+                a_bytes.append((i_value & 127) | 128)
+                i_value = i_value >> 7
+            a_bytes.append(i_value)
+
+        return bytes(a_bytes)
+
+    def load_bytes(self, a_bytes):
+        """
+        Replaces the content of the histogram with a serialized one, as returned by to_bytes
+        :param a_bytes: The serialized histogram
+        :type a_bytes: bytes
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        if bytes(a_bytes[0:2]) != self.S_MAGIC:
+            return False
+
+        a_values = []
+        i_value = 0
+        i_shift = 0
+        for i_byte in a_bytes[2:]:
+            i_value = i_value | ((i_byte & 127) << i_shift)
+            i_shift = i_shift + 7
+            if i_byte < 128:
+                a_values.append(i_value)
+                i_value = 0
+                i_shift = 0
+
+        if len(a_values) < 6 or len(a_values) % 2 != 0 or a_values[0] != self.I_VERSION:
+            return False
+
+        self.__init__(a_values[1], a_values[2])
+        self.i_min = a_values[3]
+        self.i_max = a_values[4]
+        self.i_sum = a_values[5]
+        i_index = -1
+        for i_position in range(6, len(a_values), 2):
+            i_index = i_index + a_values[i_position]
+            if i_index >= self.i_buckets:
+                self.reset()
+                return False
+            self.a_counts[i_index] = a_values[i_position + 1]
+            self.i_count = self.i_count + a_values[i_position + 1]
+
+        return True
@@ -0,0 +1,298 @@
+#
+# MetricsExporter Classes
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Long running Prometheus / OpenMetrics exporter. A background thread refreshes the inventory and the
+#              /proc/diskstats counters and renders the text only when they change. The HTTP listener only serves the
+#              last text rendered, so a scrape never reads sysfs and never waits for a refresh.
+#
+
+import http.server
+import itertools
+import threading
+import time
+
+from .diskstats import DiskStatsSampler
+
+
+class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        o_exporter = self.server.o_exporter
+        if self.path.split("?")[0] not in ["/", "/metrics"]:
+            self.send_error(404)
+            return
+
+        a_body = o_exporter.get_rendered()
+        self.send_response(200)
+        self.send_header("Content-Type", o_exporter.S_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(a_body)))
+        self.end_headers()
+        self.wfile.write(a_body)
+
+    def log_message(self, format, *args):
+        # Every 15 seconds from every Prometheus server would flood the logs
+        pass
+
+
+class MetricsExporter:
+
+    S_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+    # Position in the counters of DiskStatsSampler.read_counters, metric name, type, help, and the factor to
+    # convert to the base unit
+    A_COUNTERS = [(DiskStatsSampler.I_READS, "disksio_disk_reads_completed", "counter", "Reads completed", 1),
+                  (DiskStatsSampler.I_WRITES, "disksio_disk_writes_completed", "counter", "Writes completed", 1),
+                  (DiskStatsSampler.I_SECTORS_READ, "disksio_disk_read_bytes", "counter", "Bytes read",
+                   DiskStatsSampler.I_SECTOR_SIZE),
+                  (DiskStatsSampler.I_SECTORS_WRITTEN, "disksio_disk_written_bytes", "counter", "Bytes written",
+                   DiskStatsSampler.I_SECTOR_SIZE),
+                  (DiskStatsSampler.I_MS_READING, "disksio_disk_read_time_seconds", "counter",
+                   "Time spent reading", 0.001),
+                  (DiskStatsSampler.I_MS_WRITING, "disksio_disk_write_time_seconds", "counter",
+                   "Time spent writing", 0.001),
+                  (DiskStatsSampler.I_MS_DOING_IO, "disksio_disk_io_time_seconds", "counter",
+                   "Time with I/Os in progress, the base of %util", 0.001),
+                  (DiskStatsSampler.I_WEIGHTED_MS_DOING_IO, "disksio_disk_io_time_weighted_seconds", "counter",
+                   "Time with I/Os in progress weighted by their number, the base of the queue depth", 0.001),
+                  (DiskStatsSampler.I_IOS_IN_PROGRESS, "disksio_disk_io_in_progress", "gauge", "I/Os in progress", 1)]
+
+    def __init__(self, o_driveutils, o_sampler=None, s_address="127.0.0.1", i_port=9789, f_interval=5.0,
+                 f_inventory_interval=300.0, i_max_workers=16, f_timeout=5.0):
+        """
+        :param o_driveutils: The DriveUtils used for the inventory
+        :type o_driveutils: DriveUtils
+        :param o_sampler: The DiskStatsSampler of /proc/diskstats. By default one with the File and proc root of
+                          o_driveutils
+        :type o_sampler: DiskStatsSampler
+        :param s_address: Address to listen to
+        :param i_port: Port to listen to. 0 picks a free one, see get_port
+        :param f_interval: Seconds between reads of /proc/diskstats
+        :param f_inventory_interval: Seconds between scans of the disks
+        :param i_max_workers: Threads probing the disks in the scans, so a hung disk does not stall the refresher
+        :param f_timeout: Seconds a disk has to finish its probe before being flagged as suspect
+        """
+        self.o_driveutils = o_driveutils
+        if o_sampler is None:
+            o_sampler = DiskStatsSampler(o_driveutils.o_file, o_driveutils.s_proc_root)
+        self.o_sampler = o_sampler
+        self.s_address = s_address
+        self.i_port = i_port
+        self.f_interval = f_interval
+        self.f_inventory_interval = f_inventory_interval
+        self.i_max_workers = i_max_workers
+        self.f_timeout = f_timeout
+
+        # What the scrapes serve. It is replaced, never modified, so reading it needs no lock.
+        self.a_rendered = b"# EOF\n"
+        self.a_dev_names = []
+        self.t_inventory_values = None
+        self.s_inventory_text = ""
+        self.d_counters = None
+        self.i_renders = 0
+        self.o_scrapes = itertools.count()
+        self.f_last_inventory_refresh = 0.0
+        self.i_refresh_errors = 0
+        self.b_refresh_failing = False
+
+        self.o_server = None
+        self.a_threads = []
+        self.o_stop = threading.Event()
+
+    def escape_label_value(self, s_value):
+        return s_value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+    def format_labels(self, d_labels):
+        if len(d_labels) == 0:
+            return ""
+        a_labels = []
+        for s_label, s_value in d_labels.items():
+            a_labels.append(s_label + "=\"" + self.escape_label_value(str(s_value)) + "\"")
+        return "{" + ",".join(a_labels) + "}"
+
+    def format_value(self, o_value):
+        if isinstance(o_value, bool):
+            return "1" if o_value is True else "0"
+        if isinstance(o_value, int):
+            return str(o_value)
+        return repr(float(o_value))
+
+    def add_family(self, a_lines, s_name, s_type, s_help, a_samples):
+        """
+        Adds a metric family in OpenMetrics format
+        :param a_samples: Tuples with the labels dict and the value
+        """
+        a_lines.append("# TYPE " + s_name + " " + s_type)
+        a_lines.append("# HELP " + s_name + " " + s_help)
+        s_suffix = ""
+        if s_type == "counter":
+            s_suffix = "_total"
+        elif s_type == "info":
+            s_suffix = "_info"
+        for d_labels, o_value in a_samples:
+            a_lines.append(s_name + s_suffix + self.format_labels(d_labels) + " " + self.format_value(o_value))
+
+    def refresh_inventory(self):
+        """
+        Scans the disks, and renders their part of the text if something changed
+        :return: True if it changed
+        :rtype boolean
+        """
+        i_error_code, all_disks = self.o_driveutils.get_all_disks(self.i_max_workers, self.f_timeout)
+        self.o_driveutils.load_enclosure_info(all_disks)
+        self.f_last_inventory_refresh = time.monotonic()
+
+        a_disk_values = []
+        for o_disk in all_disks:
+            a_disk_values.append((o_disk.s_dev_name, o_disk.id, o_disk.s_serial, o_disk.s_wwn,
+                                  o_disk.manufacturer.strip(), o_disk.type, o_disk.ioc, o_disk.s_slot,
+                                  o_disk.i_byte_size, o_disk.b_unreadable, o_disk.suspect))
+        t_inventory_values = (i_error_code, tuple(a_disk_values))
+        if t_inventory_values == self.t_inventory_values:
+            return False
+
+        a_lines = []
+        self.add_family(a_lines, "disksio_disk", "info", "Identity of the disk",
+                        [({"device": t_disk[0], "id": t_disk[1], "serial": t_disk[2], "wwn": t_disk[3],
+                           "vendor": t_disk[4], "type": t_disk[5], "ioc": t_disk[6], "slot": t_disk[7]}, 1)
+                         for t_disk in a_disk_values])
+        self.add_family(a_lines, "disksio_disk_size_bytes", "gauge", "Size of the disk",
+                        [({"device": t_disk[0]}, t_disk[8]) for t_disk in a_disk_values])
+        self.add_family(a_lines, "disksio_disk_unreadable", "gauge", "1 if the stat counters of the disk are all zero",
+                        [({"device": t_disk[0]}, t_disk[9]) for t_disk in a_disk_values])
+        self.add_family(a_lines, "disksio_disk_suspect", "gauge", "1 if the disk could not be probed completely",
+                        [({"device": t_disk[0]}, t_disk[10]) for t_disk in a_disk_values])
+        self.add_family(a_lines, "disksio_scan_error", "gauge", "Error code of the last scan, 0 means ok",
+                        [({}, i_error_code)])
+
+        self.t_inventory_values = t_inventory_values
+        self.a_dev_names = [t_disk[0] for t_disk in a_disk_values]
+        self.s_inventory_text = "\n".join(a_lines) + "\n"
+
+        return True
+
+    def refresh_counters(self):
+        """
+        :return: True if the counters changed
+        :rtype boolean
+        """
+        b_success, d_counters = self.o_sampler.read_counters()
+        if b_success is False:
+            d_counters = {}
+        if d_counters == self.d_counters:
+            return False
+
+        self.d_counters = d_counters
+        return True
+
+    def refresh(self, b_inventory=False):
+        """
+        Refreshes the counters, and the inventory too if requested or if it is due, and renders if anything changed.
+        :return: True if the text was rendered again
+        :rtype boolean
+        """
+        b_changed = False
+        if b_inventory is True or self.t_inventory_values is None or \
+                time.monotonic() - self.f_last_inventory_refresh >= self.f_inventory_interval:
+            b_changed = self.refresh_inventory()
+        b_changed = self.refresh_counters() or b_changed
+
+        if b_changed is True:
+            self.render()
+        return b_changed
+
+    def refresh_safe(self, b_inventory=False):
+        """
+        refresh for the refresher thread, where an exception would end the thread and leave the scrapes serving old
+        data forever. The failures are counted and exported instead.
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        try:
+            self.refresh(b_inventory)
+        except Exception:
+            self.i_refresh_errors = self.i_refresh_errors + 1
+            self.b_refresh_failing = True
+            self.render()
+            return False
+
+        if self.b_refresh_failing is True:
+            self.b_refresh_failing = False
+            self.render()
+        return True
+
+    def render(self):
+        d_counters = self.d_counters or {}
+        # Without disks identified, like in some VMs, every device in /proc/diskstats
+        a_dev_names = self.a_dev_names or sorted(d_counters.keys())
+
+        a_lines = []
+        for i_position, s_name, s_type, s_help, f_factor in self.A_COUNTERS:
+            a_samples = []
+            for s_dev_name in a_dev_names:
+                a_counters = d_counters.get(s_dev_name)
+                if a_counters is not None:
+                    o_value = a_counters[i_position] * f_factor
+                    a_samples.append(({"device": s_dev_name}, o_value))
+            self.add_family(a_lines, s_name, s_type, s_help, a_samples)
+
+        self.add_family(a_lines, "disksio_exporter_render_timestamp_seconds", "gauge",
+                        "When the data last changed", [({}, time.time())])
+        self.add_family(a_lines, "disksio_exporter_refresh_errors", "counter", "Refreshes that failed",
+                        [({}, self.i_refresh_errors)])
+        self.add_family(a_lines, "disksio_exporter_refresh_failing", "gauge",
+                        "1 if the last refresh failed, so the rest of the data may be old",
+                        [({}, self.b_refresh_failing)])
+
+        self.a_rendered = (self.s_inventory_text + "\n".join(a_lines) + "\n# EOF\n").encode("utf-8")
+        self.i_renders = self.i_renders + 1
+
+    def get_rendered(self):
+        next(self.o_scrapes)
+        return self.a_rendered
+
+    def get_port(self):
+        """
+        :return: The port listening, useful when it was started with port 0
+        :rtype int
+        """
+        if self.o_server is None:
+            return self.i_port
+        return self.o_server.server_address[1]
+
+    def start(self):
+        """
+        Does the first refresh, so the first scrape already has data, and starts the refresher and the listener.
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        try:
+            self.o_server = http.server.ThreadingHTTPServer((self.s_address, self.i_port), MetricsRequestHandler)
+        except OSError:
+            return False
+        self.o_server.daemon_threads = True
+        self.o_server.o_exporter = self
+
+        self.refresh_safe(b_inventory=True)
+
+        self.o_stop.clear()
+        self.a_threads = [threading.Thread(target=self.run_refresher, name="disksio-refresher", daemon=True),
+                          threading.Thread(target=self.o_server.serve_forever, name="disksio-listener", daemon=True)]
+        for o_thread in self.a_threads:
+            o_thread.start()
+
+        return True
+
+    def run_refresher(self):
+        while self.o_stop.wait(self.f_interval) is False:
+            self.refresh_safe()
+
+    def stop(self):
+        self.o_stop.set()
+        if self.o_server is not None:
+            self.o_server.shutdown()
+            self.o_server.server_close()
+        for o_thread in self.a_threads:
+            o_thread.join()
+        self.a_threads = []
@@ -0,0 +1,273 @@
+#
+# ReadBenchmark Class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Read throughput and latency benchmark of a block device or a regular file.
+#              Reads bypass the page cache with O_DIRECT, into buffers allocated with mmap and aligned to the
+#              physical block size of the disk, and a pool of threads keeps the queue depth full.
+#
+
+import ctypes
+import mmap
+import os
+import random
+import stat
+import threading
+import time
+
+from .file import File
+from .latencyhistogram import LatencyHistogram
+
+
+class AlignedBuffer:
+    """
+    Anonymous mmap whose usable window starts at an address multiple of the alignment, as O_DIRECT requires
+    """
+
+    def __init__(self, i_size, i_alignment):
+        self.o_mmap = mmap.mmap(-1, i_size + i_alignment)
+        o_first_byte = ctypes.c_char.from_buffer(self.o_mmap)
+        i_address = ctypes.addressof(o_first_byte)
+        # The ctypes object keeps the mmap exported, which would not let it be closed
+        del o_first_byte
+        i_offset = (i_alignment - i_address % i_alignment) % i_alignment
+        self.o_view = memoryview(self.o_mmap)[i_offset:i_offset + i_size]
+
+    def close(self):
+        self.o_view.release()
+        self.o_mmap.close()
+
+
+class ReadBenchmark:
+
+    PATTERN_SEQUENTIAL = "sequential"
+    PATTERN_RANDOM = "random"
+
+    A_PERCENTILES = [50, 90, 99, 99.9]
+
+    o_file = File()
+    s_sys_root = "/sys"
+
+    def __init__(self, s_target, o_file=File(), s_sys_root="/sys"):
+        """
+        :param s_target: The block device, like /dev/sdb or /dev/loop0, or a regular file
+        :param o_file: The File dependency
+        :param s_sys_root: Where sysfs is mounted, to get the block sizes of the devices
+        """
+        self.s_target = s_target
+        self.o_file = o_file
+        self.s_sys_root = s_sys_root.rstrip("/")
+        self.o_lock = threading.Lock()
+        self.o_histogram = LatencyHistogram()
+
+    def get_block_size(self, i_fd):
+        """
+        The alignment for the buffers, offsets and sizes of the reads.
+        For a block device the largest of its logical and physical block sizes in sysfs, for a file the preferred
+        I/O size of its file system.
+        :return: The block size in bytes
+        :rtype int
+        """
+        o_stat = os.fstat(i_fd)
+        if stat.S_ISBLK(o_stat.st_mode) is False:
+            return max(o_stat.st_blksize, 512)
+
+        return self.get_block_size_of_device(os.path.basename(os.path.realpath(self.s_target)))
+
+    def get_block_size_of_device(self, s_dev_name):
+        """
+        :param s_dev_name: A disk or a partition, like sda1
+        :return: The largest of the logical and physical block sizes of the disk, 512 if they can not be read
+        :rtype int
+        """
+        s_dev_name = self.get_disk_dev_name(s_dev_name)
+        i_block_size = 512
+        for s_attribute in ["logical_block_size", "physical_block_size"]:
+            b_success, s_value = self.o_file.read(self.s_sys_root + "/class/block/" + s_dev_name + "/queue/" +
+                                                  s_attribute)
+            if b_success is True and s_value.strip().isdigit():
+                i_block_size = max(i_block_size, int(s_value.strip()))
+
+        return i_block_size
+
+    def get_disk_dev_name(self, s_dev_name):
+        """
+        The partitions have no queue/ in sysfs. Their directory is inside the one of their disk.
+        :return: The dev name of the disk of a partition, or the same dev name if it is not a partition
+        :rtype str
+        """
+        s_path = self.s_sys_root + "/class/block/" + s_dev_name
+        if self.o_file.path_exists(s_path + "/partition") is False:
+            return s_dev_name
+        b_success, s_target = self.o_file.read_link(s_path)
+        if b_success is False:
+            return s_dev_name
+
+        return os.path.basename(os.path.dirname(os.path.normpath(s_target)))
+
+    def open_target(self, b_direct):
+        """
+        Opens the target read only. If O_DIRECT is requested but the file system does not support it, like tmpfs,
+        it is opened buffered.
+        :return: The file descriptor, or -1 if it can not be opened. A boolean indicating if O_DIRECT is in use
+        :rtype int, boolean
+        """
+        if b_direct is True and hasattr(os, "O_DIRECT"):
+            try:
+                return os.open(self.s_target, os.O_RDONLY | os.O_DIRECT), True
+            except OSError:
+                pass
+
+        try:
+            return os.open(self.s_target, os.O_RDONLY), False
+        except OSError:
+            return -1, False
+
+    def run(self, s_pattern="sequential", i_io_size=131072, i_queue_depth=1, f_duration=10.0, i_max_ios=0,
+            b_direct=True):
+        """
+        Reads the target during f_duration seconds, or until i_max_ios reads are done.
+        The sequential pattern starts again from the beginning when it reaches the end.
+        :param s_pattern: PATTERN_SEQUENTIAL or PATTERN_RANDOM
+        :type s_pattern: str
+        :param i_io_size: Bytes per read. Rounded up to a multiple of the block size
+        :type i_io_size: int
+        :param i_queue_depth: Number of reads in flight, one thread each
+        :type i_queue_depth: int
+        :param f_duration: Maximum seconds to run. 0 for no limit
+        :type f_duration: float
+        :param i_max_ios: Maximum number of reads. 0 for no limit
+        :type i_max_ios: int
+        :param b_direct: Use O_DIRECT to bypass the page cache
+        :type b_direct: bool
+        :return: A boolean indicating success. A dict with the results, or with the error
+        :rtype bool, dict
+        """
+        if s_pattern not in [self.PATTERN_SEQUENTIAL, self.PATTERN_RANDOM]:
+            return False, {"error": "Unknown pattern " + s_pattern}
+        if f_duration <= 0 and i_max_ios <= 0:
+            return False, {"error": "A duration or a maximum number of reads is required"}
+
+        i_fd, b_direct_in_use = self.open_target(b_direct)
+        if i_fd == -1:
+            return False, {"error": "Can not open " + self.s_target}
+
+        try:
+            i_block_size = self.get_block_size(i_fd)
+            i_io_size = max(i_io_size + (-i_io_size % i_block_size), i_block_size)
+            i_target_size = os.lseek(i_fd, 0, os.SEEK_END)
+            # Only whole reads, the tail of the target that does not fill one is never read
+            i_blocks = i_target_size // i_io_size
+            if i_blocks == 0:
+                return False, {"error": "The target is smaller than one read of " + str(i_io_size) + " bytes"}
+
+            self.i_fd = i_fd
+            self.s_pattern = s_pattern
+            self.i_io_size = i_io_size
+            self.i_blocks = i_blocks
+            self.i_max_ios = i_max_ios
+            self.i_issued = 0
+            self.i_next_block = 0
+            self.i_errors = 0
+            self.b_stop = False
+            self.o_histogram = LatencyHistogram()
+
+            a_threads = []
+            f_start = time.perf_counter()
+            self.f_deadline = f_start + f_duration if f_duration > 0 else 0
+            for i_worker in range(max(i_queue_depth, 1)):
+                o_thread = threading.Thread(target=self.worker, args=(i_worker, i_block_size))
+                o_thread.daemon = True
+                o_thread.start()
+                a_threads.append(o_thread)
+            for o_thread in a_threads:
+                o_thread.join()
+            f_elapsed = time.perf_counter() - f_start
+        finally:
+            os.close(i_fd)
+
+        return True, self.get_results(f_elapsed, i_queue_depth, i_block_size, b_direct_in_use)
+
+    def get_next_offset(self, o_random):
+        """
+        Reserves the next read for a worker
+        :return: The offset, or -1 if the benchmark is over
+        :rtype int
+        """
+        with self.o_lock:
+            if self.b_stop is True or (self.i_max_ios > 0 and self.i_issued >= self.i_max_ios):
+                return -1
+            self.i_issued = self.i_issued + 1
+            if self.s_pattern == self.PATTERN_SEQUENTIAL:
+                i_block = self.i_next_block
+                self.i_next_block = (self.i_next_block + 1) % self.i_blocks
+                return i_block * self.i_io_size
+
+        return o_random.randrange(self.i_blocks) * self.i_io_size
+
+    def worker(self, i_worker, i_block_size):
+        o_buffer = AlignedBuffer(self.i_io_size, max(i_block_size, mmap.PAGESIZE))
+        o_random = random.Random(i_worker)
+        o_histogram = LatencyHistogram()
+        i_errors = 0
+        try:
+            while True:
+                i_offset = self.get_next_offset(o_random)
+                if i_offset == -1:
+                    break
+                f_start = time.perf_counter()
+                try:
+                    i_read = os.preadv(self.i_fd, [o_buffer.o_view], i_offset)
+                except OSError:
+                    i_read = -1
+                f_end = time.perf_counter()
+                if i_read != self.i_io_size:
+                    i_errors = i_errors + 1
+                else:
+                    o_histogram.record_seconds(f_end - f_start)
+                if self.f_deadline > 0 and f_end >= self.f_deadline:
+                    self.b_stop = True
+        finally:
+            o_buffer.close()
+            # Every thread records in its own histogram and they are merged once at the end
+            with self.o_lock:
+                self.o_histogram.merge(o_histogram)
+                self.i_errors = self.i_errors + i_errors
+
+    def get_results(self, f_elapsed, i_queue_depth, i_block_size, b_direct_in_use):
+        """
+        :return: The results of the last run. The latencies are in o_histogram too
+        :rtype dict
+        """
+        i_ios = self.o_histogram.i_count
+        i_bytes = i_ios * self.i_io_size
+        d_results = {"target": self.s_target,
+                     "pattern": self.s_pattern,
+                     "io_size": self.i_io_size,
+                     "block_size": i_block_size,
+                     "queue_depth": i_queue_depth,
+                     "direct": b_direct_in_use,
+                     "ios": i_ios,
+                     "errors": self.i_errors,
+                     "bytes": i_bytes,
+                     "seconds": f_elapsed,
+                     "mb_s": i_bytes / f_elapsed / 1000000 if f_elapsed > 0 else 0.0,
+                     "iops": i_ios / f_elapsed if f_elapsed > 0 else 0.0}
+        for f_percentile in self.A_PERCENTILES:
+            d_results["latency_p" + ("%g" % f_percentile) + "_ms"] = self.o_histogram.get_percentile_ms(f_percentile)
+        d_results["latency_max_ms"] = self.o_histogram.i_max / 1000.0
+
+        return d_results
+
+    def format_results(self, d_results):
+        s_line = "Target: " + d_results["target"] + " Pattern: " + d_results["pattern"] + \
+                 " IO size: " + str(d_results["io_size"]) + " QD: " + str(d_results["queue_depth"]) + \
+                 " Direct: " + str(d_results["direct"]) + \
+                 " MB/s: " + "%.2f" % d_results["mb_s"] + " IOPS: " + "%.0f" % d_results["iops"] + \
+                 " Latency ms p50/p99/p99.9/max: " + "%.3f" % d_results["latency_p50_ms"] + "/" + \
+                 "%.3f" % d_results["latency_p99_ms"] + "/" + "%.3f" % d_results["latency_p99.9_ms"] + "/" + \
+                 "%.3f" % d_results["latency_max_ms"]
+        if d_results["errors"] > 0:
+            s_line = s_line + " Errors: " + str(d_results["errors"])
+        return s_line
@@ -0,0 +1,218 @@
+#
+# SlowDiskDetector Class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Finds the disks that did not fail but became much slower than their peers, which drag down the whole
+#              RAID or erasure set. The disks are grouped by enclosure, IOC, vendor and type, so they are compared
+#              with disks doing the same work, and every interval of DiskStatsSampler every disk gets a robust score
+#              from the median and the MAD of its group. A disk is flagged after several bad intervals in a row and
+#              cleared after several good ones, with a lower threshold, so it does not flap.
+#
+
+import statistics
+
+from .disk import Disk
+
+
+class SlowDiskDetector:
+
+    # Metrics of DiskStatsSampler compared, with the minimum spread in its unit and relative to the median of the
+    # group. The floors keep a group of identical disks, whose MAD is almost 0, from flagging small differences.
+    A_METRICS = [("await_ms", 1.0, 0.5),
+                 ("util_percent", 10.0, 0.0)]
+
+    # 1.4826 * MAD estimates the standard deviation of normally distributed values
+    F_MAD_SCALE = 1.4826
+
+    def __init__(self, f_threshold=6.0, f_clear_threshold=3.0, i_trigger_samples=3, i_clear_samples=10,
+                 i_min_peers=4, f_min_iops=1.0):
+        """
+        :param f_threshold: Score from which an interval counts as slow
+        :type f_threshold: float
+        :param f_clear_threshold: Score below which an interval of a slow disk counts as recovered
+        :type f_clear_threshold: float
+        :param i_trigger_samples: Slow intervals in a row to flag a disk
+        :type i_trigger_samples: int
+        :param i_clear_samples: Recovered intervals in a row to clear a disk
+        :type i_clear_samples: int
+        :param i_min_peers: Minimum number of active disks in a group to score them. Smaller groups have no verdict.
+        :type i_min_peers: int
+        :param f_min_iops: IOPS for a disk to be active in an interval. A disk with %util is active too, as a hung
+                           disk completes no I/O at all.
+        :type f_min_iops: float
+        """
+        self.f_threshold = f_threshold
+        self.f_clear_threshold = f_clear_threshold
+        self.i_trigger_samples = i_trigger_samples
+        self.i_clear_samples = i_clear_samples
+        self.i_min_peers = i_min_peers
+        self.f_min_iops = f_min_iops
+
+        self.d_groups = {}
+        self.a_slow = set()
+        self.d_streaks = {}
+        # Dev name as key and the score, metric, value and median of the group in the last interval scored
+        self.d_last_scores = {}
+
+    def get_group_key(self, o_disk, o_enclosure_index=None):
+        """
+        :param o_enclosure_index: To group by enclosure too
+        :type o_enclosure_index: EnclosureIndex
+        :return: The enclosure, IOC, vendor and type of the disk
+        :rtype tuple
+        """
+        s_enclosure = ""
+        if o_enclosure_index is not None:
+            o_slot = o_enclosure_index.get_slot_for_dev_name(o_disk.s_dev_name)
+            if o_slot is not None:
+                s_enclosure = o_slot.s_enclosure
+
+        return s_enclosure, o_disk.ioc, o_disk.manufacturer.strip(), o_disk.type
+
+    def set_disks(self, all_disks, o_enclosure_index=None):
+        """
+        Groups the disks. To call again when the inventory changes; the state of the disks gone is dropped.
+        :param all_disks: The probed disks
+        :type all_disks: DiskInventory
+        :param o_enclosure_index: To group by enclosure too, like the one returned by DriveUtils.load_enclosure_info
+        :type o_enclosure_index: EnclosureIndex
+        :return: Number of groups
+        :rtype int
+        """
+        self.d_groups = {}
+        for o_disk in all_disks:
+            t_key = self.get_group_key(o_disk, o_enclosure_index)
+            if t_key not in self.d_groups:
+                self.d_groups[t_key] = []
+            self.d_groups[t_key].append(o_disk.s_dev_name)
+
+        a_dev_names = set([s_dev_name for a_dev_names in self.d_groups.values() for s_dev_name in a_dev_names])
+        self.a_slow = self.a_slow & a_dev_names
+        for d_state in [self.d_streaks, self.d_last_scores]:
+            for s_dev_name in list(d_state.keys()):
+                if s_dev_name not in a_dev_names:
+                    del d_state[s_dev_name]
+
+        return len(self.d_groups)
+
+    def is_active(self, d_disk_metrics):
+        return d_disk_metrics["iops"] >= self.f_min_iops or d_disk_metrics["util_percent"] > 0
+
+    def score_group(self, a_dev_names, d_metrics):
+        """
+        :param a_dev_names: The active disks of a group
+        :param d_metrics: As returned by DiskStatsSampler.sample
+        :return: Dict with the dev name as key and a tuple with the highest score of its metrics, the metric, its
+                 value and the median of the group as value
+        :rtype dict
+        """
+        d_scores = {}
+        for s_metric, f_min_spread, f_min_relative_spread in self.A_METRICS:
+            a_values = [d_metrics[s_dev_name][s_metric] for s_dev_name in a_dev_names]
+            f_median = statistics.median(a_values)
+            f_mad = statistics.median([abs(f_value - f_median) for f_value in a_values])
+            f_spread = max(self.F_MAD_SCALE * f_mad, f_min_spread, f_min_relative_spread * f_median)
+            for s_dev_name, f_value in zip(a_dev_names, a_values):
+                # Faster than the peers is a negative score, never flagged
+                f_score = (f_value - f_median) / f_spread
+                if s_dev_name not in d_scores or f_score > d_scores[s_dev_name][0]:
+                    d_scores[s_dev_name] = (f_score, s_metric, f_value, f_median)
+
+        return d_scores
+
+    def update(self, d_metrics):
+        """
+        Scores every disk against the peers of its group with the metrics of one interval. The disks idle in the
+        interval, or in groups with less than i_min_peers active, keep their state.
+        :param d_metrics: As returned by DiskStatsSampler.sample
+        :type d_metrics: dict
+        :return: The dev names that became slow, The dev names that recovered
+        :rtype list, list
+        """
+        a_became_slow = []
+        a_recovered = []
+        for a_group_dev_names in self.d_groups.values():
+            a_dev_names = [s_dev_name for s_dev_name in a_group_dev_names
+                           if s_dev_name in d_metrics and self.is_active(d_metrics[s_dev_name]) is True]
+            if len(a_dev_names) < self.i_min_peers:
+                continue
+
+            for s_dev_name, t_score in self.score_group(a_dev_names, d_metrics).items():
+                self.d_last_scores[s_dev_name] = t_score
+                if self.update_state(s_dev_name, t_score[0]) is False:
+                    continue
+                if s_dev_name in self.a_slow:
+                    a_became_slow.append(s_dev_name)
+                else:
+                    a_recovered.append(s_dev_name)
+
+        return a_became_slow, a_recovered
+
+    def update_state(self, s_dev_name, f_score):
+        """
+        Hysteresis: counts the intervals in a row past the threshold that applies to the current state
+        :return: True if the disk became slow or recovered
+        :rtype boolean
+        """
+        b_slow = s_dev_name in self.a_slow
+        if b_slow is True:
+            b_past_threshold = f_score < self.f_clear_threshold
+            i_samples = self.i_clear_samples
+        else:
+            b_past_threshold = f_score >= self.f_threshold
+            i_samples = self.i_trigger_samples
+
+        if b_past_threshold is False:
+            self.d_streaks[s_dev_name] = 0
+            return False
+
+        self.d_streaks[s_dev_name] = self.d_streaks.get(s_dev_name, 0) + 1
+        if self.d_streaks[s_dev_name] < i_samples:
+            return False
+
+        self.d_streaks[s_dev_name] = 0
+        if b_slow is True:
+            self.a_slow.discard(s_dev_name)
+        else:
+            self.a_slow.add(s_dev_name)
+        return True
+
+    def is_slow(self, s_dev_name):
+        return s_dev_name in self.a_slow
+
+    def get_health(self, s_dev_name):
+        """
+        :return: Disk.HEALTH_SLOW, Disk.HEALTH_OK, or an empty String if the disk was never scored
+        :rtype str
+        """
+        if s_dev_name in self.a_slow:
+            return Disk.HEALTH_SLOW
+        if s_dev_name in self.d_last_scores:
+            return Disk.HEALTH_OK
+        return ""
+
+    def apply_to_disks(self, all_disks):
+        """
+        Sets the s_health of the disks
+        :param all_disks: The disks
+        :type all_disks: DiskInventory
+        :return: Number of slow disks
+        :rtype int
+        """
+        i_slow = 0
+        for o_disk in all_disks:
+            o_disk.s_health = self.get_health(o_disk.s_dev_name)
+            if o_disk.s_health == Disk.HEALTH_SLOW:
+                i_slow = i_slow + 1
+
+        return i_slow
+
+    def format_score(self, s_dev_name):
+        t_score = self.d_last_scores.get(s_dev_name)
+        if t_score is None:
+            return "Device: " + s_dev_name + " Health: n/a"
+        f_score, s_metric, f_value, f_median = t_score
+        return "Device: " + s_dev_name + " Health: " + self.get_health(s_dev_name) + \
+               " " + s_metric + ": " + "%.2f" % f_value + " Peers median: " + "%.2f" % f_median + \
+               " Score: " + "%.1f" % f_score
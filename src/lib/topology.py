@@ -0,0 +1,366 @@
+#
+# Topology Classes
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Graph of the storage topology: HBAs, expanders, SAS ports, disks, partitions and the dm, md and zvol
+#              devices holding them. It is built from the /sys/devices paths of the block devices and the slaves of
+#              the virtual ones, so questions like which disks are behind an expander or which md array uses a disk
+#              are answered without walking sysfs again. The namespaces with native NVMe multipath, which are under
+#              /sys/devices/virtual/nvme-subsystem, hang from all the controllers of their subsystem.
+#
+
+import os
+
+from .file import File
+
+
+class TopologyNode:
+
+    __slots__ = ["s_name", "s_type", "o_parent", "a_children", "d_disks", "a_holders", "a_slaves"]
+
+    def __init__(self, s_name, s_type, o_parent=None):
+        self.s_name = s_name
+        self.s_type = s_type
+        self.o_parent = o_parent
+        self.a_children = []
+        # Dev names of the disks at or below this node, as keys of a dict to keep them in order without duplicates
+        self.d_disks = {}
+        # Only for the block devices: the devices built on top of this one, and the ones this one is built on
+        self.a_holders = []
+        self.a_slaves = []
+
+
+class Topology:
+
+    TYPE_HOST = "host"
+    TYPE_EXPANDER = "expander"
+    TYPE_PORT = "port"
+    TYPE_DISK = "disk"
+    TYPE_PARTITION = "partition"
+    TYPE_DM = "dm"
+    TYPE_MD = "md"
+    TYPE_ZVOL = "zvol"
+
+    A_HOLDER_TYPES = [TYPE_DM, TYPE_MD, TYPE_ZVOL]
+
+    o_file = File()
+    s_sys_root = "/sys"
+
+    def __init__(self, o_file=File(), s_sys_root="/sys"):
+        self.o_file = o_file
+        self.s_sys_root = s_sys_root.rstrip("/")
+        self.d_nodes = {}
+        # Path of every NVMe subsystem as key and the names of its controller nodes as value
+        self.d_subsystem_controllers = {}
+
+    def build(self):
+        """
+        Reads the link of every entry of /sys/class/block, which is the path of the device under /sys/devices, and
+        the slaves of the dm and md devices. Walking the whole /sys/devices would visit thousands of entries that
+        are not storage; the paths of the block devices go through all the HBAs, expanders and ports that matter.
+        The holders are not read, as they are the inverse of the slaves.
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        self.d_nodes = {}
+        self.d_subsystem_controllers = {}
+
+        b_success, a_entries = self.o_file.scan_dir(self.s_sys_root + "/class/block")
+        if b_success is False:
+            return False
+
+        d_paths = {}
+        a_partitions = set()
+        for o_entry in a_entries:
+            b_success, s_target = self.o_file.read_link(o_entry.path)
+            if b_success is True:
+                d_paths[o_entry.name] = os.path.normpath(os.path.join("class/block", s_target)).split("/")
+                if self.o_file.path_exists(o_entry.path + "/partition") is True:
+                    a_partitions.add(o_entry.name)
+
+        # Disks before their partitions
+        for s_dev_name in sorted(d_paths.keys(), key=lambda s_key: (len(d_paths[s_key]), s_key)):
+            self.add_block_device(s_dev_name, d_paths[s_dev_name], s_dev_name in a_partitions)
+
+        for o_node in list(self.d_nodes.values()):
+            if o_node.s_type in [self.TYPE_DM, self.TYPE_MD]:
+                b_success, a_slaves = self.o_file.list_dir(self.s_sys_root + "/" + "/".join(d_paths[o_node.s_name]) +
+                                                           "/slaves")
+                for s_slave in sorted(a_slaves):
+                    self.add_holder(o_node.s_name, s_slave)
+
+        return True
+
+    def get_bus_node_type(self, s_component, s_previous_component):
+        if s_component.startswith("host") and s_component[4:].isdigit():
+            return self.TYPE_HOST
+        if s_previous_component == "nvme" and s_component.startswith("nvme") and s_component[4:].isdigit():
+            # The NVMe controller is the host of its namespaces
+            return self.TYPE_HOST
+        if s_component.startswith("expander-"):
+            return self.TYPE_EXPANDER
+        if s_component.startswith("port-"):
+            return self.TYPE_PORT
+        return ""
+
+    def get_holder_type(self, s_dev_name):
+        if s_dev_name.startswith("dm-"):
+            return self.TYPE_DM
+        if s_dev_name.startswith("md"):
+            return self.TYPE_MD
+        if s_dev_name.startswith("zd"):
+            return self.TYPE_ZVOL
+        return ""
+
+    def add_block_device(self, s_dev_name, a_components, b_partition):
+        if b_partition is True:
+            # The partitions are inside the directory of their disk, or of their holder, like md0p1. The ones of
+            # loop devices are not part of the topology.
+            o_parent = self.d_nodes.get(a_components[-2]) if len(a_components) > 1 else None
+            if o_parent is not None:
+                o_node = TopologyNode(s_dev_name, self.TYPE_PARTITION, o_parent)
+                o_parent.a_children.append(o_node)
+                self.d_nodes[s_dev_name] = o_node
+            return
+
+        if "nvme-subsystem" in a_components:
+            i_subsystem = a_components.index("nvme-subsystem")
+            a_controllers = self.get_subsystem_controllers(a_components[:i_subsystem + 2])
+            self.add_disk(s_dev_name, [self.d_nodes[s_controller] for s_controller in a_controllers])
+            return
+
+        if "virtual" in a_components:
+            s_type = self.get_holder_type(s_dev_name)
+            # Loop and ram devices are not part of the topology
+            if s_type != "":
+                self.d_nodes[s_dev_name] = TopologyNode(s_dev_name, s_type)
+            return
+
+        o_parent = self.add_bus_nodes(a_components[:-1])
+        self.add_disk(s_dev_name, [o_parent] if o_parent is not None else [])
+
+    def get_subsystem_controllers(self, a_subsystem_components):
+        """
+        The directory of an NVMe subsystem has a link to every controller, like nvme0 -> ../../../pci0000:00/.../nvme0
+        :param a_subsystem_components: The path of the subsystem, like ["devices", "virtual", "nvme-subsystem",
+                                       "nvme-subsys0"]
+        :return: The names of the controller nodes, added if they were not there
+        :rtype list
+        """
+        s_subsystem_path = "/".join(a_subsystem_components)
+        a_controllers = self.d_subsystem_controllers.get(s_subsystem_path)
+        if a_controllers is not None:
+            return a_controllers
+
+        a_controllers = []
+        b_success, a_names = self.o_file.list_dir(self.s_sys_root + "/" + s_subsystem_path)
+        for s_name in sorted(a_names):
+            if s_name.startswith("nvme") is False or s_name[4:].isdigit() is False:
+                continue
+            b_success, s_target = self.o_file.read_link(self.s_sys_root + "/" + s_subsystem_path + "/" + s_name)
+            if b_success is False:
+                continue
+            o_controller = self.add_bus_nodes(os.path.normpath(os.path.join(s_subsystem_path, s_target)).split("/"))
+            if o_controller is not None and o_controller.s_type == self.TYPE_HOST:
+                a_controllers.append(o_controller.s_name)
+
+        self.d_subsystem_controllers[s_subsystem_path] = a_controllers
+        return a_controllers
+
+    def add_bus_nodes(self, a_components):
+        """
+        Adds the HBAs, expanders and ports of a path under /sys/devices that are not there yet
+        :return: The deepest of them, or None if there is none
+        :rtype TopologyNode
+        """
+        o_parent = None
+        s_previous_component = ""
+        for s_component in a_components:
+            s_type = self.get_bus_node_type(s_component, s_previous_component)
+            s_previous_component = s_component
+            if s_type == "":
+                continue
+            o_bus_node = self.d_nodes.get(s_component)
+            if o_bus_node is None:
+                o_bus_node = TopologyNode(s_component, s_type, o_parent)
+                if o_parent is not None:
+                    o_parent.a_children.append(o_bus_node)
+                self.d_nodes[s_component] = o_bus_node
+            o_parent = o_bus_node
+
+        return o_parent
+
+    def add_disk(self, s_dev_name, a_parents):
+        """
+        :param a_parents: The nodes the disk is attached to. The first one is its parent, for get_path and
+                          get_ancestor, and the disk is below all of them for get_disks_below.
+        """
+        o_node = TopologyNode(s_dev_name, self.TYPE_DISK, a_parents[0] if len(a_parents) > 0 else None)
+        o_node.d_disks[s_dev_name] = None
+        self.d_nodes[s_dev_name] = o_node
+        for o_parent in a_parents:
+            o_parent.a_children.append(o_node)
+            while o_parent is not None:
+                if s_dev_name in o_parent.d_disks:
+                    # Reached through another path, so all the nodes above have it already
+                    break
+                o_parent.d_disks[s_dev_name] = None
+                o_parent = o_parent.o_parent
+
+    def add_holder(self, s_holder, s_slave):
+        o_holder_node = self.d_nodes.get(s_holder)
+        o_slave_node = self.d_nodes.get(s_slave)
+        if o_holder_node is None or o_slave_node is None:
+            return False
+        o_holder_node.a_slaves.append(s_slave)
+        o_slave_node.a_holders.append(s_holder)
+        return True
+
+    def get_node(self, s_name):
+        return self.d_nodes.get(s_name)
+
+    def get_nodes_of_type(self, s_type):
+        return [o_node for o_node in self.d_nodes.values() if o_node.s_type == s_type]
+
+    def get_disks_below(self, s_name):
+        """
+        :param s_name: A host, like host3, an expander, like expander-3:0, or a port
+        :return: The dev names of the disks behind it, in the order they were found
+        :rtype list
+        """
+        o_node = self.d_nodes.get(s_name)
+        if o_node is None:
+            return []
+        return list(o_node.d_disks)
+
+    def get_ancestor(self, s_dev_name, s_type):
+        """
+        :return: The name of the closest node of that type above the device, or "" if there is none
+        :rtype str
+        """
+        o_node = self.d_nodes.get(s_dev_name)
+        while o_node is not None:
+            o_node = o_node.o_parent
+            if o_node is not None and o_node.s_type == s_type:
+                return o_node.s_name
+        return ""
+
+    def get_path(self, s_dev_name):
+        """
+        :return: The names of the nodes from the host down to the device, like ["host3", "port-3:0", ...]
+        :rtype list
+        """
+        a_path = []
+        o_node = self.d_nodes.get(s_dev_name)
+        while o_node is not None:
+            a_path.insert(0, o_node.s_name)
+            o_node = o_node.o_parent
+        return a_path
+
+    def get_ioc(self, s_dev_name):
+        """
+        :return: The number of the host, like DriveUtils.parse_ioc_info, or "-" if the disk is not behind one
+        :rtype str
+        """
+        s_host = self.get_ancestor(s_dev_name, self.TYPE_HOST)
+        if s_host.startswith("host"):
+            return s_host[4:]
+        return "-"
+
+    def get_partitions(self, s_dev_name):
+        """
+        :param s_dev_name: A disk or a holder, like md0
+        :rtype list
+        """
+        o_node = self.d_nodes.get(s_dev_name)
+        if o_node is None:
+            return []
+        return [o_child.s_name for o_child in o_node.a_children if o_child.s_type == self.TYPE_PARTITION]
+
+    def get_holders(self, s_dev_name):
+        """
+        The dm, md and zvol devices using the device or any of its partitions, directly or through other holders,
+        like a dm-crypt on top of an md array.
+        :return: The names of the holders
+        :rtype list
+        """
+        o_node = self.d_nodes.get(s_dev_name)
+        if o_node is None:
+            return []
+
+        a_holders = []
+        a_pending = [o_node] + [o_child for o_child in o_node.a_children if o_child.s_type == self.TYPE_PARTITION]
+        while len(a_pending) > 0:
+            o_pending_node = a_pending.pop(0)
+            for s_holder in o_pending_node.a_holders:
+                if s_holder not in a_holders:
+                    a_holders.append(s_holder)
+                    a_pending.append(self.d_nodes[s_holder])
+
+        return a_holders
+
+    def get_disks_of_holder(self, s_holder):
+        """
+        :return: The dev names of the disks under a dm or md device, going through partitions and other holders
+        :rtype list
+        """
+        d_disks = {}
+        a_pending = [s_holder]
+        while len(a_pending) > 0:
+            o_node = self.d_nodes.get(a_pending.pop(0))
+            if o_node is None:
+                continue
+            if o_node.s_type == self.TYPE_DISK:
+                d_disks[o_node.s_name] = None
+            elif o_node.s_type == self.TYPE_PARTITION:
+                a_pending.append(o_node.o_parent.s_name)
+            else:
+                a_pending.extend(o_node.a_slaves)
+
+        return list(d_disks)
+
+    def group_disks_by(self, s_type):
+        """
+        :param s_type: TYPE_HOST, TYPE_EXPANDER or TYPE_PORT
+        :return: Dict with the name of every node of that type as key and the dev names of its disks as value
+        :rtype dict
+        """
+        d_groups = {}
+        for o_node in self.d_nodes.values():
+            if o_node.s_type == s_type:
+                d_groups[o_node.s_name] = list(o_node.d_disks)
+        return d_groups
+
+    def get_metrics_by(self, s_type, d_metrics):
+        """
+        Adds up the throughput of the disks behind every host, expander or port, so a saturated path stands out
+        :param s_type: TYPE_HOST, TYPE_EXPANDER or TYPE_PORT
+        :param d_metrics: The metrics of the disks, as returned by DiskStatsSampler.sample
+        :type d_metrics: dict
+        :return: Dict with the name of the node as key and a dict with disks, iops, read_mb_s, write_mb_s and the
+                 highest util_percent and await_ms of its disks
+        :rtype dict
+        """
+        d_groups = {}
+        for s_name, a_disks in self.group_disks_by(s_type).items():
+            d_group = {"disks": 0, "iops": 0.0, "read_mb_s": 0.0, "write_mb_s": 0.0, "util_percent": 0.0,
+                       "await_ms": 0.0}
+            for s_dev_name in a_disks:
+                d_disk_metrics = d_metrics.get(s_dev_name)
+                if d_disk_metrics is None:
+                    continue
+                d_group["disks"] = d_group["disks"] + 1
+                for s_key in ["iops", "read_mb_s", "write_mb_s"]:
+                    d_group[s_key] = d_group[s_key] + d_disk_metrics[s_key]
+                for s_key in ["util_percent", "await_ms"]:
+                    d_group[s_key] = max(d_group[s_key], d_disk_metrics[s_key])
+            d_groups[s_name] = d_group
+
+        return d_groups
+
+    def format_metrics(self, s_name, d_group):
+        return s_name + " Disks: " + str(d_group["disks"]) + " IOPS: " + "%.1f" % d_group["iops"] + \
+               " MB/s read/write: " + "%.2f" % d_group["read_mb_s"] + "/" + "%.2f" % d_group["write_mb_s"] + \
+               " Max await: " + "%.2f" % d_group["await_ms"] + "ms" + \
+               " Max util: " + "%.1f" % d_group["util_percent"] + "%"
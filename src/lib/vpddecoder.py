@@ -0,0 +1,207 @@
+#
+# VpdDecoder Classes
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Decoder of the SCSI Vital Product Data pages exposed in sysfs as device/vpd_pg*: Supported VPD Pages
+#              (0x00), Unit Serial Number (0x80), Device Identification (0x83) and Block Device Characteristics (0xB1).
+#              The headers and descriptors are parsed with struct over a memoryview of the page, so there is no loop
+#              over the bytes in Python and no copy until the values are extracted.
+#
+
+import struct
+
+
+class VpdIdentity:
+    """
+    What the VPD pages of a drive say about it
+    """
+
+    # Values of i_rotation_rate that are not speeds
+    I_ROTATION_NOT_REPORTED = 0
+    I_ROTATION_NON_ROTATING = 1
+
+    __slots__ = ["a_supported_pages", "s_serial", "s_wwn", "s_eui", "s_t10_vendor_id", "s_scsi_name",
+                 "i_rotation_rate", "s_form_factor"]
+
+    def __init__(self):
+        self.a_supported_pages = []
+        self.s_serial = ""
+        # NAA designator of the logical unit, formatted like the by-id wwn- links: 0x5000c500a1b2c3d4
+        self.s_wwn = ""
+        self.s_eui = ""
+        self.s_t10_vendor_id = ""
+        self.s_scsi_name = ""
+        self.i_rotation_rate = VpdIdentity.I_ROTATION_NOT_REPORTED
+        self.s_form_factor = ""
+
+    def is_solid_state(self):
+        """
+        :return: True or False if page 0xB1 reported the rotation rate, None if not
+        """
+        if self.i_rotation_rate == VpdIdentity.I_ROTATION_NOT_REPORTED:
+            return None
+        return self.i_rotation_rate == VpdIdentity.I_ROTATION_NON_ROTATING
+
+
+class VpdDecoder:
+
+    PAGE_SUPPORTED_PAGES = 0x00
+    PAGE_UNIT_SERIAL_NUMBER = 0x80
+    PAGE_DEVICE_IDENTIFICATION = 0x83
+    PAGE_BLOCK_DEVICE_CHARACTERISTICS = 0xB1
+
+    # Names of the pages in /sys/class/block/<dev>/device/
+    D_PAGE_FILES = {PAGE_SUPPORTED_PAGES: "vpd_pg0",
+                    PAGE_UNIT_SERIAL_NUMBER: "vpd_pg80",
+                    PAGE_DEVICE_IDENTIFICATION: "vpd_pg83",
+                    PAGE_BLOCK_DEVICE_CHARACTERISTICS: "vpd_pgb1"}
+
+    # Peripheral qualifier and device type, page code and page length
+    S_HEADER_FORMAT = ">BBH"
+    I_HEADER_SIZE = struct.calcsize(S_HEADER_FORMAT)
+    # Protocol identifier and code set, PIV association and designator type, reserved and designator length
+    S_DESIGNATOR_FORMAT = ">BBBB"
+    I_DESIGNATOR_HEADER_SIZE = struct.calcsize(S_DESIGNATOR_FORMAT)
+
+    CODE_SET_BINARY = 1
+    CODE_SET_ASCII = 2
+    CODE_SET_UTF8 = 3
+
+    ASSOCIATION_LOGICAL_UNIT = 0
+
+    DESIGNATOR_T10_VENDOR_ID = 1
+    DESIGNATOR_EUI64 = 2
+    DESIGNATOR_NAA = 3
+    DESIGNATOR_SCSI_NAME = 8
+
+    D_FORM_FACTORS = {1: "5.25", 2: "3.5", 3: "2.5", 4: "1.8", 5: "less than 1.8"}
+
+    def get_page(self, a_data, i_page_code):
+        """
+        Validates the header of a page and returns its payload, without copying it
+        :param a_data: The page as read from sysfs
+        :type a_data: bytes
+        :param i_page_code: The page expected
+        :type i_page_code: int
+        :return: A boolean indicating if it is a valid page, A memoryview of the payload
+        :rtype boolean, memoryview
+        """
+        o_view = memoryview(a_data)
+        if len(o_view) < self.I_HEADER_SIZE:
+            return False, o_view[0:0]
+
+        i_peripheral, i_code, i_length = struct.unpack_from(self.S_HEADER_FORMAT, o_view)
+        if i_code != i_page_code:
+            return False, o_view[0:0]
+
+        # A page truncated by the kernel is decoded as far as it goes
+        return True, o_view[self.I_HEADER_SIZE:self.I_HEADER_SIZE + i_length]
+
+    def decode_text(self, o_view):
+        return bytes(o_view).decode("ascii", "replace").strip(" \0")
+
+    def decode_supported_pages(self, a_data):
+        """
+        :return: A boolean indicating success, The list of page codes
+        :rtype boolean, list
+        """
+        b_success, o_payload = self.get_page(a_data, self.PAGE_SUPPORTED_PAGES)
+        return b_success, list(o_payload)
+
+    def decode_serial(self, a_data):
+        """
+        :return: A boolean indicating success, The serial number, without the padding
+        :rtype boolean, str
+        """
+        b_success, o_payload = self.get_page(a_data, self.PAGE_UNIT_SERIAL_NUMBER)
+        return b_success, self.decode_text(o_payload)
+
+    def decode_device_identification(self, a_data, o_identity):
+        """
+        Fills the designators of the logical unit. The ones of the target ports are skipped.
+        :type o_identity: VpdIdentity
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        b_success, o_payload = self.get_page(a_data, self.PAGE_DEVICE_IDENTIFICATION)
+        i_offset = 0
+        while i_offset + self.I_DESIGNATOR_HEADER_SIZE <= len(o_payload):
+            i_code_set, i_type, i_reserved, i_length = struct.unpack_from(self.S_DESIGNATOR_FORMAT, o_payload,
+                                                                          i_offset)
+            i_offset = i_offset + self.I_DESIGNATOR_HEADER_SIZE
+            o_designator = o_payload[i_offset:i_offset + i_length]
+            i_offset = i_offset + i_length
+
+            if (i_type >> 4) & 0x03 != self.ASSOCIATION_LOGICAL_UNIT:
+                continue
+            i_code_set = i_code_set & 0x0F
+            i_type = i_type & 0x0F
+            if i_type == self.DESIGNATOR_NAA and i_code_set == self.CODE_SET_BINARY and o_identity.s_wwn == "":
+                o_identity.s_wwn = "0x" + o_designator.hex()
+            elif i_type == self.DESIGNATOR_EUI64 and i_code_set == self.CODE_SET_BINARY and o_identity.s_eui == "":
+                o_identity.s_eui = o_designator.hex()
+            elif i_type == self.DESIGNATOR_T10_VENDOR_ID and o_identity.s_t10_vendor_id == "":
+                o_identity.s_t10_vendor_id = " ".join(self.decode_text(o_designator).split())
+            elif i_type == self.DESIGNATOR_SCSI_NAME and o_identity.s_scsi_name == "":
+                o_identity.s_scsi_name = self.decode_text(o_designator)
+
+        return b_success
+
+    def decode_block_device_characteristics(self, a_data, o_identity):
+        """
+        Fills the rotation rate and the nominal form factor
+        :type o_identity: VpdIdentity
+        :return: A boolean indicating success
+        :rtype boolean
+        """
+        b_success, o_payload = self.get_page(a_data, self.PAGE_BLOCK_DEVICE_CHARACTERISTICS)
+        if b_success is False or len(o_payload) < 4:
+            return False
+
+        i_rotation_rate, i_product_type, i_form_factor = struct.unpack_from(">HBB", o_payload)
+        o_identity.i_rotation_rate = i_rotation_rate
+        o_identity.s_form_factor = self.D_FORM_FACTORS.get(i_form_factor & 0x0F, "")
+
+        return True
+
+    def decode(self, d_pages):
+        """
+        Decodes the pages of a drive into its identity, in a single pass
+        :param d_pages: Dict with the page code as key and the content as value. The missing pages are skipped
+        :type d_pages: dict
+        :return: The identity
+        :rtype VpdIdentity
+        """
+        o_identity = VpdIdentity()
+
+        a_data = d_pages.get(self.PAGE_SUPPORTED_PAGES)
+        if a_data is not None:
+            b_success, o_identity.a_supported_pages = self.decode_supported_pages(a_data)
+
+        a_data = d_pages.get(self.PAGE_UNIT_SERIAL_NUMBER)
+        if a_data is not None:
+            b_success, o_identity.s_serial = self.decode_serial(a_data)
+
+        a_data = d_pages.get(self.PAGE_DEVICE_IDENTIFICATION)
+        if a_data is not None:
+            self.decode_device_identification(a_data, o_identity)
+
+        a_data = d_pages.get(self.PAGE_BLOCK_DEVICE_CHARACTERISTICS)
+        if a_data is not None:
+            self.decode_block_device_characteristics(a_data, o_identity)
+
+        return o_identity
+
+    def decode_many(self, d_pages_by_dev_name):
+        """
+        :param d_pages_by_dev_name: Dict with the dev name as key and the pages, like for decode, as value
+        :type d_pages_by_dev_name: dict
+        :return: Dict with the dev name as key and the VpdIdentity as value
+        :rtype dict
+        """
+        d_identities = {}
+        for s_dev_name, d_pages in d_pages_by_dev_name.items():
+            d_identities[s_dev_name] = self.decode(d_pages)
+
+        return d_identities
@@ -0,0 +1,208 @@
+#
+# WriteBenchmark Class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+# Description: Write throughput, write latency and fsync latency benchmark. It only writes to a scratch file that it
+#              creates itself in a directory and deletes at the end, so it is safe on any file system, tmpfs included.
+#
+
+import os
+import random
+import tempfile
+import time
+
+from .file import File
+from .latencyhistogram import LatencyHistogram
+from .readbenchmark import AlignedBuffer
+
+
+class WriteBenchmark:
+
+    PATTERN_SEQUENTIAL = "sequential"
+    PATTERN_RANDOM = "random"
+    PATTERN_APPEND = "append"
+
+    # Page cache, then fsync at the end
+    MODE_BUFFERED = "buffered"
+    # Bypassing the page cache, then fsync at the end for the metadata
+    MODE_DIRECT = "direct"
+    # Every write waits for the data to be on the disk
+    MODE_DSYNC = "dsync"
+    # Page cache with a fsync every i_fsync_every writes, like a group commit
+    MODE_FSYNC = "fsync"
+
+    A_PATTERNS = [PATTERN_SEQUENTIAL, PATTERN_RANDOM, PATTERN_APPEND]
+    A_MODES = [MODE_BUFFERED, MODE_DIRECT, MODE_DSYNC, MODE_FSYNC]
+    A_PERCENTILES = [50, 90, 99, 99.9]
+
+    o_file = File()
+
+    def __init__(self, s_scratch_dir="", o_file=File()):
+        """
+        :param s_scratch_dir: Directory where the scratch file is created. By default the temporary directory
+        :param o_file: The File dependency
+        """
+        self.s_scratch_dir = s_scratch_dir if s_scratch_dir != "" else tempfile.gettempdir()
+        self.o_file = o_file
+        self.o_write_histogram = LatencyHistogram()
+        self.o_fsync_histogram = LatencyHistogram()
+
+    def get_open_flags(self, s_mode):
+        if s_mode == self.MODE_DIRECT:
+            return getattr(os, "O_DIRECT", 0)
+        if s_mode == self.MODE_DSYNC:
+            return getattr(os, "O_DSYNC", 0)
+        return 0
+
+    def create_scratch_file(self):
+        """
+        Creates a new file with an unique name, so an existing file is never overwritten
+        :return: The path, or "" if it could not be created
+        :rtype str
+        """
+        try:
+            i_fd, s_scratch_file = tempfile.mkstemp(prefix="disksio-write-", suffix=".tmp", dir=self.s_scratch_dir)
+        except OSError:
+            return ""
+        self.o_file.close_fd(i_fd)
+
+        return s_scratch_file
+
+    def run(self, s_pattern="sequential", s_mode="buffered", i_block_size=4096, i_file_size=67108864,
+            f_duration=10.0, i_max_writes=0, i_fsync_every=16):
+        """
+        Writes blocks to the scratch file during f_duration seconds, or until i_max_writes writes are done.
+        The sequential and append patterns start again from the beginning when they reach i_file_size, the append
+        one truncating the file, so the disk space used never goes over i_file_size.
+        :param s_pattern: One of A_PATTERNS
+        :type s_pattern: str
+        :param s_mode: One of A_MODES
+        :type s_mode: str
+        :param i_block_size: Bytes per write. Rounded up to 4096 in the direct mode
+        :type i_block_size: int
+        :param i_file_size: Maximum size of the scratch file
+        :type i_file_size: int
+        :param f_duration: Maximum seconds to run. 0 for no limit
+        :type f_duration: float
+        :param i_max_writes: Maximum number of writes. 0 for no limit
+        :type i_max_writes: int
+        :param i_fsync_every: In the fsync mode, writes between every fsync
+        :type i_fsync_every: int
+        :return: A boolean indicating success. A dict with the results, or with the error
+        :rtype bool, dict
+        """
+        if s_pattern not in self.A_PATTERNS:
+            return False, {"error": "Unknown pattern " + s_pattern}
+        if s_mode not in self.A_MODES:
+            return False, {"error": "Unknown mode " + s_mode}
+        if f_duration <= 0 and i_max_writes <= 0:
+            return False, {"error": "A duration or a maximum number of writes is required"}
+
+        if s_mode == self.MODE_DIRECT:
+            i_block_size = max(i_block_size + (-i_block_size % 4096), 4096)
+        i_blocks = i_file_size // i_block_size
+        if i_blocks == 0:
+            return False, {"error": "The file size is smaller than one write of " + str(i_block_size) + " bytes"}
+
+        s_scratch_file = self.create_scratch_file()
+        if s_scratch_file == "":
+            return False, {"error": "Can not create a scratch file in " + self.s_scratch_dir}
+
+        s_mode_in_use = s_mode
+        b_success, i_fd = self.o_file.open_for_write(s_scratch_file, self.get_open_flags(s_mode))
+        if b_success is False and s_mode == self.MODE_DIRECT:
+            # File systems like tmpfs do not support O_DIRECT
+            s_mode_in_use = self.MODE_BUFFERED
+            b_success, i_fd = self.o_file.open_for_write(s_scratch_file)
+        if b_success is False:
+            self.o_file.delete(s_scratch_file)
+            return False, {"error": "Can not open " + s_scratch_file}
+
+        o_buffer = AlignedBuffer(i_block_size, 4096)
+        # Random data, so compressing or deduplicating file systems do not make the writes look faster
+        o_buffer.o_view[:] = os.urandom(i_block_size)
+        self.o_write_histogram = LatencyHistogram()
+        self.o_fsync_histogram = LatencyHistogram()
+        o_random = random.Random(0)
+        i_writes = 0
+        i_errors = 0
+        i_next_block = 0
+
+        try:
+            f_start = time.perf_counter()
+            f_deadline = f_start + f_duration if f_duration > 0 else 0
+            while i_max_writes <= 0 or i_writes + i_errors < i_max_writes:
+                if s_pattern == self.PATTERN_RANDOM:
+                    i_block = o_random.randrange(i_blocks)
+                else:
+                    i_block = i_next_block
+                    i_next_block = (i_next_block + 1) % i_blocks
+                    if i_block == 0 and s_pattern == self.PATTERN_APPEND and i_writes > 0:
+                        os.ftruncate(i_fd, 0)
+
+                f_write_start = time.perf_counter()
+                b_success, i_written = self.o_file.pwrite(i_fd, o_buffer.o_view, i_block * i_block_size)
+                f_write_end = time.perf_counter()
+                if b_success is False:
+                    i_errors = i_errors + 1
+                else:
+                    self.o_write_histogram.record_seconds(f_write_end - f_write_start)
+                    i_writes = i_writes + 1
+                    if s_mode_in_use == self.MODE_FSYNC and i_writes % max(i_fsync_every, 1) == 0:
+                        self.timed_fsync(i_fd)
+
+                if f_deadline > 0 and f_write_end >= f_deadline:
+                    break
+
+            # The data is only durable after the last fsync, so it is part of the time
+            f_final_fsync_ms = self.timed_fsync(i_fd) * 1000
+            f_elapsed = time.perf_counter() - f_start
+        finally:
+            o_buffer.close()
+            self.o_file.close_fd(i_fd)
+            self.o_file.delete(s_scratch_file)
+
+        i_bytes = i_writes * i_block_size
+        d_results = {"scratch_dir": self.s_scratch_dir,
+                     "pattern": s_pattern,
+                     "mode": s_mode_in_use,
+                     "block_size": i_block_size,
+                     "writes": i_writes,
+                     "errors": i_errors,
+                     "bytes": i_bytes,
+                     "seconds": f_elapsed,
+                     "mb_s": i_bytes / f_elapsed / 1000000 if f_elapsed > 0 else 0.0,
+                     "iops": i_writes / f_elapsed if f_elapsed > 0 else 0.0,
+                     "fsyncs": self.o_fsync_histogram.i_count,
+                     "final_fsync_ms": f_final_fsync_ms}
+        for f_percentile in self.A_PERCENTILES:
+            s_percentile = "%g" % f_percentile
+            d_results["write_p" + s_percentile + "_ms"] = self.o_write_histogram.get_percentile_ms(f_percentile)
+            d_results["fsync_p" + s_percentile + "_ms"] = self.o_fsync_histogram.get_percentile_ms(f_percentile)
+        d_results["write_max_ms"] = self.o_write_histogram.i_max / 1000.0
+        d_results["fsync_max_ms"] = self.o_fsync_histogram.i_max / 1000.0
+
+        return True, d_results
+
+    def timed_fsync(self, i_fd):
+        """
+        :return: The seconds the fsync took
+        :rtype float
+        """
+        f_start = time.perf_counter()
+        self.o_file.fsync(i_fd)
+        f_elapsed = time.perf_counter() - f_start
+        self.o_fsync_histogram.record_seconds(f_elapsed)
+
+        return f_elapsed
+
+    def format_results(self, d_results):
+        return "Pattern: " + d_results["pattern"] + " Mode: " + d_results["mode"] + \
+               " Block size: " + str(d_results["block_size"]) + \
+               " MB/s: " + "%.2f" % d_results["mb_s"] + " IOPS: " + "%.0f" % d_results["iops"] + \
+               " Write ms p50/p99/max: " + "%.3f" % d_results["write_p50_ms"] + "/" + \
+               "%.3f" % d_results["write_p99_ms"] + "/" + "%.3f" % d_results["write_max_ms"] + \
+               " Fsyncs: " + str(d_results["fsyncs"]) + \
+               " Fsync ms p50/p99/max: " + "%.3f" % d_results["fsync_p50_ms"] + "/" + \
+               "%.3f" % d_results["fsync_p99_ms"] + "/" + "%.3f" % d_results["fsync_max_ms"]
@@ -0,0 +1,177 @@
+#
+# scanbenchmark
+# Author: Carles Mateo
+# Description: Scaling benchmark of the disk inventory engines against synthetic sysfs trees.
+#              Measures wall time, file system calls and peak memory for every size and writes them as JSON, so
+#              the results of two releases can be compared.
+#
+# Usage: python3 scanbenchmark.py --sizes 10,100,1000,10000 --output bench.json
+
+import argparse
+import builtins
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from lib.driveutils import DriveUtils
+from lib.fakesysfs import FakeSysfs
+from lib.file import File
+
+
+class CallCounter:
+    """
+    Counts the file system calls done through the os module and the builtin open while it is active.
+    Python resolves os.path.isfile, os.path.realpath... through these functions, so they are counted too.
+    """
+
+    A_OS_FUNCTIONS = ["open", "read", "preadv", "close", "stat", "lstat", "listdir", "scandir", "readlink"]
+
+    def __init__(self):
+        self.d_counts = {}
+        self.d_originals = {}
+        self.fn_open = None
+
+    def wrap(self, s_name, fn_original):
+        def fn_counted(*args, **kwargs):
+            self.d_counts[s_name] = self.d_counts.get(s_name, 0) + 1
+            return fn_original(*args, **kwargs)
+        return fn_counted
+
+    def __enter__(self):
+        for s_function in self.A_OS_FUNCTIONS:
+            self.d_originals[s_function] = getattr(os, s_function)
+            setattr(os, s_function, self.wrap("os." + s_function, self.d_originals[s_function]))
+        self.fn_open = builtins.open
+        builtins.open = self.wrap("open", self.fn_open)
+        return self
+
+    def __exit__(self, o_type, o_value, o_traceback):
+        for s_function, fn_original in self.d_originals.items():
+            setattr(os, s_function, fn_original)
+        builtins.open = self.fn_open
+        return False
+
+    def get_total(self):
+        return sum(self.d_counts.values())
+
+
+def get_read_syscalls():
+    """
+    Returns the read syscalls done by this process, from /proc/self/io, or None if not available
+    """
+    b_success, s_io = File().read("/proc/self/io")
+    if b_success is False:
+        return None
+    for s_line in s_io.split("\n"):
+        if s_line.startswith("syscr:"):
+            return int(s_line.split()[1])
+    return None
+
+
+def get_engines(o_fake_sysfs):
+    """
+    :return: A dict with the name of the engine and a function doing a full scan
+    """
+    def get_drive_utils():
+        return DriveUtils(File(), o_fake_sysfs.s_sys_root, o_fake_sysfs.s_dev_root, o_fake_sysfs.s_proc_root)
+
+    return {"get_all_disks": lambda: get_drive_utils().get_all_disks(),
+            "get_all_disks_concurrent": lambda: get_drive_utils().get_all_disks(i_max_workers=8)}
+
+
+def measure(fn_scan, i_repeats):
+    """
+    Runs the scan once to warm the caches, i_repeats times to get the time, and once more for the calls and once
+    for the memory, so the instrumentation does not affect the timing.
+    :return: A dict with the results
+    """
+    fn_scan()
+
+    a_times = []
+    i_disks = 0
+    for i_repeat in range(i_repeats):
+        f_start = time.perf_counter()
+        i_error_code, o_disks = fn_scan()
+        a_times.append(time.perf_counter() - f_start)
+        i_disks = len(o_disks)
+    a_times.sort()
+
+    i_read_syscalls_start = get_read_syscalls()
+    with CallCounter() as o_call_counter:
+        fn_scan()
+    i_read_syscalls_end = get_read_syscalls()
+    i_read_syscalls = None
+    if i_read_syscalls_start is not None and i_read_syscalls_end is not None:
+        i_read_syscalls = i_read_syscalls_end - i_read_syscalls_start
+
+    tracemalloc.start()
+    fn_scan()
+    i_current_memory, i_peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"disks_found": i_disks,
+            "wall_time_best_s": a_times[0],
+            "wall_time_median_s": a_times[len(a_times) // 2],
+            "fs_calls": o_call_counter.get_total(),
+            "fs_calls_by_function": o_call_counter.d_counts,
+            "read_syscalls": i_read_syscalls,
+            "peak_memory_bytes": i_peak_memory}
+
+
+def main():
+    o_parser = argparse.ArgumentParser(description="Scaling benchmark of the disk inventory on synthetic sysfs trees")
+    o_parser.add_argument("--sizes", default="10,100,1000", help="Comma separated numbers of disks")
+    o_parser.add_argument("--repeats", type=int, default=3, help="Timed runs per engine and size")
+    o_parser.add_argument("--engines", default="", help="Comma separated engines to run. By default all")
+    o_parser.add_argument("--output", default="", help="File to write the JSON results to. By default stdout")
+    o_args = o_parser.parse_args()
+
+    a_results = []
+    for s_size in o_args.sizes.split(","):
+        i_size = int(s_size)
+        s_root = tempfile.mkdtemp(prefix="disksio-bench-")
+        try:
+            o_fake_sysfs = FakeSysfs(s_root)
+            # One NVMe for every 10 disks
+            if o_fake_sysfs.create(i_size - i_size // 10, i_nvme_disks=i_size // 10) is False:
+                print("Error creating the synthetic tree in " + s_root, file=sys.stderr)
+                return 1
+
+            for s_engine, fn_scan in get_engines(o_fake_sysfs).items():
+                if o_args.engines != "" and s_engine not in o_args.engines.split(","):
+                    continue
+                d_result = measure(fn_scan, o_args.repeats)
+                d_result["engine"] = s_engine
+                d_result["disks"] = i_size
+                a_results.append(d_result)
+                print("Engine: " + s_engine + " Disks: " + str(i_size) +
+                      " Time: " + "%.4f" % d_result["wall_time_best_s"] + "s" +
+                      " FS calls: " + str(d_result["fs_calls"]) +
+                      " Peak memory: " + str(d_result["peak_memory_bytes"]), file=sys.stderr)
+        finally:
+            shutil.rmtree(s_root, ignore_errors=True)
+
+    d_report = {"benchmark": "disk_inventory_scaling",
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": a_results}
+    s_report = json.dumps(d_report, indent=2, sort_keys=True)
+
+    if o_args.output == "":
+        print(s_report)
+    elif File().write(o_args.output, s_report + "\n") is False:
+        print("Error writing " + o_args.output, file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    # execute only if run as a script
+    sys.exit(main())
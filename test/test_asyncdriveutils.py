@@ -0,0 +1,194 @@
+#
+# Tests for AsyncDriveUtils class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import asyncio
+import contextlib
+import pytest
+import threading
+import time
+from ..src.lib.file import File
+from ..src.lib.fakesysfs import FakeSysfs
+from ..src.lib.driveutils import DriveUtils
+from ..src.lib.asyncfile import AsyncFile
+from ..src.lib.asyncdriveutils import AsyncDriveUtils
+
+
+class TrackingDriveUtils(DriveUtils):
+    """
+    DriveUtils that records the probes running at the same time. The probes of the disks in a_blocked_disks wait
+    for o_release.
+    """
+
+    def __init__(self, o_file, s_sys_root, s_dev_root, s_proc_root, a_blocked_disks=None, f_delay=0.0):
+        DriveUtils.__init__(self, o_file, s_sys_root, s_dev_root, s_proc_root)
+        self.a_blocked_disks = a_blocked_disks or []
+        self.f_delay = f_delay
+        self.o_release = threading.Event()
+        self.o_lock = threading.Lock()
+        self.d_running = {}
+        self.d_max_running = {}
+        self.i_running = 0
+        self.i_max_running = 0
+        self.a_started = []
+
+    def get_disk_info(self, disk, b_cmdline=False):
+        s_dev_name = disk.s_dev_name
+        with self.o_lock:
+            self.a_started.append(s_dev_name)
+            self.i_running = self.i_running + 1
+            self.i_max_running = max(self.i_max_running, self.i_running)
+            self.d_running[s_dev_name] = self.d_running.get(s_dev_name, 0) + 1
+            self.d_max_running[s_dev_name] = max(self.d_max_running.get(s_dev_name, 0), self.d_running[s_dev_name])
+        try:
+            if s_dev_name in self.a_blocked_disks:
+                self.o_release.wait(10)
+            time.sleep(self.f_delay)
+            return DriveUtils.get_disk_info(self, disk, b_cmdline)
+        finally:
+            with self.o_lock:
+                self.i_running = self.i_running - 1
+                self.d_running[s_dev_name] = self.d_running[s_dev_name] - 1
+
+
+class TestAsyncDriveUtils(object):
+
+    def create_driveutils(self, s_root, i_disks=6, a_blocked_disks=None, f_delay=0.0):
+        o_fake_sysfs = FakeSysfs(s_root)
+        assert o_fake_sysfs.create(i_disks) is True
+        return TrackingDriveUtils(File(), o_fake_sysfs.s_sys_root, o_fake_sysfs.s_dev_root, o_fake_sysfs.s_proc_root,
+                                  a_blocked_disks, f_delay)
+
+    # Start Tests
+    def test_get_all_disks_like_sync(self, tmp_path):
+        o_driveutils = self.create_driveutils(str(tmp_path))
+        i_sync_error_code, sync_disks = o_driveutils.get_all_disks()
+
+        async def scan():
+            async with AsyncDriveUtils(o_driveutils, AsyncFile(o_driveutils.o_file, 4)) as o_async_driveutils:
+                return await o_async_driveutils.get_all_disks()
+
+        i_error_code, all_disks = asyncio.run(scan())
+
+        assert i_error_code == i_sync_error_code == 0
+        assert [o_disk.s_dev_name for o_disk in all_disks] == [o_disk.s_dev_name for o_disk in sync_disks]
+        for o_disk in all_disks:
+            o_sync_disk = sync_disks.get_by_dev_name(o_disk.s_dev_name)
+            assert (o_disk.s_serial, o_disk.ioc, o_disk.i_byte_size, o_disk.suspect) == \
+                   (o_sync_disk.s_serial, o_sync_disk.ioc, o_sync_disk.i_byte_size, o_sync_disk.suspect)
+            assert sorted(all_disks.get_aliases(o_disk.s_dev_name)) == \
+                   sorted(sync_disks.get_aliases(o_disk.s_dev_name))
+
+    def test_blocked_disk_does_not_block_the_loop(self, tmp_path):
+        o_driveutils = self.create_driveutils(str(tmp_path), a_blocked_disks=["sdb"])
+        o_async_driveutils = AsyncDriveUtils(o_driveutils, AsyncFile(o_driveutils.o_file, 4), f_timeout=0.5)
+
+        async def scan():
+            a_ticks = []
+
+            async def tick():
+                while True:
+                    a_ticks.append(time.monotonic())
+                    await asyncio.sleep(0.02)
+
+            o_ticker = asyncio.ensure_future(tick())
+            a_disks = [o_disk async for o_disk in o_async_driveutils.scan()]
+            # The device is still blocked, so a new probe times out waiting for it instead of using another thread
+            o_disk = await o_async_driveutils.probe_disk(a_disks[-1])
+            o_ticker.cancel()
+            return a_disks, o_disk, a_ticks
+
+        try:
+            a_disks, o_disk, a_ticks = asyncio.run(scan())
+        finally:
+            o_driveutils.o_release.set()
+            o_async_driveutils.close()
+
+        assert [o_disk.s_dev_name for o_disk in a_disks][-1] == "sdb"
+        assert a_disks[-1].b_timed_out is True
+        assert a_disks[-1].suspect is True
+        assert len([o_disk for o_disk in a_disks if o_disk.suspect is True]) == 1
+        assert o_disk.b_timed_out is True
+        assert o_driveutils.a_started.count("sdb") == 1
+        assert len(a_ticks) > 20
+        assert max([f_next - f_tick for f_tick, f_next in zip(a_ticks, a_ticks[1:])]) < 0.2
+
+    def test_concurrency_caps(self, tmp_path):
+        o_driveutils = self.create_driveutils(str(tmp_path), i_disks=8, f_delay=0.05)
+
+        async def scan_twice():
+            async with AsyncDriveUtils(o_driveutils, AsyncFile(o_driveutils.o_file, 3)) as o_async_driveutils:
+                return await asyncio.gather(o_async_driveutils.get_all_disks(),
+                                            o_async_driveutils.get_all_disks())
+
+        a_results = asyncio.run(scan_twice())
+
+        assert [len(all_disks) for i_error_code, all_disks in a_results] == [8, 8]
+        assert len(o_driveutils.a_started) == 16
+        assert o_driveutils.i_max_running == 3
+        assert max(o_driveutils.d_max_running.values()) == 1
+
+    def test_cancellation(self, tmp_path):
+        o_driveutils = self.create_driveutils(str(tmp_path), i_disks=12, f_delay=0.1)
+
+        async def scan_one():
+            async with AsyncDriveUtils(o_driveutils, AsyncFile(o_driveutils.o_file, 2)) as o_async_driveutils:
+                async with contextlib.aclosing(o_async_driveutils.scan()) as o_scan:
+                    async for o_disk in o_scan:
+                        break
+                await asyncio.sleep(0.3)
+                return o_disk
+
+        o_disk = asyncio.run(scan_one())
+
+        assert o_disk.suspect is False
+        # Only the 2 probes running when the first disk finished, and the ones that took their threads before the
+        # scan was closed, finish
+        assert len(o_driveutils.a_started) <= 4
+
+    def test_blocked_disks_do_not_take_the_threads(self, tmp_path):
+        o_driveutils = self.create_driveutils(str(tmp_path), a_blocked_disks=["sda", "sdb"])
+
+        async def scan():
+            async with AsyncDriveUtils(o_driveutils, AsyncFile(o_driveutils.o_file, 2),
+                                       f_timeout=0.3) as o_async_driveutils:
+                return await o_async_driveutils.get_all_disks()
+
+        f_start = time.monotonic()
+        try:
+            i_error_code, all_disks = asyncio.run(scan())
+        finally:
+            o_driveutils.o_release.set()
+        f_elapsed = time.monotonic() - f_start
+
+        assert f_elapsed < 5
+        assert len(all_disks) == 6
+        assert sorted([o_disk.s_dev_name for o_disk in all_disks if o_disk.b_timed_out is True]) == ["sda", "sdb"]
+        assert len([o_disk for o_disk in all_disks if o_disk.suspect is True]) == 2
+
+    def test_discovery_timeout(self, tmp_path):
+        o_driveutils = self.create_driveutils(str(tmp_path))
+        o_release = threading.Event()
+        fn_get_major_minors = o_driveutils.get_major_minors
+
+        def get_major_minors():
+            o_release.wait(10)
+            return fn_get_major_minors()
+
+        o_driveutils.get_major_minors = get_major_minors
+
+        async def scan():
+            async with AsyncDriveUtils(o_driveutils, AsyncFile(o_driveutils.o_file, 2),
+                                       f_discovery_timeout=0.2) as o_async_driveutils:
+                return await o_async_driveutils.get_all_disks()
+
+        try:
+            i_error_code, all_disks = asyncio.run(scan())
+        finally:
+            o_release.set()
+
+        assert i_error_code == 1
+        assert len(all_disks) == 0
@@ -0,0 +1,99 @@
+#
+# Tests for AsyncFile class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import asyncio
+import pytest
+import threading
+from ..src.lib.file import File
+from ..src.lib.asyncfile import AsyncFile, BoundedExecutor
+
+
+class TestAsyncFile(object):
+
+    # Start Tests
+    def test_reads(self, tmp_path):
+        s_dir = str(tmp_path)
+        File().write(s_dir + "/size", "7814037168\n")
+
+        async def read_all():
+            async with AsyncFile(File(), i_max_workers=2) as o_async_file:
+                return await asyncio.gather(o_async_file.read(s_dir + "/size"),
+                                            o_async_file.list_dir(s_dir),
+                                            o_async_file.file_exists(s_dir + "/missing"),
+                                            o_async_file.read(s_dir + "/missing"))
+
+        t_size, t_list, b_exists, t_missing = asyncio.run(read_all())
+
+        assert t_size == (True, "7814037168\n")
+        assert t_list == (True, ["size"])
+        assert b_exists is False
+        assert t_missing[0] is False
+
+    def test_exceptions_are_raised_in_the_loop(self):
+        def fail():
+            raise ValueError("sysfs")
+
+        async def run():
+            async with AsyncFile(File()) as o_async_file:
+                await o_async_file.run(fail)
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
+
+    def test_cancel_before_starting(self):
+        o_release = threading.Event()
+        a_ran = []
+
+        async def run():
+            o_async_file = AsyncFile(File(), i_max_workers=1)
+            o_blocked_task = asyncio.ensure_future(o_async_file.run(o_release.wait, 5))
+            o_queued_task = asyncio.ensure_future(o_async_file.run(a_ran.append, "queued"))
+            await asyncio.sleep(0.1)
+            o_queued_task.cancel()
+            await asyncio.sleep(0.05)
+            o_release.set()
+            await o_blocked_task
+            # Anything submitted after the cancelled call runs normally
+            await o_async_file.run(a_ran.append, "after")
+            o_async_file.close()
+            return o_queued_task.cancelled()
+
+        assert asyncio.run(run()) is True
+        assert a_ran == ["after"]
+
+    def test_shutdown_cancels_pending(self):
+        o_executor = BoundedExecutor(1)
+        o_release = threading.Event()
+        o_running = o_executor.submit(o_release.wait, 5)
+        o_pending = o_executor.submit(len, "sda")
+        o_executor.shutdown()
+        o_release.set()
+
+        assert o_pending.cancelled() is True
+        assert o_running.result(5) is True
+        with pytest.raises(RuntimeError):
+            o_executor.submit(len, "sdb")
+        # The threads are daemons, a blocked read never prevents exiting
+        assert all([o_thread.daemon for o_thread in o_executor.a_threads]) is True
+
+    def test_detached_thread_is_replaced(self):
+        o_executor = BoundedExecutor(1)
+        o_release = threading.Event()
+        o_blocked = o_executor.submit(o_release.wait, 5)
+        o_queued = o_executor.submit(len, "sda")
+
+        assert o_executor.detach(o_blocked) is True
+        assert o_queued.result(5) == 3
+        assert len(o_executor.a_threads) == 2
+        o_release.set()
+        assert o_blocked.result(5) is True
+        # The detached thread exits once its call finishes
+        o_executor.a_threads[0].join(5)
+        assert len(o_executor.a_threads) == 1
+        assert o_executor.submit(len, "sdb").result(5) == 3
+        assert o_executor.detach(o_executor.submit(len, "sdc")) is False
+        o_executor.shutdown()
@@ -0,0 +1,162 @@
+#
+# Tests for CachedFile class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+from ..src.lib.file import File
+from ..src.lib.cachedfile import CachedFile
+
+
+class CountingFile(File):
+    """
+    File double that counts the calls and returns the path as content
+    """
+
+    def __init__(self):
+        File.__init__(self)
+        self.i_calls = 0
+
+    def read(self, s_file):
+        self.i_calls = self.i_calls + 1
+        if "missing" in s_file:
+            return False, ""
+        return True, s_file + str(self.i_calls)
+
+    def list_dir(self, s_dir):
+        self.i_calls = self.i_calls + 1
+        return True, ["sda", "sdb"]
+
+    def get_real_path(self, s_file):
+        self.i_calls = self.i_calls + 1
+        return True, "/dev/sda"
+
+    def file_exists(self, s_file):
+        self.i_calls = self.i_calls + 1
+        return "missing" not in s_file
+
+    def read_many(self, s_dir, a_files):
+        self.i_calls = self.i_calls + 1
+        d_results = {}
+        for s_name in a_files:
+            d_results[s_name] = None if "missing" in s_name else (s_dir + "/" + s_name).encode("utf-8")
+        return True, d_results
+
+
+class TestCachedFile(object):
+
+    f_now = 0.0
+
+    def fake_time(self):
+        return self.f_now
+
+    # Start Tests
+    def test_static_attributes_are_cached(self):
+        o_counting_file = CountingFile()
+        o_file = CachedFile(o_counting_file, fn_time=self.fake_time)
+
+        self.f_now = 100.0
+        b_success, s_vendor = o_file.read("/sys/class/block/sda/device/vendor")
+        assert b_success is True
+        b_success, s_vendor_again = o_file.read("/sys/class/block/sda/device/vendor")
+        assert s_vendor_again == s_vendor
+        assert o_counting_file.i_calls == 1
+        assert o_file.i_hits == 1
+
+        # Expired
+        self.f_now = 100.0 + 21601
+        o_file.read("/sys/class/block/sda/device/vendor")
+        assert o_counting_file.i_calls == 2
+
+    def test_volatile_attributes_are_not_cached(self):
+        o_counting_file = CountingFile()
+        o_file = CachedFile(o_counting_file, fn_time=self.fake_time)
+
+        o_file.read("/sys/class/block/sda/stat")
+        o_file.read("/sys/class/block/sda/stat")
+        o_file.read("/sys/class/block/sda/device/enclosure_device:1/status")
+        o_file.read("/sys/class/block/sda/device/enclosure_device:1/status")
+
+        assert o_counting_file.i_calls == 4
+
+    def test_failures_are_not_cached(self):
+        o_counting_file = CountingFile()
+        o_file = CachedFile(o_counting_file, fn_time=self.fake_time)
+
+        b_success, s_text = o_file.read("/sys/class/block/missing/device/vendor")
+        b_success, s_text = o_file.read("/sys/class/block/missing/device/vendor")
+
+        assert b_success is False
+        assert o_counting_file.i_calls == 2
+
+    def test_lru_eviction_and_copies(self):
+        o_counting_file = CountingFile()
+        o_file = CachedFile(o_counting_file, a_ttl_rules=[("*", "*", 60)], i_max_entries=2, fn_time=self.fake_time)
+
+        b_success, a_files = o_file.list_dir("/sys/block/sda/device/")
+        a_files.append("modified")
+        b_success, a_files = o_file.list_dir("/sys/block/sda/device/")
+        assert a_files == ["sda", "sdb"]
+
+        o_file.read("/a")
+        o_file.read("/b")
+        assert len(o_file.d_cache) == 2
+        assert ("list_dir", "/sys/block/sda/device/") not in o_file.d_cache
+
+    def test_invalidate_device(self):
+        o_counting_file = CountingFile()
+        o_file = CachedFile(o_counting_file, fn_time=self.fake_time)
+
+        o_file.read("/sys/class/block/sda/device/vendor")
+        o_file.read("/sys/class/block/sdb/device/vendor")
+        o_file.get_real_path("/dev/disk/by-id/wwn-0x5000c500a1b2c3d4")
+
+        i_removed = o_file.invalidate_device("sda")
+
+        assert i_removed == 2
+        assert list(o_file.d_cache.keys()) == [("read", "/sys/class/block/sdb/device/vendor")]
+
+    def test_not_cached_methods_are_delegated(self):
+        o_file = CachedFile(File())
+
+        b_result = o_file.folder_exists("/tmp")
+        assert b_result is True
+
+    def test_read_many_only_reads_what_is_not_cached(self):
+        o_counting_file = CountingFile()
+        o_file = CachedFile(o_counting_file, fn_time=self.fake_time)
+        s_dir = "/sys/class/block/sda"
+        a_files = ["device/vendor", "stat", "device/vpd_pg_missing"]
+
+        b_success, d_first = o_file.read_many(s_dir, a_files)
+        b_success, d_second = o_file.read_many(s_dir, a_files)
+        b_success, d_vendor = o_file.read_many(s_dir, ["device/vendor"])
+
+        assert d_first == d_second
+        assert d_first["device/vpd_pg_missing"] is None
+        assert d_vendor == {"device/vendor": b"/sys/class/block/sda/device/vendor"}
+        # The stat and the missing page are read again, the vendor not
+        assert o_counting_file.i_calls == 2
+        assert list(o_file.d_cache.keys()) == [("read_many", s_dir + "/device/vendor")]
+
+    def test_files_not_found_are_not_cached(self):
+        o_counting_file = CountingFile()
+        o_file = CachedFile(o_counting_file, fn_time=self.fake_time)
+
+        assert o_file.file_exists("/sys/class/block/sda/device/vpd_pg83_missing") is False
+        assert o_file.file_exists("/sys/class/block/sda/device/vpd_pg83_missing") is False
+        assert o_file.file_exists("/sys/class/block/sda/device/vpd_pg83") is True
+        assert o_file.file_exists("/sys/class/block/sda/device/vpd_pg83") is True
+
+        assert o_counting_file.i_calls == 3
+
+    def test_rules_match_any_root(self):
+        o_file = CachedFile(CountingFile(), fn_time=self.fake_time)
+
+        assert o_file.get_ttl("read", "/tmp/fake/sys/class/block/sda/size") == 60
+        assert o_file.get_ttl("read_many", "/tmp/fake/sys/class/block/sda/device/vendor") == 21600
+        assert o_file.get_ttl("read_link", "/tmp/fake/dev/disk/by-id/wwn-0x5000c500a1b2c3d4") == 60
+        assert o_file.get_ttl("path_exists", "/tmp/fake/sys/class/block/sda/sda3") == 60
+        assert o_file.get_ttl("read", "/tmp/fake/sys/class/block/sda/stat") == 0
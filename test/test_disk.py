@@ -0,0 +1,96 @@
+#
+# Tests for Disk class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+from ..src.lib.disk import Disk, DiskStatus
+
+
+class TestDisk(object):
+
+    # Start Tests
+    def test_defaults(self):
+        o_disk = Disk("sda")
+
+        assert o_disk.s_dev_name == "sda"
+        assert o_disk.size == ""
+        assert o_disk.byte_size == 0
+        assert o_disk.s_logical_block_size == ""
+        assert o_disk.status is None
+        assert o_disk.suspect is False
+
+    def test_slots(self):
+        o_disk = Disk("sda")
+
+        with pytest.raises(AttributeError):
+            o_disk.not_an_attribute = True
+
+    def test_size(self):
+        o_disk = Disk("sda")
+
+        o_disk.set_size_from_sectors("7814037168")
+        assert o_disk.i_byte_size == 4000787030016
+        assert o_disk.size == "4.00TB"
+        assert o_disk.s_size == "4.00TB"
+
+        o_disk.set_size_from_sectors("35156656128")
+        assert o_disk.size == "18.0TB"
+
+        o_disk.set_size_from_sectors("976773168")
+        assert o_disk.size == "500GB"
+
+        o_disk.set_size_from_sectors("15630336")
+        assert o_disk.size == "8.00GB"
+
+    def test_block_sizes(self):
+        o_disk = Disk("sda")
+
+        o_disk.s_logical_block_size = "512\n"
+        o_disk.s_physical_block_size = "n/a"
+
+        assert o_disk.i_logical_block_size == 512
+        assert o_disk.s_logical_block_size == "512"
+        assert o_disk.i_physical_block_size == Disk.I_NOT_AVAILABLE
+        assert o_disk.s_physical_block_size == "n/a"
+
+    def test_status(self):
+        o_disk = Disk("sda")
+        o_disk.set_readable_from_stat(True, "0 0 0 0 0 0 0 0 0 0 0")
+
+        assert o_disk.status is DiskStatus.FAILURE
+        assert o_disk.status == "FAILURE"
+        assert "Status: " + o_disk.status == "Status: FAILURE"
+        assert o_disk.b_unreadable is True
+
+    def test_lazy_groups(self):
+        a_loaded = []
+
+        def load_group(o_disk, s_group):
+            a_loaded.append(s_group)
+            if s_group == Disk.GROUP_SERIAL:
+                o_disk.s_serial = "ZC11AAAA"
+            elif s_group == Disk.GROUP_STAT:
+                o_disk.set_readable_from_stat(True, "0 0 0 0 0 0 0 0 0 0 0")
+
+        o_disk = Disk("sda")
+        o_disk.set_lazy(load_group)
+        o_disk.suspect = True
+
+        assert o_disk.is_field_loaded("s_serial") is False
+        assert o_disk.s_serial == "ZC11AAAA"
+        assert o_disk.s_serial == "ZC11AAAA"
+        assert a_loaded == [Disk.GROUP_SERIAL]
+
+        assert o_disk.b_unreadable is True
+        assert o_disk.status == "FAILURE"
+        assert o_disk.i_sectors == Disk.I_NOT_READ
+        assert o_disk.size == ""
+        assert o_disk.suspect is True
+        assert o_disk.ioc == ""
+        assert a_loaded == [Disk.GROUP_SERIAL, Disk.GROUP_STAT, Disk.GROUP_SIZE, Disk.GROUP_IOC]
+
+        with pytest.raises(AttributeError):
+            o_disk.s_unknown
@@ -0,0 +1,92 @@
+#
+# Tests for DiskInventory class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+from ..src.lib.disk import Disk
+from ..src.lib.diskinventory import DiskInventory
+
+
+class TestDiskInventory(object):
+
+    def create_inventory(self):
+        o_inventory = DiskInventory()
+        for s_dev_name, s_serial, s_slot in [("sda", "ZC11AAAA", "1"), ("sdb", "ZC11BBBB", "37"),
+                                             ("sdc", "ZC11CCCC", "37")]:
+            o_disk = Disk(s_dev_name)
+            o_disk.s_serial = s_serial
+            o_disk.s_slot = s_slot
+            o_inventory.add(o_disk)
+
+        return o_inventory
+
+    # Start Tests
+    def test_add_and_iterate(self):
+        o_inventory = self.create_inventory()
+
+        assert len(o_inventory) == 3
+        assert [o_disk.s_dev_name for o_disk in o_inventory] == ["sda", "sdb", "sdc"]
+        assert o_inventory[1].s_dev_name == "sdb"
+        assert "sdb" in o_inventory
+        assert "sdz" not in o_inventory
+
+        b_added = o_inventory.add(Disk("sda"))
+        assert b_added is False
+        assert len(o_inventory) == 3
+
+    def test_lookups(self):
+        o_inventory = self.create_inventory()
+
+        assert o_inventory.get_by_dev_name("sdc").s_serial == "ZC11CCCC"
+        assert o_inventory.get_by_serial("ZC11AAAA").s_dev_name == "sda"
+        assert [o_disk.s_dev_name for o_disk in o_inventory.get_by_slot(37)] == ["sdb", "sdc"]
+        assert o_inventory.get_by_slot("99") == []
+        assert o_inventory.get_by_serial("nope") is None
+
+    def test_aliases_are_deduplicated(self):
+        o_inventory = self.create_inventory()
+
+        assert o_inventory.add_alias("sda", "wwn-0x5000c500a1b2c3d4") is True
+        assert o_inventory.add_alias("sda", "ata-ST4000NM0035_ZC11AAAA") is True
+        assert o_inventory.add_alias("sda", "wwn-0x5000c500a1b2c3d4") is False
+        assert o_inventory.add_alias("sdz", "wwn-0x5000c500a1b2c3ff") is False
+
+        assert o_inventory.get_aliases("sda") == ["wwn-0x5000c500a1b2c3d4", "ata-ST4000NM0035_ZC11AAAA"]
+        assert o_inventory.get_by_alias("ata-ST4000NM0035_ZC11AAAA").s_dev_name == "sda"
+
+    def test_update_reindexes(self):
+        o_inventory = self.create_inventory()
+
+        o_disk = Disk("sdb")
+        o_disk.s_serial = "ZC11NEW0"
+        o_disk.s_slot = "5"
+        o_disk.s_wwn = "0x5000c500a1b2c3d4"
+        o_disk.s_major_minor = "8:16"
+
+        assert o_inventory.update(o_disk) is True
+        assert o_inventory[1] is o_disk
+        assert o_inventory.get_by_serial("ZC11BBBB") is None
+        assert o_inventory.get_by_serial("ZC11NEW0") is o_disk
+        assert [o_slot_disk.s_dev_name for o_slot_disk in o_inventory.get_by_slot("37")] == ["sdc"]
+        assert o_inventory.get_by_wwn("0x5000c500a1b2c3d4") is o_disk
+        assert o_inventory.get_by_major_minor("8:16") is o_disk
+        assert o_inventory.update(Disk("sdz")) is False
+
+    def test_get_by_serial_lazy(self):
+        o_inventory = DiskInventory()
+        o_disk = Disk("sda")
+        o_inventory.add(o_disk)
+
+        def load_group(o_lazy_disk, s_group):
+            o_lazy_disk.s_serial = "ZC11LAZY"
+
+        o_disk.set_lazy(load_group)
+        assert o_inventory.update(o_disk) is True
+        assert o_disk.is_field_loaded("s_serial") is False
+
+        assert o_inventory.get_by_serial("ZC11LAZY") is o_disk
+        assert o_inventory.get_by_serial("ZC11NONE") is None
+        assert len(o_inventory.a_lazy_serials) == 0
@@ -0,0 +1,91 @@
+#
+# Tests for DiskStats classes
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+from ..src.lib.file import File
+from ..src.lib.diskstats import DiskStatsSampler, RingBuffer
+
+
+class TestDiskStats(object):
+
+    s_line_sda = "   8       0 sda %d 0 %d %d %d 0 %d %d %d %d %d 0 0 0 0\n"
+
+    def write_diskstats(self, s_proc_root, i_reads, i_sectors_read, i_ms_reading, i_writes, i_sectors_written,
+                        i_ms_writing, i_in_progress, i_ms_doing_io, i_weighted_ms):
+        o_file = File()
+        s_text = self.s_line_sda % (i_reads, i_sectors_read, i_ms_reading, i_writes, i_sectors_written, i_ms_writing,
+                                    i_in_progress, i_ms_doing_io, i_weighted_ms)
+        s_text += "   8       1 sda1 1 0 8 0 0 0 0 0 0 0 0\n"
+        o_file.write(s_proc_root + "/diskstats", s_text)
+
+    # Start Tests
+    def test_ring_buffer(self):
+        o_ring_buffer = RingBuffer(3)
+        assert o_ring_buffer.get_last() is None
+        assert o_ring_buffer.get_all() == []
+
+        for i_item in range(5):
+            o_ring_buffer.append(i_item)
+
+        assert len(o_ring_buffer) == 3
+        assert o_ring_buffer.get_all() == [2, 3, 4]
+        assert o_ring_buffer.get_last() == 4
+
+    def test_sample(self, tmp_path):
+        s_proc_root = str(tmp_path)
+        o_sampler = DiskStatsSampler(File(), s_proc_root=s_proc_root, i_history=2)
+
+        self.write_diskstats(s_proc_root, 1000, 8000, 500, 100, 800, 200, 3, 1000, 2000)
+        b_success, d_metrics = o_sampler.sample(f_time=10.0)
+        assert b_success is True
+        assert d_metrics == {}
+
+        # In 2 seconds: 300 reads of 2048 sectors, 100 writes, 400ms reading, 400ms writing, 1000ms busy
+        self.write_diskstats(s_proc_root, 1300, 622400, 900, 200, 1600, 600, 1, 2000, 4000)
+        b_success, d_metrics = o_sampler.sample(f_time=12.0)
+        assert b_success is True
+
+        d_sda = d_metrics["sda"]
+        assert d_sda["iops"] == 200.0
+        assert d_sda["read_mb_s"] == pytest.approx(614400 * 512 / 2 / 1000 / 1000)
+        assert d_sda["write_mb_s"] == pytest.approx(800 * 512 / 2 / 1000 / 1000)
+        assert d_sda["await_ms"] == 2.0
+        assert d_sda["queue_depth"] == 1.0
+        assert d_sda["util_percent"] == 50.0
+        assert d_metrics["sda1"]["iops"] == 0.0
+
+        o_histogram = o_sampler.get_await_histogram("sda")
+        assert len(o_histogram) == 400
+        assert o_histogram.get_percentile_ms(99) == 2.0
+        assert o_sampler.get_await_histogram("sda1") is None
+
+        self.write_diskstats(s_proc_root, 1300, 622400, 900, 200, 1600, 600, 0, 2000, 4000)
+        o_sampler.sample(f_time=13.0)
+        self.write_diskstats(s_proc_root, 1301, 622408, 901, 200, 1600, 600, 0, 2001, 4001)
+        o_sampler.sample(f_time=14.0)
+
+        a_history = o_sampler.get_history("sda")
+        assert len(a_history) == 2
+        assert a_history[-1]["iops"] == 1.0
+
+    def test_counters_going_backwards_are_skipped(self, tmp_path):
+        s_proc_root = str(tmp_path)
+        o_sampler = DiskStatsSampler(File(), s_proc_root=s_proc_root)
+
+        self.write_diskstats(s_proc_root, 1000, 8000, 500, 100, 800, 200, 3, 1000, 2000)
+        o_sampler.sample(f_time=1.0)
+        self.write_diskstats(s_proc_root, 10, 80, 5, 1, 8, 2, 0, 10, 20)
+        b_success, d_metrics = o_sampler.sample(f_time=2.0)
+
+        assert b_success is True
+        assert "sda" not in d_metrics
+
+    def test_sample_ko(self, tmp_path):
+        o_sampler = DiskStatsSampler(File(), s_proc_root=str(tmp_path) + "/not_existing")
+        b_success, d_metrics = o_sampler.sample()
+
+        assert b_success is False
@@ -0,0 +1,66 @@
+#
+# Tests for DiskTable class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+from ..src.lib.disk import Disk
+from ..src.lib.disktable import DiskTable
+
+
+class TestDiskTable(object):
+
+    def create_disk(self, s_dev_name, s_vendor, s_sectors, b_rotational, s_fault="0"):
+        o_disk = Disk(s_dev_name)
+        o_disk.manufacturer = s_vendor
+        o_disk.set_size_from_sectors(s_sectors)
+        o_disk.set_type_from_rotational("1" if b_rotational is True else "0")
+        o_disk.s_fault = s_fault
+        return o_disk
+
+    def create_table(self):
+        o_disk_table = DiskTable()
+        o_disk_table.add_disks([self.create_disk("sda", "SEAGATE ", "1000", True),
+                                self.create_disk("sdb", "SEAGATE ", "2000", True, s_fault="1")], s_host="node01")
+        o_disk_table.add_disks([self.create_disk("sda", "HGST    ", "4000", True),
+                                self.create_disk("nvme0n1", "", "8000", False)], s_host="node02")
+        return o_disk_table
+
+    # Start Tests
+    def test_add_and_get_row(self):
+        o_disk_table = self.create_table()
+
+        assert len(o_disk_table) == 4
+        d_row = o_disk_table.get_row(1)
+        assert d_row["dev_name"] == "sdb"
+        assert d_row["host"] == "node01"
+        assert d_row["vendor"] == "SEAGATE"
+        assert d_row["byte_size"] == 2000 * 512
+        assert d_row["faulted"] is True
+
+    def test_aggregates(self):
+        o_disk_table = self.create_table()
+
+        assert o_disk_table.get_total_capacity() == 15000 * 512
+        assert o_disk_table.get_capacity_by("vendor") == {"SEAGATE": 3000 * 512, "HGST": 4000 * 512, "": 8000 * 512}
+        assert o_disk_table.get_capacity_by("type") == {"Spinning": 7000 * 512, "Solid State": 8000 * 512}
+        assert o_disk_table.get_count_by("host") == {"node01": 2, "node02": 2}
+        assert o_disk_table.count_faulted() == 1
+        assert o_disk_table.get_faulted_rows() == [1]
+        assert o_disk_table.count_suspect() == 0
+
+    def test_aggregates_by_many_values(self):
+        o_disk_table = DiskTable()
+        for i_host in range(20000):
+            o_disk_table.add_disks([self.create_disk("sda", "SEAGATE ", str(1000 + i_host), True)],
+                                   s_host="node%05d" % i_host)
+
+        d_capacity = o_disk_table.get_capacity_by("host")
+        d_count = o_disk_table.get_count_by("host")
+
+        assert len(d_capacity) == len(d_count) == 20000
+        assert d_capacity["node00007"] == 1007 * 512
+        assert sum(d_capacity.values()) == o_disk_table.get_total_capacity()
+        assert set(d_count.values()) == set([1])
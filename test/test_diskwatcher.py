@@ -0,0 +1,220 @@
+#
+# Tests for DiskWatcher class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import os
+import shutil
+import struct
+import pytest
+from ..src.lib.file import File
+from ..src.lib.cachedfile import CachedFile
+from ..src.lib.fakesysfs import FakeSysfs
+from ..src.lib.driveutils import DriveUtils
+from ..src.lib.diskwatcher import DiskWatcher, InotifyWatch
+from ..src.lib.inventorydiff import InventoryEvent
+
+
+class CountingDriveUtils(DriveUtils):
+    """
+    DriveUtils that records the disks probed
+    """
+
+    def __init__(self, o_file, s_sys_root, s_dev_root, s_proc_root):
+        DriveUtils.__init__(self, o_file, s_sys_root, s_dev_root, s_proc_root)
+        self.a_probed = []
+
+    def get_disk_info(self, disk, b_cmdline=False):
+        self.a_probed.append(disk.s_dev_name)
+        return DriveUtils.get_disk_info(self, disk, b_cmdline)
+
+
+class TestDiskWatcher(object):
+
+    def create_watcher(self, s_root, b_use_inotify, o_file=None):
+        o_fake_sysfs = FakeSysfs(s_root)
+        assert o_fake_sysfs.create(6, i_slots_per_enclosure=12, i_disks_per_host=16) is True
+        if o_file is None:
+            o_file = File()
+        o_driveutils = CountingDriveUtils(o_file, o_fake_sysfs.s_sys_root, o_fake_sysfs.s_dev_root,
+                                          o_fake_sysfs.s_proc_root)
+        i_error_code, all_disks = o_driveutils.get_all_disks()
+        assert i_error_code == 0
+        o_driveutils.a_probed = []
+
+        o_watcher = DiskWatcher(o_driveutils, all_disks, f_debounce=0.1, f_max_delay=2.0, b_use_inotify=b_use_inotify,
+                                f_poll_interval=0.05)
+        assert o_watcher.start() is True
+        return o_fake_sysfs, o_watcher
+
+    def get_aliases(self, o_fake_sysfs, s_dev_name):
+        s_by_id_path = o_fake_sysfs.s_dev_root + "/disk/by-id"
+        return sorted([s_name for s_name in os.listdir(s_by_id_path)
+                       if os.readlink(s_by_id_path + "/" + s_name) == "../../" + s_dev_name])
+
+    def pull_and_insert(self, o_fake_sysfs, o_watcher):
+        s_by_id_path = o_fake_sysfs.s_dev_root + "/disk/by-id"
+        a_aliases = self.get_aliases(o_fake_sysfs, "sdb")
+        for s_alias in a_aliases:
+            os.remove(s_by_id_path + "/" + s_alias)
+
+        a_events = o_watcher.apply_changes(o_watcher.wait_for_changes(2.0))
+        assert [o_event.s_type for o_event in a_events] == [InventoryEvent.EVENT_REMOVED]
+        assert a_events[0].o_disk.s_dev_name == "sdb"
+        assert "sdb" not in o_watcher.all_disks
+        assert len(o_watcher.all_disks) == 5
+        assert o_watcher.all_disks.get_by_alias(a_aliases[0]) is None
+        assert o_watcher.o_driveutils.a_probed == []
+
+        for s_alias in a_aliases:
+            os.symlink("../../sdb", s_by_id_path + "/" + s_alias)
+
+        a_events = o_watcher.apply_changes(o_watcher.wait_for_changes(2.0))
+        assert [o_event.s_type for o_event in a_events] == [InventoryEvent.EVENT_ADDED]
+        o_disk = o_watcher.all_disks.get_by_dev_name("sdb")
+        assert o_disk.s_serial == "ZC100001"
+        assert o_disk.s_wwn == "0x5000c50000000001"
+        assert o_disk.s_major_minor == "8:16"
+        assert sorted(o_watcher.all_disks.get_aliases("sdb")) == a_aliases
+        assert o_watcher.all_disks.get_by_serial("ZC100001") is o_disk
+        assert o_watcher.o_driveutils.a_probed == ["sdb"]
+
+    # Start Tests
+    def test_pull_and_insert_inotify(self, tmp_path):
+        o_fake_sysfs, o_watcher = self.create_watcher(str(tmp_path), True)
+        if o_watcher.is_inotify() is False:
+            o_watcher.close()
+            pytest.skip("inotify is not available")
+        try:
+            self.pull_and_insert(o_fake_sysfs, o_watcher)
+        finally:
+            o_watcher.close()
+
+    def test_pull_and_insert_polling(self, tmp_path):
+        o_fake_sysfs, o_watcher = self.create_watcher(str(tmp_path), False)
+        assert o_watcher.is_inotify() is False
+        try:
+            self.pull_and_insert(o_fake_sysfs, o_watcher)
+        finally:
+            o_watcher.close()
+
+    def test_changed_disk(self, tmp_path):
+        o_fake_sysfs, o_watcher = self.create_watcher(str(tmp_path), False)
+        s_by_id_path = o_fake_sysfs.s_dev_root + "/disk/by-id"
+        a_dev_names = [o_disk.s_dev_name for o_disk in o_watcher.all_disks]
+        File().write(o_fake_sysfs.s_sys_root + "/class/block/sdc/stat", "0 0 0 0 0 0 0 0 0 0 0\n")
+        # udev recreating a link on a change event, here pointing to another disk
+        s_alias = self.get_aliases(o_fake_sysfs, "sdc")[0]
+        os.remove(s_by_id_path + "/" + s_alias)
+        os.symlink("../../sdd", s_by_id_path + "/" + s_alias)
+
+        a_events = o_watcher.apply_changes(o_watcher.wait_for_changes(2.0))
+        o_watcher.close()
+
+        assert sorted(o_watcher.o_driveutils.a_probed) == ["sdc", "sdd"]
+        assert set([(o_event.s_type, o_event.o_disk.s_dev_name) for o_event in a_events]) == \
+               set([(InventoryEvent.EVENT_CHANGED, "sdc")])
+        assert "b_unreadable" in [o_event.s_field for o_event in a_events]
+        assert o_watcher.all_disks.get_by_dev_name("sdc").b_unreadable is True
+        assert o_watcher.all_disks.get_by_alias(s_alias).s_dev_name == "sdd"
+        assert [o_disk.s_dev_name for o_disk in o_watcher.all_disks] == a_dev_names
+
+    def test_hot_swap_with_cached_file(self, tmp_path):
+        o_fake_sysfs, o_watcher = self.create_watcher(str(tmp_path), False, CachedFile(File()))
+        s_by_id_path = o_fake_sysfs.s_dev_root + "/disk/by-id"
+        s_device_path = o_fake_sysfs.s_sys_root + "/class/block/sdb/device"
+        # Another disk in the same dev name, in one burst of events
+        for s_alias in self.get_aliases(o_fake_sysfs, "sdb"):
+            os.remove(s_by_id_path + "/" + s_alias)
+        o_file = File()
+        o_file.write_binary(s_device_path + "/vpd_pg80", o_fake_sysfs.get_vpd_pg80("ZC199999"))
+        o_file.write_binary(s_device_path + "/vpd_pg83", o_fake_sysfs.get_vpd_pg83("0x5000c5000001869f"))
+        os.symlink("../../sdb", s_by_id_path + "/wwn-0x5000c5000001869f")
+
+        a_events = o_watcher.apply_changes(o_watcher.wait_for_changes(2.0))
+        o_watcher.close()
+
+        assert o_watcher.o_driveutils.a_probed == ["sdb"]
+        assert [(o_event.s_type, o_event.s_key) for o_event in a_events] == \
+               [(InventoryEvent.EVENT_REMOVED, "wwn:0x5000c50000000001"),
+                (InventoryEvent.EVENT_ADDED, "wwn:0x5000c5000001869f")]
+        o_disk = o_watcher.all_disks.get_by_dev_name("sdb")
+        assert o_disk.s_serial == "ZC199999"
+        assert o_watcher.all_disks.get_by_alias("wwn-0x5000c5000001869f") is o_disk
+
+    def test_burst_is_debounced(self, tmp_path):
+        o_fake_sysfs, o_watcher = self.create_watcher(str(tmp_path), True)
+        s_by_id_path = o_fake_sysfs.s_dev_root + "/disk/by-id"
+        for s_dev_name in ["sdd", "sde", "sdf"]:
+            for s_alias in self.get_aliases(o_fake_sysfs, s_dev_name):
+                os.remove(s_by_id_path + "/" + s_alias)
+
+        a_names = o_watcher.wait_for_changes(2.0)
+        a_events = o_watcher.apply_changes(a_names)
+        o_watcher.close()
+
+        assert len(a_names) == 6
+        assert [o_event.o_disk.s_dev_name for o_event in a_events] == ["sdd", "sde", "sdf"]
+        assert sorted([o_disk.s_dev_name for o_disk in o_watcher.all_disks]) == ["sda", "sdb", "sdc"]
+
+    def test_no_changes(self, tmp_path):
+        o_fake_sysfs, o_watcher = self.create_watcher(str(tmp_path), True)
+        a_names = o_watcher.wait_for_changes(0.1)
+        o_watcher.close()
+
+        assert len(a_names) == 0
+        assert o_watcher.apply_changes(a_names) == []
+
+    def test_overflow_probes_all_the_disks(self, tmp_path):
+        o_fake_sysfs, o_watcher = self.create_watcher(str(tmp_path), True)
+        o_watcher.close()
+        # The queue of inotify overflowed, the name of an event is missing
+        i_read_fd, i_write_fd = os.pipe()
+        o_watcher.o_watch = InotifyWatch(o_fake_sysfs.s_dev_root + "/disk/by-id")
+        o_watcher.o_watch.i_fd = i_read_fd
+        os.write(i_write_fd, struct.pack(InotifyWatch.S_EVENT_FORMAT, -1, InotifyWatch.IN_Q_OVERFLOW, 0, 0))
+        s_by_id_path = o_fake_sysfs.s_dev_root + "/disk/by-id"
+        for s_alias in self.get_aliases(o_fake_sysfs, "sdb"):
+            os.remove(s_by_id_path + "/" + s_alias)
+
+        a_names = o_watcher.wait_for_changes(2.0)
+        assert len(a_names) == 0
+        assert o_watcher.o_watch.b_rescan is True
+        a_events = o_watcher.apply_changes(a_names)
+        o_watcher.close()
+        os.close(i_write_fd)
+
+        assert o_watcher.o_watch.b_rescan is False
+        assert len(o_watcher.o_driveutils.a_probed) == 6
+        # Without aliases it is only in /proc/partitions
+        assert [(o_event.o_disk.s_dev_name, o_event.s_field) for o_event in a_events] == [("sdb", "id")]
+        assert o_watcher.all_disks.get_by_dev_name("sdb").id == "n/a"
+        assert len(o_watcher.all_disks) == 6
+
+    def test_directory_removed_is_watched_again(self, tmp_path):
+        o_fake_sysfs, o_watcher = self.create_watcher(str(tmp_path), True)
+        if o_watcher.is_inotify() is False:
+            o_watcher.close()
+            pytest.skip("inotify is not available")
+        s_by_id_path = o_fake_sysfs.s_dev_root + "/disk/by-id"
+        d_links = {}
+        for s_name in os.listdir(s_by_id_path):
+            d_links[s_name] = os.readlink(s_by_id_path + "/" + s_name)
+        shutil.rmtree(s_by_id_path)
+        os.mkdir(s_by_id_path)
+        for s_name, s_target in d_links.items():
+            if s_target != "../../sdc":
+                os.symlink(s_target, s_by_id_path + "/" + s_name)
+
+        try:
+            a_events = o_watcher.apply_changes(o_watcher.wait_for_changes(2.0))
+            assert [(o_event.o_disk.s_dev_name, o_event.s_field) for o_event in a_events] == [("sdc", "id")]
+            assert o_watcher.o_watch.i_wd != -1
+
+            s_alias = self.get_aliases(o_fake_sysfs, "sdd")[0]
+            os.remove(s_by_id_path + "/" + s_alias)
+            assert o_watcher.wait_for_changes(2.0) == set([s_alias])
+        finally:
+            o_watcher.close()
@@ -0,0 +1,343 @@
+#
+# Tests for DriveUtils class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+import os
+import time
+from ..src.lib.file import File
+from ..src.lib.driveutils import DriveUtils, ScanStatus
+from ..src.lib.diskinventory import DiskInventory
+from ..src.lib.latencyhistogram import LatencyHistogram
+
+
+class FakeFile(File):
+    """
+    File double that serves an in memory /dev/disk/by-id and sysfs. Reads of the disks in a_slow_disks block.
+    """
+
+    def __init__(self, d_ids, a_slow_disks=None, f_delay=2.0, s_partitions=""):
+        File.__init__(self)
+        self.d_ids = d_ids
+        self.s_partitions = s_partitions
+        self.a_slow_disks = a_slow_disks or []
+        self.f_delay = f_delay
+        self.i_reads = 0
+
+    def list_dir(self, s_dir):
+        if s_dir == "/dev/disk/by-id":
+            return True, list(self.d_ids.keys())
+        return False, []
+
+    def read_link(self, s_file):
+        if s_file.startswith("/dev/disk/by-id/"):
+            return True, "../../" + self.d_ids[s_file.split("/")[-1]]
+        s_dev_name = s_file.split("/")[-1]
+        return True, "../../devices/pci0000:00/0000:00:01.0/0000:01:00.0/host3/port-3:0/expander-3:0/port-3:0:0/" \
+                     "end_device-3:0:0/target3:0:0/3:0:0:0/block/" + s_dev_name
+
+    def read_many(self, s_dir, a_files):
+        d_results = {}
+        for s_name in a_files:
+            d_results[s_name] = None
+            # Like file_exists, there are no VPD pages
+            if "vpd_pg" not in s_name:
+                b_success, s_text = self.read(s_dir + "/" + s_name)
+                d_results[s_name] = s_text.encode("utf-8")
+        return True, d_results
+
+    def path_exists(self, s_file_path):
+        return True
+
+    def file_exists(self, s_file):
+        return False
+
+    def read(self, s_file):
+        self.i_reads = self.i_reads + 1
+        for s_dev_name in self.a_slow_disks:
+            if "/" + s_dev_name + "/" in s_file:
+                time.sleep(self.f_delay)
+        if s_file == "/proc/partitions":
+            return True, "major minor  #blocks  name\n\n" + self.s_partitions
+        if s_file.endswith("/size"):
+            return True, "1953525168\n"
+        if s_file.endswith("/stat"):
+            return True, "10 0 80 3 0 0 0 0 0 3 3\n"
+        if s_file.endswith("_block_size"):
+            return True, "512\n"
+        return True, "1\n"
+
+
+class SysfsTree:
+    """
+    Creates a minimal sysfs, devfs and procfs for a few Disks
+    """
+
+    s_device_path = "devices/pci0000:00/0000:00:01.0/0000:01:00.0/host7/port-7:0/expander-7:0/port-7:0:0/" \
+                    "end_device-7:0:0/target7:0:0/7:0:0:0/block/"
+
+    def __init__(self, s_root):
+        self.s_root = s_root
+        self.s_partitions = "major minor  #blocks  name\n\n"
+        o_file = File()
+        o_file.create_folder(s_root + "/sys/class/block")
+        o_file.create_folder(s_root + "/dev/disk/by-id")
+        o_file.create_folder(s_root + "/proc")
+        o_file.write(s_root + "/proc/partitions", self.s_partitions)
+
+    def get_driveutils(self):
+        return DriveUtils(File(), self.s_root + "/sys", self.s_root + "/dev", self.s_root + "/proc")
+
+    def create_disk(self, s_dev_name, i_minor, a_ids, s_serial, s_stat="10 0 80 3 0 0 0 0 0 3 3", b_partition3=False):
+        o_file = File()
+
+        s_block_path = self.s_root + "/sys/" + self.s_device_path + s_dev_name
+        o_file.create_folder(s_block_path + "/device")
+        o_file.create_folder(s_block_path + "/queue")
+
+        o_file.write(s_block_path + "/size", "7814037168\n")
+        o_file.write(s_block_path + "/stat", s_stat + "\n")
+        o_file.write(s_block_path + "/device/vendor", "SEAGATE ")
+        o_file.write_binary(s_block_path + "/device/vpd_pg80", b"\x00\x80\x00\x08" + s_serial.encode("ascii"))
+        o_file.write(s_block_path + "/queue/rotational", "1\n")
+        o_file.write(s_block_path + "/queue/logical_block_size", "512\n")
+        o_file.write(s_block_path + "/queue/physical_block_size", "4096\n")
+        os.symlink("../../" + self.s_device_path + s_dev_name, self.s_root + "/sys/class/block/" + s_dev_name)
+        self.s_partitions = self.s_partitions + "   8     " + str(i_minor) + " 3907018584 " + s_dev_name + "\n"
+
+        if b_partition3 is True:
+            o_file.create_folder(s_block_path + "/" + s_dev_name + "3")
+            os.symlink("../../" + self.s_device_path + s_dev_name + "/" + s_dev_name + "3",
+                       self.s_root + "/sys/class/block/" + s_dev_name + "3")
+
+        o_file.write(self.s_root + "/proc/partitions", self.s_partitions)
+        for s_id in a_ids:
+            os.symlink("../../" + s_dev_name, self.s_root + "/dev/disk/by-id/" + s_id)
+
+
+class TestDriveUtils(object):
+
+    d_ids = {"wwn-0x5000c500a1b2c3d1": "sda",
+             "ata-ST1000NM0033_Z1W0AAAA": "sda",
+             "wwn-0x5000c500a1b2c3d2": "sdb",
+             "wwn-0x5000c500a1b2c3d3": "sdc",
+             "wwn-0x5000c500a1b2c3d4": "sdd"}
+
+    # Start Tests
+    def test_get_all_disks(self):
+        o_driveutils = DriveUtils(FakeFile(self.d_ids))
+        i_error_code, l_disks = o_driveutils.get_all_disks()
+
+        assert i_error_code == 0
+        assert [o_disk.s_dev_name for o_disk in l_disks] == ["sda", "sdb", "sdc", "sdd"]
+        assert l_disks[0].ioc == "3"
+        assert l_disks[0].size == "1.00TB"
+
+    def test_get_all_disks_concurrent_same_order(self):
+        o_driveutils = DriveUtils(FakeFile(self.d_ids))
+        i_error_code, l_disks_sequential = o_driveutils.get_all_disks()
+        i_error_code, l_disks = o_driveutils.get_all_disks(i_max_workers=2)
+
+        assert i_error_code == 0
+        assert [o_disk.s_dev_name for o_disk in l_disks] == [o_disk.s_dev_name for o_disk in l_disks_sequential]
+        for o_disk in l_disks:
+            assert o_disk.s_physical_block_size == "512"
+            assert o_disk.suspect is False
+
+    def test_get_all_disks_concurrent_timeout(self):
+        o_driveutils = DriveUtils(FakeFile(self.d_ids, a_slow_disks=["sdb"], f_delay=3.0))
+
+        f_start = time.time()
+        i_error_code, l_disks = o_driveutils.get_all_disks(i_max_workers=1, f_timeout=0.2)
+        f_elapsed = time.time() - f_start
+
+        assert f_elapsed < 2.0
+        assert [o_disk.s_dev_name for o_disk in l_disks] == ["sda", "sdb", "sdc", "sdd"]
+        assert l_disks[1].suspect is True
+        assert l_disks[1].b_timed_out is True
+        assert l_disks[1].id == "wwn-0x5000c500a1b2c3d2"
+        assert l_disks[2].size == "1.00TB"
+
+    def test_blocked_disk_is_not_probed_again(self):
+        o_file = FakeFile(self.d_ids, a_slow_disks=["sdb"], f_delay=0.3)
+        o_driveutils = DriveUtils(o_file)
+        i_error_code, l_disks = o_driveutils.get_all_disks(i_max_workers=2, f_timeout=0.1)
+        assert l_disks[1].b_timed_out is True
+        assert o_driveutils.a_blocked_devices == set(["sdb"])
+
+        f_start = time.time()
+        for i_scan in range(5):
+            i_error_code, l_disks = o_driveutils.get_all_disks(i_max_workers=2, f_timeout=0.1)
+            assert l_disks[1].b_timed_out is True
+            assert l_disks[2].suspect is False
+        f_elapsed = time.time() - f_start
+
+        # Flagged right away, without waiting for its timeout nor taking another thread
+        assert f_elapsed < 0.3
+        f_deadline = time.time() + 20
+        while len(o_driveutils.a_blocked_devices) > 0 and time.time() < f_deadline:
+            time.sleep(0.05)
+        assert o_driveutils.a_blocked_devices == set()
+
+    def test_get_all_disks_inventory(self):
+        o_driveutils = DriveUtils(FakeFile(self.d_ids))
+        i_error_code, o_inventory = o_driveutils.get_all_disks()
+
+        assert o_inventory.get_by_alias("ata-ST1000NM0033_Z1W0AAAA").s_dev_name == "sda"
+        assert o_inventory.get_by_wwn("0x5000c500a1b2c3d3").s_dev_name == "sdc"
+        assert o_inventory.get_aliases("sda") == ["wwn-0x5000c500a1b2c3d1", "ata-ST1000NM0033_Z1W0AAAA"]
+
+    def test_wwn_alias_after_ata_alias(self):
+        d_ids = {"ata-ST1000NM0033_Z1W0AAAA": "sda",
+                 "ata-ST1000NM0033_Z1W0BBBB": "sdb",
+                 "wwn-0x5000c500a1b2c3d1": "sda",
+                 "wwn-0x5000c500a1b2c3d2": "sdb"}
+
+        for i_max_workers in [0, 2]:
+            i_error_code, o_inventory = DriveUtils(FakeFile(d_ids)).get_all_disks(i_max_workers)
+
+            assert [o_disk.id for o_disk in o_inventory] == ["ata-ST1000NM0033_Z1W0AAAA", "ata-ST1000NM0033_Z1W0BBBB"]
+            assert o_inventory.get_by_wwn("0x5000c500a1b2c3d1").s_dev_name == "sda"
+            assert o_inventory.get_by_wwn("0x5000c500a1b2c3d2").s_dev_name == "sdb"
+
+        o_inventory = DiskInventory()
+        for o_disk in DriveUtils(FakeFile(d_ids)).iter_disks(o_inventory, b_lazy=True):
+            pass
+        assert o_inventory.get_by_wwn("0x5000c500a1b2c3d2").s_dev_name == "sdb"
+
+    def test_iter_disks_yields_before_probing_the_rest(self):
+        o_file = FakeFile(self.d_ids, a_slow_disks=["sdd"], f_delay=3.0)
+        o_driveutils = DriveUtils(o_file)
+        o_scan_status = ScanStatus()
+
+        f_start = time.time()
+        o_disks = o_driveutils.iter_disks(o_scan_status=o_scan_status)
+        o_first_disk = next(o_disks)
+
+        assert time.time() - f_start < 2.0
+        assert o_first_disk.s_dev_name == "sda"
+        assert o_first_disk.size == "1.00TB"
+        o_file.a_slow_disks = []
+        assert [o_disk.s_dev_name for o_disk in o_disks] == ["sdb", "sdc", "sdd"]
+        assert o_scan_status.i_error_code == 0
+
+    def test_concurrent_scans_keep_their_error_code(self):
+        o_file = FakeFile(self.d_ids)
+        o_driveutils = DriveUtils(o_file)
+        o_scan_status = ScanStatus()
+        o_disks = o_driveutils.iter_disks(o_scan_status=o_scan_status)
+        next(o_disks)
+
+        # Another scan, while the first one is still running, can not read /dev/disk/by-id
+        o_file.list_dir = lambda s_dir: (False, [])
+        o_failed_scan_status = ScanStatus()
+        assert list(o_driveutils.iter_disks(o_scan_status=o_failed_scan_status)) == []
+        assert o_driveutils.get_all_disks()[0] == ScanStatus.ERROR_NOT_READ
+        del o_file.list_dir
+
+        assert len(list(o_disks)) == 3
+        assert o_scan_status.i_error_code == ScanStatus.ERROR_OK
+        assert o_failed_scan_status.i_error_code == ScanStatus.ERROR_NOT_READ
+
+    def test_iter_disks_partitions_fallback(self):
+        s_partitions = "   8        0  976762584 sda\n" \
+                       "   8        1     524288 sda1\n" \
+                       " 254        0  268435456 vda\n" \
+                       "   7        0      65536 loop0\n"
+        o_driveutils = DriveUtils(FakeFile(self.d_ids, s_partitions=s_partitions))
+
+        a_disks = list(o_driveutils.iter_disks())
+
+        assert [o_disk.s_dev_name for o_disk in a_disks] == ["sda", "sdb", "sdc", "sdd", "vda"]
+        assert a_disks[0].s_major_minor == "8:0"
+        assert a_disks[4].id == "n/a"
+        assert a_disks[4].s_major_minor == "254:0"
+
+    def test_get_all_disks_without_by_id(self):
+        o_file = FakeFile({}, s_partitions=" 254        0  268435456 vda\n")
+        o_file.list_dir = lambda s_dir: (False, [])
+        o_driveutils = DriveUtils(o_file)
+
+        i_error_code, l_disks = o_driveutils.get_all_disks(i_max_workers=2)
+
+        assert i_error_code == 1
+        assert [o_disk.s_dev_name for o_disk in l_disks] == ["vda"]
+
+    def test_attach_latency_histograms(self):
+        o_driveutils = DriveUtils(FakeFile(self.d_ids))
+        i_error_code, l_disks = o_driveutils.get_all_disks()
+        o_histogram = LatencyHistogram()
+
+        assert o_driveutils.attach_latency_histograms(l_disks, {"sdb": o_histogram}) == 1
+        assert l_disks.get_by_dev_name("sdb").o_latency_histogram is o_histogram
+        assert l_disks.get_by_dev_name("sda").o_latency_histogram is None
+
+    def test_iter_disks_lazy(self):
+        o_file = FakeFile(self.d_ids)
+        o_driveutils = DriveUtils(o_file)
+        i_error_code, l_probed_disks = o_driveutils.get_all_disks()
+        i_full_scan_reads = o_file.i_reads
+
+        o_file.i_reads = 0
+        l_disks = DiskInventory()
+        a_names = [o_disk.s_dev_name for o_disk in o_driveutils.iter_disks(l_disks, b_lazy=True)]
+
+        # Only /proc/partitions
+        assert o_file.i_reads == 1
+        assert a_names == ["sda", "sdb", "sdc", "sdd"]
+        assert l_disks.get_by_wwn("0x5000c500a1b2c3d3").s_dev_name == "sdc"
+        assert l_disks[1].size == "1.00TB"
+        assert o_file.i_reads == 2
+        assert l_disks[1].size == "1.00TB"
+        assert o_file.i_reads == 2
+
+        for o_disk, o_probed_disk in zip(l_disks, l_probed_disks):
+            assert o_disk.get_drive_info() == o_probed_disk.get_drive_info()
+            assert (o_disk.ioc, o_disk.manufacturer, o_disk.type, o_disk.status, o_disk.suspect,
+                    o_disk.has_partition3) == \
+                   (o_probed_disk.ioc, o_probed_disk.manufacturer, o_probed_disk.type, o_probed_disk.status,
+                    o_probed_disk.suspect, o_probed_disk.has_partition3)
+        assert o_file.i_reads == i_full_scan_reads
+
+    def test_get_all_disks_from_sysfs(self, tmp_path):
+        o_tree = SysfsTree(str(tmp_path))
+        o_tree.create_disk("sda", 0, ["wwn-0x5000c500a1b2c3d4", "ata-ST4000NM0035_ZC11ABCD",
+                                      "wwn-0x5000c500a1b2c3d4-part1"], "ZC11ABCD", b_partition3=True)
+        o_tree.create_disk("sdb", 16, ["wwn-0x5000c500a1b2c3d5"], "ZC11ABCE", s_stat="0 0 0 0 0 0 0 0 0 0 0")
+
+        i_error_code, l_disks = o_tree.get_driveutils().get_all_disks()
+
+        assert i_error_code == 0
+        assert sorted([o_disk.s_dev_name for o_disk in l_disks]) == ["sda", "sdb"]
+
+        o_disk = l_disks.get_by_dev_name("sda")
+        assert o_disk.ioc == "7"
+        assert o_disk.size == "4.00TB"
+        assert o_disk.type == "Spinning"
+        assert o_disk.manufacturer == "SEAGATE "
+        assert o_disk.s_serial == "ZC11ABCD"
+        assert o_disk.s_logical_block_size == "512"
+        assert o_disk.s_physical_block_size == "4096"
+        assert o_disk.has_partition3 is True
+        assert o_disk.suspect is False
+
+        o_disk = l_disks.get_by_dev_name("sdb")
+        assert o_disk.has_partition3 is False
+        assert o_disk.status == o_disk.STATUS_FAILURE
+        assert o_disk.b_unreadable is True
+
+    def test_missing_sysfs_entry_is_suspect(self, tmp_path):
+        o_tree = SysfsTree(str(tmp_path))
+        o_tree.create_disk("sda", 0, ["wwn-0x5000c500a1b2c3d4"], "ZC11ABCD")
+        os.symlink("../../sdz", str(tmp_path) + "/dev/disk/by-id/wwn-0x5000c500a1b2c3ff")
+
+        i_error_code, l_disks = o_tree.get_driveutils().get_all_disks()
+
+        assert i_error_code == 0
+        o_disk = l_disks.get_by_dev_name("sdz")
+        assert o_disk.suspect is True
+        assert o_disk.s_serial == ""
+        assert o_disk.s_physical_block_size == "n/a"
@@ -0,0 +1,71 @@
+#
+# Tests for Enclosure classes
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+import os
+from ..src.lib.file import File
+from ..src.lib.disk import Disk
+from ..src.lib.diskinventory import DiskInventory
+from ..src.lib.enclosure import EnclosureIndex
+
+
+class TestEnclosure(object):
+
+    def create_slot(self, s_sys_root, s_enclosure, i_slot, s_dev_name, s_fault="0"):
+        """
+        Creates a component of an enclosure, with a device if s_dev_name is not empty
+        """
+        o_file = File()
+        s_component_path = s_sys_root + "/class/enclosure/" + s_enclosure + "/Slot " + "%02d" % i_slot
+        o_file.create_folder(s_component_path)
+        o_file.write(s_component_path + "/slot", str(i_slot) + "\n")
+        o_file.write(s_component_path + "/status", "OK\n")
+        o_file.write(s_component_path + "/power_status", "on\n")
+        o_file.write(s_component_path + "/fault", s_fault + "\n")
+        o_file.write(s_component_path + "/locate", "0\n")
+        if s_dev_name != "":
+            s_device_path = s_sys_root + "/devices/" + s_enclosure + "-" + str(i_slot)
+            o_file.create_folder(s_device_path + "/block/" + s_dev_name)
+            os.symlink(s_device_path, s_component_path + "/device")
+
+    # Start Tests
+    def test_build(self, tmp_path):
+        s_sys_root = str(tmp_path)
+        self.create_slot(s_sys_root, "0:0:24:0", 1, "sda")
+        self.create_slot(s_sys_root, "0:0:24:0", 2, "")
+        self.create_slot(s_sys_root, "0:0:24:0", 3, "sdb", s_fault="1")
+        self.create_slot(s_sys_root, "1:0:24:0", 1, "sdc")
+        os.symlink(s_sys_root + "/devices", s_sys_root + "/class/enclosure/0:0:24:0/device")
+
+        o_enclosure_index = EnclosureIndex(File(), s_sys_root=s_sys_root)
+        assert o_enclosure_index.build() is True
+
+        assert o_enclosure_index.get_enclosures() == ["0:0:24:0", "1:0:24:0"]
+        assert len(o_enclosure_index.get_slots("0:0:24:0")) == 3
+        assert [o_slot.s_slot for o_slot in o_enclosure_index.get_empty_slots("0:0:24:0")] == ["2"]
+        assert [o_slot.s_dev_name for o_slot in o_enclosure_index.get_faulted_slots("0:0:24:0")] == ["sdb"]
+        assert o_enclosure_index.get_slot_for_dev_name("sdc").s_enclosure == "1:0:24:0"
+
+        o_inventory = DiskInventory()
+        for s_dev_name in ["sda", "sdb", "sdz"]:
+            o_inventory.add(Disk(s_dev_name))
+
+        i_found = o_enclosure_index.apply_to_disks(o_inventory)
+        assert i_found == 2
+        o_disk = o_inventory.get_by_dev_name("sdb")
+        assert o_disk.s_slot == "3"
+        assert o_disk.s_drive_status == "OK"
+        assert o_disk.s_power_status == "on"
+        assert o_disk.s_fault == "1"
+        assert o_disk.s_locate == "0"
+        assert o_inventory.get_by_slot("3") == [o_disk]
+
+    def test_build_ko(self, tmp_path):
+        o_enclosure_index = EnclosureIndex(File(), s_sys_root=str(tmp_path))
+
+        assert o_enclosure_index.build() is False
+        assert o_enclosure_index.get_enclosures() == []
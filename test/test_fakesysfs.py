@@ -0,0 +1,69 @@
+#
+# Tests for FakeSysfs class, checking DriveUtils against the synthetic tree
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+from ..src.lib.file import File
+from ..src.lib.fakesysfs import FakeSysfs
+from ..src.lib.driveutils import DriveUtils
+
+
+class TestFakeSysfs(object):
+
+    def create_fake_sysfs(self, s_root):
+        o_fake_sysfs = FakeSysfs(s_root)
+        b_success = o_fake_sysfs.create(30, i_nvme_disks=2, i_slots_per_enclosure=12, i_disks_per_host=16)
+        assert b_success is True
+
+        return o_fake_sysfs
+
+    def get_disk_values(self, o_disk):
+        return (o_disk.s_dev_name, o_disk.id, o_disk.s_serial, o_disk.s_wwn, o_disk.s_major_minor, o_disk.size,
+                o_disk.byte_size, o_disk.type, o_disk.ioc, o_disk.has_partition3, o_disk.s_logical_block_size,
+                o_disk.s_physical_block_size, o_disk.suspect, o_disk.b_unreadable, o_disk.status)
+
+    # Start Tests
+    def test_get_sd_name(self):
+        o_fake_sysfs = FakeSysfs("/tmp/not_used")
+
+        assert o_fake_sysfs.get_sd_name(0) == "sda"
+        assert o_fake_sysfs.get_sd_name(25) == "sdz"
+        assert o_fake_sysfs.get_sd_name(26) == "sdaa"
+        assert o_fake_sysfs.get_sd_name(701) == "sdzz"
+        assert o_fake_sysfs.get_sd_name(702) == "sdaaa"
+
+    def test_drive_utils(self, tmp_path):
+        o_fake_sysfs = self.create_fake_sysfs(str(tmp_path))
+
+        o_driveutils = DriveUtils(File(), o_fake_sysfs.s_sys_root, o_fake_sysfs.s_dev_root, o_fake_sysfs.s_proc_root)
+        i_error_code, o_inventory = o_driveutils.get_all_disks()
+
+        assert i_error_code == 0
+        assert len(o_inventory) == 32
+        for d_expected in o_fake_sysfs.a_disks:
+            o_disk = o_inventory.get_by_dev_name(d_expected["dev_name"])
+            assert o_disk.s_serial == d_expected["serial"]
+            assert o_disk.ioc == d_expected["ioc"]
+            assert o_disk.has_partition3 == d_expected["has_partition3"]
+            assert o_disk.size == "4.00TB"
+            assert o_disk.suspect is False
+
+        o_enclosure_index = o_driveutils.load_enclosure_info(o_inventory)
+        assert len(o_enclosure_index.get_enclosures()) == 3
+        assert len(o_enclosure_index.get_empty_slots("2:0:1002:0")) == 6
+        assert o_inventory.get_by_dev_name("sdn").s_slot == "1"
+        assert len(o_inventory.get_by_slot("1")) == 3
+
+    def test_concurrent_scan_returns_the_same(self, tmp_path):
+        o_fake_sysfs = self.create_fake_sysfs(str(tmp_path))
+
+        o_driveutils = DriveUtils(File(), o_fake_sysfs.s_sys_root, o_fake_sysfs.s_dev_root, o_fake_sysfs.s_proc_root)
+        i_error_code, o_inventory = o_driveutils.get_all_disks()
+        i_error_code_concurrent, o_inventory_concurrent = o_driveutils.get_all_disks(i_max_workers=4)
+
+        assert i_error_code_concurrent == i_error_code
+        assert [self.get_disk_values(o_disk) for o_disk in o_inventory_concurrent] == \
+               [self.get_disk_values(o_disk) for o_disk in o_inventory]
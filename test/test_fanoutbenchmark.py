@@ -0,0 +1,87 @@
+#
+# Tests for FanoutBenchmark class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import multiprocessing
+import pytest
+from ..src.lib.disk import Disk
+from ..src.lib.fanoutbenchmark import FanoutBenchmark, run_worker
+
+
+class TestFanoutBenchmark(object):
+
+    def create_disks(self, tmp_path):
+        """
+        Four disks backed by files, two behind each IOC, and one missing
+        """
+        a_disks = []
+        for i_disk, s_ioc in enumerate(["3", "3", "4", "4"]):
+            o_disk = Disk("sd" + chr(ord("a") + i_disk))
+            o_disk.ioc = s_ioc
+            with open(str(tmp_path / o_disk.s_dev_name), "wb") as o_target:
+                o_target.write(b"\x00" * 262144)
+            a_disks.append(o_disk)
+        return a_disks
+
+    # Start Tests
+    def test_get_jobs_per_worker(self):
+        a_disks = [Disk("sd" + chr(ord("a") + i_disk)) for i_disk in range(5)]
+        o_fanout_benchmark = FanoutBenchmark(s_dev_root="/dev/")
+
+        a_workers = o_fanout_benchmark.get_jobs_per_worker(a_disks, FanoutBenchmark.MODE_PER_DISK)
+        assert len(a_workers) == 5
+        assert a_workers[0] == [("sda", "/dev/sda")]
+
+        a_workers = o_fanout_benchmark.get_jobs_per_worker(a_disks, FanoutBenchmark.MODE_PER_CPU)
+        assert len(a_workers) <= 5
+        assert sum([len(a_jobs) for a_jobs in a_workers]) == 5
+
+    def test_run_grouped_by_ioc(self, tmp_path):
+        a_disks = self.create_disks(tmp_path)
+        o_fanout_benchmark = FanoutBenchmark(s_dev_root=str(tmp_path))
+
+        b_success, d_report = o_fanout_benchmark.run(a_disks, i_io_size=4096, i_queue_depth=2, f_duration=0,
+                                                     i_max_ios=50, b_direct=False, f_grace=20.0)
+
+        assert b_success is True
+        assert sorted(d_report["disks"].keys()) == ["sda", "sdb", "sdc", "sdd"]
+        assert d_report["disks"]["sdc"]["ioc"] == "4"
+        assert d_report["iocs"]["3"]["disks"] == 2
+        assert d_report["iocs"]["3"]["ios"] == 100
+        assert d_report["total"]["ios"] == 200
+        assert d_report["total"]["mb_s"] == pytest.approx(sum([d_report["iocs"][s_ioc]["mb_s"]
+                                                               for s_ioc in ["3", "4"]]))
+        a_lines = o_fanout_benchmark.format_report(d_report)
+        assert a_lines[2].startswith("IOC: 3 Disks: 2 Failed: 0")
+        assert a_lines[-1].startswith("Total: Disks: 4")
+
+    def test_run_missing_disk(self, tmp_path):
+        a_disks = self.create_disks(tmp_path)
+        a_disks.append(Disk("sdz"))
+        o_fanout_benchmark = FanoutBenchmark(s_dev_root=str(tmp_path))
+
+        b_success, d_report = o_fanout_benchmark.run(a_disks, s_mode=FanoutBenchmark.MODE_PER_CPU, i_io_size=4096,
+                                                     f_duration=0, i_max_ios=10, b_direct=False, f_grace=20.0)
+
+        assert b_success is False
+        assert "error" in d_report["disks"]["sdz"]
+        assert d_report["iocs"]["-"]["failed"] == 1
+        assert d_report["total"]["ios"] == 40
+
+    def test_worker_does_not_run_alone(self, tmp_path):
+        self.create_disks(tmp_path)
+        d_options = {"sys_root": "/sys", "pattern": "sequential", "io_size": 4096, "queue_depth": 1, "duration": 0,
+                     "max_ios": 10, "direct": False, "start_timeout": 0.1}
+        # Nobody else arrives to the barrier
+        o_start = multiprocessing.Barrier(2)
+        o_results = multiprocessing.Queue()
+
+        run_worker([("sda", str(tmp_path / "sda"))], d_options, o_start, o_results)
+
+        s_dev_name, b_success, d_results, a_histogram = o_results.get(timeout=5)
+        assert s_dev_name == "sda"
+        assert b_success is False
+        assert "error" in d_results
@@ -7,6 +7,8 @@
 
 import pytest
 import os
+import threading
+import time
 from ..src.lib.file import File
 
 
@@ -235,3 +237,201 @@ class TestFile(object):
 
         assert b_success is True
         assert len(l_files) > 0
+
+    def test_read_pooled(self):
+        o_file = File(i_max_pooled_fds=2)
+
+        o_file.write("/tmp/test_pooled_1.txt", "one")
+        o_file.write("/tmp/test_pooled_2.txt", "two")
+        o_file.write("/tmp/test_pooled_3.txt", "x" * 10000)
+
+        b_result, s_text = o_file.read_pooled("/tmp/test_pooled_1.txt")
+        assert b_result is True
+        assert s_text == "one"
+
+        # The content is read again from the same descriptor
+        o_file.write("/tmp/test_pooled_1.txt", "ONE")
+        b_result, s_text = o_file.read_pooled("/tmp/test_pooled_1.txt")
+        assert s_text == "ONE"
+        assert len(o_file.d_pooled_fds) == 1
+
+        b_result, s_text = o_file.read_pooled("/tmp/test_pooled_2.txt")
+        b_result, s_text = o_file.read_pooled("/tmp/test_pooled_3.txt")
+        assert b_result is True
+        assert len(s_text) == 10000
+
+        # The least recently used was evicted
+        assert list(o_file.d_pooled_fds.keys()) == ["/tmp/test_pooled_2.txt", "/tmp/test_pooled_3.txt"]
+
+        b_result, a_binary = o_file.read_binary_pooled("/tmp/test_pooled_2.txt")
+        assert b_result is True
+        assert a_binary == bytearray(b"two")
+
+        i_closed = o_file.invalidate_pooled("/tmp/test_pooled_2")
+        assert i_closed == 1
+        assert list(o_file.d_pooled_fds.keys()) == ["/tmp/test_pooled_3.txt"]
+
+        o_file.close_pooled()
+        assert len(o_file.d_pooled_fds) == 0
+
+        for s_file in ["/tmp/test_pooled_1.txt", "/tmp/test_pooled_2.txt", "/tmp/test_pooled_3.txt"]:
+            o_file.delete(s_file)
+
+    def test_read_pooled_ko(self):
+        o_file = File()
+        b_result, s_text = o_file.read_pooled("/not_existing/test_file.txt")
+
+        assert b_result is False
+        assert s_text == ""
+        assert len(o_file.d_pooled_fds) == 0
+
+    def test_pwrite(self, tmp_path):
+        o_file = File()
+        s_file = str(tmp_path / "test_pwrite.bin")
+
+        b_result, i_fd = o_file.open_for_write(s_file)
+        assert b_result is True
+        assert o_file.pwrite(i_fd, b"world", 6) == (True, 5)
+        assert o_file.pwrite(i_fd, bytearray(b"hello "), 0) == (True, 6)
+        assert o_file.fsync(i_fd) is True
+        o_file.close_fd(i_fd)
+
+        b_result, a_binary = o_file.read_binary(s_file)
+        assert a_binary == bytearray(b"hello world")
+
+        assert o_file.open_for_write(str(tmp_path / "not_existing" / "test.bin")) == (False, -1)
+        assert o_file.pwrite(i_fd, b"closed", 0) == (False, 0)
+        assert o_file.fsync(i_fd) is False
+
+    def test_write_atomic(self, tmp_path):
+        o_file = File()
+        s_file = str(tmp_path / "state.json")
+
+        assert o_file.write_atomic(s_file, "{}") is True
+        os.chmod(s_file, 0o600)
+        assert o_file.write_atomic(s_file, '{"disks": 60}') is True
+
+        b_result, s_text = o_file.read(s_file)
+        assert s_text == '{"disks": 60}'
+        assert os.stat(s_file).st_mode & 0o777 == 0o600
+        # No temporary files left behind
+        assert os.listdir(str(tmp_path)) == ["state.json"]
+
+        assert o_file.write_atomic(str(tmp_path / "not_existing" / "state.json"), "{}") is False
+
+    def test_appender(self, tmp_path):
+        o_file = File()
+        s_file = str(tmp_path / "scan.log")
+
+        b_result, o_appender = o_file.get_appender(s_file, i_max_buffer_bytes=10, f_max_delay=0)
+        assert b_result is True
+        assert o_appender.append("one\n") is True
+        # Still in the buffer
+        assert o_file.read(s_file) == (True, "")
+        assert o_appender.append("two\nthree\n") is True
+        assert o_file.read(s_file) == (True, "one\ntwo\nthree\n")
+        assert o_appender.append("four\n") is True
+        assert o_appender.close() is True
+        assert o_file.read(s_file) == (True, "one\ntwo\nthree\nfour\n")
+        assert o_appender.append("five\n") is False
+
+        b_result, o_appender = o_file.get_appender(str(tmp_path / "not_existing" / "scan.log"))
+        assert b_result is False
+        assert o_appender is None
+
+    def test_appender_max_delay(self, tmp_path):
+        s_file = str(tmp_path / "scan.log")
+
+        with File().get_appender(s_file, f_max_delay=0.05)[1] as o_appender:
+            assert o_appender.append("line\n") is True
+            time.sleep(0.5)
+            assert File().read(s_file) == (True, "line\n")
+
+    def test_appender_group_commit(self, tmp_path):
+        s_file = str(tmp_path / "scan.log")
+        b_result, o_appender = File().get_appender(s_file, f_max_delay=0)
+
+        def write_lines(i_thread):
+            for i_line in range(20):
+                o_appender.append("%d %d\n" % (i_thread, i_line))
+                assert o_appender.sync() is True
+
+        a_threads = [threading.Thread(target=write_lines, args=(i_thread,)) for i_thread in range(8)]
+        for o_thread in a_threads:
+            o_thread.start()
+        for o_thread in a_threads:
+            o_thread.join()
+        o_appender.close()
+
+        b_result, a_lines = File().readlines(s_file)
+        assert len(a_lines) == 160
+        assert o_appender.i_synced == o_appender.i_appended
+        assert o_appender.i_fsyncs <= 160
+
+    def test_iter_lines(self, tmp_path):
+        o_file = File()
+        s_file = str(tmp_path / "lines.txt")
+        o_file.write(s_file, "one\ntwo\n\nlast without end")
+
+        b_result, o_lines = o_file.iter_lines(s_file)
+        assert b_result is True
+        assert list(o_lines) == ["one\n", "two\n", "\n", "last without end"]
+
+        o_file.write(s_file, "")
+        b_result, o_lines = o_file.iter_lines(s_file)
+        assert list(o_lines) == []
+
+        # Pseudo files can not be mapped
+        b_result, o_lines = o_file.iter_lines("/proc/self/status")
+        assert b_result is True
+        assert next(o_lines).startswith("Name:")
+        o_lines.close()
+
+        b_result, o_lines = o_file.iter_lines(str(tmp_path / "not_existing.txt"))
+        assert b_result is False
+        assert list(o_lines) == []
+
+        # Invalid UTF-8
+        with open(s_file, "wb") as o_binary:
+            o_binary.write(b"one\n\xff\xfebad\nlast\n")
+        b_result, o_lines = o_file.iter_lines(s_file)
+        assert list(o_lines) == ["one\n", "\ufffd\ufffdbad\n", "last\n"]
+
+        # Nothing is opened until the first line
+        i_fds = len(os.listdir("/proc/self/fd"))
+        a_generators = [o_file.iter_lines(s_file)[1] for i_generator in range(10)]
+        assert len(os.listdir("/proc/self/fd")) == i_fds
+        o_file.write(s_file, "one\ntwo\n")
+        assert next(a_generators[0]) == "one\n"
+        assert len(os.listdir("/proc/self/fd")) > i_fds
+        a_generators[0].close()
+        assert len(os.listdir("/proc/self/fd")) == i_fds
+
+    def test_iter_with_mask(self, tmp_path):
+        o_file = File()
+        for s_name in ["a.log", "b.log", "c.txt", ".hidden.log"]:
+            o_file.write(str(tmp_path / s_name), "")
+
+        assert sorted(o_file.iter_with_mask(str(tmp_path / "*.log"))) == [str(tmp_path / "a.log"),
+                                                                          str(tmp_path / "b.log")]
+        assert list(o_file.iter_with_mask(str(tmp_path / ".*.log"))) == [str(tmp_path / ".hidden.log")]
+        assert list(o_file.iter_with_mask(str(tmp_path / "c.txt"))) == [str(tmp_path / "c.txt")]
+        assert list(o_file.iter_with_mask(str(tmp_path / "*" / "*.log"))) == []
+        assert list(o_file.iter_with_mask(str(tmp_path / "not_existing" / "*.log"))) == []
+
+    def test_delete_all_with_mask_in_batches(self, tmp_path):
+        o_file = File()
+        for i_file in range(25):
+            o_file.write(str(tmp_path / ("spool_%d.tmp" % i_file)), "")
+        os.mkdir(str(tmp_path / "spool_dir.tmp"))
+
+        for i_max_workers in [0, 4]:
+            b_success, i_files_deleted, d_failures = o_file.delete_all_with_mask_in_batches(
+                str(tmp_path / "spool_*.tmp"), i_batch_size=7, i_max_workers=i_max_workers)
+
+            # The directory can not be deleted with remove, but it does not stop the rest
+            assert b_success is False
+            assert list(d_failures.keys()) == [str(tmp_path / "spool_dir.tmp")]
+            assert i_files_deleted == (25 if i_max_workers == 0 else 0)
+
+        assert os.listdir(str(tmp_path)) == ["spool_dir.tmp"]
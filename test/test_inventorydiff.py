@@ -0,0 +1,108 @@
+#
+# Tests for InventoryDiff class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+from ..src.lib.disk import Disk
+from ..src.lib.diskinventory import DiskInventory
+from ..src.lib.inventorydiff import InventoryDiff, InventoryEvent
+
+
+class TestInventoryDiff(object):
+
+    def create_disk(self, s_dev_name, s_serial="", s_wwn="", s_slot=""):
+        o_disk = Disk(s_dev_name)
+        o_disk.s_serial = s_serial
+        o_disk.s_wwn = s_wwn
+        o_disk.s_slot = s_slot
+        return o_disk
+
+    def create_inventory(self):
+        o_inventory = DiskInventory()
+        o_inventory.add(self.create_disk("sda", "ZC100001", s_slot="0"))
+        o_inventory.add(self.create_disk("sdb", "ZC100002", s_slot="1"))
+        o_inventory.add(self.create_disk("sdc", s_wwn="0x5000c500a1b2c3d3", s_slot="2"))
+        o_inventory.add(self.create_disk("vda"))
+        return o_inventory
+
+    # Start Tests
+    def test_no_changes(self):
+        assert InventoryDiff().diff(self.create_inventory(), self.create_inventory()) == []
+
+    def test_added_removed(self):
+        o_old_inventory = self.create_inventory()
+        o_new_inventory = self.create_inventory()
+        o_new_inventory.add(self.create_disk("sdd", "ZC100004", s_slot="3"))
+        a_new_disks = [o_disk for o_disk in o_new_inventory if o_disk.s_dev_name != "sdb"]
+
+        a_events = InventoryDiff().diff(o_old_inventory, a_new_disks)
+
+        assert [(o_event.s_type, o_event.s_key) for o_event in a_events] == \
+               [(InventoryEvent.EVENT_REMOVED, "serial:ZC100002"), (InventoryEvent.EVENT_ADDED, "serial:ZC100004")]
+        assert a_events[0].o_disk.s_dev_name == "sdb"
+        assert a_events[1].to_dict() == {"type": "added", "key": "serial:ZC100004", "dev_name": "sdd"}
+
+    def test_changed(self):
+        o_old_inventory = self.create_inventory()
+        o_new_inventory = self.create_inventory()
+        # The disk of slot 0 was moved to slot 5 and got a new dev name
+        o_new_inventory[0].s_slot = "5"
+        o_new_inventory[0].s_dev_name = "sde"
+        o_new_inventory[1].s_fault = "1"
+        o_new_inventory[2].status = Disk.STATUS_FAILURE
+        o_new_inventory[2].b_unreadable = True
+
+        a_events = InventoryDiff().diff(o_old_inventory, o_new_inventory)
+
+        assert [(o_event.s_key, o_event.s_field, o_event.o_old_value, o_event.o_new_value) for o_event in a_events] \
+            == [("serial:ZC100001", "s_dev_name", "sda", "sde"),
+                ("serial:ZC100001", "s_slot", "0", "5"),
+                ("serial:ZC100002", "s_fault", "", "1"),
+                ("wwn:0x5000c500a1b2c3d3", "status", None, "FAILURE"),
+                ("wwn:0x5000c500a1b2c3d3", "b_unreadable", False, True)]
+        assert str(a_events[2]) == "changed sdb (serial:ZC100002) s_fault:  -> 1"
+
+    def test_identity_not_read(self):
+        o_old_inventory = self.create_inventory()
+        o_old_inventory[2].s_serial = "ZC100003"
+        o_new_inventory = self.create_inventory()
+        # A transient error reading the serial of sda, and of sdc that still has its WWN
+        o_new_inventory[0].s_serial = ""
+        # The WWN of sdb read for the first time
+        o_new_inventory[1].s_wwn = "0x5000c500a1b2c3d2"
+
+        a_events = InventoryDiff().diff(o_old_inventory, o_new_inventory)
+
+        assert [(o_event.s_type, o_event.s_key, o_event.s_field, o_event.o_old_value, o_event.o_new_value)
+                for o_event in a_events] == \
+               [(InventoryEvent.EVENT_CHANGED, "serial:ZC100001", "s_serial", "ZC100001", ""),
+                (InventoryEvent.EVENT_CHANGED, "serial:ZC100002", "s_wwn", "", "0x5000c500a1b2c3d2"),
+                (InventoryEvent.EVENT_CHANGED, "wwn:0x5000c500a1b2c3d3", "s_serial", "ZC100003", "")]
+
+        # Another disk in the same dev name is not the same disk
+        o_new_inventory = self.create_inventory()
+        o_new_inventory[1].s_serial = "ZC100009"
+        a_events = InventoryDiff().diff(self.create_inventory(), o_new_inventory)
+        assert [(o_event.s_type, o_event.s_key) for o_event in a_events] == \
+               [(InventoryEvent.EVENT_REMOVED, "serial:ZC100002"), (InventoryEvent.EVENT_ADDED, "serial:ZC100009")]
+
+    def test_duplicated_serial(self):
+        o_old_inventory = self.create_inventory()
+        o_new_inventory = self.create_inventory()
+        o_new_inventory.add(self.create_disk("sdz", "ZC100001"))
+
+        a_events = InventoryDiff().diff(o_old_inventory, o_new_inventory)
+
+        assert [(o_event.s_type, o_event.s_key) for o_event in a_events] == \
+               [(InventoryEvent.EVENT_ADDED, "serial:ZC100001@sdz")]
+
+    def test_linear(self):
+        a_old_disks = [self.create_disk("sd%d" % i_disk, "S%06d" % i_disk) for i_disk in range(100000)]
+        a_new_disks = [self.create_disk("sd%d" % (i_disk + 1), "S%06d" % i_disk) for i_disk in range(1, 100001)]
+
+        a_events = InventoryDiff().diff(a_old_disks, a_new_disks)
+
+        assert len(a_events) == 2 + 99999
@@ -0,0 +1,92 @@
+#
+# Tests for InventorySnapshot class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+from ..src.lib.file import File
+from ..src.lib.fakesysfs import FakeSysfs
+from ..src.lib.driveutils import DriveUtils
+from ..src.lib.inventorysnapshot import InventorySnapshot
+
+
+class CountingDriveUtils(DriveUtils):
+    """
+    DriveUtils that counts the full probes of disks
+    """
+
+    i_probes = 0
+
+    def get_disk_info(self, disk, b_cmdline=False):
+        self.i_probes = self.i_probes + 1
+        return DriveUtils.get_disk_info(self, disk, b_cmdline)
+
+
+class TestInventorySnapshot(object):
+
+    def create_snapshot(self, s_root):
+        o_fake_sysfs = FakeSysfs(s_root + "/tree")
+        assert o_fake_sysfs.create(6, i_nvme_disks=1, i_slots_per_enclosure=12, i_disks_per_host=16) is True
+        o_driveutils = CountingDriveUtils(File(), o_fake_sysfs.s_sys_root, o_fake_sysfs.s_dev_root,
+                                          o_fake_sysfs.s_proc_root)
+        return o_fake_sysfs, InventorySnapshot(o_driveutils, s_root + "/run/disksio/inventory.json")
+
+    def get_disk_values(self, o_disk):
+        return (o_disk.s_dev_name, o_disk.id, o_disk.s_serial, o_disk.s_wwn, o_disk.s_major_minor, o_disk.size,
+                o_disk.type, o_disk.ioc, o_disk.has_partition3, o_disk.s_logical_block_size,
+                o_disk.s_physical_block_size, o_disk.suspect, o_disk.b_unreadable, o_disk.status)
+
+    # Start Tests
+    def test_cold_and_warm(self, tmp_path):
+        o_fake_sysfs, o_snapshot = self.create_snapshot(str(tmp_path))
+
+        i_error_code, l_cold_disks, b_from_snapshot = o_snapshot.get_all_disks()
+        assert i_error_code == 0
+        assert b_from_snapshot is False
+        assert o_snapshot.o_driveutils.i_probes == 7
+
+        i_error_code, l_warm_disks, b_from_snapshot = o_snapshot.get_all_disks()
+        assert i_error_code == 0
+        assert b_from_snapshot is True
+        assert o_snapshot.o_driveutils.i_probes == 7
+        assert [self.get_disk_values(o_disk) for o_disk in l_warm_disks] == \
+               [self.get_disk_values(o_disk) for o_disk in l_cold_disks]
+        s_alias = l_cold_disks.get_aliases("sda")[-1]
+        assert l_warm_disks.get_by_alias(s_alias).s_dev_name == "sda"
+
+    def test_volatile_fields(self, tmp_path):
+        o_fake_sysfs, o_snapshot = self.create_snapshot(str(tmp_path))
+        o_snapshot.get_all_disks()
+
+        File().write(o_fake_sysfs.s_sys_root + "/class/block/sdb/stat", "0 0 0 0 0 0 0 0 0 0 0\n")
+        i_error_code, l_disks, b_from_snapshot = o_snapshot.get_all_disks()
+
+        assert b_from_snapshot is True
+        assert l_disks.get_by_dev_name("sdb").b_unreadable is True
+        assert l_disks.get_by_dev_name("sda").b_unreadable is False
+
+    def test_fingerprint_changes(self, tmp_path):
+        o_fake_sysfs, o_snapshot = self.create_snapshot(str(tmp_path))
+        o_snapshot.get_all_disks()
+        s_fingerprint = o_snapshot.get_fingerprint()
+
+        File().append(o_fake_sysfs.s_proc_root + "/partitions", "   8      112  3907018584 sdh\n")
+
+        assert o_snapshot.get_fingerprint() != s_fingerprint
+        i_error_code, l_disks, b_from_snapshot = o_snapshot.get_all_disks()
+        assert b_from_snapshot is False
+
+    def test_load_ko(self, tmp_path):
+        o_fake_sysfs, o_snapshot = self.create_snapshot(str(tmp_path))
+        s_fingerprint = o_snapshot.get_fingerprint()
+
+        assert o_snapshot.load(s_fingerprint)[0] is False
+        File().create_folder(str(tmp_path / "run" / "disksio"))
+        File().write(o_snapshot.s_path, "{not json")
+        assert o_snapshot.load(s_fingerprint)[0] is False
+        File().write(o_snapshot.s_path, '{"version": 1, "fingerprint": "' + s_fingerprint + '", "disks": [{}]}')
+        b_success, l_disks = o_snapshot.load(s_fingerprint)
+        assert b_success is False
+        assert len(l_disks) == 0
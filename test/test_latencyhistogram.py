@@ -0,0 +1,90 @@
+#
+# Tests for LatencyHistogram class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+import random
+from ..src.lib.latencyhistogram import LatencyHistogram
+
+
+class TestLatencyHistogram(object):
+
+    # Start Tests
+    def test_record_percentiles(self):
+        o_histogram = LatencyHistogram()
+        for i_value in range(1, 10001):
+            o_histogram.record(i_value)
+
+        assert len(o_histogram) == 10000
+        assert o_histogram.i_min == 1
+        assert o_histogram.i_max == 10000
+        assert o_histogram.get_mean() == 5000.5
+        assert o_histogram.get_value_at_percentile(50) == pytest.approx(5000, rel=0.016)
+        assert o_histogram.get_value_at_percentile(99.9) == pytest.approx(9990, rel=0.016)
+        assert o_histogram.get_value_at_percentile(100) == 10000
+        assert o_histogram.get_value_at_percentile(0) == 1
+
+    def test_small_values_exact(self):
+        o_histogram = LatencyHistogram()
+        o_histogram.record(3, 10)
+        o_histogram.record(100)
+
+        assert o_histogram.get_value_at_percentile(50) == 3
+        assert o_histogram.get_value_at_percentile(100) == 100
+
+    def test_bucket_precision(self):
+        o_histogram = LatencyHistogram()
+        o_random = random.Random(1)
+        for i_sample in range(2000):
+            i_value = o_random.randrange(o_histogram.i_max_value)
+            i_index = o_histogram.get_bucket_index(i_value)
+            i_highest_value = o_histogram.get_bucket_highest_value(i_index)
+            assert i_value <= i_highest_value <= i_value * 1.0157 + 1
+            assert i_index < o_histogram.i_buckets
+
+    def test_fixed_memory(self):
+        o_histogram = LatencyHistogram()
+        i_buckets = len(o_histogram.a_counts)
+        o_histogram.record(o_histogram.i_max_value * 100)
+        o_histogram.record_seconds(0.002, 1000000)
+
+        assert len(o_histogram.a_counts) == i_buckets
+        assert o_histogram.a_counts[-1] == 1
+        assert o_histogram.get_percentile_ms(50) == pytest.approx(2.0, rel=0.016)
+
+    def test_merge(self):
+        o_histogram_1 = LatencyHistogram()
+        o_histogram_2 = LatencyHistogram()
+        o_histogram_1.record(10)
+        o_histogram_2.record(5)
+        o_histogram_2.record(20000)
+
+        assert o_histogram_1.merge(o_histogram_2) is True
+        assert len(o_histogram_1) == 3
+        assert o_histogram_1.i_min == 5
+        assert o_histogram_1.i_max == 20000
+        assert o_histogram_1.get_value_at_percentile(50) == 10
+
+        assert o_histogram_1.merge(LatencyHistogram(i_sub_bucket_bits=5)) is False
+
+    def test_serialization(self):
+        o_histogram = LatencyHistogram()
+        for i_value in [0, 1, 150, 150, 4000, 2500000]:
+            o_histogram.record(i_value)
+
+        a_bytes = o_histogram.to_bytes()
+        assert len(a_bytes) < 40
+
+        o_loaded = LatencyHistogram()
+        assert o_loaded.load_bytes(a_bytes) is True
+        assert list(o_loaded.a_counts) == list(o_histogram.a_counts)
+        assert len(o_loaded) == 6
+        assert o_loaded.i_sum == o_histogram.i_sum
+        assert o_loaded.get_value_at_percentile(100) == 2500000
+
+        assert o_loaded.load_bytes(b"XX") is False
+        assert o_loaded.load_bytes(LatencyHistogram().to_bytes()) is True
+        assert len(o_loaded) == 0
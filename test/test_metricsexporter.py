@@ -0,0 +1,181 @@
+#
+# Tests for MetricsExporter class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+import threading
+import time
+import urllib.request
+from ..src.lib.file import File
+from ..src.lib.fakesysfs import FakeSysfs
+from ..src.lib.driveutils import DriveUtils
+from ..src.lib.metricsexporter import MetricsExporter
+
+
+class CountingFile(File):
+    """
+    File that counts the reads
+    """
+
+    i_reads = 0
+
+    def read(self, s_file):
+        self.i_reads = self.i_reads + 1
+        return File.read(self, s_file)
+
+    def read_pooled(self, s_file):
+        self.i_reads = self.i_reads + 1
+        return File.read_pooled(self, s_file)
+
+
+class SlowDriveUtils(DriveUtils):
+    """
+    DriveUtils whose scans block until o_release is set
+    """
+
+    def __init__(self, o_file, s_sys_root, s_dev_root, s_proc_root):
+        DriveUtils.__init__(self, o_file, s_sys_root, s_dev_root, s_proc_root)
+        self.o_release = threading.Event()
+        self.o_release.set()
+        self.b_fail = False
+        self.a_calls = []
+
+    def get_all_disks(self, i_max_workers=0, f_timeout=5.0):
+        self.a_calls.append((i_max_workers, f_timeout))
+        self.o_release.wait(10)
+        if self.b_fail is True:
+            raise OSError("Input/output error")
+        return DriveUtils.get_all_disks(self, i_max_workers, f_timeout)
+
+
+class TestMetricsExporter(object):
+
+    def create_exporter(self, s_root):
+        o_fake_sysfs = FakeSysfs(s_root)
+        assert o_fake_sysfs.create(3) is True
+        o_file = CountingFile()
+        o_driveutils = SlowDriveUtils(o_file, o_fake_sysfs.s_sys_root, o_fake_sysfs.s_dev_root,
+                                      o_fake_sysfs.s_proc_root)
+        # The refresher is driven by the tests
+        o_exporter = MetricsExporter(o_driveutils, i_port=0, f_interval=3600, f_inventory_interval=3600)
+        return o_fake_sysfs, o_file, o_exporter
+
+    def scrape(self, o_exporter, s_path="/metrics"):
+        s_url = "http://127.0.0.1:" + str(o_exporter.get_port()) + s_path
+        with urllib.request.urlopen(s_url, timeout=5) as o_response:
+            return o_response.headers["Content-Type"], o_response.read().decode("utf-8")
+
+    # Start Tests
+    def test_scrape(self, tmp_path):
+        o_fake_sysfs, o_file, o_exporter = self.create_exporter(str(tmp_path))
+        assert o_exporter.start() is True
+        try:
+            s_content_type, s_metrics = self.scrape(o_exporter)
+        finally:
+            o_exporter.stop()
+
+        assert s_content_type.startswith("application/openmetrics-text")
+        assert s_metrics.endswith("# EOF\n")
+        assert "# TYPE disksio_disk info\n" in s_metrics
+        assert "disksio_disk_info{device=\"sdb\",id=\"" in s_metrics
+        assert "serial=\"ZC100001\",wwn=\"0x5000c50000000001\",vendor=\"SEAGATE\"" in s_metrics
+        assert "disksio_disk_size_bytes{device=\"sda\"} 4000787030016\n" in s_metrics
+        assert "disksio_disk_unreadable{device=\"sdc\"} 0\n" in s_metrics
+        assert "disksio_scan_error 0\n" in s_metrics
+        assert "# TYPE disksio_disk_reads_completed counter\n" in s_metrics
+        assert "disksio_disk_reads_completed_total{device=\"sda\"} 1532\n" in s_metrics
+        assert "disksio_disk_read_bytes_total{device=\"sda\"} 41620480\n" in s_metrics
+        assert "disksio_disk_io_time_seconds_total{device=\"sda\"} 1.172\n" in s_metrics
+        # Only the disks, not their partitions
+        assert "device=\"sda1\"" not in s_metrics
+
+    def test_scrapes_do_not_read_nor_render(self, tmp_path):
+        o_fake_sysfs, o_file, o_exporter = self.create_exporter(str(tmp_path))
+        assert o_exporter.start() is True
+        try:
+            i_reads = o_file.i_reads
+            i_renders = o_exporter.i_renders
+            for i_scrape in range(5):
+                self.scrape(o_exporter)
+            assert o_file.i_reads == i_reads
+            assert o_exporter.i_renders == i_renders == 1
+
+            # Nothing changed
+            assert o_exporter.refresh(b_inventory=True) is False
+            assert o_exporter.i_renders == 1
+
+            File().write(o_fake_sysfs.s_proc_root + "/diskstats",
+                         "   8       0 sda 1600 0 81290 1201 12 0 96 8 0 1172 1209 0 0 0 0\n")
+            assert o_exporter.refresh() is True
+            assert o_exporter.i_renders == 2
+            s_content_type, s_metrics = self.scrape(o_exporter)
+            assert "disksio_disk_reads_completed_total{device=\"sda\"} 1600\n" in s_metrics
+            assert "disksio_disk_reads_completed_total{device=\"sdb\"}" not in s_metrics
+        finally:
+            o_exporter.stop()
+
+    def test_scrapes_during_refresh(self, tmp_path):
+        o_fake_sysfs, o_file, o_exporter = self.create_exporter(str(tmp_path))
+        assert o_exporter.start() is True
+        try:
+            o_exporter.o_driveutils.o_release.clear()
+            o_refresh_thread = threading.Thread(target=o_exporter.refresh, args=(True,))
+            o_refresh_thread.start()
+
+            f_start = time.monotonic()
+            a_threads = [threading.Thread(target=self.scrape, args=(o_exporter,)) for i_thread in range(8)]
+            for o_thread in a_threads:
+                o_thread.start()
+            for o_thread in a_threads:
+                o_thread.join()
+            f_elapsed = time.monotonic() - f_start
+
+            assert o_refresh_thread.is_alive() is True
+            o_exporter.o_driveutils.o_release.set()
+            o_refresh_thread.join()
+        finally:
+            o_exporter.o_driveutils.o_release.set()
+            o_exporter.stop()
+
+        assert f_elapsed < 2.0
+
+    def test_refresher_survives_errors(self, tmp_path):
+        o_fake_sysfs, o_file, o_exporter = self.create_exporter(str(tmp_path))
+        o_exporter.f_interval = 0.01
+        assert o_exporter.start() is True
+        try:
+            assert o_exporter.o_driveutils.a_calls == [(16, 5.0)]
+            s_content_type, s_metrics = self.scrape(o_exporter)
+            assert "disksio_exporter_refresh_failing 0\n" in s_metrics
+
+            o_exporter.o_driveutils.b_fail = True
+            o_exporter.f_last_inventory_refresh = -3600.0
+            f_deadline = time.monotonic() + 5
+            while o_exporter.i_refresh_errors < 2 and time.monotonic() < f_deadline:
+                time.sleep(0.01)
+            s_content_type, s_metrics = self.scrape(o_exporter)
+            assert "disksio_exporter_refresh_failing 1\n" in s_metrics
+            assert "disksio_exporter_refresh_errors_total 0\n" not in s_metrics
+            # The data of the last refresh that worked is still served
+            assert "disksio_disk_size_bytes{device=\"sda\"} 4000787030016\n" in s_metrics
+
+            o_exporter.o_driveutils.b_fail = False
+            while o_exporter.b_refresh_failing is True and time.monotonic() < f_deadline:
+                time.sleep(0.01)
+            s_content_type, s_metrics = self.scrape(o_exporter)
+            assert "disksio_exporter_refresh_failing 0\n" in s_metrics
+        finally:
+            o_exporter.stop()
+
+    def test_not_found_and_escaping(self, tmp_path):
+        o_fake_sysfs, o_file, o_exporter = self.create_exporter(str(tmp_path))
+        assert o_exporter.format_labels({"vendor": "A \"B\"\\C\n"}) == "{vendor=\"A \\\"B\\\"\\\\C\\n\"}"
+        assert o_exporter.start() is True
+        try:
+            with pytest.raises(urllib.error.HTTPError):
+                self.scrape(o_exporter, "/other")
+        finally:
+            o_exporter.stop()
@@ -0,0 +1,92 @@
+#
+# Tests for ReadBenchmark class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+import ctypes
+import os
+import shutil
+from ..src.lib.file import File
+from ..src.lib.fakesysfs import FakeSysfs
+from ..src.lib.readbenchmark import ReadBenchmark, AlignedBuffer
+
+
+class TestReadBenchmark(object):
+
+    def create_target(self, tmp_path, i_size=1048576):
+        s_target = str(tmp_path / "target.img")
+        with open(s_target, "wb") as o_target:
+            o_target.write(b"\x5a" * i_size)
+        return s_target
+
+    # Start Tests
+    def test_aligned_buffer(self):
+        o_buffer = AlignedBuffer(8192, 4096)
+        i_address = ctypes.addressof(ctypes.c_char.from_buffer(o_buffer.o_view))
+
+        assert i_address % 4096 == 0
+        assert len(o_buffer.o_view) == 8192
+
+    def test_block_size_of_partition(self, tmp_path):
+        o_fake_sysfs = FakeSysfs(str(tmp_path))
+        assert o_fake_sysfs.create(1) is True
+        s_class_path = o_fake_sysfs.s_sys_root + "/class/block/"
+        # A 4Kn disk. Like in the real sysfs, its partitions have no queue/
+        File().write(s_class_path + "sda/queue/logical_block_size", "4096\n")
+        shutil.rmtree(os.path.realpath(s_class_path + "sda1") + "/queue")
+        o_read_benchmark = ReadBenchmark("/dev/sda1", File(), o_fake_sysfs.s_sys_root)
+
+        assert o_read_benchmark.get_disk_dev_name("sda1") == "sda"
+        assert o_read_benchmark.get_disk_dev_name("sda") == "sda"
+        assert o_read_benchmark.get_block_size_of_device("sda1") == 4096
+        assert o_read_benchmark.get_block_size_of_device("sdz") == 512
+
+    def test_run_sequential(self, tmp_path):
+        o_read_benchmark = ReadBenchmark(self.create_target(tmp_path))
+        b_success, d_results = o_read_benchmark.run(s_pattern="sequential", i_io_size=65536, i_queue_depth=2,
+                                                    f_duration=0, i_max_ios=40)
+
+        assert b_success is True
+        assert d_results["ios"] == 40
+        assert d_results["errors"] == 0
+        assert d_results["bytes"] == 40 * 65536
+        assert d_results["iops"] > 0
+        assert d_results["latency_p50_ms"] <= d_results["latency_p99.9_ms"] <= d_results["latency_max_ms"]
+
+    def test_run_random_rounds_io_size(self, tmp_path):
+        o_read_benchmark = ReadBenchmark(self.create_target(tmp_path))
+        b_success, d_results = o_read_benchmark.run(s_pattern="random", i_io_size=100, i_queue_depth=4,
+                                                    f_duration=0, i_max_ios=100)
+
+        assert b_success is True
+        assert d_results["ios"] == 100
+        assert d_results["io_size"] % d_results["block_size"] == 0
+
+    def test_run_duration(self, tmp_path):
+        o_read_benchmark = ReadBenchmark(self.create_target(tmp_path))
+        b_success, d_results = o_read_benchmark.run(i_io_size=4096, i_queue_depth=2, f_duration=0.2, b_direct=False)
+
+        assert b_success is True
+        assert d_results["direct"] is False
+        assert d_results["ios"] > 0
+        assert d_results["seconds"] < 2.0
+
+    def test_run_ko(self, tmp_path):
+        b_success, d_results = ReadBenchmark(str(tmp_path / "missing.img")).run(f_duration=0.1)
+        assert b_success is False
+
+        b_success, d_results = ReadBenchmark(self.create_target(tmp_path, 100)).run(f_duration=0.1)
+        assert b_success is False
+
+        b_success, d_results = ReadBenchmark(self.create_target(tmp_path)).run(s_pattern="backwards")
+        assert b_success is False
+
+    def test_histogram(self, tmp_path):
+        o_read_benchmark = ReadBenchmark(self.create_target(tmp_path))
+        b_success, d_results = o_read_benchmark.run(i_io_size=4096, i_queue_depth=3, f_duration=0, i_max_ios=90)
+
+        assert len(o_read_benchmark.o_histogram) == 90
+        assert d_results["latency_max_ms"] == o_read_benchmark.o_histogram.i_max / 1000.0
@@ -0,0 +1,129 @@
+#
+# Tests for SlowDiskDetector class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+from ..src.lib.file import File
+from ..src.lib.fakesysfs import FakeSysfs
+from ..src.lib.disk import Disk
+from ..src.lib.diskinventory import DiskInventory
+from ..src.lib.driveutils import DriveUtils
+from ..src.lib.slowdiskdetector import SlowDiskDetector
+
+
+class TestSlowDiskDetector(object):
+
+    def create_disks(self, i_disks, s_ioc="0"):
+        all_disks = DiskInventory()
+        for i_disk in range(i_disks):
+            o_disk = Disk("sd" + chr(ord("a") + i_disk))
+            o_disk.ioc = s_ioc
+            o_disk.manufacturer = "SEAGATE "
+            o_disk.type = Disk.TYPE_SPINNING
+            all_disks.add(o_disk)
+        return all_disks
+
+    def get_metrics(self, all_disks, d_await_ms=None, f_await_ms=8.0, f_util_percent=30.0):
+        """
+        Metrics of an interval, all the disks with the same ones except the ones in d_await_ms
+        """
+        d_await_ms = d_await_ms or {}
+        d_metrics = {}
+        for i_disk, o_disk in enumerate(all_disks):
+            # Some noise, like real disks
+            f_disk_await_ms = d_await_ms.get(o_disk.s_dev_name, f_await_ms + (i_disk % 3) * 0.4)
+            d_metrics[o_disk.s_dev_name] = {"iops": 100.0, "read_mb_s": 10.0, "write_mb_s": 2.0,
+                                            "await_ms": f_disk_await_ms, "queue_depth": 1.0,
+                                            "util_percent": f_util_percent}
+        return d_metrics
+
+    # Start Tests
+    def test_groups_by_enclosure_ioc_vendor_and_type(self, tmp_path):
+        o_fake_sysfs = FakeSysfs(str(tmp_path))
+        assert o_fake_sysfs.create(24, i_slots_per_enclosure=12, i_disks_per_host=16) is True
+        o_driveutils = DriveUtils(File(), o_fake_sysfs.s_sys_root, o_fake_sysfs.s_dev_root, o_fake_sysfs.s_proc_root)
+        i_error_code, all_disks = o_driveutils.get_all_disks()
+        o_enclosure_index = o_driveutils.load_enclosure_info(all_disks)
+
+        o_detector = SlowDiskDetector()
+        # The second enclosure is behind two HBAs
+        assert o_detector.set_disks(all_disks, o_enclosure_index) == 3
+        assert sorted([len(a_dev_names) for a_dev_names in o_detector.d_groups.values()]) == [4, 8, 12]
+        assert o_detector.set_disks(all_disks) == 2
+
+        all_disks.get_by_dev_name("sda").type = Disk.TYPE_SOLID_STATE
+        assert o_detector.set_disks(all_disks) == 3
+
+    def test_flagged_and_cleared_with_hysteresis(self):
+        all_disks = self.create_disks(12)
+        o_detector = SlowDiskDetector(i_trigger_samples=3, i_clear_samples=4)
+        o_detector.set_disks(all_disks)
+
+        for i_interval in range(2):
+            assert o_detector.update(self.get_metrics(all_disks, {"sdc": 90.0})) == ([], [])
+        # An interval back to normal restarts the count
+        assert o_detector.update(self.get_metrics(all_disks)) == ([], [])
+        for i_interval in range(2):
+            assert o_detector.update(self.get_metrics(all_disks, {"sdc": 90.0})) == ([], [])
+        assert o_detector.update(self.get_metrics(all_disks, {"sdc": 90.0})) == (["sdc"], [])
+        assert o_detector.is_slow("sdc") is True
+        assert "await_ms: 90.00 Peers median: 8.40" in o_detector.format_score("sdc")
+
+        # Between the thresholds it does not count as recovered
+        for i_interval in range(6):
+            assert o_detector.update(self.get_metrics(all_disks, {"sdc": 25.0})) == ([], [])
+        assert o_detector.is_slow("sdc") is True
+        for i_interval in range(3):
+            assert o_detector.update(self.get_metrics(all_disks, {"sdc": 9.0})) == ([], [])
+        assert o_detector.update(self.get_metrics(all_disks, {"sdc": 9.0})) == ([], ["sdc"])
+        assert o_detector.is_slow("sdc") is False
+
+    def test_apply_to_disks(self):
+        all_disks = self.create_disks(8)
+        # Not enough peers in the group of sdh to have a verdict
+        all_disks.get_by_dev_name("sdh").ioc = "1"
+        o_detector = SlowDiskDetector(i_trigger_samples=1)
+        o_detector.set_disks(all_disks)
+        assert o_detector.apply_to_disks(all_disks) == 0
+        assert all_disks.get_by_dev_name("sda").s_health == ""
+
+        d_metrics = self.get_metrics(all_disks, {"sdb": 100.0, "sdh": 100.0})
+        # A hung disk completes no I/O, but it is busy all the time
+        d_metrics["sdd"].update({"iops": 0.0, "await_ms": 0.0, "util_percent": 100.0})
+        # An idle disk keeps its state
+        d_metrics["sde"].update({"iops": 0.0, "await_ms": 0.0, "util_percent": 0.0})
+        assert o_detector.update(d_metrics) == (["sdb", "sdd"], [])
+        assert o_detector.apply_to_disks(all_disks) == 2
+
+        assert [o_disk.s_health for o_disk in all_disks] == [Disk.HEALTH_OK, Disk.HEALTH_SLOW, Disk.HEALTH_OK,
+                                                             Disk.HEALTH_SLOW, "", Disk.HEALTH_OK, Disk.HEALTH_OK,
+                                                             ""]
+
+    def test_identical_disks_are_not_flagged(self):
+        all_disks = self.create_disks(20)
+        o_detector = SlowDiskDetector(i_trigger_samples=1)
+        o_detector.set_disks(all_disks)
+
+        # The MAD is 0, but 50% slower is not an outlier
+        for i_interval in range(10):
+            d_metrics = self.get_metrics(all_disks, {"sdf": 12.0}, f_await_ms=8.0)
+            for d_disk_metrics in d_metrics.values():
+                d_disk_metrics["await_ms"] = 8.0
+            d_metrics["sdf"]["await_ms"] = 12.0
+            d_metrics["sdg"]["util_percent"] = 45.0
+            assert o_detector.update(d_metrics) == ([], [])
+
+    def test_removed_disks_are_forgotten(self):
+        all_disks = self.create_disks(6)
+        o_detector = SlowDiskDetector(i_trigger_samples=1)
+        o_detector.set_disks(all_disks)
+        assert o_detector.update(self.get_metrics(all_disks, {"sdc": 90.0})) == (["sdc"], [])
+
+        all_disks.remove("sdc")
+        o_detector.set_disks(all_disks)
+        assert o_detector.is_slow("sdc") is False
+        assert o_detector.get_health("sdc") == ""
+        assert o_detector.get_health("sda") == Disk.HEALTH_OK
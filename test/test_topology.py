@@ -0,0 +1,121 @@
+#
+# Tests for Topology class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+from ..src.lib.file import File
+from ..src.lib.fakesysfs import FakeSysfs
+from ..src.lib.driveutils import DriveUtils
+from ..src.lib.topology import Topology, TopologyNode
+
+
+class TestTopology(object):
+
+    def create_topology(self, s_root):
+        o_fake_sysfs = FakeSysfs(s_root)
+        assert o_fake_sysfs.create(6, i_nvme_disks=1, i_slots_per_enclosure=12, i_disks_per_host=3) is True
+        assert o_fake_sysfs.create_holder("md0", ["sda1", "sdd1"], i_partitions=2) is True
+        assert o_fake_sysfs.create_holder("dm-0", ["md0"]) is True
+        assert o_fake_sysfs.create_holder("zd0", []) is True
+
+        o_topology = Topology(File(), o_fake_sysfs.s_sys_root)
+        assert o_topology.build() is True
+        return o_fake_sysfs, o_topology
+
+    # Start Tests
+    def test_build(self, tmp_path):
+        o_fake_sysfs, o_topology = self.create_topology(str(tmp_path))
+
+        assert sorted([o_node.s_name for o_node in o_topology.get_nodes_of_type(Topology.TYPE_HOST)]) == \
+               ["host0", "host1", "nvme0"]
+        assert sorted(o_topology.get_disks_below("expander-1:0")) == ["sdd", "sde", "sdf"]
+        assert sorted(o_topology.get_disks_below("host0")) == ["sda", "sdb", "sdc"]
+        assert o_topology.get_disks_below("port-0:0:1") == ["sdb"]
+        assert o_topology.get_disks_below("nvme0") == ["nvme0n1"]
+        assert o_topology.get_disks_below("expander-9:0") == []
+        assert o_topology.get_path("sde") == ["host1", "port-1:0", "expander-1:0", "port-1:0:1", "sde"]
+        assert o_topology.get_path("sda9") == ["host0", "port-0:0", "expander-0:0", "port-0:0:0", "sda", "sda9"]
+        assert o_topology.get_ancestor("sde", Topology.TYPE_EXPANDER) == "expander-1:0"
+        assert o_topology.get_ancestor("sde", Topology.TYPE_DM) == ""
+        assert o_topology.get_partitions("sdb") == ["sdb1", "sdb2", "sdb3"]
+        assert o_topology.get_partitions("sda") == ["sda1", "sda9"]
+        assert o_topology.get_node("zd0").s_type == Topology.TYPE_ZVOL
+
+    def test_ioc(self, tmp_path):
+        o_fake_sysfs, o_topology = self.create_topology(str(tmp_path))
+        o_driveutils = DriveUtils(File(), o_fake_sysfs.s_sys_root, o_fake_sysfs.s_dev_root, o_fake_sysfs.s_proc_root)
+        i_error_code, l_disks = o_driveutils.get_all_disks()
+
+        for o_disk in l_disks:
+            if o_disk.s_dev_name.startswith("sd"):
+                assert o_topology.get_ioc(o_disk.s_dev_name) == o_disk.ioc
+        assert o_topology.get_ioc("md0") == "-"
+
+    def test_holders(self, tmp_path):
+        o_fake_sysfs, o_topology = self.create_topology(str(tmp_path))
+
+        assert o_topology.get_holders("sdd") == ["md0", "dm-0"]
+        assert o_topology.get_holders("sda1") == ["md0", "dm-0"]
+        assert o_topology.get_holders("sdb") == []
+        assert o_topology.get_node("md0").a_slaves == ["sda1", "sdd1"]
+        assert o_topology.get_disks_of_holder("dm-0") == ["sda", "sdd"]
+        assert o_topology.get_partitions("md0") == ["md0p1", "md0p2"]
+        assert o_topology.get_node("md0p1").s_type == Topology.TYPE_PARTITION
+        assert o_topology.get_disks_of_holder("md0p2") == ["sda", "sdd"]
+        assert o_topology.get_holders("sdd") == ["md0", "dm-0"]
+
+    def test_get_metrics_by(self, tmp_path):
+        o_fake_sysfs, o_topology = self.create_topology(str(tmp_path))
+        d_metrics = {}
+        for s_dev_name in ["sda", "sdb", "sdd"]:
+            d_metrics[s_dev_name] = {"iops": 100.0, "read_mb_s": 10.0, "write_mb_s": 1.0,
+                                     "util_percent": 50.0 if s_dev_name == "sdb" else 20.0, "await_ms": 2.0}
+
+        d_groups = o_topology.get_metrics_by(Topology.TYPE_EXPANDER, d_metrics)
+
+        assert d_groups["expander-0:0"]["disks"] == 2
+        assert d_groups["expander-0:0"]["iops"] == 200.0
+        assert d_groups["expander-0:0"]["read_mb_s"] == 20.0
+        assert d_groups["expander-0:0"]["util_percent"] == 50.0
+        assert d_groups["expander-1:0"]["disks"] == 1
+        assert o_topology.format_metrics("expander-0:0", d_groups["expander-0:0"]).startswith(
+            "expander-0:0 Disks: 2 IOPS: 200.0")
+
+    def test_nvme_multipath(self, tmp_path):
+        o_fake_sysfs = FakeSysfs(str(tmp_path))
+        assert o_fake_sysfs.create(2, i_nvme_disks=2, i_slots_per_enclosure=12) is True
+        assert o_fake_sysfs.create_nvme_subsystem(5, [6, 7]) is True
+        o_topology = Topology(File(), o_fake_sysfs.s_sys_root)
+        assert o_topology.build() is True
+
+        assert o_topology.get_node("nvme5n1").s_type == Topology.TYPE_DISK
+        assert o_topology.get_disks_below("nvme6") == ["nvme5n1"]
+        assert o_topology.get_disks_below("nvme7") == ["nvme5n1"]
+        assert o_topology.get_path("nvme5n1p1") == ["nvme6", "nvme5n1", "nvme5n1p1"]
+        assert o_topology.get_partitions("nvme5n1") == ["nvme5n1p1"]
+        assert o_topology.get_disks_below("nvme1") == ["nvme1n1"]
+        assert sorted([o_node.s_name for o_node in o_topology.get_nodes_of_type(Topology.TYPE_HOST)]) == \
+               ["host0", "nvme0", "nvme1", "nvme6", "nvme7"]
+
+    def test_add_many_disks(self):
+        o_topology = Topology()
+        o_host_node = TopologyNode("host0", Topology.TYPE_HOST)
+        o_expander_node = TopologyNode("expander-0:0", Topology.TYPE_EXPANDER, o_host_node)
+        a_port_nodes = [TopologyNode("port-0:0:%d" % i_port, Topology.TYPE_PORT, o_expander_node)
+                        for i_port in range(2)]
+        for i_disk in range(100000):
+            o_topology.add_disk("sd%d" % i_disk, [a_port_nodes[0]])
+        # A disk reached through both ports, with multipath
+        o_topology.add_disk("sdz", a_port_nodes)
+        for o_node in [o_host_node, o_expander_node] + a_port_nodes:
+            o_topology.d_nodes[o_node.s_name] = o_node
+
+        a_disks = o_topology.get_disks_below("host0")
+        assert len(a_disks) == 100001
+        assert a_disks[:2] == ["sd0", "sd1"]
+        assert a_disks[-1] == "sdz"
+        assert o_topology.get_disks_below("port-0:0:1") == ["sdz"]
+        assert o_topology.group_disks_by(Topology.TYPE_EXPANDER) == {"expander-0:0": a_disks}
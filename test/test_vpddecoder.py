@@ -0,0 +1,102 @@
+#
+# Tests for VpdDecoder class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+import struct
+from ..src.lib.file import File
+from ..src.lib.fakesysfs import FakeSysfs
+from ..src.lib.driveutils import DriveUtils
+from ..src.lib.vpddecoder import VpdDecoder, VpdIdentity
+
+
+class TestVpdDecoder(object):
+
+    def get_page(self, i_page_code, a_payload):
+        return struct.pack(">BBH", 0, i_page_code, len(a_payload)) + a_payload
+
+    def get_designator(self, i_code_set, i_association, i_type, a_designator):
+        return struct.pack(">BBBB", i_code_set, (i_association << 4) | i_type, 0, len(a_designator)) + a_designator
+
+    # Start Tests
+    def test_decode_serial(self):
+        o_decoder = VpdDecoder()
+
+        # The length 0x30 is "0" and the spaces and dashes were lost by the old filter
+        a_serial = b"  WD-WMC1T0" + b"A" * 38
+        assert o_decoder.decode_serial(bytearray(self.get_page(0x80, a_serial))) == (True, "WD-WMC1T0" + "A" * 38)
+        assert o_decoder.decode_serial(self.get_page(0x80, b"ZC11ABCD\x00\x00")) == (True, "ZC11ABCD")
+        assert o_decoder.decode_serial(self.get_page(0x83, b"ZC11ABCD")) == (False, "")
+        assert o_decoder.decode_serial(b"\x00\x80") == (False, "")
+
+    def test_decode(self):
+        a_identification = self.get_designator(0x61, 1, 3, struct.pack(">Q", 0x5000c500a1b2c3ff)) + \
+            self.get_designator(0x02, 0, 1, b"ATA     ST4000NM0035-1V4107  ZC11ABCD") + \
+            self.get_designator(0x01, 0, 3, struct.pack(">Q", 0x5000c500a1b2c3d4)) + \
+            self.get_designator(0x01, 0, 2, struct.pack(">Q", 0x0025388b91b2c3d4))
+        d_pages = {0x00: self.get_page(0x00, bytes([0x00, 0x80, 0x83, 0xb1])),
+                   0x80: self.get_page(0x80, b"ZC11ABCD"),
+                   0x83: self.get_page(0x83, a_identification),
+                   0xb1: self.get_page(0xb1, struct.pack(">HBB", 7200, 0, 2) + bytes(56))}
+
+        o_identity = VpdDecoder().decode(d_pages)
+
+        assert o_identity.a_supported_pages == [0x00, 0x80, 0x83, 0xb1]
+        assert o_identity.s_serial == "ZC11ABCD"
+        # The NAA of the target port is skipped
+        assert o_identity.s_wwn == "0x5000c500a1b2c3d4"
+        assert o_identity.s_eui == "0025388b91b2c3d4"
+        assert o_identity.s_t10_vendor_id == "ATA ST4000NM0035-1V4107 ZC11ABCD"
+        assert o_identity.i_rotation_rate == 7200
+        assert o_identity.s_form_factor == "3.5"
+        assert o_identity.is_solid_state() is False
+
+    def test_decode_missing_and_truncated_pages(self):
+        a_identification = self.get_designator(0x01, 0, 3, struct.pack(">Q", 0x5000c500a1b2c3d4))
+        d_pages = {0x83: self.get_page(0x83, a_identification)[:-3],
+                   0xb1: self.get_page(0xb1, struct.pack(">HBB", 1, 0, 3))}
+
+        o_identity = VpdDecoder().decode(d_pages)
+
+        assert o_identity.s_serial == ""
+        assert o_identity.s_wwn == "0x5000c500a1"
+        assert o_identity.is_solid_state() is True
+        assert o_identity.s_form_factor == "2.5"
+        assert VpdIdentity().is_solid_state() is None
+
+    def test_get_vpd_identities(self, tmp_path):
+        o_fake_sysfs = FakeSysfs(str(tmp_path))
+        assert o_fake_sysfs.create(3, i_nvme_disks=1) is True
+        o_driveutils = DriveUtils(File(), o_fake_sysfs.s_sys_root, o_fake_sysfs.s_dev_root, o_fake_sysfs.s_proc_root)
+        i_error_code, l_disks = o_driveutils.get_all_disks()
+
+        d_identities = o_driveutils.get_vpd_identities(l_disks)
+
+        assert sorted(d_identities.keys()) == ["nvme0n1", "sda", "sdb", "sdc"]
+        for d_disk in o_fake_sysfs.a_disks:
+            o_identity = d_identities[d_disk["dev_name"]]
+            assert o_identity.s_serial == d_disk["serial"]
+            assert o_identity.s_wwn == d_disk["wwn"]
+            assert l_disks.get_by_dev_name(d_disk["dev_name"]).s_serial == d_disk["serial"]
+        assert d_identities["sda"].i_rotation_rate == 7200
+        assert d_identities["nvme0n1"].a_supported_pages == []
+
+    def test_wwn_without_wwn_link(self, tmp_path):
+        o_fake_sysfs = FakeSysfs(str(tmp_path))
+        assert o_fake_sysfs.create(2) is True
+        o_file = File()
+        s_by_id_path = o_fake_sysfs.s_dev_root + "/disk/by-id"
+        b_success, a_disk_ids = o_file.list_dir(s_by_id_path)
+        for s_disk_id in a_disk_ids:
+            if s_disk_id.startswith("wwn-"):
+                o_file.delete(s_by_id_path + "/" + s_disk_id)
+        o_driveutils = DriveUtils(o_file, o_fake_sysfs.s_sys_root, o_fake_sysfs.s_dev_root, o_fake_sysfs.s_proc_root)
+
+        i_error_code, l_disks = o_driveutils.get_all_disks()
+
+        assert l_disks.get_by_dev_name("sdb").id.startswith("ata-")
+        assert l_disks.get_by_dev_name("sdb").s_wwn == "0x5000c50000000001"
+        assert l_disks.get_by_wwn("0x5000c50000000001").s_dev_name == "sdb"
@@ -0,0 +1,61 @@
+#
+# Tests for WriteBenchmark class
+#
+# Author: Carles Mateo
+# Creation Date: 2026-10-18
+#
+
+import pytest
+import os
+from ..src.lib.writebenchmark import WriteBenchmark
+
+
+class TestWriteBenchmark(object):
+
+    # Start Tests
+    def test_run_modes(self, tmp_path):
+        o_write_benchmark = WriteBenchmark(str(tmp_path))
+        for s_mode in WriteBenchmark.A_MODES:
+            b_success, d_results = o_write_benchmark.run(s_mode=s_mode, i_block_size=4096, i_file_size=65536,
+                                                         f_duration=0, i_max_writes=32, i_fsync_every=8)
+
+            assert b_success is True
+            assert d_results["writes"] == 32
+            assert d_results["errors"] == 0
+            assert d_results["bytes"] == 32 * 4096
+            assert d_results["write_p50_ms"] <= d_results["write_max_ms"]
+            if s_mode == WriteBenchmark.MODE_FSYNC:
+                # Every 8 writes and the final one
+                assert d_results["fsyncs"] == 5
+            else:
+                assert d_results["fsyncs"] == 1
+
+        # The scratch file is always deleted
+        assert os.listdir(str(tmp_path)) == []
+
+    def test_run_patterns(self, tmp_path):
+        o_write_benchmark = WriteBenchmark(str(tmp_path))
+        for s_pattern in WriteBenchmark.A_PATTERNS:
+            b_success, d_results = o_write_benchmark.run(s_pattern=s_pattern, i_block_size=1000, i_file_size=8000,
+                                                         f_duration=0, i_max_writes=20)
+
+            assert b_success is True
+            assert d_results["pattern"] == s_pattern
+            assert d_results["writes"] == 20
+
+    def test_run_duration(self, tmp_path):
+        b_success, d_results = WriteBenchmark(str(tmp_path)).run(i_block_size=4096, i_file_size=1048576,
+                                                                 f_duration=0.2)
+
+        assert b_success is True
+        assert d_results["writes"] > 0
+        assert d_results["seconds"] < 2.0
+
+    def test_run_ko(self, tmp_path):
+        o_write_benchmark = WriteBenchmark(str(tmp_path))
+
+        assert o_write_benchmark.run(s_pattern="backwards")[0] is False
+        assert o_write_benchmark.run(s_mode="mmap")[0] is False
+        assert o_write_benchmark.run(i_block_size=4096, i_file_size=1000)[0] is False
+        assert o_write_benchmark.run(f_duration=0, i_max_writes=0)[0] is False
+        assert WriteBenchmark(str(tmp_path / "not_existing")).run(f_duration=0.1)[0] is False